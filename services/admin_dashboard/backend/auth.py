@@ -10,17 +10,18 @@ Provides:
 
 import os
 import json
+import time
 import secrets
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 from functools import wraps
 
 import httpx
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status, Request, Security
 from fastapi.security import OAuth2PasswordBearer, OAuth2AuthorizationCodeBearer, HTTPBearer
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 from nexus_lib.schemas.rbac import (
     User, UserCreate, UserUpdate, UserWithPermissions,
@@ -30,6 +31,7 @@ from nexus_lib.schemas.rbac import (
     TokenPayload, AuthToken,
     AuditLog, AuditAction,
 )
+from nexus_lib.utils import SimpleCache
 
 
 # =============================================================================
@@ -72,6 +74,10 @@ class AuthConfig:
     
     # Default admin (using .dev TLD which is valid)
     DEFAULT_ADMIN_EMAIL = os.getenv("NEXUS_ADMIN_EMAIL", "admin@nexus.dev")
+    
+    # Verified token cache
+    TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", "10000"))
+    TOKEN_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", "3600"))
 
 
 # =============================================================================
@@ -87,6 +93,11 @@ class RBACStore:
         self.audit_logs: List[AuditLog] = []
         self.refresh_tokens: Dict[str, str] = {}  # token -> user_id
         
+        # Memoized UserWithPermissions per user; roles_version is bumped on
+        # any role change so cached projections are rebuilt
+        self.roles_version = 0
+        self.permission_cache: Dict[str, Tuple[tuple, UserWithPermissions]] = {}
+        
         # Initialize default roles
         self._init_default_roles()
         
@@ -161,17 +172,35 @@ def create_refresh_token(user_id: str) -> str:
     return token
 
 
+# Verified tokens keyed by SHA-256 digest, kept until the token expires
+_verified_tokens = SimpleCache(max_size=AuthConfig.TOKEN_CACHE_MAX_ENTRIES, name="admin_jwt")
+
+
 def decode_token(token: str) -> TokenPayload:
-    """Decode and validate JWT token"""
-    try:
-        payload = jwt.decode(token, AuthConfig.SECRET_KEY, algorithms=[AuthConfig.ALGORITHM])
-        return TokenPayload(**payload)
-    except JWTError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {str(e)}",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    """
+    Decode and validate JWT token
+    
+    Verified payloads are cached until the token expires (at most
+    JWT_CACHE_MAX_TTL). Callers get a copy and may modify it.
+    """
+    # A token verified with one key/algorithm is not trusted under another
+    scope = hashlib.sha256(f"{AuthConfig.SECRET_KEY}|{AuthConfig.ALGORITHM}".encode()).hexdigest()[:16]
+    key = (scope, hashlib.sha256(token.encode()).digest())
+    payload = _verified_tokens.get(key)
+    if payload is None:
+        try:
+            claims = jwt.decode(token, AuthConfig.SECRET_KEY, algorithms=[AuthConfig.ALGORITHM])
+            payload = TokenPayload(**claims)
+        except (JWTError, ValidationError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=f"Invalid token: {str(e)}",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        ttl = min(claims.get("exp", 0) - time.time(), AuthConfig.TOKEN_CACHE_MAX_TTL)
+        if ttl > 0:
+            _verified_tokens.set(key, payload, ttl=ttl)
+    return payload.model_copy(deep=True)
 
 
 # =============================================================================
@@ -398,6 +427,7 @@ class RBACService:
         """Delete a user"""
         if user_id in rbac_store.users:
             del rbac_store.users[user_id]
+            rbac_store.permission_cache.pop(user_id, None)
             return True
         return False
     
@@ -408,7 +438,31 @@ class RBACService:
     
     @staticmethod
     def get_user_with_permissions(user: User) -> UserWithPermissions:
-        """Get user with computed permissions"""
+        """
+        Get user with computed permissions
+        
+        The projection is memoized per user and rebuilt when the user's
+        roles, status or profile change, or when any role changes. Callers
+        get a copy and may modify it.
+        """
+        version = (
+            rbac_store.roles_version,
+            tuple(user.roles),
+            user.status,
+            user.updated_at,
+            user.last_login,
+        )
+        cached = rbac_store.permission_cache.get(user.id)
+        if cached is not None and cached[0] == version:
+            return cached[1].model_copy(deep=True)
+        
+        projection = RBACService._project_permissions(user)
+        rbac_store.permission_cache[user.id] = (version, projection)
+        return projection.model_copy(deep=True)
+    
+    @staticmethod
+    def _project_permissions(user: User) -> UserWithPermissions:
+        """Compute permissions from the user's roles (and their parents)"""
         permissions = set()
         is_admin = False
         
@@ -460,6 +514,7 @@ class RBACService:
         )
         
         rbac_store.roles[role_id] = role
+        rbac_store.roles_version += 1
         return role
     
     @staticmethod
@@ -482,6 +537,7 @@ class RBACService:
         
         role.updated_at = datetime.utcnow()
         rbac_store.roles[role_id] = role
+        rbac_store.roles_version += 1
         return role
     
     @staticmethod
@@ -503,6 +559,7 @@ class RBACService:
                 user.roles.remove(role_id)
         
         del rbac_store.roles[role_id]
+        rbac_store.roles_version += 1
         return True
     
     @staticmethod
@@ -106,6 +106,11 @@ try:
 except ImportError as e:
     print(f"Note: Enterprise storage not loaded: {e}")
 
+try:
+    from nexus_lib.jira import invalidate_jira_webhook
+except ImportError:
+    invalidate_jira_webhook = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -254,6 +259,7 @@ async def lifespan(app: FastAPI):
     # Cleanup
     if RedisConnection is not None:
         try:
+            await ConfigManager.stop_listener()
             await RedisConnection().close()
         except Exception as e:
             logger.warning(f"Error closing Redis: {e}")
@@ -2631,7 +2637,13 @@ async def receive_jira_webhook(
     
     Configure in Jira: Admin → System → WebHooks
     Events: issue_updated, issue_deleted
+    
+    Every delivery also invalidates the shared Jira entity cache, so agents
+    reading the same Jira site stop serving the changed issue.
     """
+    if invalidate_jira_webhook is not None:
+        await invalidate_jira_webhook(payload)
+    
     if not ENTERPRISE_STORAGE:
         raise HTTPException(501, "Enterprise storage not configured")
     
@@ -22,6 +22,11 @@ from enum import Enum
 
 import httpx
 
+try:
+    from nexus_lib.jira import jira_cache_for
+except ImportError:  # shared library not on the path
+    jira_cache_for = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -225,11 +230,38 @@ class JiraClient:
     
     async def update_issue(self, issue_key: str, fields: Dict) -> Dict:
         """Update a Jira issue."""
-        return await self.request("PUT", f"/rest/api/3/issue/{issue_key}", data={"fields": fields})
+        result = await self.request("PUT", f"/rest/api/3/issue/{issue_key}", data={"fields": fields})
+        await self._invalidate(issue_key)
+        return result
     
     async def get_issue(self, issue_key: str) -> Dict:
-        """Get a Jira issue."""
-        return await self.request("GET", f"/rest/api/3/issue/{issue_key}")
+        """Get a Jira issue (through the shared Jira entity cache when available)."""
+        endpoint = f"/rest/api/3/issue/{issue_key}"
+        cache = self._cache()
+        if cache is None:
+            return await self.request("GET", endpoint)
+        
+        async def load() -> Tuple[Dict, Optional[str]]:
+            return await self.request("GET", endpoint), None
+        
+        async def unchanged(issue: Dict, etag: Optional[str]) -> bool:
+            current = await self.request("GET", endpoint, params={"fields": "updated"})
+            updated = issue.get("fields", {}).get("updated")
+            return updated is not None and updated == current.get("fields", {}).get("updated")
+        
+        return await cache.get_issue(issue_key, loader=load, variant="v3", revalidate=unchanged)
+    
+    def _cache(self):
+        """Shared entity cache for the configured Jira site, if any."""
+        if jira_cache_for is None or not self.config.base_url:
+            return None
+        return jira_cache_for(self.config.base_url)
+    
+    async def _invalidate(self, issue_key: str):
+        """Drop cached copies of an issue this client just changed."""
+        cache = self._cache()
+        if cache is not None:
+            await cache.invalidate_issue(issue_key, source="write")
     
     async def add_comment(self, issue_key: str, comment: str) -> Dict:
         """Add a comment to an issue."""
@@ -245,7 +277,9 @@ class JiraClient:
                 ]
             }
         }
-        return await self.request("POST", f"/rest/api/3/issue/{issue_key}/comment", data=body)
+        result = await self.request("POST", f"/rest/api/3/issue/{issue_key}/comment", data=body)
+        await self._invalidate(issue_key)
+        return result
     
     async def transition_issue(self, issue_key: str, transition_name: str) -> bool:
         """Transition an issue to a new status."""
@@ -259,6 +293,7 @@ class JiraClient:
                     f"/rest/api/3/issue/{issue_key}/transitions",
                     data={"transition": {"id": transition["id"]}}
                 )
+                await self._invalidate(issue_key)
                 return True
         
         return False
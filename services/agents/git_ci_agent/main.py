@@ -32,7 +32,7 @@ from nexus_lib.schemas.agent_contract import (
     TaskStatus,
     AgentType,
 )
-from nexus_lib.middleware import MetricsMiddleware, AuthMiddleware
+from nexus_lib.middleware import NexusMiddleware, MetricsStage, AuthStage
 from nexus_lib.instrumentation import (
     setup_tracing,
     track_tool_usage,
@@ -569,11 +569,15 @@ app = FastAPI(
 )
 
 # Add middleware
-app.add_middleware(MetricsMiddleware, agent_type="git_ci")
 app.add_middleware(
-    AuthMiddleware,
-    secret_key=os.environ.get("NEXUS_JWT_SECRET"),
-    require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+    NexusMiddleware,
+    stages=[
+        MetricsStage(agent_type="git_ci"),
+        AuthStage(
+            secret_key=os.environ.get("NEXUS_JWT_SECRET"),
+            require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+        ),
+    ]
 )
 
 # Add metrics endpoint
@@ -6,13 +6,15 @@ Now with dynamic configuration via ConfigManager - supports live mode switching
 """
 import os
 import sys
+import json
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Query, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from prometheus_client import Counter
 
 # Add shared lib to path
@@ -30,14 +32,15 @@ from nexus_lib.schemas.agent_contract import (
     TaskStatus,
     AgentType,
 )
-from nexus_lib.middleware import MetricsMiddleware, AuthMiddleware
+from nexus_lib.middleware import NexusMiddleware, MetricsStage, AuthStage
 from nexus_lib.instrumentation import (
     setup_tracing,
     track_tool_usage,
     create_metrics_endpoint,
     JIRA_TICKETS_PROCESSED,
 )
-from nexus_lib.utils import generate_task_id, utc_now
+from nexus_lib.utils import generate_task_id, utc_now, SimpleCache, cached
+from nexus_lib.jira import JiraTransport, jira_cache_for, invalidate_jira_webhook
 from nexus_lib.config import ConfigManager, ConfigKeys, is_mock_mode
 
 # Configure logging
@@ -47,6 +50,79 @@ logging.basicConfig(
 )
 logger = logging.getLogger("nexus.jira-agent")
 
+# Fields needed to render a hierarchy node (everything else is left on Jira)
+HIERARCHY_FIELDS = (
+    "summary,status,issuetype,priority,project,parent,assignee,"
+    "customfield_10014,customfield_10016"
+)
+
+# JQL for the children of a batch of issues; {keys} is a comma-separated key list.
+# Legacy company-managed projects can add: OR "Epic Link" in ({keys})
+HIERARCHY_CHILD_JQL = os.environ.get("JIRA_HIERARCHY_CHILD_JQL", "parent in ({keys})")
+
+# Parent keys per child query (keeps JQL well under URL length limits)
+HIERARCHY_BATCH_SIZE = int(os.environ.get("JIRA_HIERARCHY_BATCH_SIZE", "50"))
+
+# Fields sprint statistics are computed from
+SPRINT_STATS_FIELDS = "status,customfield_10016"
+
+# Seconds a sprint's statistics are cached (webhooks invalidate sooner)
+SPRINT_STATS_CACHE_TTL = int(os.environ.get("JIRA_SPRINT_STATS_CACHE_TTL", "300"))
+
+sprint_stats_cache = SimpleCache(default_ttl=SPRINT_STATS_CACHE_TTL, max_size=1000, name="sprint_stats")
+
+
+# ============================================================================
+# SPRINT STATISTICS
+# ============================================================================
+
+class SprintStatsAccumulator:
+    """
+    Single-pass sprint statistics over raw Jira search pages.
+    
+    Reads status and story points straight from the issue dicts, so no
+    JiraTicket models are built for what is only a set of counters.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.in_progress = 0
+        self.total_points = 0.0
+        self.completed_points = 0.0
+        self.blockers: List[str] = []
+    
+    def add(self, issues: List[Dict[str, Any]]):
+        """Fold one page of issues into the totals"""
+        for issue in issues:
+            fields = issue.get("fields") or {}
+            status = ((fields.get("status") or {}).get("name") or "").lower()
+            points = fields.get("customfield_10016") or 0
+            
+            self.total += 1
+            self.total_points += points
+            if status == "done":
+                self.completed += 1
+                self.completed_points += points
+            elif status == "in progress":
+                self.in_progress += 1
+            if "block" in status:
+                self.blockers.append(issue["key"])
+    
+    def result(self, sprint_name: Optional[str]) -> JiraSprintStats:
+        return JiraSprintStats(
+            sprint_id=0,
+            sprint_name=sprint_name or "Current Sprint",
+            total_issues=self.total,
+            completed_issues=self.completed,
+            in_progress_issues=self.in_progress,
+            blocked_issues=len(self.blockers),
+            total_story_points=self.total_points,
+            completed_story_points=self.completed_points,
+            completion_percentage=(self.completed / self.total * 100) if self.total > 0 else 0,
+            blockers=self.blockers
+        )
+
 
 # ============================================================================
 # JIRA CLIENT WRAPPER
@@ -54,9 +130,12 @@ logger = logging.getLogger("nexus.jira-agent")
 
 class JiraClient:
     """
-    Wrapper for Jira API interactions using atlassian-python-api
+    Wrapper for Jira API interactions over the async Jira transport
     Supports both real API calls and mock mode for development
     
+    Live calls go through ``JiraTransport`` (pooled httpx, REST v2/v3), so a
+    slow Jira request never blocks the agent's event loop.
+    
     Now uses ConfigManager for dynamic configuration:
     - Mode can be switched live via Admin Dashboard
     - Credentials are fetched from Redis/env/defaults
@@ -89,8 +168,6 @@ class JiraClient:
     async def _init_live_client(self):
         """Initialize the live Jira client with credentials from ConfigManager."""
         try:
-            from atlassian import Jira
-            
             jira_url = await ConfigManager.get(ConfigKeys.JIRA_URL)
             jira_username = await ConfigManager.get(ConfigKeys.JIRA_USERNAME)
             jira_token = await ConfigManager.get(ConfigKeys.JIRA_API_TOKEN)
@@ -101,18 +178,14 @@ class JiraClient:
                 self._jira = None
                 return
             
-            self._jira = Jira(
-                url=jira_url,
+            self._jira = JiraTransport(
+                base_url=jira_url,
                 username=jira_username,
-                password=jira_token,
-                cloud=True  # Assume cloud by default
+                api_token=jira_token,
+                cache=jira_cache_for(jira_url)
             )
             logger.info(f"Jira client initialized in LIVE mode - {jira_url}")
             
-        except ImportError:
-            logger.warning("atlassian-python-api not installed, using mock mode")
-            self._last_mode = True
-            self._jira = None
         except Exception as e:
             logger.error(f"Failed to initialize Jira client: {e}")
             self._last_mode = True
@@ -144,7 +217,7 @@ class JiraClient:
             key=issue["key"],
             id=issue.get("id"),
             summary=fields.get("summary", "No summary"),
-            description=fields.get("description"),
+            description=self._flatten_adf(fields.get("description")),
             issue_type=self._map_issue_type(fields.get("issuetype", {}).get("name")),
             status=fields.get("status", {}).get("name", "Unknown"),
             resolution=fields.get("resolution", {}).get("name") if fields.get("resolution") else None,
@@ -205,6 +278,29 @@ class JiraClient:
                 return sprint.get("name")
         return None
     
+    def _flatten_adf(self, value: Any) -> Optional[str]:
+        """Flatten an Atlassian Document Format node (REST v3) to plain text"""
+        if value is None or isinstance(value, str):
+            return value
+        if not isinstance(value, dict):
+            return str(value)
+        
+        node_type = value.get("type")
+        if node_type == "text":
+            return value.get("text", "")
+        if node_type == "hardBreak":
+            return "\n"
+        if node_type in ("mention", "emoji"):
+            attrs = value.get("attrs", {})
+            return attrs.get("text") or attrs.get("shortName") or ""
+        
+        # Block containers put each child on its own line; inline content
+        # (paragraphs, headings, code blocks) is concatenated as-is.
+        parts = [self._flatten_adf(child) or "" for child in value.get("content", [])]
+        if node_type in ("doc", "blockquote", "bulletList", "orderedList", "listItem", "table", "tableRow", "tableCell", "panel"):
+            return "\n".join(p for p in parts if p)
+        return "".join(parts)
+    
     def _parse_datetime(self, dt_str: Optional[str]) -> Optional[datetime]:
         """Parse Jira datetime string"""
         if not dt_str:
@@ -221,32 +317,102 @@ class JiraClient:
         if self.mock_mode:
             return self._mock_issue(key)
         
-        issue = self._jira.issue(key, expand=expand)
+        issue = await self._jira.get_issue(key, expand=expand)
         return self._parse_issue(issue, include_subtasks=True)
     
     async def get_issue_hierarchy(self, key: str, max_depth: int = 3) -> JiraTicket:
-        """Recursively fetch issue hierarchy (Epic -> Stories -> Subtasks)"""
+        """Fetch issue hierarchy (Epic -> Stories -> Subtasks) level by level"""
         await self._ensure_initialized()
         
         if self.mock_mode:
             return self._mock_hierarchy(key)
         
-        root = await self.get_issue(key)
-        await self._fetch_children(root, depth=0, max_depth=max_depth)
+        root = None
+        by_key: Dict[str, JiraTicket] = {}
+        async for depth, tickets in self.iter_issue_hierarchy(key, max_depth=max_depth):
+            for ticket in tickets:
+                by_key[ticket.key] = ticket
+                if depth == 0:
+                    root = ticket
+                else:
+                    by_key[ticket.parent_key].subtasks.append(ticket)
         return root
     
-    async def _fetch_children(self, ticket: JiraTicket, depth: int, max_depth: int):
-        """Recursively fetch child issues"""
-        if depth >= max_depth:
+    async def iter_issue_hierarchy(
+        self,
+        key: str,
+        max_depth: int = 3
+    ) -> AsyncIterator[Tuple[int, List[JiraTicket]]]:
+        """
+        Walk an issue hierarchy breadth-first.
+        
+        Each level costs one batched child query per HIERARCHY_BATCH_SIZE
+        parents, fully paginated and run concurrently, instead of one query
+        per node.
+        
+        Yields:
+            (depth, tickets) per level; depth 0 is the root, and every deeper
+            ticket's ``parent_key`` names its parent on the previous level
+        """
+        await self._ensure_initialized()
+        
+        if self.mock_mode:
+            level = [self._mock_hierarchy(key)]
+            for depth in range(max_depth + 1):
+                if not level:
+                    break
+                yield depth, [t.model_copy(update={"subtasks": []}) for t in level]
+                level = [
+                    child.model_copy(update={"parent_key": parent.key})
+                    for parent in level
+                    for child in parent.subtasks
+                ]
             return
         
-        if ticket.issue_type == JiraIssueType.EPIC:
-            jql = f'"Epic Link" = {ticket.key}'
-            results = await self.search_issues(jql)
-            ticket.subtasks = results.issues
-            
-            for child in ticket.subtasks:
-                await self._fetch_children(child, depth + 1, max_depth)
+        # The root is fetched in full (changelog, every field); only the child
+        # levels use the narrow HIERARCHY_FIELDS projection
+        root = (await self.get_issue(key)).model_copy(update={"subtasks": []})
+        yield 0, [root]
+        
+        seen = {root.key}
+        level = [root]
+        for depth in range(1, max_depth + 1):
+            parents = [t.key for t in level if t.issue_type != JiraIssueType.SUBTASK]
+            if not parents:
+                break
+            children = [c for c in await self._fetch_children(parents) if c.key not in seen]
+            if not children:
+                break
+            seen.update(c.key for c in children)
+            yield depth, children
+            level = children
+    
+    async def _fetch_children(self, parent_keys: List[str]) -> List[JiraTicket]:
+        """Children of every issue in ``parent_keys``, with parent_key resolved"""
+        parents = set(parent_keys)
+        batches = [
+            parent_keys[i:i + HIERARCHY_BATCH_SIZE]
+            for i in range(0, len(parent_keys), HIERARCHY_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(
+            self._jira.search_all(HIERARCHY_CHILD_JQL.format(keys=", ".join(batch)), fields=HIERARCHY_FIELDS)
+            for batch in batches
+        ))
+        
+        children = []
+        for issues in results:
+            for issue in issues:
+                fields = issue.get("fields", {})
+                parent = (fields.get("parent") or {}).get("key")
+                if parent not in parents:
+                    # Matched through the Epic Link field instead of parent
+                    parent = fields.get("customfield_10014")
+                if parent not in parents:
+                    continue
+                child = self._parse_issue(issue)
+                child.parent_key = parent
+                children.append(child)
+        return children
     
     async def search_issues(
         self,
@@ -261,7 +427,7 @@ class JiraClient:
         if self.mock_mode:
             return self._mock_search(jql, max_results)
         
-        result = self._jira.jql(jql, start=start_at, limit=max_results, fields=fields)
+        result = await self._jira.search(jql, start_at=start_at, max_results=max_results, fields=fields)
         
         return JiraSearchResult(
             total=result.get("total", 0),
@@ -279,10 +445,10 @@ class JiraClient:
             return True
         
         try:
-            transitions = self._jira.get_issue_transitions(key)
+            transitions = await self._jira.get_transitions(key)
             
             target_transition = None
-            for t in transitions.get("transitions", []):
+            for t in transitions:
                 if t["to"]["name"].lower() == status.lower():
                     target_transition = t["id"]
                     break
@@ -291,10 +457,10 @@ class JiraClient:
                 logger.warning(f"No transition found for status: {status}")
                 return False
             
-            self._jira.set_issue_status(key, target_transition)
+            await self._jira.transition_issue(key, target_transition)
             
             if comment:
-                self._jira.issue_add_comment(key, comment)
+                await self._jira.add_comment(key, comment)
             
             return True
         except Exception as e:
@@ -319,7 +485,7 @@ class JiraClient:
             for field_name, value in fields.items():
                 update_payload["fields"][field_name] = value
             
-            self._jira.update_issue_field(key, update_payload["fields"])
+            await self._jira.update_issue(key, update_payload["fields"])
             
             logger.info(f"Updated {key} fields: {list(fields.keys())}")
             
@@ -346,49 +512,48 @@ class JiraClient:
             return True
         
         try:
-            self._jira.issue_add_comment(key, comment)
+            await self._jira.add_comment(key, comment)
             return True
         except Exception as e:
             logger.error(f"Failed to add comment: {e}")
             return False
     
     async def get_sprint_stats(self, project_key: str, sprint_name: Optional[str] = None) -> JiraSprintStats:
-        """Get sprint statistics for a project"""
+        """
+        Get sprint statistics for a project
+        
+        Live results are cached per sprint until a Jira webhook reports a
+        change in the project (or SPRINT_STATS_CACHE_TTL passes).
+        """
         await self._ensure_initialized()
         
         if self.mock_mode:
             return self._mock_sprint_stats(project_key, sprint_name)
         
+        # The entity cache's search generation changes on every invalidation
+        # of the project, so stale entries are simply never looked up again
+        cache = self._jira.cache
+        generation = await cache.search_generation([project_key]) if cache else None
+        return await self._load_sprint_stats(project_key, sprint_name, generation)
+    
+    @cached(ttl=SPRINT_STATS_CACHE_TTL, key_prefix="sprint_stats", store=sprint_stats_cache)
+    async def _load_sprint_stats(
+        self,
+        project_key: str,
+        sprint_name: Optional[str],
+        generation: Optional[Tuple[str, ...]]
+    ) -> JiraSprintStats:
+        """Page through every sprint issue, fetching only the fields the stats use"""
         jql = f'project = {project_key}'
         if sprint_name:
             jql += f' AND sprint = "{sprint_name}"'
         else:
             jql += ' AND sprint in openSprints()'
         
-        result = await self.search_issues(jql, max_results=500)
-        
-        total = len(result.issues)
-        completed = sum(1 for i in result.issues if i.status.lower() == "done")
-        in_progress = sum(1 for i in result.issues if i.status.lower() == "in progress")
-        blocked = sum(1 for i in result.issues if "block" in i.status.lower())
-        
-        total_points = sum(i.story_points or 0 for i in result.issues)
-        completed_points = sum(i.story_points or 0 for i in result.issues if i.status.lower() == "done")
-        
-        blockers = [i.key for i in result.issues if "block" in i.status.lower()]
-        
-        return JiraSprintStats(
-            sprint_id=0,
-            sprint_name=sprint_name or "Current Sprint",
-            total_issues=total,
-            completed_issues=completed,
-            in_progress_issues=in_progress,
-            blocked_issues=blocked,
-            total_story_points=total_points,
-            completed_story_points=completed_points,
-            completion_percentage=(completed / total * 100) if total > 0 else 0,
-            blockers=blockers
-        )
+        stats = SprintStatsAccumulator()
+        async for page in self._jira.iter_search_pages(jql, fields=SPRINT_STATS_FIELDS):
+            stats.add(page)
+        return stats.result(sprint_name)
     
     # ============================================================================
     # MOCK DATA GENERATORS
@@ -542,11 +707,15 @@ app = FastAPI(
 )
 
 # Add middleware
-app.add_middleware(MetricsMiddleware, agent_type="jira")
 app.add_middleware(
-    AuthMiddleware,
-    secret_key=os.environ.get("NEXUS_JWT_SECRET"),
-    require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+    NexusMiddleware,
+    stages=[
+        MetricsStage(agent_type="jira"),
+        AuthStage(
+            secret_key=os.environ.get("NEXUS_JWT_SECRET"),
+            require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+        ),
+    ]
 )
 
 # Add metrics endpoint
@@ -561,12 +730,14 @@ create_metrics_endpoint(app)
 async def health_check():
     """Health check endpoint with dynamic mode detection"""
     current_mode = await is_mock_mode()
+    cache = getattr(jira_client._jira, "cache", None)
     return {
         "status": "healthy",
         "service": "jira-agent",
         "version": "2.3.0",
         "mock_mode": current_mode,
-        "dynamic_config": True
+        "dynamic_config": True,
+        "jira_cache": cache.get_stats() if cache else None
     }
 
 
@@ -634,6 +805,49 @@ async def get_ticket_hierarchy(
         )
 
 
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events message"""
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@app.get("/hierarchy/{ticket_key}/stream")
+async def stream_ticket_hierarchy(
+    ticket_key: str,
+    max_depth: int = Query(3, ge=1, le=5, description="Maximum depth to traverse")
+):
+    """
+    Stream a ticket hierarchy level by level over SSE
+    
+    Emits one ``level`` event per depth (``depth`` and its ``tickets``, each
+    with ``parent_key`` set and no nested ``subtasks``) as soon as it is
+    fetched, then ``complete`` with ``total_tickets``, so large Epics can be
+    rendered progressively.
+    """
+    async def event_source():
+        total = 0
+        project_key = None
+        try:
+            async for depth, tickets in jira_client.iter_issue_hierarchy(ticket_key, max_depth=max_depth):
+                total += len(tickets)
+                project_key = project_key or tickets[0].project_key
+                yield _format_sse({
+                    "event": "level",
+                    "depth": depth,
+                    "tickets": [t.model_dump(mode="json", exclude={"subtasks"}) for t in tickets]
+                })
+            JIRA_TICKETS_PROCESSED.labels(action="hierarchy", project_key=project_key or "unknown").inc(total)
+            yield _format_sse({"event": "complete", "total_tickets": total})
+        except Exception as e:
+            logger.error(f"Failed to stream hierarchy for {ticket_key}: {e}")
+            yield _format_sse({"event": "error", "error": str(e)})
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/search", response_model=AgentTaskResponse)
 @track_tool_usage("search_issues", agent_type="jira")
 async def search_issues(
@@ -769,6 +983,18 @@ async def update_ticket_fields(request: TicketFieldUpdateRequest):
         )
 
 
+@app.post("/webhooks/jira")
+async def receive_jira_webhook(payload: Dict[str, Any]):
+    """
+    Invalidate cached Jira data from a Jira webhook
+    
+    Point Jira (issue created/updated/deleted and sprint events) here, or
+    forward events received elsewhere. Invalidation goes through the shared
+    entity cache, so every service reading the same Jira site sees it.
+    """
+    return await invalidate_jira_webhook(payload)
+
+
 @app.get("/sprint-stats/{project_key}", response_model=AgentTaskResponse)
 @track_tool_usage("get_sprint_stats", agent_type="jira")
 async def get_sprint_stats(
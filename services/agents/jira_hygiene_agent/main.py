@@ -9,9 +9,12 @@ Now with dynamic configuration via ConfigManager - supports live mode switching
 """
 import os
 import sys
+import time
+import math
 import logging
-from typing import Optional, List, Dict, Any, Set
+from typing import Optional, List, Dict, Any, Set, Tuple
 from datetime import datetime
+from dataclasses import dataclass, field as dataclass_field
 from contextlib import asynccontextmanager
 from collections import defaultdict
 
@@ -31,7 +34,7 @@ from nexus_lib.schemas.agent_contract import (
     TaskStatus,
     AgentType,
 )
-from nexus_lib.middleware import MetricsMiddleware, AuthMiddleware
+from nexus_lib.middleware import NexusMiddleware, MetricsStage, AuthStage
 from nexus_lib.instrumentation import (
     setup_tracing,
     track_tool_usage,
@@ -39,6 +42,7 @@ from nexus_lib.instrumentation import (
 )
 from nexus_lib.utils import AsyncHttpClient, generate_task_id
 from nexus_lib.config import ConfigManager, ConfigKeys, is_mock_mode
+from nexus_lib.jira import JiraTransport
 
 # Configure logging
 logging.basicConfig(
@@ -82,6 +86,12 @@ COMPLIANT_TICKETS = Gauge(
     ['project_key']
 )
 
+TICKETS_FETCHED_TOTAL = Counter(
+    'nexus_hygiene_tickets_fetched_total',
+    'Tickets fetched from Jira by hygiene checks',
+    ['project_key', 'sync_type']  # full, delta
+)
+
 
 # ============================================================================
 # CONFIGURATION
@@ -131,6 +141,14 @@ class HygieneConfig(BaseModel):
     schedule_hour: int = Field(default=9)
     schedule_minute: int = Field(default=0)
     schedule_days: str = Field(default="mon-fri")
+    
+    # Seconds between full re-syncs of a project snapshot; checks in between
+    # only fetch tickets updated since the last check
+    full_sync_interval: int = Field(default=86400)
+    
+    def fetch_fields(self) -> str:
+        """Fields a hygiene check needs from Jira (required fields plus reporting)"""
+        return ",".join(dict.fromkeys([*self.required_fields, "summary", "assignee", "updated"]))
 
 
 # ============================================================================
@@ -168,11 +186,30 @@ class HygieneCheckResult(BaseModel):
     violation_summary: Dict[str, int]  # field_name -> count
 
 
+@dataclass
+class TicketHygiene:
+    """Stored validation result for one ticket"""
+    summary: str
+    missing_fields: List[str]
+    assignee_email: str
+    assignee_display_name: str
+
+
+@dataclass
+class HygieneSnapshot:
+    """Per-project validation results, kept current by delta fetches"""
+    required_fields: Tuple[str, ...]
+    full_synced_at: float
+    cursor: float = 0.0
+    tickets: Dict[str, TicketHygiene] = dataclass_field(default_factory=dict)
+
+
 class HygieneCheckRequest(BaseModel):
     """Request to run a hygiene check"""
     project_key: Optional[str] = Field(None, description="Specific project to check (optional)")
     notify: bool = Field(True, description="Send notifications to assignees")
     dry_run: bool = Field(False, description="Check without sending notifications")
+    full_sync: bool = Field(False, description="Re-fetch every active ticket instead of only changed ones")
 
 
 # ============================================================================
@@ -211,28 +248,23 @@ class JiraHygieneClient:
     async def _init_live_client(self):
         """Initialize the live Jira client with credentials from ConfigManager."""
         try:
-            from atlassian import Jira
-            
             self._jira_url = await ConfigManager.get(ConfigKeys.JIRA_URL)
             jira_username = await ConfigManager.get(ConfigKeys.JIRA_USERNAME)
             jira_token = await ConfigManager.get(ConfigKeys.JIRA_API_TOKEN)
             
             if all([self._jira_url, jira_username, jira_token]):
-                self._jira = Jira(
-                    url=self._jira_url,
+                # Not on the shared entity cache: delta fetches advance a
+                # cursor, so their results must come straight from Jira
+                self._jira = JiraTransport(
+                    base_url=self._jira_url,
                     username=jira_username,
-                    password=jira_token,
-                    cloud=True
+                    api_token=jira_token
                 )
                 logger.info(f"Jira Hygiene client initialized in LIVE mode - {self._jira_url}")
             else:
                 logger.warning("Jira credentials incomplete, using mock mode")
                 self._last_mode = True
                 self._jira = None
-        except ImportError:
-            logger.warning("atlassian-python-api not installed, using mock mode")
-            self._last_mode = True
-            self._jira = None
         except Exception as e:
             logger.error(f"Failed to initialize Jira client: {e}")
             self._last_mode = True
@@ -250,61 +282,82 @@ class JiraHygieneClient:
     def jira_url(self):
         return self._jira_url or "https://jira.example.com"
     
-    async def get_active_sprint_tickets(self, project_key: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Fetch tickets from active sprints/releases"""
-        await self._ensure_initialized()
-        if self.mock_mode:
-            return self._get_mock_tickets(project_key)
+    def _build_jql(
+        self,
+        project_key: Optional[str] = None,
+        active_only: bool = True,
+        updated_within_minutes: Optional[int] = None
+    ) -> str:
+        """JQL for the tickets hygiene checks cover"""
+        jql_parts = []
         
-        try:
-            # Build JQL for active tickets
-            jql_parts = []
-            
-            # Filter by project if specified
-            if project_key:
-                jql_parts.append(f"project = {project_key}")
-            elif self.config.projects:
-                projects_str = ", ".join(self.config.projects)
-                jql_parts.append(f"project IN ({projects_str})")
-            
-            # Filter by issue type
-            types_str = ", ".join([f'"{t}"' for t in self.config.issue_types])
-            jql_parts.append(f"issuetype IN ({types_str})")
-            
+        # Filter by project if specified
+        if project_key:
+            jql_parts.append(f"project = {project_key}")
+        elif self.config.projects:
+            projects_str = ", ".join(self.config.projects)
+            jql_parts.append(f"project IN ({projects_str})")
+        
+        # Filter by issue type
+        types_str = ", ".join([f'"{t}"' for t in self.config.issue_types])
+        jql_parts.append(f"issuetype IN ({types_str})")
+        
+        if active_only:
             # Exclude completed statuses
             statuses_str = ", ".join([f'"{s}"' for s in self.config.excluded_statuses])
             jql_parts.append(f"status NOT IN ({statuses_str})")
             
             # Active sprint or fix version
             jql_parts.append("(sprint in openSprints() OR fixVersion in unreleasedVersions())")
-            
-            jql = " AND ".join(jql_parts)
-            
-            # Fetch tickets
-            issues = []
-            start_at = 0
-            max_results = 100
-            
-            while True:
-                result = self.jira.jql(
-                    jql,
-                    start=start_at,
-                    limit=max_results,
-                    fields="*all"
-                )
-                
-                issues.extend(result.get("issues", []))
-                
-                if len(result.get("issues", [])) < max_results:
-                    break
-                start_at += max_results
-            
-            return issues
+        
+        # Relative dates avoid the Jira user's timezone
+        if updated_within_minutes is not None:
+            jql_parts.append(f"updated >= -{updated_within_minutes}m")
+        
+        return " AND ".join(jql_parts)
+    
+    async def get_active_sprint_tickets(
+        self,
+        project_key: Optional[str] = None,
+        updated_within_minutes: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch tickets from active sprints/releases
+        
+        Only the configured required fields (plus summary, assignee and
+        updated) are requested.
+        
+        Args:
+            project_key: Specific project (defaults to the configured projects)
+            updated_within_minutes: Only tickets updated in this window
+        """
+        await self._ensure_initialized()
+        if self.mock_mode:
+            return self._get_mock_tickets(project_key)
+        
+        try:
+            jql = self._build_jql(project_key, updated_within_minutes=updated_within_minutes)
+            return await self.jira.search_all(jql, fields=self.config.fetch_fields())
             
         except Exception as e:
             logger.error(f"Failed to fetch tickets: {e}")
             raise
     
+    async def get_updated_ticket_keys(self, project_key: Optional[str], updated_within_minutes: int) -> Set[str]:
+        """
+        Keys of in-scope tickets updated in the window, active or not
+        
+        Tickets in this set but missing from the active delta have left the
+        active set (completed, moved out of the sprint, re-typed).
+        """
+        await self._ensure_initialized()
+        if self.mock_mode:
+            return {t["key"] for t in self._get_mock_tickets(project_key)}
+        
+        jql = self._build_jql(project_key, active_only=False, updated_within_minutes=updated_within_minutes)
+        issues = await self.jira.search_all(jql, fields="updated")
+        return {issue["key"] for issue in issues}
+    
     def _get_mock_tickets(self, project_key: Optional[str] = None) -> List[Dict[str, Any]]:
         """Generate mock tickets for testing"""
         project = project_key or "PROJ"
@@ -431,6 +484,8 @@ class HygieneChecker:
         self.jira_client = jira_client
         self.slack_client = slack_client
         self.config = config
+        # Validation results per project ("ALL" for the configured projects)
+        self._snapshots: Dict[str, HygieneSnapshot] = {}
     
     def _is_field_empty(self, value: Any) -> bool:
         """Check if a field value is considered empty"""
@@ -476,71 +531,127 @@ class HygieneChecker:
         base_url = self.jira_client.jira_url.rstrip("/")
         return f"{base_url}/browse/{ticket_key}"
     
+    def _evaluate_ticket(self, ticket: Dict[str, Any]) -> TicketHygiene:
+        """Validation result to store for a ticket"""
+        email, display_name = self._get_assignee_info(ticket)
+        return TicketHygiene(
+            summary=ticket.get("fields", {}).get("summary", "No summary"),
+            missing_fields=self._validate_ticket(ticket),
+            assignee_email=email,
+            assignee_display_name=display_name
+        )
+    
+    async def _sync_snapshot(self, project_key: Optional[str], full_sync: bool = False) -> HygieneSnapshot:
+        """
+        Bring a project's snapshot up to date
+        
+        The first check, a change of required fields, ``full_sync`` or an
+        expired ``full_sync_interval`` re-fetch every active ticket. Other
+        checks fetch only tickets updated since the previous check (plus a
+        minute of overlap) and re-validate those; tickets that changed but
+        are no longer active are dropped. The periodic full sync catches
+        membership changes that do not touch the ticket (e.g. a released
+        fix version) and deleted tickets.
+        """
+        project = project_key or "ALL"
+        required = tuple(self.config.required_fields)
+        snapshot = self._snapshots.get(project)
+        started = time.time()
+        
+        if (
+            full_sync
+            or snapshot is None
+            or snapshot.required_fields != required
+            or started - snapshot.full_synced_at >= self.config.full_sync_interval
+        ):
+            tickets = await self.jira_client.get_active_sprint_tickets(project_key)
+            snapshot = HygieneSnapshot(required_fields=required, full_synced_at=started)
+            snapshot.tickets = {t.get("key", "UNKNOWN"): self._evaluate_ticket(t) for t in tickets}
+            TICKETS_FETCHED_TOTAL.labels(project_key=project, sync_type="full").inc(len(tickets))
+        else:
+            window = math.ceil((started - snapshot.cursor) / 60) + 1
+            changed = await self.jira_client.get_updated_ticket_keys(project_key, window)
+            if changed:
+                tickets = await self.jira_client.get_active_sprint_tickets(project_key, updated_within_minutes=window)
+                for key in changed - {t.get("key") for t in tickets}:
+                    snapshot.tickets.pop(key, None)
+                for ticket in tickets:
+                    snapshot.tickets[ticket.get("key", "UNKNOWN")] = self._evaluate_ticket(ticket)
+                TICKETS_FETCHED_TOTAL.labels(project_key=project, sync_type="delta").inc(len(tickets))
+            logger.info(f"Hygiene delta for {project}: {len(changed)} tickets updated in the last {window}m")
+        
+        snapshot.cursor = started
+        self._snapshots[project] = snapshot
+        return snapshot
+    
+    def get_snapshot_stats(self) -> Dict[str, Any]:
+        """Size and age of each project snapshot"""
+        return {
+            project: {
+                "tickets": len(snapshot.tickets),
+                "last_check": datetime.utcfromtimestamp(snapshot.cursor).isoformat(),
+                "last_full_sync": datetime.utcfromtimestamp(snapshot.full_synced_at).isoformat(),
+            }
+            for project, snapshot in self._snapshots.items()
+        }
+    
     @track_tool_usage("check_hygiene", agent_type="jira_hygiene")
     async def check_hygiene(
         self,
         project_key: Optional[str] = None,
-        trigger_type: str = "manual"
+        trigger_type: str = "manual",
+        full_sync: bool = False
     ) -> HygieneCheckResult:
         """
         Run hygiene check on active tickets
         
         Args:
             project_key: Specific project to check (optional)
-            trigger_type: "scheduled" or "manual"
+            trigger_type: "scheduled", "manual" or "api"
+            full_sync: Re-fetch every active ticket instead of only changed ones
         
         Returns:
             HygieneCheckResult with violations and score
         """
         check_id = generate_task_id("hygiene")
-        
-        # Fetch tickets
-        tickets = self.jira_client.get_active_sprint_tickets(project_key)
         project = project_key or "ALL"
         
-        logger.info(f"Checking hygiene for {len(tickets)} tickets in {project}")
+        snapshot = await self._sync_snapshot(project_key, full_sync=full_sync)
+        
+        logger.info(f"Checking hygiene for {len(snapshot.tickets)} tickets in {project}")
         
         # Track metrics
         HYGIENE_CHECKS_TOTAL.labels(project_key=project, trigger_type=trigger_type).inc()
         
-        # Analyze tickets
+        # Score from the stored per-ticket results
         violations_by_assignee: Dict[str, List[TicketViolation]] = defaultdict(list)
         violation_summary: Dict[str, int] = defaultdict(int)
         compliant_count = 0
         
-        for ticket in tickets:
-            ticket_key = ticket.get("key", "UNKNOWN")
-            fields = ticket.get("fields", {})
-            
-            # Validate ticket
-            missing_fields = self._validate_ticket(ticket)
-            
-            if not missing_fields:
+        for ticket_key, ticket in snapshot.tickets.items():
+            if not ticket.missing_fields:
                 compliant_count += 1
                 continue
             
-            # Get assignee
-            email, display_name = self._get_assignee_info(ticket)
-            
             # Create violation record
             violation = TicketViolation(
                 ticket_key=ticket_key,
-                ticket_summary=fields.get("summary", "No summary"),
+                ticket_summary=ticket.summary,
                 ticket_url=self._build_ticket_url(ticket_key),
-                missing_fields=missing_fields,
-                assignee_email=email,
-                assignee_display_name=display_name
+                missing_fields=ticket.missing_fields,
+                assignee_email=ticket.assignee_email,
+                assignee_display_name=ticket.assignee_display_name
             )
             
-            violations_by_assignee[email].append(violation)
+            violations_by_assignee[ticket.assignee_email].append(violation)
             
             # Update violation counts
-            for field in missing_fields:
+            for field in ticket.missing_fields:
                 violation_summary[field] += 1
                 VIOLATIONS_TOTAL.labels(project_key=project, violation_type=field).inc()
         
         # Calculate hygiene score
-        total_tickets = len(tickets)
+        total_tickets = len(snapshot.tickets)
         hygiene_score = (compliant_count / total_tickets * 100) if total_tickets > 0 else 100.0
         
         # Update Prometheus metrics
@@ -865,6 +976,7 @@ async def lifespan(app: FastAPI):
         schedule_hour=int(os.environ.get("HYGIENE_SCHEDULE_HOUR", "9")),
         schedule_minute=int(os.environ.get("HYGIENE_SCHEDULE_MINUTE", "0")),
         schedule_days=os.environ.get("HYGIENE_SCHEDULE_DAYS", "mon-fri"),
+        full_sync_interval=int(os.environ.get("HYGIENE_FULL_SYNC_INTERVAL", "86400")),
     )
     
     # Initialize clients
@@ -897,11 +1009,15 @@ app = FastAPI(
 )
 
 # Add middleware
-app.add_middleware(MetricsMiddleware, agent_type="jira_hygiene")
 app.add_middleware(
-    AuthMiddleware,
-    secret_key=os.environ.get("NEXUS_JWT_SECRET"),
-    require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+    NexusMiddleware,
+    stages=[
+        MetricsStage(agent_type="jira_hygiene"),
+        AuthStage(
+            secret_key=os.environ.get("NEXUS_JWT_SECRET"),
+            require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+        ),
+    ]
 )
 
 # Add metrics endpoint
@@ -937,6 +1053,7 @@ async def run_check(
     - **project_key**: Specific project to check (optional, checks all if not provided)
     - **notify**: Send DM notifications to assignees (default: true)
     - **dry_run**: Run check without sending notifications (default: false)
+    - **full_sync**: Re-fetch every active ticket instead of only changed ones (default: false)
     """
     task_id = generate_task_id("hygiene")
     
@@ -944,7 +1061,8 @@ async def run_check(
         # Run hygiene check
         result = await checker.check_hygiene(
             project_key=request.project_key,
-            trigger_type="manual"
+            trigger_type="manual",
+            full_sync=request.full_sync
         )
         
         # Send notifications in background if not dry run
@@ -1000,20 +1118,24 @@ async def get_status():
         "jira": {
             "mock_mode": jira_client.mock_mode if jira_client else True,
             "url": jira_client.jira_url if jira_client else None
-        }
+        },
+        "snapshots": checker.get_snapshot_stats() if checker else {}
     }
 
 
 @app.get("/violations/{project_key}")
-async def get_violations(project_key: str):
+async def get_violations(project_key: str, full_sync: bool = False):
     """
     Get current violations for a specific project
     
-    Runs a check and returns violations without sending notifications
+    Brings the project snapshot up to date (fetching only tickets changed
+    since the last check) and returns violations without sending
+    notifications. Pass ``full_sync=true`` to re-fetch every active ticket.
     """
     result = await checker.check_hygiene(
         project_key=project_key,
-        trigger_type="api"
+        trigger_type="api",
+        full_sync=full_sync
     )
     
     return {
@@ -1054,7 +1176,8 @@ async def execute_task(request: AgentTaskRequest):
         hygiene_request = HygieneCheckRequest(
             project_key=payload.get("project_key"),
             notify=payload.get("notify", True),
-            dry_run=payload.get("dry_run", False)
+            dry_run=payload.get("dry_run", False),
+            full_sync=payload.get("full_sync", False)
         )
         return await run_check(hygiene_request, BackgroundTasks())
     else:
@@ -29,7 +29,8 @@ import time
 import json
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote
 from functools import wraps
 
 import httpx
@@ -43,6 +44,12 @@ from fastapi.responses import Response
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../shared")))
 
 from nexus_lib.config import ConfigManager, ConfigKeys, is_mock_mode
+from nexus_lib.utils import (
+    LogReduction,
+    StreamingLogReducer,
+    http_pool,
+    reduce_build_log_async,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -63,6 +70,11 @@ class Config:
     MAX_LOG_CHARS = int(os.getenv("RCA_MAX_LOG_CHARS", "100000"))
     MAX_DIFF_CHARS = int(os.getenv("RCA_MAX_DIFF_CHARS", "50000"))
     
+    # Console log streaming (Jenkins progressive text API)
+    LOG_CHUNK_CHARS = int(os.getenv("RCA_LOG_CHUNK_CHARS", "65536"))
+    LOG_POLL_INTERVAL = float(os.getenv("RCA_LOG_POLL_INTERVAL", "2"))
+    LOG_FOLLOW_TIMEOUT = float(os.getenv("RCA_LOG_FOLLOW_TIMEOUT", "300"))
+    
     # Service settings
     PORT = int(os.getenv("PORT", "8006"))
     WEBHOOK_SECRET = os.getenv("RCA_WEBHOOK_SECRET", "")
@@ -579,6 +591,68 @@ class JenkinsClient:
             logger.error(f"Failed to get console output: {e}")
             raise
     
+    @staticmethod
+    def _job_path(job_name: str) -> str:
+        """Jenkins URL path for a (possibly foldered) job name"""
+        return "/".join(f"job/{quote(part, safe='')}" for part in job_name.strip("/").split("/"))
+    
+    async def stream_console_output(self, job_name: str, build_number: int) -> AsyncIterator[str]:
+        """
+        Stream console output in chunks via the progressive text API.
+        
+        Follows ``X-Text-Size`` / ``X-More-Data`` so a build that is still
+        writing its log is read to the end (up to RCA_LOG_FOLLOW_TIMEOUT).
+        """
+        if self.mock_mode:
+            output = self._mock_console_output(job_name, build_number)
+            for i in range(0, len(output), Config.LOG_CHUNK_CHARS):
+                yield output[i:i + Config.LOG_CHUNK_CHARS]
+            return
+        
+        url = (
+            f"{Config.JENKINS_URL.rstrip('/')}/{self._job_path(job_name)}"
+            f"/{build_number}/logText/progressiveText"
+        )
+        auth = (Config.JENKINS_USERNAME, Config.JENKINS_API_TOKEN) if Config.JENKINS_USERNAME else None
+        client = http_pool.get_client(url)
+        deadline = time.monotonic() + Config.LOG_FOLLOW_TIMEOUT
+        offset = 0
+        
+        while True:
+            async with client.stream("GET", url, params={"start": offset}, auth=auth, timeout=60.0) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_text(Config.LOG_CHUNK_CHARS):
+                    yield chunk
+                offset = int(response.headers.get("X-Text-Size", offset))
+                more_data = response.headers.get("X-More-Data", "").lower() == "true"
+            
+            if not more_data or time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(Config.LOG_POLL_INTERVAL)
+    
+    async def reduce_console_output(
+        self,
+        job_name: str,
+        build_number: int,
+        max_total_chars: int
+    ) -> LogReduction:
+        """
+        Download and reduce console output as it streams in.
+        
+        Only the reducer's bounded state is held in memory. Falls back to the
+        full-text API if the progressive endpoint fails.
+        """
+        reducer = StreamingLogReducer(max_total_chars=max_total_chars)
+        try:
+            async for chunk in self.stream_console_output(job_name, build_number):
+                await asyncio.to_thread(reducer.feed, chunk)
+            return reducer.finish()
+        except httpx.HTTPError as e:
+            logger.warning(f"Progressive log streaming failed, fetching full log: {e}")
+        
+        console_output = await self.get_console_output(job_name, build_number)
+        return await reduce_build_log_async(console_output, max_total_chars=max_total_chars)
+    
     def _mock_build_info(self, job_name: str, build_number: int) -> Dict[str, Any]:
         """Generate mock build info for testing."""
         return {
@@ -1029,15 +1103,19 @@ class RcaEngine:
             logger.info(f"Fetching build info for {request.job_name}#{request.build_number}")
             build_info = await self.jenkins.get_build_info(request.job_name, request.build_number)
             
-            logger.info(f"Fetching console output for {request.job_name}#{request.build_number}")
-            console_output = await self.jenkins.get_console_output(request.job_name, request.build_number)
-            
-            # Step 2: Truncate logs for LLM context window
-            from nexus_lib.utils import truncate_build_log
-            truncated_logs = truncate_build_log(
-                console_output,
+            # Step 2: Stream console output into the reducer for the LLM context window
+            logger.info(f"Streaming console output for {request.job_name}#{request.build_number}")
+            reduction = await self.jenkins.reduce_console_output(
+                request.job_name,
+                request.build_number,
                 max_total_chars=Config.MAX_LOG_CHARS
             )
+            truncated_logs = reduction.text
+            if reduction.truncated:
+                logger.info(
+                    f"Reduced log from {reduction.total_lines} lines to {reduction.error_blocks} error blocks "
+                    f"(patterns: {reduction.matched_families})"
+                )
             
             # Step 3: Fetch git diff if available
             git_diff = ""
@@ -27,7 +27,7 @@ from nexus_lib.schemas.agent_contract import (
     SlackUser,
     SlackCommand,
 )
-from nexus_lib.middleware import MetricsMiddleware, AuthMiddleware
+from nexus_lib.middleware import NexusMiddleware, MetricsStage
 from nexus_lib.instrumentation import (
     setup_tracing,
     track_tool_usage,
@@ -99,7 +99,10 @@ class SlackClient:
     
     @property
     def http_client(self):
-        return self._http_client or AsyncHttpClient(base_url="https://slack.com/api")
+        if self._http_client is None:
+            # Unauthenticated fallback, created once; connections come from the shared pool
+            self._http_client = AsyncHttpClient(base_url="https://slack.com/api")
+        return self._http_client
     
     async def post_message(
         self,
@@ -569,7 +572,7 @@ app = FastAPI(
 )
 
 # Add middleware
-app.add_middleware(MetricsMiddleware, agent_type="slack")
+app.add_middleware(NexusMiddleware, stages=[MetricsStage(agent_type="slack")])
 
 # Add metrics endpoint
 create_metrics_endpoint(app)
@@ -0,0 +1,272 @@
+"""
+Nexus Embedding Service
+Batched, non-blocking text embedding with a content-hash LRU cache
+"""
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from nexus_lib.utils import hash_content
+
+logger = logging.getLogger("nexus.embeddings")
+
+# Dimension of all-MiniLM-L6-v2, also used by the hash fallback
+DEFAULT_DIMENSION = 384
+
+
+def hash_embedding(text: str, dimension: int = DEFAULT_DIMENSION) -> List[float]:
+    """
+    Deterministic pseudo-embedding used when sentence-transformers is unavailable
+
+    Args:
+        text: Text to embed
+        dimension: Output vector size
+
+    Returns:
+        SHA256 bytes scaled to [-1, 1] and tiled to ``dimension``
+    """
+    hash_bytes = hashlib.sha256(text.encode()).digest()
+    values = [(b / 128.0) - 1.0 for b in hash_bytes]
+    return (values * (dimension // len(values) + 1))[:dimension]
+
+
+class EmbeddingService:
+    """
+    Shared embedding pipeline for memory and caching.
+
+    Concurrent ``embed`` calls are collected for up to ``max_wait_ms`` (or
+    until ``batch_size`` texts are pending) and encoded in a single model call
+    on a worker thread, so the event loop never runs the model. Results are
+    cached by content hash with LRU eviction, and identical texts already
+    in flight share one encode.
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        cache_size: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Initialize the embedding service
+
+        Args:
+            model_name: sentence-transformers model name
+            batch_size: Maximum texts per model call
+            max_wait_ms: How long to wait for a batch to fill before encoding
+            cache_size: Maximum cached embeddings (0 disables the cache)
+            max_workers: Worker threads running the model
+        """
+        self.model_name = model_name or os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        self.batch_size = batch_size or int(os.environ.get("EMBEDDING_BATCH_SIZE", "32"))
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(
+            os.environ.get("EMBEDDING_BATCH_WAIT_MS", "5")
+        )
+        self.cache_size = cache_size if cache_size is not None else int(
+            os.environ.get("EMBEDDING_CACHE_SIZE", "10000")
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or int(os.environ.get("EMBEDDING_WORKERS", "1")),
+            thread_name_prefix="nexus-embed"
+        )
+        self._model = None
+        self._model_loaded = False
+
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._pending: List[str] = []
+        self._pending_texts: Dict[str, str] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: set = set()
+
+        self._stats = {"hits": 0, "misses": 0, "batches": 0, "texts_encoded": 0, "encode_seconds": 0.0}
+
+    # -------------------------------------------------------------------------
+    # Model
+    # -------------------------------------------------------------------------
+
+    def _load_model(self):
+        """Load the sentence-transformers model (worker thread)"""
+        if self._model_loaded:
+            return self._model
+        try:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+            logger.info(f"Loaded embedding model {self.model_name}")
+        except ImportError:
+            logger.warning("sentence-transformers not installed, using hash embeddings")
+            self._model = None
+        except Exception as e:
+            # Offline host, unknown model name, disk full...
+            logger.error(f"Failed to load embedding model {self.model_name}, using hash embeddings: {e}")
+            self._model = None
+        self._model_loaded = True
+        return self._model
+
+    def encode(self, texts: List[str]) -> List[List[float]]:
+        """
+        Encode texts synchronously (runs on the calling thread)
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding per text
+        """
+        model = self._load_model()
+        if model is None:
+            return [hash_embedding(text) for text in texts]
+        return [vector.tolist() for vector in model.encode(texts, batch_size=self.batch_size)]
+
+    async def warmup(self):
+        """
+        Load the model and run one encode so the first request is not slow
+
+        Never raises: a failed warmup is logged and requests fall back to
+        hash embeddings if the model could not be loaded.
+        """
+        started = time.perf_counter()
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self.encode, ["warmup"])
+        except Exception as e:
+            logger.error(f"Embedding warmup failed: {e}")
+            return
+        logger.info(f"Embedding model warm in {time.perf_counter() - started:.2f}s")
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def _cache_get(self, key: str) -> Optional[List[float]]:
+        embedding = self._cache.get(key)
+        if embedding is not None:
+            self._cache.move_to_end(key)
+        return embedding
+
+    def _cache_put(self, key: str, embedding: List[float]):
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    # Batching
+    # -------------------------------------------------------------------------
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed a single text"""
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts, batching cache misses with other callers
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding per text, in order
+        """
+        loop = asyncio.get_running_loop()
+        results: List[Optional[List[float]]] = []
+        waiting: Dict[int, asyncio.Future] = {}
+
+        for i, text in enumerate(texts):
+            key = hash_content(text)
+            embedding = self._cache_get(key)
+            if embedding is not None:
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+                if key not in self._in_flight:
+                    self._in_flight[key] = loop.create_future()
+                    self._pending.append(key)
+                    self._pending_texts[key] = text
+                waiting[i] = self._in_flight[key]
+            results.append(embedding)
+
+        if self._pending:
+            self._schedule_flush(loop)
+
+        if waiting:
+            # Shield shared futures so one cancelled caller does not cancel the others
+            embeddings = await asyncio.gather(*(asyncio.shield(f) for f in waiting.values()))
+            for i, embedding in zip(waiting, embeddings):
+                results[i] = embedding
+
+        return results
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop):
+        """Flush now if a batch is full, otherwise after ``max_wait_ms``"""
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+    def _flush(self):
+        """Start encoding every pending text, ``batch_size`` at a time"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        while self._pending:
+            keys = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            texts = [self._pending_texts.pop(key) for key in keys]
+            task = asyncio.ensure_future(self._run_batch(keys, texts))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, keys: List[str], texts: List[str]):
+        """Encode one batch on the executor and resolve its waiters"""
+        started = time.perf_counter()
+        try:
+            embeddings = await asyncio.get_running_loop().run_in_executor(self._executor, self.encode, texts)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(texts)} failed: {e}")
+            for key in keys:
+                future = self._in_flight.pop(key, None)
+                if future and not future.done():
+                    future.set_exception(e)
+            return
+
+        self._stats["batches"] += 1
+        self._stats["texts_encoded"] += len(texts)
+        self._stats["encode_seconds"] += time.perf_counter() - started
+
+        for key, embedding in zip(keys, embeddings):
+            self._cache_put(key, embedding)
+            future = self._in_flight.pop(key, None)
+            if future and not future.done():
+                future.set_result(embedding)
+
+    async def close(self):
+        """Finish pending batches and stop the worker threads"""
+        self._flush()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get embedding pipeline statistics"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        batches = self._stats["batches"]
+        return {
+            "model": self.model_name,
+            "model_loaded": self._model_loaded,
+            "cache_entries": len(self._cache),
+            "cache_size": self.cache_size,
+            "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "avg_batch_size": round(self._stats["texts_encoded"] / batches, 2) if batches else 0.0,
+            **{k: round(v, 4) if isinstance(v, float) else v for k, v in self._stats.items()}
+        }
@@ -1,18 +1,29 @@
 """
 Nexus Vector Memory
-RAG-enabled memory system using ChromaDB or PostgreSQL with pgvector
+RAG-enabled memory system using ChromaDB, PostgreSQL with pgvector, or a
+local NumPy index
 """
 import os
 import sys
+import json
+import time
+import asyncio
 import logging
-import hashlib
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Deque, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass
 
 # Add shared lib to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../shared")))
 
+from nexus_lib.instrumentation import (
+    MEMORY_WRITES_TOTAL,
+    MEMORY_WRITE_QUEUE_DEPTH,
+    MEMORY_WRITE_BATCH_SIZE,
+)
+from app.core.embeddings import EmbeddingService
+
 logger = logging.getLogger("nexus.memory")
 
 
@@ -29,24 +40,30 @@ class MemoryDocument:
 class VectorMemory:
     """
     Vector-based memory system for RAG (Retrieval Augmented Generation)
-    Supports ChromaDB (local) and pgvector (PostgreSQL) backends
+    Supports ChromaDB (local), pgvector (PostgreSQL) and an in-process
+    NumPy index with memory-mapped persistence ("local")
     """
     
     def __init__(
         self,
         backend: str = None,
-        collection_name: str = "nexus_memory"
+        collection_name: str = "nexus_memory",
+        embeddings: Optional[EmbeddingService] = None
     ):
         self.backend = backend or os.environ.get("MEMORY_BACKEND", "mock")
         self.collection_name = collection_name
+        self.embeddings = embeddings or EmbeddingService()
         self.client = None
         self.collection = None
+        self._index_training: Optional[asyncio.Task] = None
         
         # Initialize backend
         if self.backend == "chromadb":
             self._init_chromadb()
         elif self.backend == "pgvector":
             self._init_pgvector()
+        elif self.backend == "local":
+            self._init_local()
         else:
             logger.info("Memory running in MOCK mode")
             self.backend = "mock"
@@ -82,6 +99,41 @@ class VectorMemory:
             self.backend = "mock"
             self._mock_store = {}
     
+    def _init_local(self):
+        """Initialize the in-process NumPy index backend"""
+        try:
+            from app.core.vector_index import LocalVectorIndex
+            
+            persist_dir = os.environ.get("LOCAL_MEMORY_DIR", "./memory_data")
+            self.index = LocalVectorIndex(
+                path=persist_dir or None,
+                name=self.collection_name
+            )
+            logger.info(f"Local vector index initialized ({len(self.index)} documents)")
+            
+        except ImportError:
+            logger.warning("numpy not installed, falling back to mock mode")
+            self.backend = "mock"
+            self._mock_store = {}
+        except Exception as e:
+            logger.error(f"Failed to initialize local vector index: {e}")
+            self.backend = "mock"
+            self._mock_store = {}
+    
+    def _schedule_index_training(self):
+        """(Re)build the local index's IVF quantizer on a worker thread when it is due"""
+        if self._index_training is not None and not self._index_training.done():
+            return
+        if not self.index.needs_training():
+            return
+        
+        def _log_training_error(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Local index training failed: {task.exception()}")
+        
+        self._index_training = asyncio.create_task(asyncio.to_thread(self.index.train))
+        self._index_training.add_done_callback(_log_training_error)
+    
     def _init_pgvector(self):
         """Initialize pgvector backend"""
         try:
@@ -123,32 +175,19 @@ class VectorMemory:
         
         return self._pg_pool
     
-    def _generate_embedding(self, text: str) -> List[float]:
+    @property
+    def uses_embeddings(self) -> bool:
+        """Whether the backend embeds text itself (chromadb embeds internally, mock not at all)"""
+        return self.backend in ("pgvector", "local")
+    
+    async def embed(self, text: str) -> List[float]:
         """
-        Generate embedding for text
-        In production, use a proper embedding model like sentence-transformers
+        Generate an embedding for arbitrary text (e.g. for similarity caching)
+        
+        Goes through the shared EmbeddingService, so it is cached, batched with
+        concurrent callers and encoded on a worker thread.
         """
-        try:
-            from sentence_transformers import SentenceTransformer
-            
-            if not hasattr(self, '_embedding_model'):
-                self._embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-            
-            embedding = self._embedding_model.encode(text)
-            return embedding.tolist()
-        except ImportError:
-            # Fallback: simple hash-based pseudo-embedding
-            hash_bytes = hashlib.sha256(text.encode()).digest()
-            # Convert to 384-dimensional vector (to match all-MiniLM-L6-v2)
-            embedding = []
-            for i in range(0, len(hash_bytes), 1):
-                # Normalize to [-1, 1]
-                val = (hash_bytes[i % len(hash_bytes)] / 128.0) - 1.0
-                embedding.append(val)
-            # Pad to 384 dimensions
-            while len(embedding) < 384:
-                embedding.extend(embedding[:min(384 - len(embedding), len(embedding))])
-            return embedding[:384]
+        return await self.embeddings.embed(text)
     
     async def add_context(
         self,
@@ -157,55 +196,85 @@ class VectorMemory:
         metadata: Optional[Dict[str, Any]] = None
     ):
         """
-        Add a document to memory
+        Add a document to memory (failures are logged, not raised)
         
         Args:
             doc_id: Unique document identifier
             text: Document content
             metadata: Optional metadata dict
         """
-        metadata = metadata or {}
-        metadata["added_at"] = datetime.utcnow().isoformat()
+        try:
+            await self.add_contexts([(doc_id, text, metadata)])
+        except Exception as e:
+            logger.error(f"Failed to add to {self.backend} memory: {e}")
+    
+    async def add_contexts(
+        self,
+        documents: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ):
+        """
+        Add several documents to memory in one bulk write
+        
+        Args:
+            documents: (doc_id, text, metadata) tuples
+        
+        Raises:
+            Exception: Whatever the backend raised, so callers such as
+                MemoryWriteQueue can count the batch as failed
+        """
+        if not documents:
+            return
+        
+        added_at = datetime.utcnow().isoformat()
+        doc_ids = [doc_id for doc_id, _, _ in documents]
+        texts = [text for _, text, _ in documents]
+        metadatas = [{**(metadata or {}), "added_at": added_at} for _, _, metadata in documents]
         
         if self.backend == "chromadb":
-            try:
-                self.collection.upsert(
-                    ids=[doc_id],
-                    documents=[text],
-                    metadatas=[metadata]
-                )
-                logger.debug(f"Added document {doc_id} to ChromaDB")
-            except Exception as e:
-                logger.error(f"Failed to add to ChromaDB: {e}")
+            self.collection.upsert(
+                ids=doc_ids,
+                documents=texts,
+                metadatas=metadatas
+            )
+            logger.debug(f"Added {len(doc_ids)} documents to ChromaDB")
         
         elif self.backend == "pgvector":
-            try:
-                import json
-                pool = await self._get_pg_pool()
-                embedding = self._generate_embedding(text)
-                
-                async with pool.acquire() as conn:
-                    await conn.execute("""
-                        INSERT INTO nexus_memory (id, content, metadata, embedding)
-                        VALUES ($1, $2, $3, $4)
-                        ON CONFLICT (id) DO UPDATE SET
-                            content = $2,
-                            metadata = $3,
-                            embedding = $4
-                    """, doc_id, text, json.dumps(metadata), embedding)
-                
-                logger.debug(f"Added document {doc_id} to pgvector")
-            except Exception as e:
-                logger.error(f"Failed to add to pgvector: {e}")
+            pool = await self._get_pg_pool()
+            embeddings = await self.embeddings.embed_many(texts)
+            
+            async with pool.acquire() as conn:
+                await conn.executemany("""
+                    INSERT INTO nexus_memory (id, content, metadata, embedding)
+                    VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (id) DO UPDATE SET
+                        content = $2,
+                        metadata = $3,
+                        embedding = $4
+                """, [
+                    (doc_id, text, json.dumps(metadata), embedding)
+                    for doc_id, text, metadata, embedding in zip(doc_ids, texts, metadatas, embeddings)
+                ])
+            
+            logger.debug(f"Added {len(doc_ids)} documents to pgvector")
         
-        else:  # mock mode
-            self._mock_store[doc_id] = MemoryDocument(
-                id=doc_id,
-                content=text,
-                metadata=metadata,
-                created_at=datetime.utcnow()
+        elif self.backend == "local":
+            embeddings = await self.embeddings.embed_many(texts)
+            await asyncio.to_thread(
+                self.index.upsert_many,
+                list(zip(doc_ids, embeddings, texts, metadatas))
             )
-            logger.debug(f"Added document {doc_id} to mock store")
+            self._schedule_index_training()
+            logger.debug(f"Added {len(doc_ids)} documents to local index")
+        
+        else:  # mock mode
+            for doc_id, text, metadata in zip(doc_ids, texts, metadatas):
+                self._mock_store[doc_id] = MemoryDocument(
+                    id=doc_id,
+                    content=text,
+                    metadata=metadata,
+                    created_at=datetime.utcnow()
+                )
+            logger.debug(f"Added {len(doc_ids)} documents to mock store")
     
     async def retrieve(
         self,
@@ -247,7 +316,7 @@ class VectorMemory:
         elif self.backend == "pgvector":
             try:
                 pool = await self._get_pg_pool()
-                embedding = self._generate_embedding(query)
+                embedding = await self.embed(query)
                 
                 async with pool.acquire() as conn:
                     rows = await conn.fetch("""
@@ -268,6 +337,27 @@ class VectorMemory:
                 logger.error(f"pgvector retrieval failed: {e}")
                 return ""
         
+        elif self.backend == "local":
+            try:
+                if not len(self.index):
+                    return ""
+                embedding = await self.embed(query)
+                results = await asyncio.to_thread(
+                    self.index.search, embedding, n_results, filter_metadata
+                )
+                self._schedule_index_training()
+                
+                if results:
+                    context = "\n\n".join([
+                        f"- {doc['content'][:500]}..." if len(doc['content']) > 500 else f"- {doc['content']}"
+                        for _, _, doc in results
+                    ])
+                    return f"RELEVANT HISTORICAL CONTEXT:\n{context}"
+                return ""
+            except Exception as e:
+                logger.error(f"Local index retrieval failed: {e}")
+                return ""
+        
         else:  # mock mode
             # Simple keyword matching for mock mode
             if not self._mock_store:
@@ -310,6 +400,9 @@ class VectorMemory:
             except Exception as e:
                 logger.error(f"pgvector delete failed: {e}")
         
+        elif self.backend == "local":
+            await asyncio.to_thread(self.index.delete, doc_id)
+        
         else:
             self._mock_store.pop(doc_id, None)
     
@@ -334,6 +427,9 @@ class VectorMemory:
             except Exception as e:
                 logger.error(f"pgvector clear failed: {e}")
         
+        elif self.backend == "local":
+            await asyncio.to_thread(self.index.clear)
+        
         else:
             self._mock_store.clear()
     
@@ -356,56 +452,422 @@ class VectorMemory:
             except:
                 stats["count"] = 0
         
+        elif self.backend == "local":
+            stats.update(self.index.get_stats())
+        
         else:
             stats["count"] = len(self._mock_store)
         
+        stats["embeddings"] = self.embeddings.get_stats()
         return stats
+    
+    async def close(self):
+        """Persist and release backend resources"""
+        await self.embeddings.close()
+        if self.backend == "local":
+            await asyncio.to_thread(self.index.close)
+        elif self.backend == "pgvector" and self._pg_pool is not None:
+            await self._pg_pool.close()
+            self._pg_pool = None
+
+
+class MemoryWriteQueue:
+    """
+    Write-behind queue for VectorMemory documents
+    
+    ``add_context`` only enqueues; a background worker drains the queue in
+    batches (up to ``batch_size`` documents or ``flush_interval`` seconds
+    after the first one) through ``VectorMemory.add_contexts``. The buffer is
+    bounded: when it is full, producers wait up to ``enqueue_timeout``
+    seconds and the document is dropped (and counted) if space does not free up.
+    """
+    
+    def __init__(
+        self,
+        memory: VectorMemory,
+        max_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        enqueue_timeout: Optional[float] = None
+    ):
+        """
+        Initialize the write queue
+        
+        Args:
+            memory: VectorMemory the batches are written to
+            max_size: Maximum queued documents
+            batch_size: Maximum documents per write
+            flush_interval: Seconds to wait for a batch to fill
+            enqueue_timeout: Seconds a producer waits when the queue is full
+        """
+        self.memory = memory
+        self.max_size = max_size or int(os.environ.get("MEMORY_WRITE_QUEUE_SIZE", "1000"))
+        self.batch_size = batch_size or int(os.environ.get("MEMORY_WRITE_BATCH_SIZE", "50"))
+        self.flush_interval = flush_interval if flush_interval is not None else float(
+            os.environ.get("MEMORY_WRITE_FLUSH_INTERVAL", "1.0")
+        )
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else float(
+            os.environ.get("MEMORY_WRITE_ENQUEUE_TIMEOUT", "0.5")
+        )
+        
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_size)
+        self._worker: Optional[asyncio.Task] = None
+        self._stats = {"enqueued": 0, "written": 0, "failed": 0, "dropped": 0, "batches": 0}
+    
+    def start(self):
+        """Start the background writer"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                f"Memory write-behind queue started (max_size={self.max_size}, "
+                f"batch_size={self.batch_size})"
+            )
+    
+    async def add_context(
+        self,
+        doc_id: str,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Queue a document for writing
+        
+        Returns:
+            False if the queue stayed full for ``enqueue_timeout`` and the document was dropped
+        """
+        try:
+            await asyncio.wait_for(
+                self._queue.put((doc_id, text, metadata)),
+                timeout=self.enqueue_timeout
+            )
+        except asyncio.TimeoutError:
+            self._stats["dropped"] += 1
+            MEMORY_WRITES_TOTAL.labels(result="dropped").inc()
+            logger.warning(f"Memory write queue full, dropped document {doc_id}")
+            return False
+        
+        self._stats["enqueued"] += 1
+        MEMORY_WRITE_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+    
+    async def _next_batch(self) -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+        """Wait for a document, then gather more until the batch is full or the interval passes"""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+    
+    async def _run(self):
+        """Drain the queue until cancelled"""
+        while True:
+            batch = await self._next_batch()
+            await self._write(batch)
+    
+    async def _write(self, batch: List[Tuple[str, str, Optional[Dict[str, Any]]]]):
+        """Write one batch and mark its documents done"""
+        try:
+            await self.memory.add_contexts(batch)
+            self._stats["written"] += len(batch)
+            MEMORY_WRITES_TOTAL.labels(result="written").inc(len(batch))
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            MEMORY_WRITES_TOTAL.labels(result="failed").inc(len(batch))
+            logger.error(f"Memory write of {len(batch)} documents failed: {e}")
+        finally:
+            self._stats["batches"] += 1
+            MEMORY_WRITE_BATCH_SIZE.observe(len(batch))
+            MEMORY_WRITE_QUEUE_DEPTH.set(self._queue.qsize())
+            for _ in batch:
+                self._queue.task_done()
+    
+    async def flush(self):
+        """Wait until every queued document has been written"""
+        await self._queue.join()
+    
+    async def close(self, timeout: Optional[float] = None):
+        """
+        Flush outstanding documents and stop the writer
+        
+        Args:
+            timeout: Maximum seconds to wait for the flush
+        """
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Memory write queue flush timed out, {self._queue.qsize()} documents lost")
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info(f"Memory write-behind queue stopped ({self._stats['written']} documents written)")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue statistics"""
+        return {
+            "queued": self._queue.qsize(),
+            "max_size": self.max_size,
+            "running": self._worker is not None and not self._worker.done(),
+            **self._stats
+        }
+
+
+@dataclass
+class ConversationSession:
+    """Turns of one conversation, oldest first"""
+    turns: Deque[Dict[str, Any]]
+    last_active: float
 
 
 class ConversationMemory:
     """
     Short-term conversation memory for maintaining context within a session
-    """
     
-    def __init__(self, max_turns: int = 10):
-        self.max_turns = max_turns
-        self.conversations: Dict[str, List[Dict]] = {}
+    Each session is a fixed-size ring buffer of turns. Sessions are kept in
+    least-recently-active order so idle sessions (``ttl`` seconds) and the
+    oldest sessions beyond ``max_sessions`` are evicted from the front in
+    O(1) per session.
+    """
     
-    def add_turn(
+    def __init__(
         self,
-        session_id: str,
-        role: str,
-        content: str,
-        metadata: Optional[Dict] = None
+        max_turns: int = 10,
+        ttl: Optional[float] = None,
+        max_sessions: Optional[int] = None
     ):
-        """Add a conversation turn"""
-        if session_id not in self.conversations:
-            self.conversations[session_id] = []
+        """
+        Initialize conversation memory
+        
+        Args:
+            max_turns: Turns kept per session
+            ttl: Seconds of inactivity after which a session is dropped
+            max_sessions: Maximum sessions held before the least recently active is dropped
+        """
+        self.max_turns = max_turns
+        self.ttl = ttl if ttl is not None else float(os.environ.get("CONVERSATION_TTL", "3600"))
+        self.max_sessions = max_sessions or int(os.environ.get("CONVERSATION_MAX_SESSIONS", "10000"))
+        self.conversations: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._evictions = {"ttl": 0, "capacity": 0}
+    
+    def _evict(self, now: float):
+        """Drop idle sessions and enforce the session cap"""
+        while self.conversations:
+            session_id, session = next(iter(self.conversations.items()))
+            if now - session.last_active > self.ttl:
+                reason = "ttl"
+            elif len(self.conversations) > self.max_sessions:
+                reason = "capacity"
+            else:
+                break
+            del self.conversations[session_id]
+            self._evictions[reason] += 1
+    
+    def _touch(self, session_id: str, create: bool = False) -> Optional[ConversationSession]:
+        """Return a live session, marking it most recently active"""
+        now = time.monotonic()
+        session = self.conversations.get(session_id)
+        if session is not None and now - session.last_active > self.ttl:
+            del self.conversations[session_id]
+            self._evictions["ttl"] += 1
+            session = None
         
-        turn = {
+        if session is None:
+            if not create:
+                return None
+            session = ConversationSession(turns=deque(maxlen=self.max_turns), last_active=now)
+            self.conversations[session_id] = session
+        
+        session.last_active = now
+        self.conversations.move_to_end(session_id)
+        self._evict(now)
+        return session
+    
+    @staticmethod
+    def _make_turn(role: str, content: str, metadata: Optional[Dict]) -> Dict[str, Any]:
+        return {
             "role": role,
             "content": content,
             "timestamp": datetime.utcnow().isoformat(),
             "metadata": metadata or {}
         }
-        
-        self.conversations[session_id].append(turn)
-        
-        # Trim to max turns
-        if len(self.conversations[session_id]) > self.max_turns:
-            self.conversations[session_id] = self.conversations[session_id][-self.max_turns:]
     
-    def get_context(self, session_id: str) -> str:
-        """Get conversation context as string"""
-        if session_id not in self.conversations:
-            return ""
-        
-        turns = self.conversations[session_id]
+    @staticmethod
+    def _render(turns) -> str:
         return "\n".join([
             f"{t['role']}: {t['content']}"
             for t in turns
         ])
     
-    def clear_session(self, session_id: str):
+    async def add_turn(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict] = None
+    ):
+        """Add a conversation turn"""
+        # The ring buffer drops the oldest turn once max_turns is reached
+        self._touch(session_id, create=True).turns.append(self._make_turn(role, content, metadata))
+    
+    async def get_turns(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get a session's turns, oldest first"""
+        session = self._touch(session_id)
+        return list(session.turns) if session else []
+    
+    async def get_context(self, session_id: str) -> str:
+        """Get conversation context as string"""
+        return self._render(await self.get_turns(session_id))
+    
+    async def clear_session(self, session_id: str):
         """Clear a session's conversation history"""
         self.conversations.pop(session_id, None)
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get conversation memory statistics"""
+        self._evict(time.monotonic())
+        return {
+            "backend": "memory",
+            "sessions": len(self.conversations),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl,
+            "evictions": dict(self._evictions)
+        }
+
+
+class RedisConversationMemory(ConversationMemory):
+    """
+    Conversation memory shared between orchestrator replicas via Redis
+    
+    Each session is a capped Redis list (``LTRIM`` to ``max_turns``) whose
+    expiry is refreshed on every access, giving the same idle TTL as the
+    in-process store; Redis ``maxmemory`` policy bounds the total. Falls
+    back to the in-process store while Redis is unreachable, and after a
+    failure does not try Redis again for ``redis_retry_seconds``.
+    """
+    
+    KEY_PREFIX = "nexus:conversation:"
+    
+    def __init__(
+        self,
+        max_turns: int = 10,
+        ttl: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        redis_connection=None,
+        redis_retry_seconds: Optional[float] = None
+    ):
+        super().__init__(max_turns=max_turns, ttl=ttl, max_sessions=max_sessions)
+        if redis_connection is None:
+            from nexus_lib.config import RedisConnection
+            redis_connection = RedisConnection()
+        self._redis_connection = redis_connection
+        self.redis_retry_seconds = redis_retry_seconds if redis_retry_seconds is not None else float(
+            os.environ.get("CONVERSATION_REDIS_RETRY_SECONDS", "30")
+        )
+        self._redis_down_until = 0.0
+    
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+    
+    async def _redis(self):
+        """Redis client, or None while Redis is unavailable"""
+        if time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            client = await self._redis_connection.get_client()
+        except Exception as e:
+            client = None
+            logger.debug(f"Redis client unavailable: {e}")
+        if client is None:
+            self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        return client
+    
+    def _redis_failed(self, action: str, e: Exception):
+        logger.warning(f"Redis conversation {action} failed, using local store: {e}")
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+    
+    async def add_turn(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        metadata: Optional[Dict] = None
+    ):
+        """Add a conversation turn"""
+        client = await self._redis()
+        if client is None:
+            return await super().add_turn(session_id, role, content, metadata)
+        
+        key = self._key(session_id)
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.rpush(key, json.dumps(self._make_turn(role, content, metadata)))
+                pipe.ltrim(key, -self.max_turns, -1)
+                pipe.expire(key, int(self.ttl))
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed("write", e)
+            await super().add_turn(session_id, role, content, metadata)
+    
+    async def get_turns(self, session_id: str) -> List[Dict[str, Any]]:
+        """Get a session's turns, oldest first"""
+        client = await self._redis()
+        if client is None:
+            return await super().get_turns(session_id)
+        
+        key = self._key(session_id)
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.lrange(key, 0, -1)
+                pipe.expire(key, int(self.ttl))
+                raw_turns, _ = await pipe.execute()
+            return [json.loads(t) for t in raw_turns]
+        except Exception as e:
+            self._redis_failed("read", e)
+            return await super().get_turns(session_id)
+    
+    async def clear_session(self, session_id: str):
+        """Clear a session's conversation history"""
+        await super().clear_session(session_id)
+        client = await self._redis()
+        if client is not None:
+            try:
+                await client.delete(self._key(session_id))
+            except Exception as e:
+                self._redis_failed("delete", e)
+    
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get conversation memory statistics"""
+        stats = await super().get_stats()
+        redis_up = self._redis_connection.is_connected and time.monotonic() >= self._redis_down_until
+        stats["backend"] = "redis" if redis_up else "memory (redis unavailable)"
+        return stats
+
+
+def create_conversation_memory(backend: Optional[str] = None, **kwargs) -> ConversationMemory:
+    """
+    Create the configured conversation memory
+    
+    Args:
+        backend: "memory" (in-process) or "redis" (shared); defaults to CONVERSATION_BACKEND
+    """
+    backend = backend or os.environ.get("CONVERSATION_BACKEND", "memory")
+    if backend == "redis":
+        return RedisConversationMemory(**kwargs)
+    return ConversationMemory(**kwargs)
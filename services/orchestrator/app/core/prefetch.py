@@ -0,0 +1,220 @@
+"""
+Nexus Tool Prefetch
+Speculatively starts the tools a query class almost always needs while the
+first LLM call is still in flight
+"""
+import os
+import re
+import json
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from nexus_lib.instrumentation import TOOL_PREFETCH_TOTAL
+from nexus_lib.utils import SimpleCache
+
+logger = logging.getLogger("nexus.prefetch")
+
+
+# Query class (ReActEngine._classify_query) -> tools to start speculatively
+PREFETCH_PLANS: Dict[str, List[str]] = {
+    "release_check": ["get_sprint_stats", "get_build_status", "get_security_scan"],
+    "rca": ["get_build_status"],
+    "jira_query": ["get_jira_ticket"],
+    "ci_query": ["get_build_status"],
+    "security_query": ["get_security_scan"],
+    "report": ["get_sprint_stats"],
+}
+
+# user_context keys that can supply a tool parameter
+CONTEXT_PARAM_KEYS: Dict[str, List[str]] = {
+    "project_key": ["project_key", "project"],
+    "repo_name": ["repo_name", "repository", "repo"],
+    "job_name": ["job_name", "job"],
+}
+
+TICKET_KEY_PATTERN = re.compile(r"\b([A-Z][A-Z0-9]+)-(\d+)\b")
+
+
+def _args_key(tool_name: str, args: Dict[str, Any]) -> Tuple[str, str]:
+    """Hashable key for a tool call"""
+    return tool_name, json.dumps(args, sort_keys=True, default=str)
+
+
+class PrefetchSession:
+    """Prefetched tool calls for a single ReAct run"""
+
+    def __init__(self, planner: "PrefetchPlanner", task_type: str):
+        self.planner = planner
+        self.task_type = task_type
+        self.tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+
+    def claim(self, tool_name: str, args: Any) -> Optional[asyncio.Task]:
+        """
+        Take the prefetched call matching a requested action
+
+        Returns:
+            The running (or finished) task, or None if this call was not prefetched
+        """
+        if not self.tasks or not isinstance(args, dict):
+            return None
+        task = self.tasks.pop(_args_key(tool_name, args), None)
+        if task is not None:
+            self.planner._record(self.task_type, "hit")
+            logger.debug(f"Prefetch hit for {tool_name} ({self.task_type})")
+        return task
+
+    def close(self):
+        """Cancel prefetched calls that were never requested"""
+        for task in self.tasks.values():
+            task.cancel()
+            self.planner._record(self.task_type, "wasted")
+        self.tasks.clear()
+
+
+class PrefetchPlanner:
+    """
+    Plans speculative tool calls per query class.
+
+    Arguments come from the query (ticket keys), the caller's user context
+    and, failing those, the arguments the LLM last used for the same tool in
+    the same tenant (or team, or for the same user or session when there is
+    neither). Callers with none of these never share learned arguments.
+    Only GET tools are prefetched, and only when every
+    required parameter is known. Hit rate is tracked per class so plans that
+    rarely pay off are visible.
+    """
+
+    def __init__(self, tools: Dict[str, Any], enabled: Optional[bool] = None):
+        """
+        Initialize the planner
+
+        Args:
+            tools: Tool registry (name -> Tool with method/required_params)
+            enabled: Turn prefetching on or off (defaults to REACT_PREFETCH_ENABLED)
+        """
+        self.tools = tools
+        self.enabled = enabled if enabled is not None else (
+            os.environ.get("REACT_PREFETCH_ENABLED", "true").lower() == "true"
+        )
+        # Keyed by (scope, tool); bounded so per-user/session scopes can't grow without limit
+        self._learned_args = SimpleCache(
+            default_ttl=int(os.environ.get("REACT_PREFETCH_ARGS_TTL", "86400")),
+            max_size=int(os.environ.get("REACT_PREFETCH_ARGS_MAX_ENTRIES", "10000")),
+            name="prefetch_args",
+        )
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def _scope(user_context: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Key learned arguments are shared under, or None for an anonymous caller"""
+        user_context = user_context or {}
+        for key in ("tenant_id", "team_id", "user_id", "session_id"):
+            if user_context.get(key):
+                return f"{key}:{user_context[key]}"
+        return None
+
+    def _resolve_args(
+        self,
+        tool_name: str,
+        query: str,
+        user_context: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Fill a tool's required parameters, or None if any is unknown"""
+        user_context = user_context or {}
+        scope = self._scope(user_context)
+        learned = (self._learned_args.get((scope, tool_name)) if scope else None) or {}
+        ticket = TICKET_KEY_PATTERN.search(query)
+
+        args = {}
+        for param in self.tools[tool_name].required_params:
+            value = None
+            if param == "ticket_key" and ticket:
+                value = ticket.group(0)
+            if value is None:
+                value = next(
+                    (user_context[k] for k in CONTEXT_PARAM_KEYS.get(param, [param]) if user_context.get(k)),
+                    None
+                )
+            if value is None and param == "project_key" and ticket:
+                value = ticket.group(1)
+            if value is None:
+                value = learned.get(param)
+            if value is None:
+                return None
+            args[param] = value
+        return args
+
+    def plan(
+        self,
+        task_type: str,
+        query: str,
+        user_context: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Choose the tool calls to prefetch
+
+        Returns:
+            (tool_name, args) pairs
+        """
+        if not self.enabled:
+            return []
+
+        calls = []
+        for tool_name in PREFETCH_PLANS.get(task_type, []):
+            tool = self.tools.get(tool_name)
+            if tool is None or tool.method != "GET":
+                continue
+            args = self._resolve_args(tool_name, query, user_context)
+            if args is not None:
+                calls.append((tool_name, args))
+        return calls
+
+    def start(
+        self,
+        task_type: str,
+        query: str,
+        user_context: Optional[Dict[str, Any]],
+        execute: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    ) -> PrefetchSession:
+        """
+        Start the planned calls in the background
+
+        Args:
+            task_type: Query class
+            query: User query
+            user_context: Caller context
+            execute: Coroutine function running a tool (ReActEngine._execute_tool)
+        """
+        session = PrefetchSession(self, task_type)
+        for tool_name, args in self.plan(task_type, query, user_context):
+            session.tasks[_args_key(tool_name, args)] = asyncio.create_task(execute(tool_name, args))
+            self._record(task_type, "prefetched")
+        if session.tasks:
+            logger.debug(f"Prefetching {len(session.tasks)} tools for {task_type}")
+        return session
+
+    def learn(self, user_context: Optional[Dict[str, Any]], actions: List[Dict[str, Any]]):
+        """Remember the arguments the LLM used so later runs can prefetch them"""
+        scope = self._scope(user_context)
+        if scope is None:
+            return
+        for action in actions:
+            args = action.get("action_input")
+            if action.get("action") in self.tools and isinstance(args, dict) and args:
+                self._learned_args.set((scope, action["action"]), dict(args))
+
+    def _record(self, task_type: str, result: str):
+        counts = self._stats.setdefault(task_type, {"prefetched": 0, "hit": 0, "wasted": 0})
+        counts[result] += 1
+        TOOL_PREFETCH_TOTAL.labels(task_type=task_type, result=result).inc()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-class prefetch counts and hit rates"""
+        return {
+            task_type: {
+                **counts,
+                "hit_rate": round(counts["hit"] / counts["prefetched"], 4) if counts["prefetched"] else 0.0
+            }
+            for task_type, counts in self._stats.items()
+        }
@@ -3,21 +3,23 @@ Nexus ReAct Engine
 LangChain-powered reasoning engine with tool orchestration
 """
 import os
+import re
 import sys
 import json
 import logging
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, AsyncIterator
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 # Add shared lib to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../shared")))
 
-from nexus_lib.utils import AsyncHttpClient, agent_registry, generate_task_id
-from nexus_lib.specialists import specialist_registry, SpecialistStatus
+from nexus_lib.utils import AsyncHttpClient, agent_registry, generate_task_id, gather_with_concurrency
+from nexus_lib.specialists import specialist_registry, SpecialistStatus, ToolRoute
 from nexus_lib.instrumentation import (
     track_llm_usage,
+    track_llm_stream,
     track_tool_usage,
     track_react_loop,
     REACT_ITERATIONS,
@@ -25,11 +27,14 @@ from nexus_lib.instrumentation import (
 )
 from nexus_lib.schemas.agent_contract import (
     AgentTaskRequest,
+    ReActAction,
     ReActStep,
     ReActTrace,
     TaskStatus,
 )
 
+from app.core.prefetch import PrefetchPlanner, PrefetchSession
+
 logger = logging.getLogger("nexus.react")
 
 
@@ -48,325 +53,108 @@ class Tool(BaseModel):
     required_params: List[str] = Field(default_factory=list)
 
 
-# Define available tools - comprehensive list for all specialist agents
+def _tool_from_route(route: ToolRoute) -> Tool:
+    """Project a compiled specialist route into the ReAct tool catalogue"""
+    return Tool(
+        name=route.name,
+        description=route.tool.description,
+        agent_type=route.specialist_id,
+        endpoint=route.path_template,
+        method=route.method,
+        parameters={p.name: p.description for p in route.tool.parameters},
+        required_params=route.tool.required_params
+    )
+
+
+# Tool catalogue for the prompt and prefetch planner, derived from the
+# specialist registry (SPECIALIST_DEFINITIONS is the single source of truth)
 AVAILABLE_TOOLS: Dict[str, Tool] = {
-    # ==========================================================================
-    # JIRA AGENT TOOLS
-    # ==========================================================================
-    "get_jira_ticket": Tool(
-        name="get_jira_ticket",
-        description="Fetch details of a Jira ticket by its key (e.g., PROJ-123). Returns ticket summary, status, assignee, and other details.",
-        agent_type="jira",
-        endpoint="/issue/{ticket_key}",
-        method="GET",
-        required_params=["ticket_key"]
-    ),
-    "get_ticket_hierarchy": Tool(
-        name="get_ticket_hierarchy",
-        description="Fetch the complete hierarchy of tickets under an Epic. Shows Epic -> Stories -> Subtasks structure.",
-        agent_type="jira",
-        endpoint="/hierarchy/{ticket_key}",
-        method="GET",
-        required_params=["ticket_key"]
-    ),
-    "search_jira": Tool(
-        name="search_jira",
-        description="Search Jira tickets using JQL (Jira Query Language). Example: 'project = PROJ AND status = \"In Progress\"'",
-        agent_type="jira",
-        endpoint="/search",
-        method="GET",
-        parameters={"jql": "JQL query string"},
-        required_params=["jql"]
-    ),
-    "update_jira_ticket": Tool(
-        name="update_jira_ticket",
-        description="Update a Jira ticket's status or add a comment. Requires ticket key and either status or comment.",
-        agent_type="jira",
-        endpoint="/update",
-        method="POST",
-        parameters={"key": "Ticket key", "status": "New status", "comment": "Comment text"},
-        required_params=["key"]
-    ),
-    "get_sprint_stats": Tool(
-        name="get_sprint_stats",
-        description="Get sprint statistics including completion rate, story points, and blockers for a project.",
-        agent_type="jira",
-        endpoint="/sprint-stats/{project_key}",
-        method="GET",
-        required_params=["project_key"]
-    ),
-    
-    # ==========================================================================
-    # GIT/CI AGENT TOOLS
-    # ==========================================================================
-    "get_repo_health": Tool(
-        name="get_repo_health",
-        description="Check GitHub repository health including branch status, open PRs, and CI status.",
-        agent_type="git_ci",
-        endpoint="/repo/{repo_name}/health",
-        method="GET",
-        required_params=["repo_name"]
-    ),
-    "get_pr_status": Tool(
-        name="get_pr_status",
-        description="Get details of a specific GitHub Pull Request including CI status and approvals.",
-        agent_type="git_ci",
-        endpoint="/repo/{repo_name}/pr/{pr_number}",
-        method="GET",
-        required_params=["repo_name", "pr_number"]
-    ),
-    "get_build_status": Tool(
-        name="get_build_status",
-        description="Get Jenkins build status for a job. Returns build result, test results, and artifacts.",
-        agent_type="git_ci",
-        endpoint="/build/{job_name}/status",
-        method="GET",
-        required_params=["job_name"]
-    ),
-    "trigger_build": Tool(
-        name="trigger_build",
-        description="Trigger a new Jenkins build for a specified job.",
-        agent_type="git_ci",
-        endpoint="/build/{job_name}",
-        method="POST",
-        required_params=["job_name"]
-    ),
-    "get_security_scan": Tool(
-        name="get_security_scan",
-        description="Get security scan results for a repository including vulnerabilities and risk score.",
-        agent_type="git_ci",
-        endpoint="/security/{repo_name}",
-        method="GET",
-        required_params=["repo_name"]
-    ),
-    
-    # ==========================================================================
-    # REPORTING AGENT TOOLS
-    # ==========================================================================
-    "generate_report": Tool(
-        name="generate_report",
-        description="Generate a release readiness HTML report from provided data.",
-        agent_type="reporting",
-        endpoint="/generate",
-        method="POST",
-        required_params=["report_data"]
-    ),
-    "publish_report": Tool(
-        name="publish_report",
-        description="Publish a report to Confluence. Can create a new page or update existing.",
-        agent_type="reporting",
-        endpoint="/publish",
-        method="POST",
-        parameters={"page_id": "Existing page ID (optional)", "space_key": "Confluence space", "title": "Page title"},
-        required_params=["title", "report_data"]
-    ),
-    "analyze_readiness": Tool(
-        name="analyze_readiness",
-        description="Analyze release data and determine Go/No-Go decision with checklist.",
-        agent_type="reporting",
-        endpoint="/analyze",
-        method="POST",
-        required_params=["report_data"]
-    ),
-    
-    # ==========================================================================
-    # SLACK AGENT TOOLS
-    # ==========================================================================
-    "send_slack_notification": Tool(
-        name="send_slack_notification",
-        description="Send a message to a Slack channel with optional Block Kit formatting.",
-        agent_type="slack",
-        endpoint="/notify",
-        method="POST",
-        parameters={"channel": "Channel ID", "message": "Message text", "blocks": "Block Kit blocks (optional)"},
-        required_params=["channel", "message"]
-    ),
-    "send_slack_dm": Tool(
-        name="send_slack_dm",
-        description="Send a direct message to a Slack user.",
-        agent_type="slack",
-        endpoint="/dm",
-        method="POST",
-        parameters={"user_id": "Slack user ID", "message": "Message text"},
-        required_params=["user_id", "message"]
-    ),
-    
-    # ==========================================================================
-    # RCA AGENT TOOLS
-    # ==========================================================================
-    "analyze_build_failure": Tool(
-        name="analyze_build_failure",
-        description="Analyze a failed Jenkins build to determine root cause. Uses LLM to correlate error logs with git diffs to identify which code change caused the failure and suggest fixes.",
-        agent_type="rca",
-        endpoint="/analyze",
-        method="POST",
-        parameters={
-            "job_name": "Jenkins job name",
-            "build_number": "Build number to analyze",
-            "repo_name": "GitHub repository name (optional)",
-            "pr_id": "Pull request ID (optional)",
-            "commit_sha": "Specific commit SHA (optional)"
-        },
-        required_params=["job_name", "build_number"]
-    ),
-    "get_rca_history": Tool(
-        name="get_rca_history",
-        description="Get history of RCA analyses for a job or repository.",
-        agent_type="rca",
-        endpoint="/history",
-        method="GET",
-        parameters={"job_name": "Jenkins job name", "repo_name": "Repository name"},
-        required_params=[]
-    ),
-    
-    # ==========================================================================
-    # JIRA HYGIENE AGENT TOOLS
-    # ==========================================================================
-    "run_hygiene_check": Tool(
-        name="run_hygiene_check",
-        description="Run a hygiene check on Jira data for a project. Identifies missing fields, stale tickets, and other quality issues.",
-        agent_type="hygiene",
-        endpoint="/check/{project_key}",
-        method="POST",
-        parameters={"check_types": "Types of checks to run (optional)"},
-        required_params=["project_key"]
-    ),
-    "get_hygiene_score": Tool(
-        name="get_hygiene_score",
-        description="Get the current hygiene score for a project. Returns score, trends, and issue breakdown.",
-        agent_type="hygiene",
-        endpoint="/score/{project_key}",
-        method="GET",
-        required_params=["project_key"]
-    ),
-    "fix_hygiene_issues": Tool(
-        name="fix_hygiene_issues",
-        description="Automatically fix identified hygiene issues for a project.",
-        agent_type="hygiene",
-        endpoint="/fix",
-        method="POST",
-        parameters={"issue_ids": "Specific issue IDs to fix (optional)"},
-        required_params=["project_key"]
-    ),
-    "get_hygiene_history": Tool(
-        name="get_hygiene_history",
-        description="Get historical hygiene scores and trends for a project.",
-        agent_type="hygiene",
-        endpoint="/history/{project_key}",
-        method="GET",
-        required_params=["project_key"]
-    ),
-    
-    # ==========================================================================
-    # ANALYTICS SERVICE TOOLS
-    # ==========================================================================
-    "get_dora_metrics": Tool(
-        name="get_dora_metrics",
-        description="Get DORA (DevOps Research and Assessment) metrics: deployment frequency, lead time, change failure rate, and MTTR.",
-        agent_type="analytics",
-        endpoint="/dora",
-        method="GET",
-        parameters={"project": "Project identifier", "from_date": "Start date (ISO)", "to_date": "End date (ISO)"},
-        required_params=[]
-    ),
-    "get_release_kpis": Tool(
-        name="get_release_kpis",
-        description="Get key performance indicators for releases including velocity, quality, and efficiency metrics.",
-        agent_type="analytics",
-        endpoint="/kpis",
-        method="GET",
-        parameters={"project": "Project identifier", "release_version": "Specific release version"},
-        required_params=[]
-    ),
-    "get_trend_analysis": Tool(
-        name="get_trend_analysis",
-        description="Analyze trends in release metrics over time. Identifies patterns, anomalies, and forecasts.",
-        agent_type="analytics",
-        endpoint="/trends",
-        method="GET",
-        parameters={"metric": "Metric to analyze (velocity, quality)", "period": "Time period (7d, 30d, 90d)"},
-        required_params=[]
-    ),
-    "predict_release_readiness": Tool(
-        name="predict_release_readiness",
-        description="Predict release readiness based on historical data and current trajectory.",
-        agent_type="analytics",
-        endpoint="/predict",
-        method="POST",
-        parameters={"target_date": "Target release date"},
-        required_params=["release_version"]
-    ),
-    
-    # ==========================================================================
-    # WEBHOOKS SERVICE TOOLS
-    # ==========================================================================
-    "create_webhook_subscription": Tool(
-        name="create_webhook_subscription",
-        description="Create a new webhook subscription for event notifications.",
-        agent_type="webhooks",
-        endpoint="/subscriptions",
-        method="POST",
-        parameters={"secret": "HMAC secret for signature verification"},
-        required_params=["event_type", "target_url"]
-    ),
-    "list_webhook_subscriptions": Tool(
-        name="list_webhook_subscriptions",
-        description="List all active webhook subscriptions.",
-        agent_type="webhooks",
-        endpoint="/subscriptions",
-        method="GET",
-        required_params=[]
-    ),
-    "get_webhook_delivery_status": Tool(
-        name="get_webhook_delivery_status",
-        description="Get delivery status and history for webhook events.",
-        agent_type="webhooks",
-        endpoint="/deliveries",
-        method="GET",
-        parameters={"subscription_id": "Subscription ID"},
-        required_params=[]
-    ),
-    
-    # ==========================================================================
-    # SCHEDULING AGENT TOOLS
-    # ==========================================================================
-    "schedule_task": Tool(
-        name="schedule_task",
-        description="Schedule a recurring or one-time task.",
-        agent_type="scheduling",
-        endpoint="/schedule",
-        method="POST",
-        parameters={"cron": "Cron expression for recurring", "run_at": "ISO datetime for one-time", "payload": "Task payload"},
-        required_params=["task_type"]
-    ),
-    "list_scheduled_tasks": Tool(
-        name="list_scheduled_tasks",
-        description="List all scheduled tasks.",
-        agent_type="scheduling",
-        endpoint="/tasks",
-        method="GET",
-        required_params=[]
-    ),
+    name: _tool_from_route(route) for name, route in specialist_registry.routes.items()
 }
 
 
+# Tool catalogue grouped by agent type, built once on first use
+_tools_by_agent: Optional[Dict[str, List[Tool]]] = None
+
+# Rendered tools descriptions keyed by the health state they were built for
+_tools_description_cache: Dict[tuple, str] = {}
+
+
+def _get_tools_by_agent() -> Dict[str, List[Tool]]:
+    """Group AVAILABLE_TOOLS by agent type (cached)"""
+    global _tools_by_agent
+    if _tools_by_agent is None:
+        grouped: Dict[str, List[Tool]] = {}
+        for tool in AVAILABLE_TOOLS.values():
+            grouped.setdefault(tool.agent_type, []).append(tool)
+        _tools_by_agent = grouped
+    return _tools_by_agent
+
+
+def get_health_signature() -> tuple:
+    """
+    Snapshot of specialist health states relevant to the tool catalogue.
+    
+    Changes whenever any tool-providing specialist changes status, so it can be
+    used as a cache key for anything rendered from health information.
+    """
+    signature = []
+    for agent_type in _get_tools_by_agent():
+        health = specialist_registry.get_health(agent_type)
+        signature.append(health.status.value if health else None)
+    return tuple(signature)
+
+
+def invalidate_tools_description_cache():
+    """Drop cached tool groupings and descriptions (call after editing AVAILABLE_TOOLS)"""
+    global _tools_by_agent
+    _tools_by_agent = None
+    _tools_description_cache.clear()
+
+
+def _on_routes_rebuilt(routes: Dict[str, ToolRoute]):
+    """Keep AVAILABLE_TOOLS in step with specialist (un)registration"""
+    AVAILABLE_TOOLS.clear()
+    AVAILABLE_TOOLS.update({name: _tool_from_route(route) for name, route in routes.items()})
+    invalidate_tools_description_cache()
+
+
+specialist_registry.add_route_listener(_on_routes_rebuilt)
+
+
+def get_agent_types_for_result(result: Dict[str, Any]) -> List[str]:
+    """
+    Get the agent types whose tools contributed to a ReAct result.
+    
+    Derived from the result's plan summary; used to tag cached responses so
+    data-change events only invalidate the answers they affect.
+    """
+    agent_types = {
+        AVAILABLE_TOOLS[name].agent_type
+        for name in re.findall(r"\w+", result.get("plan") or "")
+        if name in AVAILABLE_TOOLS
+    }
+    return sorted(agent_types)
+
+
 def get_tools_description(include_health: bool = False) -> str:
     """
     Generate tools description for LLM prompt.
     
+    The rendered text is cached; with ``include_health`` it is re-rendered only
+    when the specialist health signature changes.
+    
     Args:
         include_health: If True, indicate which tools are currently available based on specialist health.
     """
-    lines = ["Available tools:"]
+    cache_key = (include_health, get_health_signature() if include_health else None)
+    cached_description = _tools_description_cache.get(cache_key)
+    if cached_description is not None:
+        return cached_description
     
-    # Group tools by agent type
-    tools_by_agent: Dict[str, List[Tool]] = {}
-    for name, tool in AVAILABLE_TOOLS.items():
-        if tool.agent_type not in tools_by_agent:
-            tools_by_agent[tool.agent_type] = []
-        tools_by_agent[tool.agent_type].append(tool)
+    lines = ["Available tools:"]
     
-    for agent_type, tools in tools_by_agent.items():
+    for agent_type, tools in _get_tools_by_agent().items():
         # Check specialist health if requested
         status_indicator = ""
         if include_health:
@@ -385,7 +173,9 @@ def get_tools_description(include_health: bool = False) -> str:
             lines.append(f"- {tool.name}: {tool.description}")
             lines.append(f"  Required params: {params}")
     
-    return "\n".join(lines)
+    description = "\n".join(lines)
+    _tools_description_cache[cache_key] = description
+    return description
 
 
 # ============================================================================
@@ -402,6 +192,7 @@ class LLMClient:
         self.model = os.environ.get("LLM_MODEL", "gemini-2.5-flash")
         self.api_key = os.environ.get("LLM_API_KEY") or os.environ.get("GOOGLE_API_KEY")
         self.client = None
+        self._stream_client = None
         
         if self.provider == "google" and self.api_key:
             try:
@@ -462,6 +253,74 @@ class LLMClient:
             logger.error(f"LLM generation failed: {e}")
             return self._mock_generate(prompt)
     
+    async def stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream response chunks from the LLM
+        
+        Delegates to the ``stream()`` implementation of the matching
+        ``nexus_lib.llm`` client; mock mode yields the mock response word by
+        word. As with ``generate``, a provider error before the first chunk
+        falls back to the mock response; an error after it is re-raised (and
+        the call recorded as failed) rather than passing off a truncated
+        answer as complete. Calls are recorded with ``track_llm_stream`` and
+        token counts (estimated from the text for providers) are written
+        into ``usage``.
+        """
+        with track_llm_stream(model_name=self.model) as tracker:
+            response = None
+            if self.provider == "mock":
+                response = self._mock_generate(prompt)
+            else:
+                chunks: List[str] = []
+                try:
+                    if self._stream_client is None:
+                        from nexus_lib.llm import create_llm_client
+                        self._stream_client = create_llm_client(
+                            provider=self.provider,
+                            model=self.model,
+                            api_key=self.api_key
+                        )
+                    
+                    async for chunk in self._stream_client.stream(prompt, system_prompt):
+                        chunks.append(chunk)
+                        yield chunk
+                except Exception as e:
+                    logger.error(f"LLM streaming failed: {e}")
+                    if chunks:
+                        raise
+                    response = self._mock_generate(prompt)
+                
+                if response is None:
+                    response = {
+                        "input_tokens": self.estimate_tokens((system_prompt or "") + prompt),
+                        "output_tokens": self.estimate_tokens("".join(chunks))
+                    }
+            
+            if "content" in response:
+                for chunk in re.findall(r"\S+\s*", response["content"]):
+                    yield chunk
+            
+            tracker.record(response["input_tokens"], response["output_tokens"])
+            if usage is not None:
+                usage["input_tokens"] = response["input_tokens"]
+                usage["output_tokens"] = response["output_tokens"]
+    
+    async def close(self):
+        """Close the streaming client if one was created"""
+        if self._stream_client is not None:
+            await self._stream_client.close()
+            self._stream_client = None
+    
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 chars per token) for streamed responses without usage data"""
+        return len(text) // 4
+    
     def _mock_generate(self, prompt: str) -> Dict[str, Any]:
         """Generate mock response for development"""
         # Parse the prompt to extract intent
@@ -527,7 +386,7 @@ class LLMClient:
             }
         elif "status" in prompt_lower or "ready" in prompt_lower or "release" in prompt_lower:
             return {
-                "content": "Thought: To check release readiness, I need to gather information from multiple sources. Let me start with Jira sprint stats.\nAction: get_sprint_stats\nAction Input: {\"project_key\": \"PROJ\"}",
+                "content": "Thought: To check release readiness, I need to gather information from multiple independent sources, so I'll query them in parallel.\nAction: get_sprint_stats\nAction Input: {\"project_key\": \"PROJ\"}\nAction: get_build_status\nAction Input: {\"job_name\": \"nexus-main\"}\nAction: get_security_scan\nAction Input: {\"repo_name\": \"nexus/backend\"}",
                 "input_tokens": 100,
                 "output_tokens": 50
             }
@@ -552,8 +411,8 @@ class ReActEngine:
 
 You operate using the ReAct (Reasoning + Acting) framework:
 1. Thought: Reason about what information you need and why
-2. Action: Call a tool to gather information
-3. Observation: Review the tool's response
+2. Action: Call one or more tools to gather information
+3. Observation: Review the tools' responses
 4. Repeat until you have enough information
 5. Final Answer: Provide a comprehensive response
 
@@ -565,8 +424,13 @@ IMPORTANT RULES:
 - When you have enough information, provide a Final Answer
 - If a tool fails, explain the issue and try an alternative approach
 - Format your response exactly as: "Thought: ...\nAction: ...\nAction Input: ..."
+- When several tools are independent of each other (e.g. sprint stats, build status and security scan), request them in the same step by repeating the "Action: ...\nAction Input: ..." pair; they run in parallel and all observations are returned together
 - For final answers: "Thought: ...\nFinal Answer: ..."
+"""
 
+    # Appended after the cached SYSTEM_PROMPT so the tools/rules prefix stays
+    # byte-identical across queries and provider-side prompt caching can hit
+    MEMORY_PROMPT = """
 Current context from memory:
 {memory_context}
 """
@@ -580,13 +444,61 @@ Previous steps in this conversation:
 
 What is your next step?"""
     
-    def __init__(self, memory_client, max_iterations: int = 10):
+    def __init__(
+        self,
+        memory_client,
+        max_iterations: int = 10,
+        max_parallel_tools: Optional[int] = None,
+        memory_writer=None
+    ):
         self.memory = memory_client
+        # Write-behind queue for completed traces; writes go inline without one
+        self.memory_writer = memory_writer
+        self.prefetch = PrefetchPlanner(AVAILABLE_TOOLS)
         self.llm = LLMClient()
         self.max_iterations = max_iterations
+        self.max_parallel_tools = max_parallel_tools or int(os.environ.get("MAX_PARALLEL_TOOLS", "4"))
         self.http_clients: Dict[str, AsyncHttpClient] = {}
         
-        logger.info(f"ReAct engine initialized with max {max_iterations} iterations")
+        # (tools_description, rendered SYSTEM_PROMPT) for the current health state
+        self._system_prompt_cache: Optional[tuple] = None
+        
+        logger.info(
+            f"ReAct engine initialized with max {max_iterations} iterations, "
+            f"{self.max_parallel_tools} parallel tools"
+        )
+    
+    def _get_system_prompt(self) -> str:
+        """
+        Get the static part of the system prompt (persona, tools and rules).
+        
+        Rendered once and reused until the tools description changes, which
+        only happens when the specialist health state changes.
+        """
+        tools_description = get_tools_description()
+        if self._system_prompt_cache is None or self._system_prompt_cache[0] is not tools_description:
+            self._system_prompt_cache = (
+                tools_description,
+                self.SYSTEM_PROMPT.format(tools_description=tools_description)
+            )
+        return self._system_prompt_cache[1]
+    
+    def _format_step(self, step: ReActStep) -> str:
+        """Render a completed step for the transcript in the user prompt"""
+        text = f"\nStep {step.step_number}:\n"
+        text += f"Thought: {step.thought}\n"
+        if len(step.actions) > 1:
+            for action in step.actions:
+                text += f"Action: {action.action}\n"
+                text += f"Action Input: {json.dumps(action.action_input)}\n"
+                text += f"Observation: {self._format_observation(action.observation or '')}\n"
+            return text
+        if step.action:
+            text += f"Action: {step.action}\n"
+            text += f"Action Input: {json.dumps(step.action_input)}\n"
+        if step.observation:
+            text += f"Observation: {self._format_observation(step.observation)}\n"
+        return text
     
     async def _get_agent_client(self, agent_type: str) -> AsyncHttpClient:
         """Get or create HTTP client for an agent"""
@@ -605,13 +517,18 @@ What is your next step?"""
         """
         Check if a specialist is available.
         
+        Uses the registry's passive health only; no probe runs on the query
+        path. A specialist with no health data yet is tried (the call's
+        outcome becomes its first data point, and the circuit breaker guards
+        against a dead host).
+        
         Returns:
             Tuple of (is_available: bool, status_message: str)
         """
         health = specialist_registry.get_health(agent_type)
-        if not health:
-            # Force a health check
-            health = await specialist_registry.check_health(agent_type)
+        if not health or health.status == SpecialistStatus.UNKNOWN:
+            specialist_registry.request_probe(agent_type)
+            return True, "unknown: no health data yet"
         
         if health.status == SpecialistStatus.HEALTHY:
             return True, "healthy"
@@ -622,40 +539,40 @@ What is your next step?"""
     
     async def _execute_tool(self, tool_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a tool and return the result"""
-        if tool_name not in AVAILABLE_TOOLS:
-            return {"error": f"Unknown tool: {tool_name}", "available_tools": list(AVAILABLE_TOOLS.keys())}
-        
-        tool = AVAILABLE_TOOLS[tool_name]
+        route = specialist_registry.get_route(tool_name)
+        if route is None:
+            return {"error": f"Unknown tool: {tool_name}", "available_tools": list(specialist_registry.routes)}
+        agent_type = route.specialist_id
         
         # Check specialist availability
-        is_available, status_msg = await self._check_specialist_available(tool.agent_type)
+        is_available, status_msg = await self._check_specialist_available(agent_type)
         if not is_available:
-            logger.warning(f"Specialist {tool.agent_type} is {status_msg} - tool {tool_name} cannot be executed")
+            logger.warning(f"Specialist {agent_type} is {status_msg} - tool {tool_name} cannot be executed")
             return {
-                "error": f"Specialist '{tool.agent_type}' is currently unavailable",
+                "error": f"Specialist '{agent_type}' is currently unavailable",
                 "status": status_msg,
                 "suggestion": "The service may be starting up or experiencing issues. Try again in a moment."
             }
         
         try:
-            client = await self._get_agent_client(tool.agent_type)
+            client = await self._get_agent_client(agent_type)
         except ValueError as e:
             return {"error": str(e)}
         
-        # Build endpoint with path parameters
-        endpoint = tool.endpoint
-        for param in tool.required_params:
-            if param in args:
-                endpoint = endpoint.replace(f"{{{param}}}", str(args[param]))
-        
-        # Build query params
-        query_params = {k: v for k, v in args.items() if f"{{{k}}}" not in tool.endpoint}
+        try:
+            endpoint = route.build_path(args)
+        except KeyError:
+            return {
+                "error": f"Missing required parameters for {tool_name}: {', '.join(route.missing_params(args))}",
+                "tool": tool_name,
+                "agent": agent_type
+            }
         
         try:
-            logger.info(f"Executing tool: {tool_name} on {tool.agent_type}")
+            logger.info(f"Executing tool: {tool_name} on {agent_type}")
             
-            if tool.method == "GET":
-                result = await client.get(endpoint, params=query_params if query_params else None)
+            if route.method == "GET":
+                result = await client.get(endpoint, params=route.query_params(args) or None)
             else:
                 result = await client.post(endpoint, json_body=args)
             
@@ -663,14 +580,56 @@ What is your next step?"""
             return result
         except Exception as e:
             logger.error(f"Tool execution failed for {tool_name}: {e}")
-            return {"error": str(e), "tool": tool_name, "agent": tool.agent_type}
+            return {"error": str(e), "tool": tool_name, "agent": agent_type}
+    
+    async def _run_tool(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        prefetch: Optional[PrefetchSession] = None
+    ) -> Dict[str, Any]:
+        """Execute a tool, reusing a matching prefetched call if one was started"""
+        task = prefetch.claim(tool_name, args) if prefetch else None
+        if task is not None:
+            return await task
+        return await self._execute_tool(tool_name, args)
+    
+    async def _execute_tools(
+        self,
+        actions: List[Dict[str, Any]],
+        prefetch: Optional[PrefetchSession] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several independent tools concurrently.
+        
+        Concurrency is capped by ``max_parallel_tools``. Results are returned
+        in the same order as ``actions``; a tool that raises is reported as an
+        error result rather than failing the whole step.
+        """
+        results = await gather_with_concurrency(
+            self.max_parallel_tools,
+            *(self._run_tool(a["action"], a["action_input"], prefetch) for a in actions),
+            return_exceptions=True
+        )
+        
+        return [
+            {"error": str(result), "tool": action["action"]} if isinstance(result, Exception) else result
+            for action, result in zip(actions, results)
+        ]
     
     def _parse_llm_response(self, response: str) -> Dict[str, Any]:
-        """Parse LLM response into structured components"""
+        """
+        Parse LLM response into structured components
+        
+        A response may contain several ``Action``/``Action Input`` pairs; all of
+        them are returned under ``actions`` while ``action``/``action_input``
+        mirror the first one.
+        """
         result = {
             "thought": None,
             "action": None,
             "action_input": None,
+            "actions": [],
             "final_answer": None
         }
         
@@ -678,88 +637,159 @@ What is your next step?"""
         current_key = None
         current_value = []
         
+        def flush():
+            if not current_key:
+                return
+            value = " ".join(current_value).strip()
+            if current_key == "action":
+                result["actions"].append({"action": value, "action_input": None})
+            elif current_key == "action_input":
+                if result["actions"] and result["actions"][-1]["action_input"] is None:
+                    result["actions"][-1]["action_input"] = value
+            else:
+                result[current_key] = value
+        
         for line in lines:
             line = line.strip()
             if line.startswith("Thought:"):
-                if current_key:
-                    result[current_key] = " ".join(current_value).strip()
+                flush()
                 current_key = "thought"
                 current_value = [line[8:].strip()]
             elif line.startswith("Action:"):
-                if current_key:
-                    result[current_key] = " ".join(current_value).strip()
+                flush()
                 current_key = "action"
                 current_value = [line[7:].strip()]
             elif line.startswith("Action Input:"):
-                if current_key:
-                    result[current_key] = " ".join(current_value).strip()
+                flush()
                 current_key = "action_input"
                 current_value = [line[13:].strip()]
             elif line.startswith("Final Answer:"):
-                if current_key:
-                    result[current_key] = " ".join(current_value).strip()
+                flush()
                 current_key = "final_answer"
                 current_value = [line[13:].strip()]
             else:
                 current_value.append(line)
         
-        if current_key:
-            result[current_key] = " ".join(current_value).strip()
+        flush()
         
-        # Parse action input as JSON
-        if result["action_input"]:
-            try:
-                result["action_input"] = json.loads(result["action_input"])
-            except json.JSONDecodeError:
-                # Try to extract JSON from the string
-                import re
-                match = re.search(r'\{[^{}]*\}', result["action_input"])
-                if match:
-                    try:
-                        result["action_input"] = json.loads(match.group())
-                    except:
-                        result["action_input"] = {"raw": result["action_input"]}
+        if result["actions"]:
+            result["action"] = result["actions"][0]["action"] or None
+        
+        # Parse action inputs as JSON and drop actions without input
+        result["actions"] = [
+            {"action": a["action"], "action_input": self._parse_action_input(a["action_input"])}
+            for a in result["actions"]
+            if a["action"] and a["action_input"]
+        ]
+        
+        if result["actions"] and result["actions"][0]["action"] == result["action"]:
+            result["action_input"] = result["actions"][0]["action_input"]
         
         return result
     
+    def _parse_action_input(self, raw: str) -> Any:
+        """Parse an action input string as JSON"""
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            # Try to extract JSON from the string
+            import re
+            match = re.search(r'\{[^{}]*\}', raw)
+            if match:
+                try:
+                    return json.loads(match.group())
+                except:
+                    return {"raw": raw}
+            return raw
+    
+    @staticmethod
+    def _format_observation(observation: str) -> str:
+        """Truncate an observation for the step transcript"""
+        return f"{observation[:500]}..." if len(observation) > 500 else observation
+    
     async def run(self, query: str, user_context: Dict[str, str]) -> Dict[str, Any]:
         """
         Execute the ReAct loop to process a user query
         """
+        result = None
+        async for event in self._react_loop(query, user_context, stream_tokens=False):
+            if event["event"] == "complete":
+                result = event["result"]
+        return result
+    
+    async def run_stream(self, query: str, user_context: Dict[str, str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute the ReAct loop, yielding progress events as they happen.
+        
+        Events (``event`` key): ``start``, ``token`` (LLM output chunks),
+        ``thought``, ``action``, ``observation``, ``final_answer`` and a closing
+        ``complete`` event carrying the same result dict that ``run`` returns.
+        """
+        async for event in self._react_loop(query, user_context, stream_tokens=True):
+            yield event
+    
+    async def _react_loop(
+        self,
+        query: str,
+        user_context: Dict[str, str],
+        stream_tokens: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """ReAct loop shared by ``run`` and ``run_stream``"""
         trace = ReActTrace(
             query=query,
             model_name=self.llm.model
         )
         
+        yield {"event": "start", "trace_id": trace.trace_id, "query": query}
+        
+        # Start the tools this query class almost always needs while we
+        # retrieve memory and wait on the first LLM call
+        task_type = self._classify_query(query)
+        prefetch = self.prefetch.start(task_type, query, user_context, self._execute_tool)
+        
+        try:
+            async for event in self._react_steps(query, user_context, trace, task_type, prefetch, stream_tokens):
+                yield event
+        finally:
+            prefetch.close()
+    
+    async def _react_steps(
+        self,
+        query: str,
+        user_context: Dict[str, str],
+        trace: ReActTrace,
+        task_type: str,
+        prefetch: PrefetchSession,
+        stream_tokens: bool
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Think/act iterations of the ReAct loop"""
         # Get memory context
         memory_context = await self.memory.retrieve(query) if self.memory else ""
         
+        memory_prompt = self.MEMORY_PROMPT.format(
+            memory_context=memory_context or "No previous context available."
+        )
+        
         steps: List[ReActStep] = []
         observation = None
         
-        with track_react_loop(task_type=self._classify_query(query)) as tracker:
+        # Step transcript, appended to as steps complete rather than rebuilt
+        previous_steps_text = ""
+        
+        with track_react_loop(task_type=task_type) as tracker:
             for iteration in range(self.max_iterations):
                 tracker.record_step("think")
+                step_number = iteration + 1
                 
                 # Build prompt
-                previous_steps_text = ""
-                for i, step in enumerate(steps):
-                    previous_steps_text += f"\nStep {i+1}:\n"
-                    previous_steps_text += f"Thought: {step.thought}\n"
-                    if step.action:
-                        previous_steps_text += f"Action: {step.action}\n"
-                        previous_steps_text += f"Action Input: {json.dumps(step.action_input)}\n"
-                    if step.observation:
-                        previous_steps_text += f"Observation: {step.observation[:500]}...\n" if len(str(step.observation)) > 500 else f"Observation: {step.observation}\n"
+                if steps:
+                    previous_steps_text += self._format_step(steps[-1])
                 
                 observation_prompt = ""
                 if observation:
-                    observation_prompt = f"Observation from previous action:\n{observation}"
+                    observation_prompt = f"Observation from previous action(s):\n{observation}"
                 
-                system_prompt = self.SYSTEM_PROMPT.format(
-                    tools_description=get_tools_description(),
-                    memory_context=memory_context or "No previous context available."
-                )
+                system_prompt = self._get_system_prompt() + memory_prompt
                 
                 user_prompt = self.USER_PROMPT.format(
                     query=query,
@@ -768,8 +798,16 @@ What is your next step?"""
                 )
                 
                 # Generate LLM response
-                llm_response = await self.llm.generate(user_prompt, system_prompt)
-                content = llm_response.get("content", "")
+                if stream_tokens:
+                    chunks = []
+                    llm_response = {}
+                    async for chunk in self.llm.stream(user_prompt, system_prompt, usage=llm_response):
+                        chunks.append(chunk)
+                        yield {"event": "token", "step": step_number, "content": chunk}
+                    content = "".join(chunks)
+                else:
+                    llm_response = await self.llm.generate(user_prompt, system_prompt)
+                    content = llm_response.get("content", "")
                 
                 trace.total_input_tokens += llm_response.get("input_tokens", 0)
                 trace.total_output_tokens += llm_response.get("output_tokens", 0)
@@ -778,12 +816,14 @@ What is your next step?"""
                 parsed = self._parse_llm_response(content)
                 
                 step = ReActStep(
-                    step_number=iteration + 1,
+                    step_number=step_number,
                     thought=parsed["thought"] or content,
                     action=parsed["action"],
                     action_input=parsed["action_input"]
                 )
                 
+                yield {"event": "thought", "step": step_number, "thought": step.thought}
+                
                 # Check for final answer
                 if parsed["final_answer"]:
                     step.is_final = True
@@ -792,38 +832,79 @@ What is your next step?"""
                     
                     trace.steps = steps
                     trace.final_answer = parsed["final_answer"]
-                    trace.total_iterations = iteration + 1
+                    trace.total_iterations = step_number
                     trace.success = True
                     trace.completed_at = datetime.utcnow()
                     
                     tracker.complete(success=True)
                     
-                    # Store in memory
-                    if self.memory:
-                        await self.memory.add_context(
+                    yield {"event": "final_answer", "step": step_number, "answer": parsed["final_answer"]}
+                    
+                    # Store in memory (queued when a write-behind queue is configured)
+                    memory_sink = self.memory_writer or self.memory
+                    if memory_sink:
+                        await memory_sink.add_context(
                             doc_id=trace.trace_id,
                             text=f"Query: {query}\nAnswer: {parsed['final_answer']}",
                             metadata={"user_context": user_context}
                         )
                     
-                    return {
+                    yield {"event": "complete", "result": {
                         "plan": self._summarize_plan(steps),
                         "result": parsed["final_answer"],
-                        "steps": iteration + 1,
+                        "steps": step_number,
                         "trace_id": trace.trace_id,
                         "tokens_used": trace.total_input_tokens + trace.total_output_tokens
-                    }
+                    }}
+                    return
                 
-                # Execute action
-                if parsed["action"] and parsed["action_input"]:
+                # Execute action(s)
+                if len(parsed["actions"]) > 1:
+                    tracker.record_step("act")
+                    
+                    yield {"event": "action", "step": step_number, "actions": parsed["actions"]}
+                    
+                    self.prefetch.learn(user_context, parsed["actions"])
+                    tool_results = await self._execute_tools(parsed["actions"], prefetch)
+                    step.actions = [
+                        ReActAction(
+                            action=a["action"],
+                            action_input=a["action_input"] if isinstance(a["action_input"], dict) else {"raw": a["action_input"]},
+                            observation=json.dumps(r, indent=2, default=str)
+                        )
+                        for a, r in zip(parsed["actions"], tool_results)
+                    ]
+                    for action in step.actions:
+                        yield {
+                            "event": "observation",
+                            "step": step_number,
+                            "action": action.action,
+                            "observation": action.observation
+                        }
+                    observation = "\n\n".join(
+                        f"[{a.action}]\n{a.observation}" for a in step.actions
+                    )
+                    step.observation = observation
+                elif parsed["action"] and parsed["action_input"]:
                     tracker.record_step("act")
                     
-                    tool_result = await self._execute_tool(
+                    yield {"event": "action", "step": step_number, "actions": parsed["actions"]}
+                    
+                    self.prefetch.learn(user_context, parsed["actions"])
+                    tool_result = await self._run_tool(
                         parsed["action"],
-                        parsed["action_input"]
+                        parsed["action_input"],
+                        prefetch
                     )
                     observation = json.dumps(tool_result, indent=2, default=str)
                     step.observation = observation
+                    
+                    yield {
+                        "event": "observation",
+                        "step": step_number,
+                        "action": parsed["action"],
+                        "observation": observation
+                    }
                 
                 steps.append(step)
             
@@ -835,13 +916,13 @@ What is your next step?"""
             trace.success = False
             trace.completed_at = datetime.utcnow()
             
-            return {
+            yield {"event": "complete", "result": {
                 "plan": self._summarize_plan(steps),
                 "result": "Max iterations reached. Please try a more specific query.",
                 "steps": self.max_iterations,
                 "trace_id": trace.trace_id,
                 "error": "max_iterations_exceeded"
-            }
+            }}
     
     def _classify_query(self, query: str) -> str:
         """Classify query type for metrics"""
@@ -866,7 +947,10 @@ What is your next step?"""
         if not steps:
             return "No plan executed"
         
-        actions = [s.action for s in steps if s.action]
+        actions = [
+            f"[{' + '.join(a.action for a in s.actions)}]" if len(s.actions) > 1 else s.action
+            for s in steps if s.action
+        ]
         if actions:
             return " -> ".join(actions)
         return steps[0].thought[:100] if steps[0].thought else "Direct response"
@@ -875,3 +959,4 @@ What is your next step?"""
         """Close all HTTP clients"""
         for client in self.http_clients.values():
             await client.close()
+        await self.llm.close()
@@ -0,0 +1,318 @@
+"""
+Nexus Response Cache
+Scoped, TTL-bound cache for orchestrator query responses with optional
+semantic (embedding similarity) matching and event-driven invalidation
+"""
+import os
+import re
+import math
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from nexus_lib.instrumentation import (
+    RESPONSE_CACHE_REQUESTS,
+    RESPONSE_CACHE_INVALIDATIONS,
+    RESPONSE_CACHE_ENTRIES,
+)
+
+logger = logging.getLogger("nexus.response_cache")
+
+
+# Webhook event type prefix -> agent types whose data the event changes.
+# ``None`` means the event may affect any answer.
+EVENT_AGENT_MAP: Dict[str, Optional[Set[str]]] = {
+    "ticket": {"jira", "hygiene", "reporting"},
+    "hygiene": {"hygiene"},
+    "build": {"git_ci", "rca", "reporting"},
+    "deployment": {"git_ci", "analytics"},
+    "security": {"git_ci", "reporting"},
+    "analytics": {"analytics"},
+    "release": None,
+}
+
+# Query class (ReActEngine._classify_query) -> agent types a tool-less answer
+# of that class depends on. ``None`` means any agent.
+QUERY_CLASS_AGENTS: Dict[str, Optional[Set[str]]] = {
+    "rca": {"git_ci", "rca"},
+    "release_check": {"jira", "git_ci", "reporting"},
+    "jira_query": {"jira"},
+    "ci_query": {"git_ci"},
+    "security_query": {"git_ci"},
+    "report": {"jira", "reporting"},
+    "general": None,
+}
+
+ALL_AGENTS: Set[str] = set().union(*(agents for agents in EVENT_AGENT_MAP.values() if agents))
+
+
+@dataclass
+class CachedResponse:
+    """A cached ReAct result"""
+    key: Tuple[str, str]
+    result: Dict[str, Any]
+    expires_at: float
+    tags: Set[str] = field(default_factory=set)
+    embedding: Optional[List[float]] = None
+    hits: int = 0
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for exact-match caching.
+
+    Lowercases, drops punctuation that does not change meaning and collapses
+    whitespace, while keeping version strings (v2.0) and keys (PROJ-123) intact.
+    """
+    normalized = re.sub(r"[^\w\s.\-/]", " ", query.lower())
+    normalized = re.sub(r"\.(?=\s|$)", " ", normalized)
+    return " ".join(normalized.split())
+
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    """Cosine similarity of two vectors"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(y * y for y in b))
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+class ResponseCache:
+    """
+    Response cache in front of ``ReActEngine.run``.
+
+    Entries are keyed on the normalized query plus the caller's scope
+    (tenant, and user unless ``scope="tenant"``); callers without an identity
+    for that scope bypass the cache. Each entry is tagged with the agent types
+    its answer was built from, or for answers that called no tools the agents
+    its query class depends on, so that data-change events only evict the
+    answers they can affect.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        scope: Optional[str] = None,
+        semantic: Optional[bool] = None,
+        similarity_threshold: Optional[float] = None,
+        embedder: Optional[Callable[[str], Awaitable[List[float]]]] = None,
+        tag_resolver: Optional[Callable[[Dict[str, Any]], Iterable[str]]] = None
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            ttl: Entry time to live in seconds
+            max_entries: Maximum entries kept before LRU eviction
+            scope: "user" to isolate per user, "tenant" to share within a tenant
+            semantic: Also match on embedding similarity when exact lookup misses
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embedder: Async callable returning an embedding (e.g. VectorMemory.embed)
+            tag_resolver: Callable returning the agent types a result depends on
+        """
+        self.enabled = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+        self.ttl = ttl if ttl is not None else int(os.environ.get("RESPONSE_CACHE_TTL", "300"))
+        self.max_entries = max_entries or int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+        self.scope = scope or os.environ.get("RESPONSE_CACHE_SCOPE", "user")
+        self.semantic = semantic if semantic is not None else (
+            os.environ.get("RESPONSE_CACHE_SEMANTIC", "false").lower() == "true"
+        )
+        self.similarity_threshold = similarity_threshold or float(
+            os.environ.get("RESPONSE_CACHE_SIMILARITY", "0.92")
+        )
+        self.embedder = embedder
+        self.tag_resolver = tag_resolver
+
+        self._entries: "OrderedDict[Tuple[str, str], CachedResponse]" = OrderedDict()
+        self._stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "invalidations": 0}
+
+        logger.info(
+            f"Response cache initialized (enabled={self.enabled}, ttl={self.ttl}s, "
+            f"scope={self.scope}, semantic={self.semantic and embedder is not None})"
+        )
+
+    def scope_key(self, user_context: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Build the scope part of the cache key, or None for an anonymous caller"""
+        user_context = user_context or {}
+        tenant = user_context.get("tenant_id") or user_context.get("team_id")
+        if self.scope == "tenant":
+            return str(tenant) if tenant else None
+        user_id = user_context.get("user_id")
+        return f"{tenant or 'default'}:{user_id}" if user_id else None
+
+    async def get(
+        self,
+        query: str,
+        user_context: Optional[Dict[str, Any]] = None,
+        task_type: str = "general"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Returns:
+            The cached result, or None on miss
+        """
+        scope = self.scope_key(user_context) if self.enabled else None
+        if scope is None:
+            return None
+
+        key = (scope, normalize_query(query))
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry and entry.expires_at <= now:
+            self._remove(key, reason="ttl")
+            entry = None
+
+        result_label = "hit"
+        if entry is None and self.semantic and self.embedder:
+            entry = await self._find_similar(key, now)
+            result_label = "semantic_hit"
+
+        if entry is None:
+            self._stats["misses"] += 1
+            RESPONSE_CACHE_REQUESTS.labels(task_type=task_type, result="miss").inc()
+            return None
+
+        entry.hits += 1
+        self._entries.move_to_end(entry.key)
+        self._stats["semantic_hits" if result_label == "semantic_hit" else "hits"] += 1
+        RESPONSE_CACHE_REQUESTS.labels(task_type=task_type, result=result_label).inc()
+        logger.debug(f"Response cache {result_label} for '{key[1]}'")
+        return entry.result
+
+    async def _find_similar(self, key: Tuple[str, str], now: float) -> Optional[CachedResponse]:
+        """Find the most similar live entry in the same scope"""
+        candidates = [
+            e for e in self._entries.values()
+            if e.key[0] == key[0] and e.embedding is not None and e.expires_at > now
+        ]
+        if not candidates:
+            return None
+
+        try:
+            query_embedding = await self.embedder(key[1])
+        except Exception as e:
+            logger.warning(f"Response cache embedding failed: {e}")
+            return None
+
+        best, best_score = None, self.similarity_threshold
+        for entry in candidates:
+            score = _cosine_similarity(query_embedding, entry.embedding)
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    async def set(
+        self,
+        query: str,
+        result: Dict[str, Any],
+        user_context: Optional[Dict[str, Any]] = None,
+        task_type: str = "general"
+    ):
+        """Cache a successful result"""
+        scope = self.scope_key(user_context) if self.enabled else None
+        if scope is None or result.get("error"):
+            return
+
+        key = (scope, normalize_query(query))
+        tags = set(self.tag_resolver(result)) if self.tag_resolver else set()
+        if not tags:
+            agents = QUERY_CLASS_AGENTS.get(task_type)
+            tags = set(agents) if agents is not None else set(ALL_AGENTS)
+
+        embedding = None
+        if self.semantic and self.embedder:
+            try:
+                embedding = await self.embedder(key[1])
+            except Exception as e:
+                logger.warning(f"Response cache embedding failed: {e}")
+
+        self._entries[key] = CachedResponse(
+            key=key,
+            result=result,
+            expires_at=time.monotonic() + self.ttl,
+            tags=tags,
+            embedding=embedding
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest, reason="evicted")
+
+        RESPONSE_CACHE_ENTRIES.set(len(self._entries))
+
+    def _remove(self, key: Tuple[str, str], reason: str):
+        """Remove a single entry and record why"""
+        if self._entries.pop(key, None) is not None:
+            self._stats["invalidations"] += 1
+            RESPONSE_CACHE_INVALIDATIONS.labels(reason=reason).inc()
+            RESPONSE_CACHE_ENTRIES.set(len(self._entries))
+
+    def invalidate(
+        self,
+        agent_types: Optional[Iterable[str]] = None,
+        scope: Optional[str] = None,
+        reason: str = "manual"
+    ) -> int:
+        """
+        Invalidate cached responses
+
+        Args:
+            agent_types: Only drop entries built from these agents (all entries if None)
+            scope: Only drop entries in this scope key
+            reason: Label recorded in the invalidation metric
+
+        Returns:
+            Number of entries removed
+        """
+        agents = set(agent_types) if agent_types is not None else None
+
+        doomed = [
+            key for key, entry in self._entries.items()
+            if (scope is None or key[0] == scope)
+            and (agents is None or entry.tags & agents)
+        ]
+        for key in doomed:
+            self._remove(key, reason=reason)
+
+        if doomed:
+            logger.info(f"Invalidated {len(doomed)} cached responses ({reason})")
+        return len(doomed)
+
+    def invalidate_for_event(self, event_type: str) -> int:
+        """
+        Invalidate responses affected by a data-change event
+
+        Args:
+            event_type: Event type such as "ticket.updated" or "build.failed"
+        """
+        prefix = event_type.split(".", 1)[0]
+        if prefix not in EVENT_AGENT_MAP:
+            return 0
+        return self.invalidate(agent_types=EVENT_AGENT_MAP[prefix], reason="event")
+
+    def clear(self):
+        """Drop every cached response"""
+        self.invalidate(reason="manual")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self._stats["hits"] + self._stats["semantic_hits"] + self._stats["misses"]
+        hit_rate = (self._stats["hits"] + self._stats["semantic_hits"]) / lookups if lookups else 0.0
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "scope": self.scope,
+            "semantic": self.semantic and self.embedder is not None,
+            "hit_rate": round(hit_rate, 4),
+            **self._stats
+        }
@@ -0,0 +1,502 @@
+"""
+Nexus Local Vector Index
+In-process NumPy vector index with memory-mapped persistence and an
+optional IVF (inverted file) coarse quantizer for large collections
+"""
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("nexus.vector_index")
+
+
+class LocalVectorIndex:
+    """
+    Cosine-similarity vector index backed by a NumPy matrix.
+
+    Vectors are L2-normalized on insert so a query is a single matrix-vector
+    product followed by a partial sort. The matrix lives in a memory-mapped
+    ``.npy`` file that grows by doubling; documents and ids are kept in an
+    append-only JSONL log that is replayed on load and compacted on close.
+
+    Once the collection reaches ``ivf_min_vectors`` rows, a k-means coarse
+    quantizer partitions the rows into ``sqrt(n)`` lists and queries only
+    score the rows in the ``nprobe`` closest lists. The quantizer is never
+    built inside ``search``: callers check ``needs_training()`` and run
+    ``train()`` on a worker thread, and searches keep using the previous
+    quantizer (or a flat scan) until the new one is installed. Every public
+    method is thread-safe.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        name: str = "nexus_memory",
+        dim: Optional[int] = None,
+        initial_capacity: int = 1024,
+        ivf_min_vectors: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ):
+        """
+        Initialize the index, loading any persisted state
+
+        Args:
+            path: Directory for the vector and document files (in-memory if None)
+            name: File name prefix
+            dim: Vector dimension (taken from the first vector or the file if None)
+            initial_capacity: Rows allocated before the first resize
+            ivf_min_vectors: Collection size at which the IVF quantizer is built
+            nprobe: Number of IVF lists scored per query
+        """
+        self.path = path
+        self.name = name
+        self.dim = dim
+        self.initial_capacity = initial_capacity
+        self.ivf_min_vectors = ivf_min_vectors or int(os.environ.get("MEMORY_IVF_MIN_VECTORS", "50000"))
+        self.nprobe = nprobe or int(os.environ.get("MEMORY_IVF_NPROBE", "8"))
+
+        self._vectors: Optional[np.ndarray] = None
+        self._assignments: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._trained_at = 0
+        self._training = False
+        self._dirty: Optional[set] = None  # rows changed while training runs
+        self._epoch = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._log = None
+
+        if self.path:
+            os.makedirs(self.path, exist_ok=True)
+            self._load()
+
+    # -------------------------------------------------------------------------
+    # Storage
+    # -------------------------------------------------------------------------
+
+    @property
+    def _vectors_file(self) -> str:
+        return os.path.join(self.path, f"{self.name}.vectors.npy")
+
+    @property
+    def _log_file(self) -> str:
+        return os.path.join(self.path, f"{self.name}.docs.jsonl")
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        """Allocate a (capacity, dim) float32 matrix, file-backed when persistent"""
+        if not self.path:
+            return np.zeros((capacity, self.dim), dtype=np.float32)
+        return np.lib.format.open_memmap(
+            f"{self._vectors_file}.tmp", mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+        )
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the vector matrix (doubling) so it holds at least ``rows`` rows"""
+        if self._vectors is not None and rows <= self._vectors.shape[0]:
+            return
+
+        capacity = self._vectors.shape[0] if self._vectors is not None else self.initial_capacity
+        while capacity < rows:
+            capacity *= 2
+
+        vectors = self._allocate(capacity)
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        if self._vectors is not None:
+            vectors[:self._count] = self._vectors[:self._count]
+            assignments[:self._count] = self._assignments[:self._count]
+
+        if self.path:
+            # Swap the grown file in place of the old one and re-map it
+            vectors.flush()
+            del vectors
+            self._vectors = None
+            os.replace(f"{self._vectors_file}.tmp", self._vectors_file)
+            vectors = np.load(self._vectors_file, mmap_mode="r+")
+
+        self._vectors = vectors
+        self._assignments = assignments
+
+    def _load(self):
+        """Load persisted vectors and replay the document log"""
+        if os.path.exists(self._log_file):
+            with open(self._log_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping truncated vector index log record")
+                        continue
+                    if record.get("op") == "del":
+                        self._remove_row(record["id"])
+                    else:
+                        self._place_row(record["id"], record)
+
+        if os.path.exists(self._vectors_file):
+            vectors = np.load(self._vectors_file, mmap_mode="r+")
+            if self.dim is not None and vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vector index dimension mismatch: file has {vectors.shape[1]}, expected {self.dim}"
+                )
+            self.dim = vectors.shape[1]
+            self._vectors = vectors
+            self._assignments = np.full(vectors.shape[0], -1, dtype=np.int32)
+
+        if self._count and (self._vectors is None or self._vectors.shape[0] < self._count):
+            logger.error("Vector index files are inconsistent; starting empty")
+            self._reset_state()
+
+        self._log = open(self._log_file, "a", encoding="utf-8")
+        logger.info(f"Local vector index loaded {self._count} documents from {self.path}")
+
+    def _append_log(self, record: Dict[str, Any]):
+        """Append a record to the document log"""
+        if self._log is not None:
+            self._log.write(json.dumps(record, default=str) + "\n")
+            self._log.flush()
+
+    def _reset_state(self):
+        """Forget every document and the IVF quantizer"""
+        self._ids, self._rows, self._docs = [], {}, {}
+        self._count = 0
+        self._centroids = None
+        self._trained_at = 0
+        self._epoch += 1
+        if self._assignments is not None:
+            self._assignments.fill(-1)
+
+    # -------------------------------------------------------------------------
+    # Row bookkeeping
+    # -------------------------------------------------------------------------
+
+    def _place_row(self, doc_id: str, doc: Dict[str, Any]) -> int:
+        """Assign a row to ``doc_id`` (reusing its existing row) and record the document"""
+        row = self._rows.get(doc_id)
+        if row is None:
+            row = self._count
+            self._rows[doc_id] = row
+            self._ids.append(doc_id)
+            self._count += 1
+        if self._dirty is not None:
+            self._dirty.add(row)
+        self._docs[doc_id] = {
+            "content": doc["content"],
+            "metadata": doc.get("metadata") or {},
+            "created_at": doc.get("created_at")
+        }
+        return row
+
+    def _remove_row(self, doc_id: str) -> bool:
+        """Remove ``doc_id`` by moving the last row into its slot"""
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return False
+        self._docs.pop(doc_id, None)
+
+        last = self._count - 1
+        if self._dirty is not None:
+            self._dirty.add(row)
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+            if self._vectors is not None:
+                self._vectors[row] = self._vectors[last]
+                self._assignments[row] = self._assignments[last]
+        self._ids.pop()
+        self._count -= 1
+        return True
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def upsert(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Insert or replace a document
+
+        Args:
+            doc_id: Unique document identifier
+            embedding: Document embedding
+            content: Document text
+            metadata: Optional metadata dict
+        """
+        with self._lock:
+            self._upsert(doc_id, embedding, content, metadata)
+
+    def upsert_many(
+        self,
+        documents: List[Tuple[str, List[float], str, Optional[Dict[str, Any]]]]
+    ):
+        """
+        Insert or replace several documents under one lock acquisition
+
+        Args:
+            documents: (doc_id, embedding, content, metadata) tuples
+        """
+        with self._lock:
+            for doc_id, embedding, content, metadata in documents:
+                self._upsert(doc_id, embedding, content, metadata)
+
+    def _upsert(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        content: str,
+        metadata: Optional[Dict[str, Any]]
+    ):
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self.dim is None:
+            self.dim = vector.shape[0]
+        if vector.shape != (self.dim,):
+            raise ValueError(f"Expected a {self.dim}-dimensional embedding, got {vector.shape}")
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+
+        self._ensure_capacity(self._count + 1)
+
+        record = {
+            "op": "put",
+            "id": doc_id,
+            "content": content,
+            "metadata": metadata or {},
+            "created_at": datetime.utcnow().isoformat()
+        }
+        row = self._place_row(doc_id, record)
+        self._vectors[row] = vector
+        self._assignments[row] = (
+            int(np.argmax(self._centroids @ vector)) if self._centroids is not None else -1
+        )
+        self._append_log(record)
+
+    def delete(self, doc_id: str) -> bool:
+        """Delete a document; returns False if it was not indexed"""
+        with self._lock:
+            removed = self._remove_row(doc_id)
+            if removed:
+                self._append_log({"op": "del", "id": doc_id})
+            return removed
+
+    def clear(self):
+        """Drop every document"""
+        with self._lock:
+            self._reset_state()
+            if self._log is not None:
+                self._log.close()
+                self._log = open(self._log_file, "w", encoding="utf-8")
+
+    def search(
+        self,
+        embedding: List[float],
+        k: int = 3,
+        filter_metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """
+        Find the ``k`` most similar documents
+
+        Args:
+            embedding: Query embedding
+            k: Number of results
+            filter_metadata: Only match documents whose metadata has these key/values
+
+        Returns:
+            (doc_id, cosine similarity, document) tuples, best first
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        with self._lock:
+            return self._search(query, k, filter_metadata)
+
+    def _search(
+        self,
+        query: np.ndarray,
+        k: int,
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        if not self._count or k <= 0:
+            return []
+
+        candidates = self._candidate_rows(query)
+        if filter_metadata:
+            candidates = np.array([
+                row for row in (candidates if candidates is not None else range(self._count))
+                if all(
+                    self._docs[self._ids[row]]["metadata"].get(key) == value
+                    for key, value in filter_metadata.items()
+                )
+            ], dtype=np.int64)
+
+        if candidates is None:
+            scores = self._vectors[:self._count] @ query
+            rows = np.arange(self._count)
+        else:
+            if not len(candidates):
+                return []
+            scores = self._vectors[candidates] @ query
+            rows = candidates
+
+        if k < len(scores):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            doc_id = self._ids[int(rows[i])]
+            results.append((doc_id, float(scores[i]), self._docs[doc_id]))
+        return results
+
+    # -------------------------------------------------------------------------
+    # IVF coarse quantizer
+    # -------------------------------------------------------------------------
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to score for ``query``, or None to scan the whole matrix"""
+        if self._count < self.ivf_min_vectors or self._centroids is None:
+            return None
+
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        # Lookup table indexed by list id; the trailing slot (-1) keeps unassigned rows
+        probed = np.zeros(len(self._centroids) + 1, dtype=bool)
+        probed[probe] = True
+        probed[-1] = True
+        return np.flatnonzero(probed[self._assignments[:self._count]])
+
+    def needs_training(self) -> bool:
+        """Whether the IVF quantizer is missing or the collection has doubled since it was built"""
+        with self._lock:
+            return (
+                not self._training
+                and self._count >= self.ivf_min_vectors
+                and (self._centroids is None or self._count >= 2 * self._trained_at)
+            )
+
+    def train(self, iterations: int = 10, sample_size: int = 20000, seed: int = 0):
+        """
+        Build the IVF coarse quantizer with spherical k-means
+
+        Meant to run on a worker thread: the lock is only held to snapshot
+        the rows and to install the result, so searches and upserts proceed
+        meanwhile. Rows written during training are reassigned on install.
+
+        Args:
+            iterations: k-means iterations
+            sample_size: Rows sampled for training
+            seed: Random seed for sampling and initialization
+        """
+        with self._lock:
+            if not self._count or self._training:
+                return
+            self._training = True
+            self._dirty = set()
+            epoch = self._epoch
+            count = self._count
+            vectors = self._vectors
+            rng = np.random.default_rng(seed)
+            sample = vectors[rng.choice(count, size=min(sample_size, count), replace=False)]
+
+        try:
+            n_lists = min(max(1, int(np.sqrt(count))), len(sample))
+            centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                for c in range(n_lists):
+                    members = sample[labels == c]
+                    if len(members):
+                        centroid = members.sum(axis=0)
+                        norm = np.linalg.norm(centroid)
+                        centroids[c] = centroid / norm if norm else centroid
+
+            # Assign the snapshot rows in chunks to bound the temporary score matrix
+            assignments = np.empty(count, dtype=np.int32)
+            for start in range(0, count, 8192):
+                stop = min(start + 8192, count)
+                assignments[start:stop] = np.argmax(vectors[start:stop] @ centroids.T, axis=1)
+
+            with self._lock:
+                if epoch != self._epoch:
+                    return
+                kept = min(count, self._count)
+                self._assignments[:kept] = assignments[:kept]
+                stale = sorted(row for row in self._dirty if row < kept)
+                stale.extend(range(kept, self._count))
+                if stale:
+                    self._assignments[stale] = np.argmax(self._vectors[stale] @ centroids.T, axis=1)
+                self._centroids = centroids
+                self._trained_at = count
+        finally:
+            with self._lock:
+                self._training = False
+                self._dirty = None
+        logger.info(f"Built IVF index with {n_lists} lists over {count} vectors")
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def flush(self):
+        """Flush vector pages to disk"""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self.path and isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+
+    def close(self):
+        """Flush vectors and compact the document log"""
+        if not self.path:
+            return
+        with self._lock:
+            self._flush()
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+            tmp_file = f"{self._log_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                for doc_id in self._ids:
+                    f.write(json.dumps({"op": "put", "id": doc_id, **self._docs[doc_id]}, default=str) + "\n")
+            os.replace(tmp_file, self._log_file)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        with self._lock:
+            return {
+                "count": self._count,
+                "dim": self.dim,
+                "capacity": self._vectors.shape[0] if self._vectors is not None else 0,
+                "ivf_lists": len(self._centroids) if self._centroids is not None else 0,
+                "ivf_training": self._training,
+                "persistent": bool(self.path)
+            }
@@ -4,13 +4,14 @@ Main FastAPI application for the orchestration service
 """
 import os
 import sys
+import json
 import logging
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 # Add shared lib to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../shared")))
@@ -22,17 +23,18 @@ from nexus_lib.schemas.agent_contract import (
     AgentType,
     HealthCheck,
 )
-from nexus_lib.middleware import MetricsMiddleware, AuthMiddleware, RequestIdMiddleware
+from nexus_lib.middleware import NexusMiddleware, RequestIdStage, MetricsStage, AuthStage
 from nexus_lib.instrumentation import setup_tracing, create_metrics_endpoint
-from nexus_lib.utils import generate_task_id
+from nexus_lib.utils import generate_task_id, http_pool
 from nexus_lib.specialists import (
     specialist_registry,
     SpecialistStatus,
     SPECIALIST_DEFINITIONS,
 )
 
-from app.core.react_engine import ReActEngine
-from app.core.memory import VectorMemory, ConversationMemory
+from app.core.react_engine import ReActEngine, get_agent_types_for_result
+from app.core.memory import VectorMemory, ConversationMemory, MemoryWriteQueue, create_conversation_memory
+from app.core.response_cache import ResponseCache
 
 # Configure logging
 logging.basicConfig(
@@ -45,12 +47,14 @@ logger = logging.getLogger("nexus.orchestrator")
 react_engine: Optional[ReActEngine] = None
 vector_memory: Optional[VectorMemory] = None
 conversation_memory: Optional[ConversationMemory] = None
+memory_writer: Optional[MemoryWriteQueue] = None
+response_cache: Optional[ResponseCache] = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
-    global react_engine, vector_memory, conversation_memory
+    global react_engine, vector_memory, conversation_memory, response_cache, memory_writer
     
     # Startup
     logger.info("=" * 60)
@@ -62,15 +66,34 @@ async def lifespan(app: FastAPI):
     # Initialize memory systems
     logger.info("Initializing memory systems...")
     vector_memory = VectorMemory()
-    conversation_memory = ConversationMemory()
+    conversation_memory = create_conversation_memory()
+    
+    # Persist completed traces in the background instead of on the request path
+    memory_writer = MemoryWriteQueue(vector_memory)
+    memory_writer.start()
     
     # Initialize ReAct engine
     logger.info("Initializing ReAct reasoning engine...")
     react_engine = ReActEngine(
         memory_client=vector_memory,
-        max_iterations=int(os.environ.get("MAX_REACT_ITERATIONS", "10"))
+        max_iterations=int(os.environ.get("MAX_REACT_ITERATIONS", "10")),
+        memory_writer=memory_writer
+    )
+    
+    # Initialize response cache in front of the ReAct engine
+    response_cache = ResponseCache(
+        embedder=vector_memory.embed,
+        tag_resolver=get_agent_types_for_result
     )
     
+    # Load the embedding model before serving so the first query is not slow,
+    # but only if something will embed text
+    if (
+        os.environ.get("EMBEDDING_WARMUP", "true").lower() == "true"
+        and (vector_memory.uses_embeddings or response_cache.semantic)
+    ):
+        await vector_memory.embeddings.warmup()
+    
     # Register and verify specialist agents
     logger.info("-" * 60)
     logger.info("SPECIALIST AGENT REGISTRATION")
@@ -128,6 +151,15 @@ async def lifespan(app: FastAPI):
     
     if react_engine:
         await react_engine.close()
+    if memory_writer:
+        await memory_writer.close(
+            timeout=float(os.environ.get("MEMORY_WRITE_SHUTDOWN_TIMEOUT", "10"))
+        )
+    if vector_memory:
+        await vector_memory.close()
+    
+    # Close the shared keep-alive connection pools
+    await http_pool.close_all()
     logger.info("Shutdown complete")
 
 
@@ -159,13 +191,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add custom middleware
-app.add_middleware(RequestIdMiddleware)
-app.add_middleware(MetricsMiddleware, agent_type="orchestrator")
+# Add custom middleware (one fused ASGI layer)
 app.add_middleware(
-    AuthMiddleware,
-    secret_key=os.environ.get("NEXUS_JWT_SECRET"),
-    require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+    NexusMiddleware,
+    stages=[
+        RequestIdStage(),
+        MetricsStage(agent_type="orchestrator"),
+        AuthStage(
+            secret_key=os.environ.get("NEXUS_JWT_SECRET"),
+            require_auth=os.environ.get("NEXUS_REQUIRE_AUTH", "false").lower() == "true"
+        ),
+    ]
 )
 
 # Add metrics endpoint
@@ -388,13 +424,23 @@ async def execute_task(request: AgentTaskRequest):
         
         # Add to conversation memory
         session_id = request.user_context.get("session_id", request.task_id) if request.user_context else request.task_id
-        conversation_memory.add_turn(session_id, "user", query)
+        await conversation_memory.add_turn(session_id, "user", query)
+        
+        # Serve from the response cache unless the caller opts out
+        use_cache = response_cache is not None and not request.payload.get("no_cache", False)
+        task_type = react_engine._classify_query(query)
+        result = await response_cache.get(query, request.user_context, task_type=task_type) if use_cache else None
         
-        # Execute ReAct loop
-        result = await react_engine.run(query, request.user_context or {})
+        if result is not None:
+            result = {**result, "cached": True}
+        else:
+            # Execute ReAct loop
+            result = await react_engine.run(query, request.user_context or {})
+            if use_cache:
+                await response_cache.set(query, result, request.user_context, task_type=task_type)
         
         # Add result to conversation memory
-        conversation_memory.add_turn(session_id, "assistant", result.get("result", ""))
+        await conversation_memory.add_turn(session_id, "assistant", result.get("result", ""))
         
         return AgentTaskResponse(
             task_id=request.task_id,
@@ -413,12 +459,142 @@ async def execute_task(request: AgentTaskRequest):
         )
 
 
+async def _stream_query(
+    query: str,
+    user_context: Dict[str, Any],
+    session_id: str,
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a query through the ReAct engine, yielding progress events.
+    
+    Mirrors ``execute_task``: conversation memory is updated and the response
+    cache is consulted and filled, so streamed and blocking calls share state.
+    """
+    await conversation_memory.add_turn(session_id, "user", query)
+    
+    use_cache = use_cache and response_cache is not None
+    task_type = react_engine._classify_query(query)
+    cached_result = await response_cache.get(query, user_context, task_type=task_type) if use_cache else None
+    
+    if cached_result is not None:
+        result = {**cached_result, "cached": True}
+        yield {"event": "final_answer", "answer": result.get("result")}
+        yield {"event": "complete", "result": result}
+    else:
+        result = None
+        async for event in react_engine.run_stream(query, user_context):
+            if event["event"] == "complete":
+                result = event["result"]
+                if use_cache:
+                    await response_cache.set(query, result, user_context, task_type=task_type)
+            yield event
+    
+    await conversation_memory.add_turn(session_id, "assistant", (result or {}).get("result", ""))
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events message"""
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+@app.post("/execute/stream")
+async def execute_task_stream(request: AgentTaskRequest):
+    """
+    Execute a task using the ReAct engine, streaming progress over SSE
+    
+    Emits one Server-Sent Event per ReAct step component as it happens:
+    ``start``, ``token`` (LLM output chunks), ``thought``, ``action``,
+    ``observation``, ``final_answer`` and a closing ``complete`` event whose
+    ``result`` matches the ``data`` returned by ``/execute``.
+    """
+    query = request.payload.get("query", "")
+    if not query:
+        raise HTTPException(status_code=400, detail="Query is required in payload")
+    
+    user_context = request.user_context or {}
+    session_id = user_context.get("session_id", request.task_id)
+    
+    async def event_source():
+        try:
+            async for event in _stream_query(
+                query,
+                user_context,
+                session_id,
+                use_cache=not request.payload.get("no_cache", False)
+            ):
+                yield _format_sse({**event, "task_id": request.task_id})
+        except Exception as e:
+            logger.exception(f"Streaming task failed: {e}")
+            yield _format_sse({"event": "error", "task_id": request.task_id, "error": str(e)})
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/ws/execute")
+async def execute_task_websocket(websocket: WebSocket):
+    """
+    Execute tasks over a WebSocket, streaming progress events
+    
+    Each client message is a JSON object with ``query`` and optional
+    ``user_context``/``task_id``; the server replies with the same events as
+    ``/execute/stream``, one JSON message per event.
+    """
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_json()
+            query = message.get("query", "")
+            task_id = message.get("task_id") or generate_task_id("ws")
+            
+            if not query:
+                await websocket.send_json({"event": "error", "task_id": task_id, "error": "Query is required"})
+                continue
+            
+            user_context = message.get("user_context") or {}
+            try:
+                async for event in _stream_query(
+                    query,
+                    user_context,
+                    user_context.get("session_id", task_id),
+                    use_cache=not message.get("no_cache", False)
+                ):
+                    await websocket.send_json(json.loads(json.dumps({**event, "task_id": task_id}, default=str)))
+            except WebSocketDisconnect:
+                raise
+            except Exception as e:
+                logger.exception(f"Streaming task failed: {e}")
+                await websocket.send_json({"event": "error", "task_id": task_id, "error": str(e)})
+    except WebSocketDisconnect:
+        logger.debug("WebSocket client disconnected")
+
+
+def _caller_context(request: Request, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """``user_context`` with the authenticated caller's user and tenant filled in"""
+    context = dict(user_context or {})
+    user = getattr(request.state, "user", None) or {}
+    if user.get("sub"):
+        context["user_id"] = user["sub"]
+    for key in ("tenant_id", "team_id"):
+        if user.get(key):
+            context[key] = user[key]
+    tenant_id = getattr(getattr(request.state, "tenant", None), "id", None)
+    if tenant_id:
+        context["tenant_id"] = tenant_id
+    return context
+
+
 @app.post("/query")
 async def simple_query(request: Request):
     """
     Simple query endpoint for quick interactions
     
-    Accepts a plain text query and returns the result.
+    Accepts a plain text query and returns the result. The authenticated
+    caller's identity scopes the response cache.
     """
     try:
         body = await request.json()
@@ -430,7 +606,8 @@ async def simple_query(request: Request):
         task_request = AgentTaskRequest(
             task_id=generate_task_id("query"),
             action="process_query",
-            payload={"query": query}
+            payload={"query": query},
+            user_context=_caller_context(request, body.get("user_context"))
         )
         
         response = await execute_task(task_request)
@@ -447,6 +624,56 @@ async def simple_query(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Get response cache statistics
+    """
+    if not response_cache:
+        raise HTTPException(status_code=503, detail="Response cache not initialized")
+    return response_cache.get_stats()
+
+
+@app.get("/prefetch/stats")
+async def get_prefetch_stats():
+    """
+    Get speculative tool prefetch statistics per query class
+    """
+    if not react_engine:
+        raise HTTPException(status_code=503, detail="ReAct engine not initialized")
+    return {
+        "enabled": react_engine.prefetch.enabled,
+        "classes": react_engine.prefetch.get_stats()
+    }
+
+
+@app.post("/cache/invalidate")
+async def invalidate_cache(request: Request):
+    """
+    Invalidate cached query responses
+    
+    Accepts either a webhook event payload (``{"type": "ticket.updated", ...}``),
+    so the orchestrator can be registered as a webhook subscriber, or an explicit
+    ``{"agents": ["jira"]}`` selector. An empty body clears the whole cache.
+    """
+    if not response_cache:
+        raise HTTPException(status_code=503, detail="Response cache not initialized")
+    
+    try:
+        body = await request.json()
+    except Exception:
+        body = {}
+    
+    if body.get("type"):
+        invalidated = response_cache.invalidate_for_event(body["type"])
+    elif body.get("agents"):
+        invalidated = response_cache.invalidate(agent_types=body["agents"], reason="agent")
+    else:
+        invalidated = response_cache.invalidate(reason="manual")
+    
+    return {"status": "success", "invalidated": invalidated}
+
+
 @app.get("/memory/stats")
 async def get_memory_stats():
     """
@@ -456,7 +683,8 @@ async def get_memory_stats():
     
     return {
         "vector_memory": vector_stats,
-        "conversation_sessions": len(conversation_memory.conversations) if conversation_memory else 0
+        "write_queue": memory_writer.get_stats() if memory_writer else {},
+        "conversation_memory": await conversation_memory.get_stats() if conversation_memory else {}
     }
 
 
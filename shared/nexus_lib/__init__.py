@@ -36,6 +36,7 @@ from nexus_lib.schemas.agent_contract import (
     # Agent Protocol
     AgentTaskRequest,
     AgentTaskResponse,
+    ReActAction,
     ReActStep,
     ReActTrace,
     # Slack Models
@@ -55,6 +56,15 @@ from nexus_lib.middleware import (
     AuthMiddleware,
     RequestIdMiddleware,
     RateLimitMiddleware,
+    NexusMiddleware,
+    MiddlewareStage,
+    RequestIdStage,
+    MetricsStage,
+    AuthStage,
+    RateLimitStage,
+    RateLimit,
+    RateLimitResult,
+    TokenBucketLimiter,
 )
 
 from nexus_lib.instrumentation import (
@@ -63,6 +73,8 @@ from nexus_lib.instrumentation import (
     instrument_fastapi,
     instrument_httpx,
     track_llm_usage,
+    track_llm_stream,
+    LLMStreamTracker,
     track_tool_usage,
     track_react_loop,
     ReActTracker,
@@ -79,6 +91,11 @@ from nexus_lib.instrumentation import (
 
 from nexus_lib.utils import (
     AsyncHttpClient,
+    HttpPoolManager,
+    http_pool,
+    CircuitBreaker,
+    CircuitState,
+    RetryBudget,
     AgentRegistry,
     agent_registry,
     SimpleCache,
@@ -106,7 +123,9 @@ from nexus_lib.specialists import (
     SpecialistTool,
     SpecialistDefinition,
     SpecialistHealth,
+    ToolRoute,
     SpecialistRegistry,
+    compile_routes,
     specialist_registry,
     SPECIALIST_DEFINITIONS,
     get_healthy_specialists,
@@ -114,6 +133,14 @@ from nexus_lib.specialists import (
     get_specialist_for_tool,
 )
 
+from nexus_lib.jira import (
+    JiraTransport,
+    JiraAPIError,
+    JiraEntityCache,
+    jira_cache_for,
+    invalidate_jira_webhook,
+)
+
 __version__ = "2.3.0"
 __all__ = [
     # Version
@@ -151,6 +178,7 @@ __all__ = [
     # Agent Protocol
     "AgentTaskRequest",
     "AgentTaskResponse",
+    "ReActAction",
     "ReActStep",
     "ReActTrace",
     # Slack Models
@@ -168,12 +196,23 @@ __all__ = [
     "AuthMiddleware",
     "RequestIdMiddleware",
     "RateLimitMiddleware",
+    "NexusMiddleware",
+    "MiddlewareStage",
+    "RequestIdStage",
+    "MetricsStage",
+    "AuthStage",
+    "RateLimitStage",
+    "RateLimit",
+    "RateLimitResult",
+    "TokenBucketLimiter",
     # Instrumentation
     "setup_tracing",
     "get_tracer",
     "instrument_fastapi",
     "instrument_httpx",
     "track_llm_usage",
+    "track_llm_stream",
+    "LLMStreamTracker",
     "track_tool_usage",
     "track_react_loop",
     "ReActTracker",
@@ -188,6 +227,11 @@ __all__ = [
     "RELEASE_DECISIONS",
     # Utils
     "AsyncHttpClient",
+    "HttpPoolManager",
+    "http_pool",
+    "CircuitBreaker",
+    "CircuitState",
+    "RetryBudget",
     "AgentRegistry",
     "agent_registry",
     "SimpleCache",
@@ -213,11 +257,19 @@ __all__ = [
     "SpecialistTool",
     "SpecialistDefinition",
     "SpecialistHealth",
+    "ToolRoute",
     "SpecialistRegistry",
+    "compile_routes",
     "specialist_registry",
     "SPECIALIST_DEFINITIONS",
     "get_healthy_specialists",
     "is_specialist_available",
     "get_specialist_for_tool",
+    # Jira transport
+    "JiraTransport",
+    "JiraAPIError",
+    "JiraEntityCache",
+    "jira_cache_for",
+    "invalidate_jira_webhook",
 ]
 
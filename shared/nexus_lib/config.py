@@ -11,6 +11,7 @@ Features:
 - Mock mode toggle
 - Secure credential management
 - Connection pooling and caching
+- Process-local config snapshot with pub/sub invalidation
 
 Author: Nexus Team
 Version: 2.3.0
@@ -20,6 +21,7 @@ import asyncio
 import json
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union
@@ -139,6 +141,22 @@ ENV_VAR_MAPPING = {
     ConfigKeys.WEBHOOKS_URL: "WEBHOOKS_URL",
 }
 
+# Reverse index: environment variable name -> Redis key
+ENV_TO_KEY = {env_var: key for key, env_var in ENV_VAR_MAPPING.items()}
+
+# Namespace held in the process-local snapshot
+CONFIG_KEY_PREFIX = "nexus:config:"
+
+# Pub/sub channel ConfigManager writes are announced on
+CONFIG_CHANGES_CHANNEL = "nexus:events:config"
+
+# Keyspace notification patterns (catch writes made outside ConfigManager
+# when the server has notify-keyspace-events enabled)
+CONFIG_KEYSPACE_PATTERNS = (
+    f"__keyspace@*__:{CONFIG_KEY_PREFIX}*",
+    f"__keyspace@*__:{ConfigKeys.SYSTEM_MODE}",
+)
+
 # Keys that contain sensitive data (should be masked in UI)
 SENSITIVE_KEYS = {
     ConfigKeys.JIRA_API_TOKEN,
@@ -220,6 +238,13 @@ class ConfigManager:
     2. Environment variables (static configuration)
     3. Default values
     
+    The Redis layer for ``nexus:mode`` and ``nexus:config:*`` is held in a
+    process-local snapshot loaded with one SCAN + MGET. Writes made through
+    ConfigManager are published on ``CONFIG_CHANGES_CHANNEL`` and a background
+    listener applies them (and keyspace notifications, when enabled) to every
+    process's snapshot, so reads are dict lookups and mode switches propagate
+    immediately. Without a live listener the snapshot is reloaded every 30s.
+    
     Usage:
         # Get a configuration value
         jira_url = await ConfigManager.get("nexus:config:jira_url")
@@ -236,6 +261,16 @@ class ConfigManager:
     _cache_ttl: Dict[str, datetime] = {}
     _cache_duration = timedelta(seconds=30)
     
+    # Near cache of the Redis config namespace
+    _snapshot: Dict[str, str] = {}
+    _snapshot_loaded_at: Optional[float] = None
+    _snapshot_ttl = float(os.environ.get("CONFIG_SNAPSHOT_TTL", "300"))
+    _push_enabled = os.environ.get("CONFIG_PUSH_INVALIDATION", "true").lower() == "true"
+    _refresh_task: Optional[asyncio.Task] = None
+    _listener_task: Optional[asyncio.Task] = None
+    _listener_connected: bool = False
+    _snapshot_stats: Dict[str, int] = {"loads": 0, "invalidations": 0}
+    
     @classmethod
     async def get(
         cls,
@@ -254,23 +289,17 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
+        if use_cache and cls._in_snapshot(key):
+            await cls._ensure_snapshot()
+            return cls._resolve(key, cls._snapshot.get(key), default)
+        
         # Check cache first
         if use_cache and key in cls._cache:
             if datetime.now() < cls._cache_ttl.get(key, datetime.min):
                 return cls._cache[key]
         
         # Try Redis first
-        value = await cls._get_from_redis(key)
-        
-        if value is None:
-            # Fall back to environment variable
-            env_var = ENV_VAR_MAPPING.get(key)
-            if env_var:
-                value = os.environ.get(env_var)
-        
-        if value is None:
-            # Fall back to default
-            value = DEFAULT_CONFIG.get(key, default)
+        value = cls._resolve(key, await cls._get_from_redis(key), default)
         
         # Update cache
         if value is not None:
@@ -291,13 +320,7 @@ class ConfigManager:
         Returns:
             Configuration value or default
         """
-        # Find the Redis key for this env var
-        redis_key = None
-        for rkey, evar in ENV_VAR_MAPPING.items():
-            if evar == env_var:
-                redis_key = rkey
-                break
-        
+        redis_key = ENV_TO_KEY.get(env_var)
         if redis_key:
             return await cls.get(redis_key, default)
         
@@ -328,6 +351,9 @@ class ConfigManager:
                 # Update cache
                 cls._cache[key] = value
                 cls._cache_ttl[key] = datetime.now() + cls._cache_duration
+                if cls._in_snapshot(key):
+                    cls._snapshot[key] = value
+                await cls._publish_change(redis, [key])
                 
                 logger.info(f"Config updated: {cls._mask_key(key)}")
                 return True
@@ -344,6 +370,8 @@ class ConfigManager:
                 await redis.delete(key)
                 cls._cache.pop(key, None)
                 cls._cache_ttl.pop(key, None)
+                cls._snapshot.pop(key, None)
+                await cls._publish_change(redis, [key])
                 return True
         except Exception as e:
             logger.error(f"Failed to delete config {key}: {e}")
@@ -365,7 +393,7 @@ class ConfigManager:
         try:
             redis = await RedisConnection().get_client()
             if redis:
-                keys = await redis.keys(pattern)
+                keys = [key async for key in redis.scan_iter(match=pattern, count=500)]
                 if keys:
                     values = await redis.mget(keys)
                     for key, value in zip(keys, values):
@@ -400,6 +428,9 @@ class ConfigManager:
                 for key, value in config.items():
                     cls._cache[key] = value
                     cls._cache_ttl[key] = datetime.now() + cls._cache_duration
+                    if cls._in_snapshot(key):
+                        cls._snapshot[key] = value
+                await cls._publish_change(redis, list(config.keys()))
                 
                 return True
         except Exception as e:
@@ -442,6 +473,182 @@ class ConfigManager:
         """Clear the configuration cache."""
         cls._cache.clear()
         cls._cache_ttl.clear()
+        cls._snapshot = {}
+        cls._snapshot_loaded_at = None
+    
+    # -------------------------------------------------------------------------
+    # Snapshot (near cache)
+    # -------------------------------------------------------------------------
+    
+    @classmethod
+    def _in_snapshot(cls, key: str) -> bool:
+        """Whether a key is served from the snapshot."""
+        return key == ConfigKeys.SYSTEM_MODE or key.startswith(CONFIG_KEY_PREFIX)
+    
+    @classmethod
+    def _resolve(cls, key: str, redis_value: Optional[str], default: Optional[str]) -> Optional[str]:
+        """Apply the Redis -> environment -> default priority."""
+        if redis_value is not None:
+            return redis_value
+        env_var = ENV_VAR_MAPPING.get(key)
+        if env_var:
+            value = os.environ.get(env_var)
+            if value is not None:
+                return value
+        return DEFAULT_CONFIG.get(key, default)
+    
+    @classmethod
+    def _snapshot_fresh(cls) -> bool:
+        if cls._snapshot_loaded_at is None:
+            return False
+        max_age = cls._snapshot_ttl if cls._listener_connected else cls._cache_duration.total_seconds()
+        return time.monotonic() - cls._snapshot_loaded_at < max_age
+    
+    @classmethod
+    async def _ensure_snapshot(cls):
+        """Load the snapshot if it is missing or stale (one load per process at a time)."""
+        if cls._snapshot_fresh():
+            return
+        loop = asyncio.get_running_loop()
+        task = cls._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = cls._refresh_task = loop.create_task(cls._load_snapshot())
+        await asyncio.shield(task)
+    
+    @classmethod
+    async def _load_snapshot(cls):
+        """Read the whole config namespace with one SCAN + MGET."""
+        snapshot: Dict[str, str] = {}
+        redis = None
+        try:
+            redis = await RedisConnection().get_client()
+            if redis:
+                keys = [key async for key in redis.scan_iter(match=f"{CONFIG_KEY_PREFIX}*", count=500)]
+                keys.append(ConfigKeys.SYSTEM_MODE)
+                values = await redis.mget(keys)
+                snapshot = {key: value for key, value in zip(keys, values) if value is not None}
+        except Exception as e:
+            logger.warning(f"Config snapshot load failed: {e}")
+            redis = None
+        
+        # Without Redis the empty snapshot still caches the miss for one short
+        # interval, so env/default reads do not retry the connection each call
+        cls._snapshot = snapshot
+        cls._snapshot_loaded_at = time.monotonic()
+        cls._snapshot_stats["loads"] += 1
+        
+        if redis and cls._push_enabled:
+            cls._start_listener()
+    
+    @classmethod
+    def _start_listener(cls):
+        """Start the invalidation listener on the running loop if it is not already running."""
+        loop = asyncio.get_running_loop()
+        task = cls._listener_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        cls._listener_task = loop.create_task(cls._listen())
+    
+    @classmethod
+    async def _listen(cls):
+        """Apply published config changes and keyspace notifications to the snapshot."""
+        backoff = 1.0
+        while True:
+            pubsub = None
+            try:
+                redis = await RedisConnection().get_client()
+                if not redis:
+                    raise ConnectionError("Redis unavailable")
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(CONFIG_CHANGES_CHANNEL)
+                await pubsub.psubscribe(*CONFIG_KEYSPACE_PATTERNS)
+                cls._listener_connected = True
+                backoff = 1.0
+                logger.info("Config invalidation listener subscribed")
+                
+                while True:
+                    # Poll below the client's socket timeout so an idle channel is not an error
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message:
+                        await cls._handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Config invalidation listener error: {e}")
+            finally:
+                # Changes may be missed while disconnected: fall back to short reloads
+                cls._listener_connected = False
+                cls._snapshot_loaded_at = None
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+            
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+    
+    @classmethod
+    async def _handle_message(cls, message: Dict[str, Any]):
+        """Refresh the keys named by a pub/sub or keyspace message."""
+        if message.get("type") == "message":
+            try:
+                keys = json.loads(message["data"]).get("keys", [])
+            except (TypeError, ValueError):
+                return
+        elif message.get("type") == "pmessage":
+            keys = [message["channel"].split("__:", 1)[-1]]
+        else:
+            return
+        
+        keys = [key for key in keys if cls._in_snapshot(key)]
+        if not keys:
+            return
+        
+        redis = await RedisConnection().get_client()
+        if not redis:
+            cls._snapshot_loaded_at = None
+            return
+        values = await redis.mget(keys)
+        for key, value in zip(keys, values):
+            if value is None:
+                cls._snapshot.pop(key, None)
+            else:
+                cls._snapshot[key] = value
+            cls._cache.pop(key, None)
+        cls._snapshot_stats["invalidations"] += 1
+    
+    @classmethod
+    async def _publish_change(cls, redis, keys: List[str]):
+        """Announce changed keys to other processes."""
+        try:
+            await redis.publish(CONFIG_CHANGES_CHANNEL, json.dumps({"keys": keys}))
+        except Exception as e:
+            logger.debug(f"Config change publish failed: {e}")
+    
+    @classmethod
+    async def stop_listener(cls):
+        """Stop the invalidation listener (call on shutdown)."""
+        task, cls._listener_task = cls._listener_task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+    
+    @classmethod
+    def get_snapshot_stats(cls) -> Dict[str, Any]:
+        """Get near-cache statistics."""
+        return {
+            "keys": len(cls._snapshot),
+            "age_seconds": (
+                round(time.monotonic() - cls._snapshot_loaded_at, 2)
+                if cls._snapshot_loaded_at is not None else None
+            ),
+            "push_invalidation": cls._listener_connected,
+            **cls._snapshot_stats
+        }
     
     @classmethod
     async def _get_from_redis(cls, key: str) -> Optional[str]:
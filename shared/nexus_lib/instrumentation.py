@@ -113,6 +113,106 @@ REACT_STEP_DURATION = Histogram(
     buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
 )
 
+RESPONSE_CACHE_REQUESTS = Counter(
+    'nexus_response_cache_requests_total',
+    'Orchestrator response cache lookups',
+    ['task_type', 'result']  # result = hit, semantic_hit, miss
+)
+
+RESPONSE_CACHE_INVALIDATIONS = Counter(
+    'nexus_response_cache_invalidations_total',
+    'Orchestrator response cache entries invalidated',
+    ['reason']  # event, agent, manual, ttl, evicted
+)
+
+RESPONSE_CACHE_ENTRIES = Gauge(
+    'nexus_response_cache_entries',
+    'Number of entries in the orchestrator response cache'
+)
+
+MEMORY_WRITES_TOTAL = Counter(
+    'nexus_memory_writes_total',
+    'Write-behind memory documents by outcome',
+    ['result']  # written, failed, dropped
+)
+
+MEMORY_WRITE_QUEUE_DEPTH = Gauge(
+    'nexus_memory_write_queue_depth',
+    'Documents waiting in the write-behind memory queue'
+)
+
+MEMORY_WRITE_BATCH_SIZE = Histogram(
+    'nexus_memory_write_batch_size',
+    'Documents per write-behind memory flush',
+    buckets=[1, 2, 5, 10, 20, 50, 100, 200]
+)
+
+TOOL_PREFETCH_TOTAL = Counter(
+    'nexus_tool_prefetch_total',
+    'Speculatively prefetched ReAct tool calls by outcome',
+    ['task_type', 'result']  # prefetched, hit, wasted
+)
+
+HTTP_POOL_REQUESTS = Counter(
+    'nexus_http_pool_requests_total',
+    'Requests sent through the shared HTTP connection pools',
+    ['host']
+)
+
+HTTP_POOL_IN_FLIGHT = Gauge(
+    'nexus_http_pool_in_flight',
+    'Requests currently using a shared HTTP connection pool',
+    ['host']
+)
+
+CIRCUIT_BREAKER_STATE = Gauge(
+    'nexus_circuit_breaker_state',
+    'Per-host circuit breaker state (0=closed, 1=half_open, 2=open)',
+    ['host']
+)
+
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    'nexus_circuit_breaker_transitions_total',
+    'Circuit breaker state transitions',
+    ['host', 'state']
+)
+
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    'nexus_circuit_breaker_rejections_total',
+    'Requests rejected because the circuit was open',
+    ['host']
+)
+
+HTTP_RETRIES_TOTAL = Counter(
+    'nexus_http_retries_total',
+    'HTTP retry decisions per host',
+    ['host', 'result']  # retried, budget_exhausted
+)
+
+CACHE_REQUESTS_TOTAL = Counter(
+    'nexus_cache_requests_total',
+    'In-process cache lookups (nexus_lib SimpleCache / @cached)',
+    ['cache', 'result']  # hit, stale, miss
+)
+
+CACHE_EVICTIONS_TOTAL = Counter(
+    'nexus_cache_evictions_total',
+    'In-process cache entries evicted',
+    ['cache', 'reason']  # size, expired
+)
+
+JIRA_CACHE_REQUESTS = Counter(
+    'nexus_jira_cache_requests_total',
+    'Shared Jira entity cache lookups',
+    ['entity', 'result']  # l1_hit, l2_hit, revalidated, coalesced, miss
+)
+
+JIRA_CACHE_INVALIDATIONS = Counter(
+    'nexus_jira_cache_invalidations_total',
+    'Shared Jira entity cache invalidations',
+    ['source']  # webhook, write
+)
+
 
 # ============================================================================
 # PROMETHEUS METRICS - Business Metrics
@@ -327,43 +427,14 @@ def track_llm_usage(model_name: str = "gemini-2.5-flash"):
                             input_tokens = input_tokens or usage.get("prompt_tokens", 0)
                             output_tokens = output_tokens or usage.get("completion_tokens", 0)
                     
-                    # Calculate metrics
-                    duration = time.perf_counter() - start_time
-                    estimated_cost = estimate_llm_cost(model_name, input_tokens, output_tokens)
-                    tokens_per_second = output_tokens / duration if duration > 0 else 0
-                    
-                    # Record Prometheus metrics
-                    LLM_TOKENS_TOTAL.labels(model_name=model_name, type="input").inc(input_tokens)
-                    LLM_TOKENS_TOTAL.labels(model_name=model_name, type="output").inc(output_tokens)
-                    LLM_LATENCY.labels(model_name=model_name).observe(duration)
-                    LLM_COST_TOTAL.labels(model_name=model_name).inc(estimated_cost)
-                    LLM_REQUESTS_TOTAL.labels(model_name=model_name, status="success").inc()
-                    LLM_TOKEN_GENERATION_SPEED.labels(model_name=model_name).observe(tokens_per_second)
-                    
-                    # Add span attributes
-                    span.set_attribute("llm.input_tokens", input_tokens)
-                    span.set_attribute("llm.output_tokens", output_tokens)
-                    span.set_attribute("llm.total_tokens", input_tokens + output_tokens)
-                    span.set_attribute("llm.latency_seconds", duration)
-                    span.set_attribute("llm.estimated_cost_usd", estimated_cost)
-                    span.set_attribute("llm.tokens_per_second", tokens_per_second)
+                    usage = _record_llm_usage(
+                        span, model_name, input_tokens, output_tokens,
+                        time.perf_counter() - start_time
+                    )
                     
                     # Attach usage info to result if dict
                     if isinstance(result, dict):
-                        result["_llm_usage"] = LLMUsage(
-                            model_name=model_name,
-                            input_tokens=input_tokens,
-                            output_tokens=output_tokens,
-                            total_tokens=input_tokens + output_tokens,
-                            latency_seconds=duration,
-                            estimated_cost=estimated_cost,
-                            tokens_per_second=tokens_per_second
-                        )
-                    
-                    logger.debug(
-                        f"LLM call: model={model_name}, tokens={input_tokens}+{output_tokens}, "
-                        f"latency={duration:.2f}s, cost=${estimated_cost:.6f}"
-                    )
+                        result["_llm_usage"] = usage
                     
                     return result
                     
@@ -399,6 +470,110 @@ def track_llm_usage(model_name: str = "gemini-2.5-flash"):
     return decorator
 
 
+def _record_llm_usage(
+    span,
+    model_name: str,
+    input_tokens: int,
+    output_tokens: int,
+    duration: float
+) -> LLMUsage:
+    """Record metrics and span attributes for a successful LLM call"""
+    estimated_cost = estimate_llm_cost(model_name, input_tokens, output_tokens)
+    tokens_per_second = output_tokens / duration if duration > 0 else 0
+    
+    # Record Prometheus metrics
+    LLM_TOKENS_TOTAL.labels(model_name=model_name, type="input").inc(input_tokens)
+    LLM_TOKENS_TOTAL.labels(model_name=model_name, type="output").inc(output_tokens)
+    LLM_LATENCY.labels(model_name=model_name).observe(duration)
+    LLM_COST_TOTAL.labels(model_name=model_name).inc(estimated_cost)
+    LLM_REQUESTS_TOTAL.labels(model_name=model_name, status="success").inc()
+    LLM_TOKEN_GENERATION_SPEED.labels(model_name=model_name).observe(tokens_per_second)
+    
+    # Add span attributes
+    span.set_attribute("llm.input_tokens", input_tokens)
+    span.set_attribute("llm.output_tokens", output_tokens)
+    span.set_attribute("llm.total_tokens", input_tokens + output_tokens)
+    span.set_attribute("llm.latency_seconds", duration)
+    span.set_attribute("llm.estimated_cost_usd", estimated_cost)
+    span.set_attribute("llm.tokens_per_second", tokens_per_second)
+    
+    logger.debug(
+        f"LLM call: model={model_name}, tokens={input_tokens}+{output_tokens}, "
+        f"latency={duration:.2f}s, cost=${estimated_cost:.6f}"
+    )
+    
+    return LLMUsage(
+        model_name=model_name,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        total_tokens=input_tokens + output_tokens,
+        latency_seconds=duration,
+        estimated_cost=estimated_cost,
+        tokens_per_second=tokens_per_second
+    )
+
+
+@contextmanager
+def track_llm_stream(model_name: str = "gemini-2.5-flash"):
+    """
+    Context manager to track a streamed LLM call
+    
+    Records the same span and metrics as ``track_llm_usage`` once the
+    stream has been consumed and its token counts are known.
+    
+    Usage:
+        with track_llm_stream("gemini-2.5-flash") as tracker:
+            async for chunk in client.stream(prompt):
+                ...
+            tracker.record(input_tokens, output_tokens)
+    """
+    tracker = LLMStreamTracker(model_name)
+    try:
+        yield tracker
+    except Exception as e:
+        tracker.fail(e)
+        raise
+    finally:
+        tracker.finalize()
+
+
+class LLMStreamTracker:
+    """Helper class for tracking a streamed LLM call"""
+    
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.start_time = time.perf_counter()
+        self.usage: Optional[LLMUsage] = None
+        self.status = "cancelled"
+        # Not made current: the stream may be resumed from other contexts
+        self.span = get_tracer("llm").start_span(
+            "llm.stream",
+            kind=SpanKind.CLIENT,
+            attributes={"llm.model": model_name}
+        )
+    
+    def record(self, input_tokens: int, output_tokens: int) -> LLMUsage:
+        """Record usage for a stream that completed"""
+        self.status = "success"
+        self.usage = _record_llm_usage(
+            self.span, self.model_name, input_tokens, output_tokens,
+            time.perf_counter() - self.start_time
+        )
+        return self.usage
+    
+    def fail(self, error: Exception):
+        """Record a stream that failed"""
+        self.status = "error"
+        LLM_REQUESTS_TOTAL.labels(model_name=self.model_name, status="error").inc()
+        self.span.set_status(Status(StatusCode.ERROR, str(error)))
+        self.span.record_exception(error)
+    
+    def finalize(self):
+        """End the span"""
+        self.span.set_attribute("llm.status", self.status)
+        self.span.end()
+
+
 def asyncio_iscoroutinefunction(func):
     """Check if function is async"""
     import asyncio
@@ -0,0 +1,953 @@
+"""
+Nexus Jira Transport
+Non-blocking Jira REST client on the shared HTTP connection pool
+
+``atlassian.Jira`` is synchronous: calling it from an ``async def`` handler
+stalls the whole event loop for the duration of the HTTP round-trip. This
+transport talks to the Jira REST API (v2 or v3) through the pooled
+``httpx.AsyncClient`` for the Jira host, so concurrent requests overlap and
+share keep-alive connections, with a per-transport cap on requests in flight.
+
+``JiraEntityCache`` is a read-through cache for Jira entities (issues, search
+results, transitions) shared by every service that talks to the same Jira
+site: an in-process L1 in front of Redis, invalidated by Jira webhooks and
+revalidated with ETag / ``updated`` checks.
+"""
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Awaitable, Tuple, Hashable
+
+import httpx
+
+from nexus_lib.utils import http_pool, HttpPoolManager, SimpleCache, describe_transport_error
+from nexus_lib.instrumentation import JIRA_CACHE_REQUESTS, JIRA_CACHE_INVALIDATIONS
+
+logger = logging.getLogger("nexus.jira")
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Maximum Jira requests in flight per transport
+JIRA_MAX_CONCURRENCY = int(os.environ.get("JIRA_MAX_CONCURRENCY", "8"))
+
+# REST API version ("2" returns plain-text descriptions, "3" returns ADF)
+JIRA_API_VERSION = os.environ.get("JIRA_API_VERSION", "2")
+
+# Per-request timeout (seconds)
+JIRA_TIMEOUT = float(os.environ.get("JIRA_TIMEOUT", "30"))
+
+# Attempts for rate-limited (429) or unavailable (503) responses
+JIRA_MAX_RETRIES = int(os.environ.get("JIRA_MAX_RETRIES", "3"))
+
+# Issues requested per search page when paginating
+JIRA_SEARCH_PAGE_SIZE = int(os.environ.get("JIRA_SEARCH_PAGE_SIZE", "100"))
+
+# Statuses worth retrying after a pause (Retry-After is honoured)
+RETRYABLE_STATUSES = {429, 503}
+
+# Shared entity cache (issues, searches, transitions)
+JIRA_CACHE_ENABLED = os.environ.get("JIRA_CACHE_ENABLED", "true").lower() == "true"
+
+# Redis (L2) lifetime of cached issues and searches (seconds)
+JIRA_CACHE_TTL = int(os.environ.get("JIRA_CACHE_TTL", "600"))
+
+# In-process (L1) lifetime (seconds)
+JIRA_CACHE_L1_TTL = float(os.environ.get("JIRA_CACHE_L1_TTL", "30"))
+
+# Age after which a cached issue is revalidated with Jira before use (seconds)
+JIRA_CACHE_REVALIDATE_AFTER = float(os.environ.get("JIRA_CACHE_REVALIDATE_AFTER", "60"))
+
+# Lifetime of cached workflow transitions (seconds)
+JIRA_CACHE_TRANSITIONS_TTL = int(os.environ.get("JIRA_CACHE_TRANSITIONS_TTL", "3600"))
+
+# How often invalidation generations are re-read from Redis (seconds)
+JIRA_CACHE_GENERATION_TTL = float(os.environ.get("JIRA_CACHE_GENERATION_TTL", "5"))
+
+
+class JiraAPIError(Exception):
+    """Jira returned an error response"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None, response: Optional[Any] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+# =============================================================================
+# ASYNC JIRA TRANSPORT
+# =============================================================================
+
+class JiraTransport:
+    """
+    Async Jira REST client.
+
+    Requests go through the process-wide ``http_pool`` client for the Jira
+    origin, so they share connections, circuit state and passive host health
+    with every other caller. A semaphore (per event loop) caps requests in
+    flight so one burst of work cannot trip Jira's rate limits.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        username: str,
+        api_token: str,
+        api_version: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        pool: Optional[HttpPoolManager] = None,
+        cache: Optional["JiraEntityCache"] = None
+    ):
+        """
+        Initialize the transport
+
+        Args:
+            base_url: Jira site URL (e.g. https://your-org.atlassian.net)
+            username: Account email/username
+            api_token: API token (basic auth password)
+            api_version: REST API version, "2" or "3" (defaults to JIRA_API_VERSION)
+            max_concurrency: Requests in flight (defaults to JIRA_MAX_CONCURRENCY)
+            timeout: Per-request timeout in seconds (defaults to JIRA_TIMEOUT)
+            max_retries: Attempts for 429/503 responses (defaults to JIRA_MAX_RETRIES)
+            pool: Connection pool manager (defaults to the shared ``http_pool``)
+            cache: Entity cache for reads (e.g. ``jira_cache_for(base_url)``); uncached if None
+        """
+        self.base_url = base_url.rstrip("/")
+        self.api_version = str(api_version or JIRA_API_VERSION)
+        self.api_root = f"{self.base_url}/rest/api/{self.api_version}"
+        self.max_concurrency = max_concurrency or JIRA_MAX_CONCURRENCY
+        self.timeout = timeout or JIRA_TIMEOUT
+        self.max_retries = max(1, max_retries or JIRA_MAX_RETRIES)
+        self.pool = pool or http_pool
+        self.origin = self.pool.origin(self.base_url)
+        self.cache = cache
+
+        self._auth = httpx.BasicAuth(username, api_token)
+        self._headers = {"Accept": "application/json", "User-Agent": "Nexus-Jira/1.0"}
+        self._semaphores: Dict[Any, asyncio.Semaphore] = {}
+        self._stats = {"requests": 0, "retries": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Concurrency cap for the running event loop"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            for stale in [loop for loop in self._semaphores if loop.is_closed()]:
+                del self._semaphores[stale]
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Any] = None
+    ) -> Any:
+        """
+        Make a Jira REST call
+
+        Args:
+            method: HTTP method
+            path: Path under /rest/api/<version> (e.g. "/issue/PROJ-1")
+            params: Query parameters
+            json_body: JSON body
+
+        Returns:
+            Decoded JSON response (None for empty bodies)
+
+        Raises:
+            JiraAPIError: On 4xx/5xx responses (after retrying 429/503)
+        """
+        response = await self.send(method, path, params=params, json_body=json_body)
+        if not response.content:
+            return None
+        return response.json()
+
+    async def send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """
+        Make a Jira REST call and return the raw response (304 included)
+
+        Raises:
+            JiraAPIError: On 4xx/5xx responses (after retrying 429/503)
+        """
+        url = f"{self.api_root}{path}"
+        request_headers = {**self._headers, **headers} if headers else self._headers
+
+        async with self._semaphore():
+            for attempt in range(1, self.max_retries + 1):
+                response = await self._send(method, url, params, json_body, request_headers)
+                if response.status_code not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                    break
+                delay = self._retry_delay(response, attempt)
+                self._stats["retries"] += 1
+                logger.warning(f"Jira {response.status_code} on {method} {path}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        if response.status_code >= 400:
+            self._stats["errors"] += 1
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text[:500]
+            raise JiraAPIError(
+                f"Jira API error {response.status_code} on {method} {path}",
+                status_code=response.status_code,
+                response=body
+            )
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_body: Optional[Any],
+        headers: Dict[str, str]
+    ) -> httpx.Response:
+        """One HTTP round-trip, recorded in the pool's host stats"""
+        self._stats["requests"] += 1
+        self._stats["in_flight"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+        self.pool.request_started(self.origin)
+        started = time.perf_counter()
+        try:
+            response = await self.pool.get_client(url).request(
+                method.upper(),
+                url,
+                params=params,
+                json=json_body,
+                headers=headers,
+                auth=self._auth,
+                timeout=self.timeout
+            )
+        except Exception as e:
+            self.pool.request_finished(
+                self.origin,
+                error=True,
+                latency=time.perf_counter() - started,
+                detail=describe_transport_error(e)
+            )
+            raise
+        except BaseException:
+            # Cancelled: no outcome to record, but the request has left the pool
+            self.pool.request_finished(self.origin)
+            raise
+        finally:
+            self._stats["in_flight"] -= 1
+
+        server_error = response.status_code >= 500
+        self.pool.request_finished(
+            self.origin,
+            error=server_error,
+            latency=time.perf_counter() - started,
+            detail=f"HTTP {response.status_code}" if server_error else None
+        )
+        return response
+
+    @staticmethod
+    def _retry_delay(response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After if given, else exponential"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), 30.0)
+            except ValueError:
+                pass
+        return min(0.5 * 2 ** (attempt - 1), 8.0)
+
+    # -------------------------------------------------------------------------
+    # Issues
+    # -------------------------------------------------------------------------
+
+    async def get_issue(
+        self,
+        key: str,
+        expand: Optional[str] = None,
+        fields: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Fetch one issue (through the entity cache when configured)"""
+        params = {}
+        if expand:
+            params["expand"] = expand
+        if fields:
+            params["fields"] = fields
+        if self.cache is None:
+            return await self.request("GET", f"/issue/{key}", params=params or None)
+        return await self.cache.get_issue(
+            key,
+            loader=lambda: self._load_issue(key, params),
+            variant=f"{expand or ''}|{fields or ''}",
+            revalidate=lambda issue, etag: self._issue_unchanged(key, issue, etag)
+        )
+
+    async def _load_issue(self, key: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Fetch an issue with its ETag"""
+        response = await self.send("GET", f"/issue/{key}", params=params or None)
+        return response.json(), response.headers.get("ETag")
+
+    async def _issue_unchanged(self, key: str, issue: Dict[str, Any], etag: Optional[str]) -> bool:
+        """
+        Whether a cached copy of an issue is still current
+
+        Sends If-None-Match when an ETag is known; otherwise (or if Jira
+        ignores it) compares the issue's ``updated`` timestamp, fetching
+        only that field.
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        response = await self.send("GET", f"/issue/{key}", params={"fields": "updated"}, headers=headers)
+        if response.status_code == 304:
+            return True
+        cached_updated = (issue.get("fields") or {}).get("updated")
+        return cached_updated is not None and cached_updated == response.json().get("fields", {}).get("updated")
+
+    async def update_issue(self, key: str, fields: Dict[str, Any]):
+        """Set fields on an issue"""
+        await self.request("PUT", f"/issue/{key}", json_body={"fields": fields})
+        await self._invalidate(key)
+
+    async def get_transitions(self, key: str) -> List[Dict[str, Any]]:
+        """
+        Transitions currently available for an issue
+
+        With a cache, transitions are shared by every issue with the same
+        project, issue type and status (they come from the workflow).
+        """
+        if self.cache is None:
+            return await self._load_transitions(key)
+        fields = (await self.get_issue(key, fields="project,issuetype,status,updated")).get("fields", {})
+        return await self.cache.get_transitions(
+            (fields.get("project") or {}).get("key") or key.rsplit("-", 1)[0],
+            (fields.get("issuetype") or {}).get("name", ""),
+            (fields.get("status") or {}).get("name", ""),
+            loader=lambda: self._load_transitions(key)
+        )
+
+    async def _load_transitions(self, key: str) -> List[Dict[str, Any]]:
+        result = await self.request("GET", f"/issue/{key}/transitions")
+        return (result or {}).get("transitions", [])
+
+    async def transition_issue(self, key: str, transition_id: str):
+        """Move an issue through a workflow transition"""
+        await self.request("POST", f"/issue/{key}/transitions", json_body={"transition": {"id": str(transition_id)}})
+        await self._invalidate(key)
+
+    async def add_comment(self, key: str, body: str) -> Dict[str, Any]:
+        """Add a plain-text comment (wrapped in ADF for API v3)"""
+        if self.api_version == "3":
+            payload = {
+                "body": {
+                    "type": "doc",
+                    "version": 1,
+                    "content": [{"type": "paragraph", "content": [{"type": "text", "text": body}]}]
+                }
+            }
+        else:
+            payload = {"body": body}
+        result = await self.request("POST", f"/issue/{key}/comment", json_body=payload)
+        await self._invalidate(key)
+        return result
+
+    async def _invalidate(self, key: str):
+        """Drop cached data for an issue this transport just changed"""
+        if self.cache is not None:
+            await self.cache.invalidate_issue(key, source="write")
+
+    # -------------------------------------------------------------------------
+    # Search
+    # -------------------------------------------------------------------------
+
+    async def search(
+        self,
+        jql: str,
+        start_at: int = 0,
+        max_results: int = 50,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """One page of JQL search results (``total``, ``startAt``, ``issues``...)"""
+        params: Dict[str, Any] = {"jql": jql, "startAt": start_at, "maxResults": max_results}
+        if fields:
+            params["fields"] = fields
+        if expand:
+            params["expand"] = expand
+        if self.cache is None:
+            return await self.request("GET", "/search", params=params) or {}
+
+        async def load():
+            return await self.request("GET", "/search", params=params) or {}
+
+        return await self.cache.get_search(jql, loader=load, variant=f"{start_at}|{max_results}|{fields}|{expand}")
+
+    async def iter_search_pages(
+        self,
+        jql: str,
+        fields: Optional[str] = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Page through every result of a JQL search.
+
+        The first page reports ``total``; the remaining pages are then
+        requested concurrently (bounded by the transport's concurrency cap)
+        and yielded in order.
+
+        Args:
+            jql: JQL query
+            fields: Comma-separated fields to return (keep it narrow)
+            page_size: Issues per page (defaults to JIRA_SEARCH_PAGE_SIZE)
+            limit: Stop after this many issues
+
+        Yields:
+            Lists of raw issue dicts, one per page
+        """
+        page_size = page_size or JIRA_SEARCH_PAGE_SIZE
+        if limit is not None:
+            page_size = min(page_size, limit)
+
+        first = await self.search(jql, start_at=0, max_results=page_size, fields=fields)
+        issues = first.get("issues", [])
+        # Jira may cap maxResults below what was asked for
+        page_size = first.get("maxResults") or page_size
+        total = first.get("total", len(issues))
+        if limit is not None:
+            total = min(total, limit)
+        yield issues[:total]
+
+        if len(issues) >= total or not issues:
+            return
+
+        tasks = [
+            asyncio.ensure_future(self.search(jql, start_at=start, max_results=page_size, fields=fields))
+            for start in range(len(issues), total, page_size)
+        ]
+        try:
+            fetched = len(issues)
+            for task in tasks:
+                page = (await task).get("issues", [])
+                yield page[:total - fetched]
+                fetched += len(page)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def search_all(
+        self,
+        jql: str,
+        fields: Optional[str] = None,
+        page_size: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Every issue matching ``jql`` (see ``iter_search_pages``)"""
+        issues: List[Dict[str, Any]] = []
+        async for page in self.iter_search_pages(jql, fields=fields, page_size=page_size, limit=limit):
+            issues.extend(page)
+        return issues
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Request counters for this transport"""
+        return {
+            "origin": self.origin,
+            "api_version": self.api_version,
+            "max_concurrency": self.max_concurrency,
+            **self._stats
+        }
+
+
+# =============================================================================
+# SHARED ENTITY CACHE
+# =============================================================================
+
+# Project clauses of a JQL query ("project = X", "project in (X, Y)")
+_JQL_PROJECT_EQ = re.compile(r'\bproject\s*=\s*["\']?([A-Za-z][A-Za-z0-9_]*)', re.IGNORECASE)
+_JQL_PROJECT_IN = re.compile(r'\bproject\s+in\s*\(([^)]*)\)', re.IGNORECASE)
+_JQL_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+_JQL_OR = re.compile(r'\bOR\b|\|\|', re.IGNORECASE)
+_JQL_NOT = re.compile(r'(?:\bNOT|!)\s*$', re.IGNORECASE)
+_JQL_ORDER_BY = re.compile(r'\bORDER\s+BY\b', re.IGNORECASE)
+
+# Generation bumped by every invalidation (searches that name no project)
+_ANY = "*"
+# Generation bumped by sprint events (part of every search key)
+_SPRINTS = "~sprint"
+
+
+def jql_projects(jql: str) -> List[str]:
+    """
+    Project keys a JQL query is confined to (empty if it may match any project)
+
+    Only a top-level ``project = X`` / ``project in (...)`` clause in a pure
+    conjunction confines a query. A top-level OR can add issues from other
+    projects, and issue-key clauses such as ``parent in (EPIC-1)`` match
+    children in any project, so neither scopes the query.
+    """
+    # Blank out string literals (keeping offsets) so their contents are not parsed
+    masked = _JQL_QUOTED.sub(lambda m: "_" * len(m.group()), jql)
+    order_by = _JQL_ORDER_BY.search(masked)
+    if order_by:
+        masked = masked[:order_by.start()]
+
+    depth, depths = 0, []
+    for char in masked:
+        if char == ")":
+            depth -= 1
+        depths.append(depth)
+        if char == "(":
+            depth += 1
+
+    if any(depths[m.start()] == 0 for m in _JQL_OR.finditer(masked)):
+        return []
+
+    def top_level(match) -> bool:
+        return (
+            masked[match.start():match.start() + 7].lower() == "project"
+            and depths[match.start()] == 0
+            and not _JQL_NOT.search(masked[:match.start()])
+        )
+
+    projects = {m.group(1).upper() for m in _JQL_PROJECT_EQ.finditer(jql) if top_level(m)}
+    for m in _JQL_PROJECT_IN.finditer(jql):
+        if top_level(m):
+            projects.update(p.strip().strip("\"'").upper() for p in m.group(1).split(",") if p.strip())
+    return sorted(projects)
+
+
+class JiraEntityCache:
+    """
+    Read-through cache for one Jira site, shared across services.
+
+    Lookups go L1 (in-process ``SimpleCache``) -> L2 (Redis, keys prefixed
+    ``nexus:jira:<site>:``) -> Jira. Invalidation is generational: a webhook
+    or a write bumps the issue's project generation in Redis, and every
+    cache key embeds the generations it depends on, so each process stops
+    using stale entries within ``generation_ttl`` without any fan-out.
+
+    Issues older than ``revalidate_after`` are checked with Jira (ETag or
+    ``updated``) before being served, which bounds staleness when a webhook
+    is missed. Searches rely on generations and TTL only. Concurrent misses
+    for the same key share a single load. Without Redis the cache runs on
+    L1 alone and re-tries Redis after ``redis_retry_seconds``.
+    """
+
+    def __init__(
+        self,
+        site: str,
+        enabled: Optional[bool] = None,
+        ttl: Optional[int] = None,
+        l1_ttl: Optional[float] = None,
+        revalidate_after: Optional[float] = None,
+        transitions_ttl: Optional[int] = None,
+        generation_ttl: Optional[float] = None,
+        redis_retry_seconds: float = 30.0
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            site: Jira host (e.g. your-org.atlassian.net), used to namespace keys
+            enabled: Serve from cache (defaults to JIRA_CACHE_ENABLED)
+            ttl: L2 lifetime in seconds (defaults to JIRA_CACHE_TTL)
+            l1_ttl: L1 lifetime in seconds (defaults to JIRA_CACHE_L1_TTL)
+            revalidate_after: Issue age that triggers revalidation (defaults to JIRA_CACHE_REVALIDATE_AFTER)
+            transitions_ttl: Transitions lifetime (defaults to JIRA_CACHE_TRANSITIONS_TTL)
+            generation_ttl: Generation refresh interval (defaults to JIRA_CACHE_GENERATION_TTL)
+            redis_retry_seconds: How long to stay on L1 only after a Redis error
+        """
+        self.site = site
+        self.enabled = JIRA_CACHE_ENABLED if enabled is None else enabled
+        self.ttl = ttl or JIRA_CACHE_TTL
+        self.l1_ttl = l1_ttl if l1_ttl is not None else JIRA_CACHE_L1_TTL
+        self.revalidate_after = revalidate_after if revalidate_after is not None else JIRA_CACHE_REVALIDATE_AFTER
+        self.transitions_ttl = transitions_ttl or JIRA_CACHE_TRANSITIONS_TTL
+        self.generation_ttl = generation_ttl if generation_ttl is not None else JIRA_CACHE_GENERATION_TTL
+        self.redis_retry_seconds = redis_retry_seconds
+        self.prefix = f"nexus:jira:{site}:"
+
+        self._l1 = SimpleCache(default_ttl=int(self.l1_ttl) or 1, name="jira_l1")
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        # Shared generations (from Redis) and local ones (bumped in-process,
+        # so invalidation works while Redis is down)
+        self._shared_generations: Dict[str, int] = {}
+        self._local_generations: Dict[str, int] = {}
+        self._generations_checked = float("-inf")
+        self._redis_down_until = 0.0
+        self._stats: Dict[str, int] = {
+            "l1_hit": 0, "l2_hit": 0, "revalidated": 0, "coalesced": 0, "miss": 0, "invalidations": 0
+        }
+
+    # -------------------------------------------------------------------------
+    # Redis (L2)
+    # -------------------------------------------------------------------------
+
+    async def _redis(self):
+        """Redis client, or None while Redis is unavailable"""
+        if time.monotonic() < self._redis_down_until:
+            return None
+        try:
+            from nexus_lib.config import RedisConnection
+            redis = await RedisConnection().get_client()
+        except Exception as e:
+            redis = None
+            logger.debug(f"Redis client unavailable: {e}")
+        if redis is None:
+            self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        return redis
+
+    def _redis_failed(self, e: Exception):
+        logger.warning(f"Jira cache Redis error, using in-process cache only: {e}")
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+
+    async def _l2_get(self, key: str, field: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        redis = await self._redis()
+        if redis is None:
+            return None
+        try:
+            raw = await (redis.hget(self.prefix + key, field) if field is not None else redis.get(self.prefix + key))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return json.loads(raw) if raw else None
+
+    async def _l2_set(self, key: str, entry: Dict[str, Any], ttl: int, field: Optional[str] = None):
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            data = json.dumps(entry)
+            if field is None:
+                await redis.set(self.prefix + key, data, ex=ttl)
+            else:
+                pipe = redis.pipeline()
+                pipe.hset(self.prefix + key, field, data)
+                pipe.expire(self.prefix + key, ttl)
+                await pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+    # -------------------------------------------------------------------------
+    # Generations
+    # -------------------------------------------------------------------------
+
+    async def _refresh_generations(self):
+        if time.monotonic() - self._generations_checked < self.generation_ttl:
+            return
+        self._generations_checked = time.monotonic()
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            raw = await redis.hgetall(self.prefix + "generations")
+        except Exception as e:
+            self._redis_failed(e)
+            return
+        self._shared_generations = {k: int(v) for k, v in (raw or {}).items()}
+
+    async def _generation(self, scopes: List[str]) -> Tuple[str, ...]:
+        """Generation token for the given projects (plus sprints)"""
+        await self._refresh_generations()
+        return tuple(
+            f"{scope}:{self._shared_generations.get(scope, 0)}.{self._local_generations.get(scope, 0)}"
+            for scope in [*(scopes or [_ANY]), _SPRINTS]
+        )
+
+    async def _bump(self, *scopes: str):
+        for scope in scopes:
+            self._local_generations[scope] = self._local_generations.get(scope, 0) + 1
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            pipe = redis.pipeline()
+            for scope in scopes:
+                pipe.hincrby(self.prefix + "generations", scope, 1)
+            for scope, value in zip(scopes, await pipe.execute()):
+                self._shared_generations[scope] = int(value)
+        except Exception as e:
+            self._redis_failed(e)
+
+    async def search_generation(self, projects: List[str]) -> Tuple[str, ...]:
+        """
+        Token that changes whenever cached searches over ``projects`` go stale
+
+        Useful for callers that cache values derived from searches (e.g.
+        aggregates) under their own keys.
+        """
+        return await self._generation(sorted({p.upper() for p in projects}))
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def _record(self, entity: str, result: str):
+        self._stats[result] += 1
+        JIRA_CACHE_REQUESTS.labels(entity=entity, result=result).inc()
+
+    async def _load_once(self, key: Hashable, load: Callable[[], Awaitable[Tuple[Any, str]]]) -> Tuple[Any, str]:
+        """
+        Run ``load`` once for concurrent callers asking for the same key
+
+        ``load`` returns ``(entry, result)``; callers that waited on another
+        caller's load get result "coalesced".
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            try:
+                entry, _ = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leading load was cancelled (not us): load it ourselves
+                if future.cancelled():
+                    continue
+                raise
+            return entry, "coalesced"
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await load()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        except BaseException:
+            # Cancelled: release waiters so they retry instead of hanging
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def get_issue(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Tuple[Dict[str, Any], Optional[str]]]],
+        variant: str = "",
+        revalidate: Optional[Callable[[Dict[str, Any], Optional[str]], Awaitable[bool]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Cached issue
+
+        Args:
+            key: Issue key
+            loader: Fetches ``(issue, etag)`` from Jira
+            variant: Distinguishes different field/expand selections of the same issue
+            revalidate: ``(issue, etag) -> still current?`` for entries older than ``revalidate_after``
+
+        Returns:
+            Raw issue dict
+        """
+        if not self.enabled:
+            return (await loader())[0]
+
+        project = key.rsplit("-", 1)[0].upper()
+        generation = await self._generation([project])
+        l1_key = ("issue", key, variant, generation)
+        l2_key = f"issue:{key}"
+        shared = self._shared_generations.get(project, 0)
+
+        async def load():
+            issue, etag = await loader()
+            loaded = {"v": issue, "etag": etag, "checked": time.time(), "gen": shared}
+            # Cache before releasing waiters so late arrivals hit L1
+            self._l1.set(l1_key, loaded, ttl=self.l1_ttl)
+            await self._l2_set(l2_key, loaded, self.ttl, field=variant)
+            return loaded, "miss"
+
+        async def fetch():
+            cached = await self._l2_get(l2_key, variant)
+            # Entries written before the latest invalidation are ignored
+            if cached is None or cached.get("gen") != shared:
+                return await load()
+            self._l1.set(l1_key, cached, ttl=self.l1_ttl)
+            return cached, "l2_hit"
+
+        found, entry, _ = self._l1.lookup(l1_key)
+        result = "l1_hit"
+        if not found:
+            entry, result = await self._load_once(l1_key, fetch)
+
+        if revalidate is not None and result != "miss" and time.time() - entry["checked"] >= self.revalidate_after:
+            try:
+                current = await revalidate(entry["v"], entry.get("etag"))
+            except Exception as e:
+                logger.debug(f"Revalidation of {key} failed: {e}")
+                current = False
+            if current:
+                entry, result = {**entry, "checked": time.time()}, "revalidated"
+                self._l1.set(l1_key, entry, ttl=self.l1_ttl)
+                await self._l2_set(l2_key, entry, self.ttl, field=variant)
+            else:
+                entry, result = await self._load_once(l1_key, load)
+
+        self._record("issue", result)
+        return entry["v"]
+
+    async def _get_keyed(
+        self,
+        entity: str,
+        l2_key: str,
+        generation: Tuple[str, ...],
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int
+    ) -> Any:
+        """L1 -> L2 -> loader for entries whose key already embeds their generations"""
+        l1_key = (entity, l2_key, generation)
+
+        async def fetch():
+            cached = await self._l2_get(l2_key)
+            if cached is not None:
+                result = "l2_hit"
+            else:
+                cached, result = {"v": await loader(), "checked": time.time()}, "miss"
+                await self._l2_set(l2_key, cached, ttl)
+            self._l1.set(l1_key, cached, ttl=min(self.l1_ttl, ttl))
+            return cached, result
+
+        found, entry, _ = self._l1.lookup(l1_key)
+        result = "l1_hit"
+        if not found:
+            entry, result = await self._load_once(l1_key, fetch)
+        self._record(entity, result)
+        return entry["v"]
+
+    async def get_search(self, jql: str, loader: Callable[[], Awaitable[Dict[str, Any]]], variant: str = "") -> Dict[str, Any]:
+        """
+        Cached JQL search page
+
+        The key covers the query, ``variant`` (paging/fields) and the
+        generations of the projects the JQL is confined to (see
+        ``jql_projects``), so any invalidation in those projects (or of
+        sprints) retires it. Queries that may match any project depend on
+        the generation every invalidation bumps.
+        """
+        if not self.enabled:
+            return await loader()
+        generation = await self._generation(jql_projects(jql))
+        digest = hashlib.sha256(f"{jql}|{variant}|{generation}".encode()).hexdigest()[:32]
+        return await self._get_keyed("search", f"search:{digest}", generation, loader, self.ttl)
+
+    async def get_transitions(
+        self,
+        project: str,
+        issue_type: str,
+        status: str,
+        loader: Callable[[], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Cached workflow transitions for issues of one type in one status"""
+        if not self.enabled:
+            return await loader()
+        key = f"transitions:{project.upper()}:{issue_type}:{status}"
+        return await self._get_keyed("transitions", key, (), loader, self.transitions_ttl)
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+
+    async def invalidate_issue(self, key: str, project: Optional[str] = None, source: str = "webhook"):
+        """
+        Drop an issue and every cached search over its project
+
+        Args:
+            key: Issue key
+            project: Project key (derived from the issue key if omitted)
+            source: What triggered the invalidation ("webhook", "write")
+        """
+        project = (project or key.rsplit("-", 1)[0]).upper()
+        redis = await self._redis()
+        if redis is not None:
+            try:
+                await redis.delete(self.prefix + f"issue:{key}")
+            except Exception as e:
+                self._redis_failed(e)
+        await self._bump(project, _ANY)
+        self._stats["invalidations"] += 1
+        JIRA_CACHE_INVALIDATIONS.labels(source=source).inc()
+
+    async def invalidate_sprints(self, source: str = "webhook"):
+        """Retire every cached search (sprint membership or state changed)"""
+        await self._bump(_SPRINTS, _ANY)
+        self._stats["invalidations"] += 1
+        JIRA_CACHE_INVALIDATIONS.labels(source=source).inc()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this cache"""
+        lookups = sum(self._stats[k] for k in ("l1_hit", "l2_hit", "revalidated", "coalesced", "miss"))
+        served = lookups - self._stats["miss"]
+        return {
+            "site": self.site,
+            "enabled": self.enabled,
+            "redis": time.monotonic() >= self._redis_down_until,
+            "l1_entries": len(self._l1._cache),
+            "hit_rate": round(served / lookups, 3) if lookups else None,
+            **self._stats
+        }
+
+
+# Caches by Jira site, shared by every transport in the process
+_caches: Dict[str, JiraEntityCache] = {}
+
+
+def _site(url: str) -> str:
+    return httpx.URL(url).host.lower() or url
+
+
+def jira_cache_for(base_url: str) -> JiraEntityCache:
+    """Process-wide entity cache for the Jira site at ``base_url``"""
+    site = _site(base_url)
+    cache = _caches.get(site)
+    if cache is None:
+        cache = _caches[site] = JiraEntityCache(site)
+    return cache
+
+
+async def invalidate_jira_webhook(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Invalidate cached entities for a Jira webhook delivery
+
+    Issue events drop the issue and retire searches over its project;
+    ``sprint_*`` events retire all searches. The site comes from the
+    issue's ``self`` link; without one every known site is invalidated.
+
+    Args:
+        payload: Jira webhook body
+
+    Returns:
+        ``{"event": ..., "invalidated": ...}``
+    """
+    event = payload.get("webhookEvent", "")
+    issue = payload.get("issue") or {}
+    key = issue.get("key")
+    project = ((issue.get("fields") or {}).get("project") or {}).get("key")
+
+    caches = [jira_cache_for(issue["self"])] if issue.get("self") else list(_caches.values())
+    for cache in caches:
+        if event.startswith("sprint_"):
+            await cache.invalidate_sprints()
+        elif key:
+            await cache.invalidate_issue(key, project=project)
+
+    if event.startswith("sprint_"):
+        invalidated = "sprints"
+    else:
+        invalidated = key
+    return {"event": event, "invalidated": invalidated}
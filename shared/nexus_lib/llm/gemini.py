@@ -325,7 +325,13 @@ class GeminiClient(BaseLLMClient):
                 stream=True,
             )
             
-            for chunk in response:
+            # The SDK's stream iterator blocks on the network, so pull each
+            # chunk in a worker thread to keep the event loop responsive
+            chunks = iter(response)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
                 if chunk.text:
                     yield chunk.text
                     
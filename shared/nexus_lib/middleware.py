@@ -1,21 +1,32 @@
 """
 Nexus Middleware Components
-JWT Authentication and Metrics Middleware for inter-service communication
+JWT Authentication, Metrics, Rate Limiting and Request ID middleware for
+inter-service communication, fused into a single pure ASGI layer
 """
 import os
+import math
 import time
+import uuid
+import hashlib
 import logging
 import jwt
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Callable, List
+from typing import Optional, Callable, List, Dict, Any, Tuple
 from functools import wraps
 
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.responses import Response, JSONResponse
+from starlette.routing import Match, Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from prometheus_client import Counter, Histogram, Gauge
 
+from nexus_lib.utils import SimpleCache
+
 logger = logging.getLogger("nexus.middleware")
 
 
@@ -62,6 +73,13 @@ HTTP_ERRORS_TOTAL = Counter(
     ['method', 'endpoint', 'error_type', 'agent_type']
 )
 
+# Rate Limit Metrics
+RATE_LIMIT_DECISIONS = Counter(
+    'nexus_rate_limit_decisions_total',
+    'Rate limiter decisions',
+    ['result', 'backend']  # result = allowed, limited; backend = redis, local
+)
+
 
 # ============================================================================
 # JWT AUTHENTICATION
@@ -84,11 +102,26 @@ class JWTConfig:
         self.audience = audience
 
 
+# Verified token payloads keyed by (config scope, token digest). Shared by all
+# handlers in the process so AuthStage, JWTBearer etc. verify a token once.
+JWT_CACHE_ENABLED = os.environ.get("JWT_CACHE_ENABLED", "true").lower() == "true"
+JWT_CACHE_MAX_TTL = float(os.environ.get("JWT_CACHE_MAX_TTL", "3600"))
+_verified_tokens = SimpleCache(
+    max_size=int(os.environ.get("JWT_CACHE_MAX_ENTRIES", "10000")),
+    name="jwt"
+)
+
+
 class JWTHandler:
     """JWT Token Handler for creating and validating tokens"""
     
-    def __init__(self, config: JWTConfig = None):
+    def __init__(self, config: JWTConfig = None, cache: Optional[SimpleCache] = None):
         self.config = config or JWTConfig()
+        self.cache = cache if cache is not None else _verified_tokens
+        # A token verified with one key/issuer/audience is not trusted under another
+        self._cache_scope = hashlib.sha256("|".join((
+            self.config.secret_key, self.config.algorithm, self.config.issuer, self.config.audience
+        )).encode()).hexdigest()[:16]
     
     def create_access_token(
         self,
@@ -129,7 +162,27 @@ class JWTHandler:
         )
     
     def decode_token(self, token: str) -> dict:
-        """Decode and validate a JWT token"""
+        """
+        Decode and validate a JWT token
+        
+        Verified payloads are cached until the token expires (at most
+        JWT_CACHE_MAX_TTL), so repeated calls with the same token skip the
+        signature check. Callers get a copy and may modify it.
+        """
+        if not JWT_CACHE_ENABLED:
+            return self._verify(token)
+        
+        key = (self._cache_scope, hashlib.sha256(token.encode()).digest())
+        payload = self.cache.get(key)
+        if payload is None:
+            payload = self._verify(token)
+            ttl = min(payload.get("exp", 0) - time.time(), JWT_CACHE_MAX_TTL)
+            if ttl > 0:
+                self.cache.set(key, payload, ttl=ttl)
+        return dict(payload)
+    
+    def _verify(self, token: str) -> dict:
+        """Verify signature and claims"""
         try:
             payload = jwt.decode(
                 token,
@@ -206,262 +259,767 @@ def require_auth(agent_types: List[str] = None):
 
 
 # ============================================================================
-# METRICS MIDDLEWARE
+# FUSED ASGI MIDDLEWARE
 # ============================================================================
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+def _looks_like_uuid(s: str) -> bool:
+    """Check if string looks like a UUID"""
+    if len(s) == 36 and s.count("-") == 4:
+        return all(c.isalnum() or c == "-" for c in s)
+    return False
+
+
+def _looks_like_ticket_key(s: str) -> bool:
+    """Check if string looks like a Jira ticket key (e.g., PROJ-123)"""
+    if "-" in s:
+        parts = s.split("-")
+        if len(parts) == 2:
+            return parts[0].isalpha() and parts[1].isdigit()
+    return False
+
+
+def normalize_endpoint(path: str) -> str:
     """
-    Middleware to capture HTTP request metrics
-    - Request count by method, endpoint, status
-    - Request latency histogram
-    - Active request gauge
-    - Error tracking
+    Replace IDs in a path with placeholders to keep label/key cardinality low
+    e.g., /users/123 -> /users/{id}
+    """
+    parts = path.split("/")
+    normalized = []
+    for part in parts:
+        if part.isdigit():
+            normalized.append("{id}")
+        elif _looks_like_uuid(part):
+            normalized.append("{uuid}")
+        elif _looks_like_ticket_key(part):
+            normalized.append("{ticket_key}")
+        else:
+            normalized.append(part)
+    return "/".join(normalized)
+
+
+class RouteTemplateCache:
     """
+    Maps request paths to the route template that will serve them
+    (e.g. /jira/ticket/PROJ-1 -> /jira/ticket/{key}).
     
-    def __init__(self, app, agent_type: str = "unknown"):
-        super().__init__(app)
-        self.agent_type = agent_type
+    Templates come from the application's router, so labels and rate limit
+    keys match the declared routes. Static routes are a dict lookup; paths
+    for parameterised routes are matched once and then served from an LRU.
+    Paths no route matches fall back to normalize_endpoint().
+    """
+    
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.environ.get("ROUTE_TEMPLATE_CACHE_SIZE", "4096"))
+        self._resolved: "OrderedDict[str, str]" = OrderedDict()
+        self._router = None
+        self._route_count = -1
+        self._static: Dict[str, str] = {}
+        self._dynamic: List[Any] = []
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Skip metrics for health endpoints
-        if request.url.path in ["/health", "/metrics", "/ready", "/live"]:
-            return await call_next(request)
+    def resolve(self, scope: Scope) -> str:
+        """
+        Get the route template for an HTTP scope
         
-        method = request.method
-        endpoint = self._normalize_endpoint(request.url.path)
+        Args:
+            scope: ASGI HTTP scope (``scope["app"]`` provides the router)
         
-        # Track active requests
-        ACTIVE_REQUESTS.labels(agent_type=self.agent_type).inc()
+        Returns:
+            Route template, or the normalized path if no route matches
+        """
+        path = scope["path"]
+        template = self._resolved.get(path)
+        if template is not None:
+            self._resolved.move_to_end(path)
+            return template
         
-        # Track request size
-        content_length = request.headers.get("content-length")
-        if content_length:
-            HTTP_REQUEST_SIZE.labels(method=method, endpoint=endpoint).observe(int(content_length))
+        self._index(scope)
+        template = self._static.get(path) or self._match(scope) or normalize_endpoint(path)
+        self._resolved[path] = template
+        if len(self._resolved) > self.max_size:
+            self._resolved.popitem(last=False)
+        return template
+    
+    def _index(self, scope: Scope):
+        """(Re)build the static/dynamic split when the route table changes"""
+        router = getattr(scope.get("app"), "router", None)
+        routes = getattr(router, "routes", None) or []
+        if router is self._router and len(routes) == self._route_count:
+            return
+        
+        self._router = router
+        self._route_count = len(routes)
+        self._static = {}
+        self._dynamic = []
+        self._resolved.clear()
+        for route in routes:
+            path = getattr(route, "path", None)
+            if path is None:
+                continue
+            if isinstance(route, Route) and not route.param_convertors:
+                self._static.setdefault(path, path)
+            else:
+                self._dynamic.append(route)
+    
+    def _match(self, scope: Scope) -> Optional[str]:
+        partial = None
+        for route in self._dynamic:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial
+
+
+class RequestContext:
+    """Per-request data shared by middleware stages"""
+    
+    __slots__ = ("request", "method", "path", "endpoint", "started_at")
+    
+    def __init__(self, request: Request, endpoint: str):
+        self.request = request
+        self.method = request.scope["method"]
+        self.path = request.scope["path"]
+        self.endpoint = endpoint
+        self.started_at = time.perf_counter()
+
+
+class MiddlewareStage:
+    """
+    One step of NexusMiddleware.
+    
+    ``on_request`` runs in stage order before the endpoint and may return a
+    response to short-circuit the request. ``on_response`` sees the response
+    status and (mutable) headers, and ``on_complete`` runs once the response
+    has been sent or the endpoint raised. Both run in reverse order and only
+    for stages whose ``on_request`` ran. WebSocket connections only go
+    through ``on_websocket``, which may reject the handshake.
+    """
+    
+    exclude_paths: tuple = ()
+    
+    def applies_to(self, path: str) -> bool:
+        """Whether this stage runs for ``path``"""
+        return not path.startswith(self.exclude_paths)
+    
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        return None
+    
+    def on_response(self, ctx: RequestContext, status_code: int, headers: MutableHeaders):
+        pass
+    
+    def on_complete(self, ctx: RequestContext, status_code: int, error: Optional[BaseException]):
+        pass
+    
+    async def on_websocket(self, conn: HTTPConnection) -> Optional[str]:
+        """Reason to reject a WebSocket handshake, or None to let it through"""
+        return None
+
+
+class NexusMiddleware:
+    """
+    Pure ASGI middleware that runs a list of stages in one layer.
+    
+    Each BaseHTTPMiddleware adds a task, a memory stream and a response
+    wrapper per request, and buffers streaming responses through them.
+    Running all cross-cutting concerns as stages of a single ASGI callable
+    avoids that, and the route template is resolved once per request for
+    every stage that needs it.
+    
+    Usage:
+        app.add_middleware(
+            NexusMiddleware,
+            stages=[RequestIdStage(), MetricsStage("jira"), AuthStage(...)],
+        )
+    """
+    
+    def __init__(self, app: ASGIApp, stages: Optional[List[MiddlewareStage]] = None):
+        self.app = app
+        self.stages = list(stages or [])
+        self.routes = RouteTemplateCache()
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        start_time = time.perf_counter()
+        path = scope["path"]
+        stages = [stage for stage in self.stages if stage.applies_to(path)]
+        if not stages:
+            await self.app(scope, receive, send)
+            return
+        
+        ctx = RequestContext(Request(scope, receive), self.routes.resolve(scope))
+        entered: List[MiddlewareStage] = []
         status_code = 500
-        error_type = None
+        error = None
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                for stage in reversed(entered):
+                    stage.on_response(ctx, status_code, headers)
+            await send(message)
         
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            
-            # Track response size
-            response_size = response.headers.get("content-length")
-            if response_size:
-                HTTP_RESPONSE_SIZE.labels(method=method, endpoint=endpoint).observe(int(response_size))
-            
-            return response
+            response = None
+            for stage in stages:
+                entered.append(stage)
+                response = await stage.on_request(ctx)
+                if response is not None:
+                    break
             
+            if response is not None:
+                await response(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            error_type = type(e).__name__
-            logger.exception(f"Request failed: {method} {endpoint}")
+            error = e
             raise
-            
         finally:
-            duration = time.perf_counter() - start_time
-            
-            # Record request count
-            HTTP_REQUESTS_TOTAL.labels(
+            for stage in reversed(entered):
+                try:
+                    stage.on_complete(ctx, status_code, error)
+                except Exception:
+                    logger.exception(f"Middleware stage {type(stage).__name__} failed")
+    
+    async def _websocket(self, scope: Scope, receive: Receive, send: Send):
+        """Let each applicable stage vet the handshake before the endpoint accepts it"""
+        conn = HTTPConnection(scope)
+        for stage in self.stages:
+            if not stage.applies_to(scope["path"]):
+                continue
+            reason = await stage.on_websocket(conn)
+            if reason is not None:
+                # Closing before accept rejects the handshake (HTTP 403)
+                await send({"type": "websocket.close", "code": 1008, "reason": reason})
+                return
+        await self.app(scope, receive, send)
+
+
+# ============================================================================
+# REQUEST ID
+# ============================================================================
+
+class RequestIdStage(MiddlewareStage):
+    """Add unique request ID to each request for tracing"""
+    
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        # Use existing request ID from header or generate new one
+        ctx.request.state.request_id = ctx.request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        return None
+    
+    def on_response(self, ctx: RequestContext, status_code: int, headers: MutableHeaders):
+        headers["X-Request-ID"] = ctx.request.state.request_id
+
+
+class RequestIdMiddleware(NexusMiddleware):
+    """Add unique request ID to each request for tracing"""
+    
+    def __init__(self, app: ASGIApp):
+        super().__init__(app, stages=[RequestIdStage()])
+
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+class MetricsStage(MiddlewareStage):
+    """
+    Capture HTTP request metrics
+    - Request count by method, endpoint (route template), status
+    - Request latency histogram
+    - Active request gauge
+    - Error tracking
+    """
+    
+    def __init__(self, agent_type: str = "unknown", exclude_paths: Optional[List[str]] = None):
+        self.agent_type = agent_type
+        # Exact matches: /metrics-like prefixes are real routes in some services
+        self.skip_paths = frozenset(exclude_paths or ["/health", "/metrics", "/ready", "/live"])
+        self._active = ACTIVE_REQUESTS.labels(agent_type=agent_type)
+    
+    def applies_to(self, path: str) -> bool:
+        return path not in self.skip_paths
+    
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        self._active.inc()
+        
+        # Track request size
+        content_length = ctx.request.headers.get("content-length")
+        if content_length:
+            HTTP_REQUEST_SIZE.labels(method=ctx.method, endpoint=ctx.endpoint).observe(int(content_length))
+        return None
+    
+    def on_response(self, ctx: RequestContext, status_code: int, headers: MutableHeaders):
+        # Track response size
+        response_size = headers.get("content-length")
+        if response_size:
+            HTTP_RESPONSE_SIZE.labels(method=ctx.method, endpoint=ctx.endpoint).observe(int(response_size))
+    
+    def on_complete(self, ctx: RequestContext, status_code: int, error: Optional[BaseException]):
+        duration = time.perf_counter() - ctx.started_at
+        method, endpoint = ctx.method, ctx.endpoint
+        
+        if error is not None:
+            logger.error(f"Request failed: {method} {endpoint}", exc_info=error)
+        
+        # Record request count
+        HTTP_REQUESTS_TOTAL.labels(
+            method=method,
+            endpoint=endpoint,
+            status=str(status_code),
+            agent_type=self.agent_type
+        ).inc()
+        
+        # Record latency
+        HTTP_REQUEST_DURATION.labels(
+            method=method,
+            endpoint=endpoint,
+            agent_type=self.agent_type
+        ).observe(duration)
+        
+        # Track errors
+        if status_code >= 400 or error is not None:
+            HTTP_ERRORS_TOTAL.labels(
                 method=method,
                 endpoint=endpoint,
-                status=str(status_code),
+                error_type=type(error).__name__ if error is not None else f"http_{status_code}",
                 agent_type=self.agent_type
             ).inc()
-            
-            # Record latency
-            HTTP_REQUEST_DURATION.labels(
-                method=method,
-                endpoint=endpoint,
-                agent_type=self.agent_type
-            ).observe(duration)
-            
-            # Track errors
-            if status_code >= 400 or error_type:
-                HTTP_ERRORS_TOTAL.labels(
-                    method=method,
-                    endpoint=endpoint,
-                    error_type=error_type or f"http_{status_code}",
-                    agent_type=self.agent_type
-                ).inc()
-            
-            # Decrease active requests
-            ACTIVE_REQUESTS.labels(agent_type=self.agent_type).dec()
+        
+        self._active.dec()
+
+
+class MetricsMiddleware(NexusMiddleware):
+    """
+    Middleware to capture HTTP request metrics (a NexusMiddleware with a
+    single MetricsStage)
+    """
+    
+    def __init__(self, app: ASGIApp, agent_type: str = "unknown"):
+        super().__init__(app, stages=[MetricsStage(agent_type)])
+        self.agent_type = agent_type
     
     def _normalize_endpoint(self, path: str) -> str:
         """
         Normalize endpoint paths to prevent high cardinality
         e.g., /users/123 -> /users/{id}
         """
-        parts = path.split("/")
-        normalized = []
-        for part in parts:
-            if part.isdigit():
-                normalized.append("{id}")
-            elif self._looks_like_uuid(part):
-                normalized.append("{uuid}")
-            elif self._looks_like_ticket_key(part):
-                normalized.append("{ticket_key}")
-            else:
-                normalized.append(part)
-        return "/".join(normalized)
-    
-    @staticmethod
-    def _looks_like_uuid(s: str) -> bool:
-        """Check if string looks like a UUID"""
-        if len(s) == 36 and s.count("-") == 4:
-            return all(c.isalnum() or c == "-" for c in s)
-        return False
-    
-    @staticmethod
-    def _looks_like_ticket_key(s: str) -> bool:
-        """Check if string looks like a Jira ticket key (e.g., PROJ-123)"""
-        if "-" in s:
-            parts = s.split("-")
-            if len(parts) == 2:
-                return parts[0].isalpha() and parts[1].isdigit()
-        return False
+        return normalize_endpoint(path)
 
 
 # ============================================================================
-# AUTH MIDDLEWARE (Legacy compatibility)
+# AUTHENTICATION
 # ============================================================================
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthStage(MiddlewareStage):
     """
-    Authentication middleware for validating JWT tokens
-    Wraps the JWT validation logic for use as middleware
+    Validate JWT bearer tokens and attach the payload to ``request.state.user``
+    
+    WebSocket handshakes are checked too; since browsers cannot set headers
+    on them, the token may also be passed as the ``access_token`` query
+    parameter. Rejected handshakes are closed with code 1008.
     """
     
     def __init__(
         self,
-        app,
         secret_key: str = None,
         exclude_paths: List[str] = None,
         require_auth: bool = True
     ):
-        super().__init__(app)
         self.jwt_handler = JWTHandler(JWTConfig(secret_key=secret_key))
-        self.exclude_paths = exclude_paths or ["/health", "/metrics", "/ready", "/live", "/docs", "/openapi.json"]
+        self.exclude_paths = tuple(exclude_paths or ["/health", "/metrics", "/ready", "/live", "/docs", "/openapi.json"])
         self.require_auth = require_auth
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Skip auth for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-        
-        # Skip auth if not required (development mode)
-        if not self.require_auth:
-            return await call_next(request)
-        
-        # Get authorization header
-        auth_header = request.headers.get("Authorization")
-        
+    def applies_to(self, path: str) -> bool:
+        # Skip auth entirely if not required (development mode)
+        return self.require_auth and super().applies_to(path)
+    
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        error = self._authenticate(ctx.request, ctx.request.headers.get("Authorization"))
+        return self._unauthorized(error) if error else None
+    
+    async def on_websocket(self, conn: HTTPConnection) -> Optional[str]:
+        auth_header = conn.headers.get("Authorization")
+        if not auth_header and conn.query_params.get("access_token"):
+            auth_header = f"Bearer {conn.query_params['access_token']}"
+        return self._authenticate(conn, auth_header)
+    
+    def _authenticate(self, conn: HTTPConnection, auth_header: Optional[str]) -> Optional[str]:
+        """Validate ``auth_header`` and attach the payload, returning an error detail on failure"""
         if not auth_header:
             # Allow requests without auth in development
             if os.environ.get("NEXUS_ENV", "development") == "development":
                 logger.debug("No auth header, allowing in development mode")
-                return await call_next(request)
-            raise HTTPException(status_code=401, detail="Missing authorization header")
+                return None
+            return "Missing authorization header"
         
         # Extract and validate token
         try:
             scheme, token = auth_header.split(" ", 1)
-            if scheme.lower() != "bearer":
-                raise HTTPException(status_code=401, detail="Invalid authorization scheme")
-            
-            payload = self.jwt_handler.decode_token(token)
-            request.state.user = payload
-            request.state.agent_type = payload.get("agent_type")
-            
         except ValueError:
-            raise HTTPException(status_code=401, detail="Invalid authorization header format")
-        except HTTPException:
-            raise
+            return "Invalid authorization header format"
+        if scheme.lower() != "bearer":
+            return "Invalid authorization scheme"
+        
+        try:
+            payload = self.jwt_handler.decode_token(token)
+        except HTTPException as e:
+            return e.detail
         except Exception as e:
             logger.error(f"Auth error: {e}")
-            raise HTTPException(status_code=401, detail="Authentication failed")
+            return "Authentication failed"
         
-        return await call_next(request)
+        conn.state.user = payload
+        conn.state.agent_type = payload.get("agent_type")
+        return None
+    
+    @staticmethod
+    def _unauthorized(detail: str) -> Response:
+        return JSONResponse(status_code=401, content={"detail": detail})
+
+
+class AuthMiddleware(NexusMiddleware):
+    """
+    Authentication middleware for validating JWT tokens (a NexusMiddleware
+    with a single AuthStage)
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret_key: str = None,
+        exclude_paths: List[str] = None,
+        require_auth: bool = True
+    ):
+        stage = AuthStage(secret_key=secret_key, exclude_paths=exclude_paths, require_auth=require_auth)
+        super().__init__(app, stages=[stage])
+        self.jwt_handler = stage.jwt_handler
+        self.require_auth = require_auth
 
 
 # ============================================================================
-# REQUEST ID MIDDLEWARE
+# RATE LIMITING MIDDLEWARE
 # ============================================================================
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    """Add unique request ID to each request for tracing"""
+@dataclass(frozen=True)
+class RateLimit:
+    """A request budget: ``limit`` requests per ``period_seconds``"""
+    name: str
+    limit: int
+    period_seconds: float
+    
+    @property
+    def rate(self) -> float:
+        """Tokens refilled per second"""
+        return self.limit / self.period_seconds
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+    backend: str = "local"
+
+
+# Token buckets for every limit are refilled and charged in one atomic step.
+# KEYS: one hash per limit. ARGV: limit_1, rate_1 (tokens/ms), limit_2, rate_2...
+# Uses the Redis server clock so all replicas agree on elapsed time.
+TOKEN_BUCKET_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local tokens = {}
+local allowed = 1
+local retry_after = 0
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[2 * i - 1])
+  local rate = tonumber(ARGV[2 * i])
+  local state = redis.call('HMGET', KEYS[i], 't', 'ts')
+  local t = tonumber(state[1])
+  local ts = tonumber(state[2])
+  if t == nil or ts == nil then
+    t = capacity
+    ts = now
+  end
+  t = math.min(capacity, t + math.max(0, now - ts) * rate)
+  tokens[i] = t
+  if t < 1 then
+    allowed = 0
+    retry_after = math.max(retry_after, math.ceil((1 - t) / rate))
+  end
+end
+local remaining = -1
+for i = 1, #KEYS do
+  local capacity = tonumber(ARGV[2 * i - 1])
+  local rate = tonumber(ARGV[2 * i])
+  local t = tokens[i]
+  if allowed == 1 then
+    t = t - 1
+  end
+  redis.call('HSET', KEYS[i], 't', tostring(t), 'ts', now)
+  redis.call('PEXPIRE', KEYS[i], math.ceil(capacity / rate) + 1000)
+  if remaining < 0 or math.floor(t) < remaining then
+    remaining = math.floor(t)
+  end
+end
+return {allowed, remaining, retry_after}
+"""
+
+
+class TokenBucketLimiter:
+    """
+    Distributed token-bucket rate limiter.
+    
+    Buckets live in Redis and are updated by a Lua script, so limits hold
+    across replicas. Each limit refills continuously (no window-edge bursts)
+    and a request must take a token from every limit it is subject to. When
+    Redis is unreachable the limiter falls back to per-process buckets
+    (LRU-bounded) and re-tries Redis after ``redis_retry_seconds``.
+    """
+    
+    def __init__(
+        self,
+        key_prefix: str = "nexus:ratelimit",
+        max_local_buckets: Optional[int] = None,
+        redis_retry_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the limiter
+        
+        Args:
+            key_prefix: Redis key prefix for bucket hashes
+            max_local_buckets: Buckets kept by the in-process fallback
+            redis_retry_seconds: How long to stay on the fallback after a Redis error
+        """
+        self.key_prefix = key_prefix
+        self.max_local_buckets = max_local_buckets or int(os.environ.get("RATE_LIMIT_LOCAL_BUCKETS", "10000"))
+        self.redis_retry_seconds = redis_retry_seconds if redis_retry_seconds is not None else float(
+            os.environ.get("RATE_LIMIT_REDIS_RETRY_SECONDS", "30")
+        )
+        self.use_redis = os.environ.get("RATE_LIMIT_BACKEND", "redis").lower() == "redis"
+        
+        self._local: "OrderedDict[str, List[float]]" = OrderedDict()  # key -> [tokens, updated_at]
+        self._script = None
+        self._script_client = None
+        self._redis_down_until = 0.0
     
-    async def dispatch(self, request: Request, call_next) -> Response:
-        import uuid
+    def _bucket_key(self, scope: str, limit: RateLimit, slot: Optional[str] = None) -> str:
+        # Hash tag keeps every bucket charged by one request in one cluster slot
+        if slot is None or slot == scope:
+            return f"{self.key_prefix}:{{{scope}}}:{limit.name}"
+        return f"{self.key_prefix}:{{{slot}}}:{scope}:{limit.name}"
+    
+    def _buckets(
+        self,
+        scope: str,
+        limits: List[RateLimit],
+        shared_scope: Optional[str],
+        shared_limits: List[RateLimit]
+    ) -> List[Tuple[str, RateLimit]]:
+        buckets = [(self._bucket_key(scope, limit, shared_scope), limit) for limit in limits]
+        if shared_scope is not None:
+            buckets.extend((self._bucket_key(shared_scope, limit), limit) for limit in shared_limits)
+        return buckets
+    
+    async def acquire(
+        self,
+        scope: str,
+        limits: List[RateLimit],
+        shared_scope: Optional[str] = None,
+        shared_limits: Optional[List[RateLimit]] = None
+    ) -> RateLimitResult:
+        """
+        Take one token from every limit for ``scope`` (and ``shared_scope``)
         
-        # Use existing request ID from header or generate new one
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
-        request.state.request_id = request_id
+        Args:
+            scope: Bucket identity (e.g. tenant:user:route)
+            limits: Limits charged to ``scope``
+            shared_scope: Wider bucket identity (e.g. the tenant) charged in
+                the same atomic step
+            shared_limits: Limits charged to ``shared_scope``
         
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
+        Returns:
+            RateLimitResult; ``retry_after`` is set when not allowed
+        """
+        buckets = self._buckets(scope, limits, shared_scope, shared_limits or [])
+        if self.use_redis and time.monotonic() >= self._redis_down_until:
+            result = await self._acquire_redis(buckets)
+            if result is not None:
+                return result
+        return self._acquire_local(buckets)
+    
+    async def _acquire_redis(self, buckets: List[Tuple[str, RateLimit]]) -> Optional[RateLimitResult]:
+        try:
+            from nexus_lib.config import RedisConnection
+            redis = await RedisConnection().get_client()
+            if redis is None:
+                raise ConnectionError("Redis unavailable")
+            if self._script is None or self._script_client is not redis:
+                self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+                self._script_client = redis
+            
+            args: List[Any] = []
+            for _, limit in buckets:
+                args.extend([limit.limit, limit.rate / 1000.0])
+            allowed, remaining, retry_after_ms = await self._script(
+                keys=[key for key, _ in buckets],
+                args=args
+            )
+        except Exception as e:
+            logger.warning(f"Redis rate limiter unavailable, using local buckets: {e}")
+            self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+            return None
         
-        return response
-
+        return RateLimitResult(
+            allowed=bool(int(allowed)),
+            limit=min(limit.limit for _, limit in buckets),
+            remaining=max(0, int(remaining)),
+            retry_after=int(retry_after_ms) / 1000.0,
+            backend="redis"
+        )
+    
+    def _acquire_local(self, buckets: List[Tuple[str, RateLimit]]) -> RateLimitResult:
+        now = time.monotonic()
+        states = []
+        retry_after = 0.0
+        for key, limit in buckets:
+            bucket = self._local.get(key)
+            if bucket is None:
+                bucket = [float(limit.limit), now]
+                self._local[key] = bucket
+            self._local.move_to_end(key)
+            bucket[0] = min(limit.limit, bucket[0] + (now - bucket[1]) * limit.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                retry_after = max(retry_after, (1 - bucket[0]) / limit.rate)
+            states.append(bucket)
+        
+        allowed = retry_after == 0.0
+        if allowed:
+            for bucket in states:
+                bucket[0] -= 1
+        
+        while len(self._local) > self.max_local_buckets:
+            self._local.popitem(last=False)
+        
+        return RateLimitResult(
+            allowed=allowed,
+            limit=min(limit.limit for _, limit in buckets),
+            remaining=max(0, int(min(bucket[0] for bucket in states))),
+            retry_after=retry_after,
+            backend="local"
+        )
 
-# ============================================================================
-# RATE LIMITING MIDDLEWARE
-# ============================================================================
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting middleware"""
+class RateLimitStage(MiddlewareStage):
+    """
+    Token-bucket rate limiting.
+    
+    Every request is charged ``requests_per_minute`` against a bucket keyed
+    per tenant, user and route template. Requests with a tenant (resolved by
+    TenantStage, which must run first) are also charged the tenant's
+    ``TenantLimits.max_requests_per_hour`` and ``max_requests_per_day``
+    against buckets keyed by the tenant alone, so those quotas hold across
+    all of its users and routes. Limited requests receive 429 with a
+    ``Retry-After`` header.
+    """
     
     def __init__(
         self,
-        app,
         requests_per_minute: int = 100,
-        exclude_paths: List[str] = None
+        exclude_paths: List[str] = None,
+        limiter: Optional[TokenBucketLimiter] = None
     ):
-        super().__init__(app)
         self.requests_per_minute = requests_per_minute
-        self.exclude_paths = exclude_paths or ["/health", "/metrics"]
-        self._request_counts: dict = {}
-        self._last_reset = time.time()
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        # Skip rate limiting for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-        
-        # Reset counts every minute
-        current_time = time.time()
-        if current_time - self._last_reset > 60:
-            self._request_counts = {}
-            self._last_reset = current_time
-        
-        # Get client identifier
-        client_id = self._get_client_id(request)
-        
-        # Check rate limit
-        count = self._request_counts.get(client_id, 0)
-        if count >= self.requests_per_minute:
-            raise HTTPException(
-                status_code=429,
-                detail="Rate limit exceeded. Please try again later."
-            )
-        
-        self._request_counts[client_id] = count + 1
+        self.exclude_paths = tuple(exclude_paths or ["/health", "/metrics"])
+        self.limiter = limiter or TokenBucketLimiter()
+        self._default_limits = [RateLimit("minute", requests_per_minute, 60)]
+    
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        request = ctx.request
+        tenant = getattr(request.state, "tenant", None)
+        tenant_id = getattr(tenant, "id", None)
+        scope = ":".join((
+            tenant_id or "-",
+            self._get_client_id(request),
+            f"{ctx.method} {ctx.endpoint}"
+        ))
         
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(self.requests_per_minute - count - 1)
+        client_limits, tenant_limits = self._limits_for(tenant)
+        result = await self.limiter.acquire(
+            scope,
+            client_limits,
+            shared_scope=tenant_id if tenant_limits else None,
+            shared_limits=tenant_limits
+        )
+        RATE_LIMIT_DECISIONS.labels(
+            result="allowed" if result.allowed else "limited",
+            backend=result.backend
+        ).inc()
+        request.state.rate_limit = result
         
-        return response
+        if not result.allowed:
+            return JSONResponse(
+                status_code=429,
+                content={"detail": "Rate limit exceeded. Please try again later."},
+                headers={"Retry-After": str(max(1, math.ceil(result.retry_after)))}
+            )
+        return None
+    
+    def on_response(self, ctx: RequestContext, status_code: int, headers: MutableHeaders):
+        result = ctx.request.state.rate_limit
+        headers["X-RateLimit-Limit"] = str(result.limit)
+        headers["X-RateLimit-Remaining"] = str(result.remaining)
+    
+    def _limits_for(self, tenant) -> Tuple[List[RateLimit], List[RateLimit]]:
+        """Per-client limits and tenant-wide limits for a tenant (or None)"""
+        tenant_limits = getattr(tenant, "limits", None)
+        if tenant_limits is None or getattr(tenant, "id", None) is None:
+            return self._default_limits, []
+        return self._default_limits, [
+            RateLimit("hour", tenant_limits.max_requests_per_hour, 3600),
+            RateLimit("day", tenant_limits.max_requests_per_day, 86400),
+        ]
     
     def _get_client_id(self, request: Request) -> str:
         """Get client identifier for rate limiting"""
         # Try to get user from JWT
-        if hasattr(request.state, "user"):
-            return request.state.user.get("sub", "anonymous")
+        user = getattr(request.state, "user", None)
+        if user:
+            return user.get("sub", "anonymous")
         
         # Fall back to IP address
         forwarded = request.headers.get("X-Forwarded-For")
         if forwarded:
             return forwarded.split(",")[0].strip()
         return request.client.host if request.client else "unknown"
+
+
+class RateLimitMiddleware(NexusMiddleware):
+    """
+    Token-bucket rate limiting middleware (a NexusMiddleware with a single
+    RateLimitStage)
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 100,
+        exclude_paths: List[str] = None,
+        limiter: Optional[TokenBucketLimiter] = None
+    ):
+        self.stage = RateLimitStage(requests_per_minute, exclude_paths, limiter)
+        super().__init__(app, stages=[self.stage])
+        self.limiter = self.stage.limiter
+    
+    def _limits_for(self, tenant) -> Tuple[List[RateLimit], List[RateLimit]]:
+        return self.stage._limits_for(tenant)
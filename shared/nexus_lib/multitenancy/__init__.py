@@ -4,7 +4,7 @@ Organization isolation and tenant management
 """
 from .tenant import Tenant, TenantConfig, TenantStatus
 from .context import TenantContext, get_current_tenant, set_current_tenant
-from .middleware import TenantMiddleware
+from .middleware import TenantMiddleware, TenantStage
 from .repository import TenantRepository
 
 __all__ = [
@@ -15,6 +15,7 @@ __all__ = [
     "get_current_tenant",
     "set_current_tenant",
     "TenantMiddleware",
+    "TenantStage",
     "TenantRepository",
 ]
 
@@ -3,9 +3,13 @@ Tenant Middleware
 FastAPI middleware for tenant resolution and context management
 """
 import logging
-from typing import Optional, Callable, Awaitable
+from typing import Optional
 from fastapi import Request, Response, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp
+
+from ..middleware import MiddlewareStage, NexusMiddleware, RequestContext
 
 from .tenant import Tenant, TenantStatus
 from .context import set_current_tenant, get_current_tenant
@@ -14,9 +18,9 @@ from .repository import TenantRepository
 logger = logging.getLogger("nexus.multitenancy.middleware")
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantStage(MiddlewareStage):
     """
-    Middleware that resolves tenant from request and sets context
+    Middleware stage that resolves tenant from request and sets context
     
     Tenant can be resolved from:
     1. X-Tenant-ID header
@@ -28,48 +32,37 @@ class TenantMiddleware(BaseHTTPMiddleware):
     
     def __init__(
         self,
-        app,
         repository: Optional[TenantRepository] = None,
         require_tenant: bool = False,
         exclude_paths: Optional[list] = None,
     ):
-        super().__init__(app)
         self.repository = repository or TenantRepository()
         self.require_tenant = require_tenant
-        self.exclude_paths = exclude_paths or [
+        self.exclude_paths = tuple(exclude_paths or [
             "/health",
             "/metrics",
             "/docs",
             "/openapi.json",
             "/redoc",
-        ]
+        ])
     
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        """Process request with tenant context"""
-        # Skip tenant resolution for excluded paths
-        path = request.url.path
-        if any(path.startswith(p) for p in self.exclude_paths):
-            return await call_next(request)
-        
-        # Try to resolve tenant
+    async def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        """Resolve the tenant and set it in context"""
+        request = ctx.request
         tenant = await self._resolve_tenant(request)
         
         if tenant is None and self.require_tenant:
-            raise HTTPException(
+            return JSONResponse(
                 status_code=401,
-                detail="Tenant not found. Please provide X-Tenant-ID or X-Tenant-Slug header."
+                content={"detail": "Tenant not found. Please provide X-Tenant-ID or X-Tenant-Slug header."}
             )
         
         if tenant:
             # Validate tenant status
             if not tenant.is_active():
-                raise HTTPException(
+                return JSONResponse(
                     status_code=403,
-                    detail=f"Tenant is {tenant.status.value}. Access denied."
+                    content={"detail": f"Tenant is {tenant.status.value}. Access denied."}
                 )
             
             # Set tenant in context
@@ -79,19 +72,17 @@ class TenantMiddleware(BaseHTTPMiddleware):
             request.state.tenant = tenant
             request.state.tenant_id = tenant.id
             request.state.tenant_slug = tenant.slug
-        
-        try:
-            response = await call_next(request)
-            
-            # Add tenant info to response headers
-            if tenant:
-                response.headers["X-Tenant-ID"] = tenant.id
-            
-            return response
-            
-        finally:
-            # Clear tenant context
-            set_current_tenant(None)
+        return None
+    
+    def on_response(self, ctx: RequestContext, status_code: int, headers: MutableHeaders):
+        # Add tenant info to response headers
+        tenant_id = getattr(ctx.request.state, "tenant_id", None)
+        if tenant_id:
+            headers["X-Tenant-ID"] = tenant_id
+    
+    def on_complete(self, ctx: RequestContext, status_code: int, error: Optional[BaseException]):
+        # Clear tenant context
+        set_current_tenant(None)
     
     async def _resolve_tenant(self, request: Request) -> Optional[Tenant]:
         """Resolve tenant from request"""
@@ -145,6 +136,28 @@ class TenantMiddleware(BaseHTTPMiddleware):
         return None
 
 
+class TenantMiddleware(NexusMiddleware):
+    """
+    Middleware that resolves tenant from request and sets context (a
+    NexusMiddleware with a single TenantStage)
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        repository: Optional[TenantRepository] = None,
+        require_tenant: bool = False,
+        exclude_paths: Optional[list] = None,
+    ):
+        self.stage = TenantStage(repository, require_tenant, exclude_paths)
+        super().__init__(app, stages=[self.stage])
+        self.repository = self.stage.repository
+        self.require_tenant = require_tenant
+    
+    async def _resolve_tenant(self, request: Request) -> Optional[Tenant]:
+        return await self.stage._resolve_tenant(request)
+
+
 def get_tenant_from_request(request: Request) -> Optional[Tenant]:
     """
     Get tenant from request state
@@ -532,12 +532,23 @@ class AgentTaskResponse(BaseModel):
     completed_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class ReActAction(BaseModel):
+    """Single tool invocation issued within a ReAct step"""
+    action: str = Field(..., description="Selected action/tool")
+    action_input: Dict[str, Any] = Field(default_factory=dict, description="Action parameters")
+    observation: Optional[str] = Field(None, description="Result/observation from action")
+
+
 class ReActStep(BaseModel):
     """Single step in the ReAct reasoning loop"""
     step_number: int
     thought: str = Field(..., description="Agent's reasoning/thought")
     action: Optional[str] = Field(None, description="Selected action/tool")
     action_input: Optional[Dict[str, Any]] = Field(None, description="Action parameters")
+    actions: List[ReActAction] = Field(
+        default_factory=list,
+        description="All actions executed in parallel in this step (multi-action steps)"
+    )
     observation: Optional[str] = Field(None, description="Result/observation from action")
     is_final: bool = Field(False, description="Whether this is the final answer")
 
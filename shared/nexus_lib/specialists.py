@@ -3,15 +3,18 @@ Nexus Specialist Registry
 Production-ready agent registration, discovery, and health management
 """
 import os
+import time
+import random
+import string
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional, Set, FrozenSet, Callable
 from datetime import datetime, timezone
 from enum import Enum
 from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
 
-import httpx
+from nexus_lib.utils import http_pool, HttpPoolManager, CircuitState, describe_transport_error
 
 logger = logging.getLogger("nexus.specialists")
 
@@ -82,9 +85,94 @@ class SpecialistHealth:
     response_time_ms: Optional[float] = None
     error_message: Optional[str] = None
     consecutive_failures: int = 0
+    circuit_state: str = CircuitState.CLOSED.value
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class ToolRoute:
+    """
+    Compiled dispatch entry for one tool.
+    
+    Built once when specialists are (re)registered so a tool call only needs
+    a dict lookup and, for parameterised endpoints, one ``str.format``.
+    """
+    name: str
+    specialist_id: str
+    tool: SpecialistTool
+    method: str
+    path_template: str
+    path_params: FrozenSet[str]
+    schema: Dict[str, Any]
+    
+    @classmethod
+    def compile(cls, specialist_id: str, tool: SpecialistTool) -> "ToolRoute":
+        """Pre-parse a tool's endpoint template and parameter schema"""
+        path_params = frozenset(
+            field_name
+            for _, field_name, _, _ in string.Formatter().parse(tool.endpoint)
+            if field_name
+        )
+        properties: Dict[str, Any] = {}
+        for param in tool.parameters:
+            prop = {"type": param.type, "description": param.description}
+            if param.default is not None:
+                prop["default"] = param.default
+            properties[param.name] = prop
+        for name in sorted(path_params - properties.keys()):
+            properties[name] = {"type": "string"}
+        required = list(dict.fromkeys(tool.required_params + sorted(path_params)))
+        return cls(
+            name=tool.name,
+            specialist_id=specialist_id,
+            tool=tool,
+            method=tool.method.upper(),
+            path_template=tool.endpoint,
+            path_params=path_params,
+            schema={"type": "object", "properties": properties, "required": required},
+        )
+    
+    def build_path(self, args: Dict[str, Any]) -> str:
+        """
+        Render the endpoint for ``args``.
+        
+        Raises:
+            KeyError: If a path parameter is missing from ``args``
+        """
+        if not self.path_params:
+            return self.path_template
+        return self.path_template.format_map(args)
+    
+    def query_params(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Arguments that are not consumed by the path"""
+        if not self.path_params:
+            return args
+        return {k: v for k, v in args.items() if k not in self.path_params}
+    
+    def missing_params(self, args: Dict[str, Any]) -> List[str]:
+        """Required parameters absent from ``args``"""
+        return [name for name in self.schema["required"] if name not in args]
+
+
+def compile_routes(definitions: Dict[str, SpecialistDefinition]) -> Dict[str, ToolRoute]:
+    """
+    Build the tool name -> ToolRoute table for a set of specialists.
+    
+    If two specialists declare the same tool name the first one wins, as
+    with the linear lookup this table replaces.
+    """
+    routes: Dict[str, ToolRoute] = {}
+    for spec_id, definition in definitions.items():
+        for tool in definition.tools:
+            if tool.name in routes:
+                logger.warning(
+                    f"Tool {tool.name} of {spec_id} shadowed by {routes[tool.name].specialist_id}"
+                )
+                continue
+            routes[tool.name] = ToolRoute.compile(spec_id, tool)
+    return routes
+
+
 # =============================================================================
 # SPECIALIST DEFINITIONS
 # =============================================================================
@@ -487,8 +575,18 @@ class SpecialistRegistry:
     - Health monitoring with circuit breaker pattern
     - Tool capability mapping
     - Dependency tracking
+    
+    Health is derived passively from the outcomes of real requests to each
+    specialist (latency EWMA and rolling error rate recorded by the shared
+    HTTP pool). Active probes only go to specialists that are idle or
+    suspect, on jittered per-specialist schedules with backoff.
     """
     
+    # Consecutive failed requests that make a specialist unhealthy
+    UNHEALTHY_AFTER_FAILURES = 3
+    # Requests in the window before error rates are trusted
+    MIN_PASSIVE_REQUESTS = 5
+    
     def __init__(self, health_check_interval: int = 30):
         self._definitions = SPECIALIST_DEFINITIONS.copy()
         self._health: Dict[str, SpecialistHealth] = {}
@@ -497,9 +595,29 @@ class SpecialistRegistry:
         self._health_check_task: Optional[asyncio.Task] = None
         self._initialized = False
         
+        # Passive health thresholds
+        self._degraded_error_rate = float(os.environ.get("SPECIALIST_DEGRADED_ERROR_RATE", "0.1"))
+        self._unhealthy_error_rate = float(os.environ.get("SPECIALIST_UNHEALTHY_ERROR_RATE", "0.5"))
+        self._slow_ms = float(os.environ.get("SPECIALIST_SLOW_MS", "2000"))
+        
+        # Adaptive probing
+        self._suspect_probe_interval = float(os.environ.get("SPECIALIST_SUSPECT_PROBE_INTERVAL", "5"))
+        self._max_probe_interval = float(os.environ.get("SPECIALIST_MAX_PROBE_INTERVAL", "300"))
+        self._probe_jitter = float(os.environ.get("SPECIALIST_PROBE_JITTER", "0.2"))
+        self._next_probe: Dict[str, float] = {}
+        self._probe_failures: Dict[str, int] = {}
+        self._probe_wakeup: Optional[asyncio.Event] = None
+        
+        # Compiled tool routing table, swapped whole on (un)registration
+        self._routes: Dict[str, ToolRoute] = compile_routes(self._definitions)
+        self._route_listeners: List[Callable[[Dict[str, ToolRoute]], None]] = []
+        
         # Load URLs from environment
         self._load_urls_from_env()
         
+        # Mirror per-host circuit breaker state from the shared HTTP pool
+        http_pool.add_circuit_listener(self._on_circuit_change)
+        
         logger.info(f"SpecialistRegistry initialized with {len(self._definitions)} specialists")
     
     def _load_urls_from_env(self):
@@ -515,6 +633,20 @@ class SpecialistRegistry:
             # Initialize health status
             self._health[spec_id] = SpecialistHealth()
     
+    def _on_circuit_change(self, origin: str, state: CircuitState):
+        """Update health of the specialists served by ``origin`` when its circuit changes"""
+        for spec_id, url in self._urls.items():
+            if HttpPoolManager.origin(url) != origin:
+                continue
+            health = self._health.setdefault(spec_id, SpecialistHealth())
+            health.circuit_state = state.value
+            if state == CircuitState.OPEN:
+                health.status = SpecialistStatus.UNHEALTHY
+                health.error_message = "Circuit open"
+            elif state == CircuitState.CLOSED and health.error_message == "Circuit open":
+                health.status = SpecialistStatus.HEALTHY
+                health.error_message = None
+    
     @property
     def all_specialists(self) -> Dict[str, SpecialistDefinition]:
         """Get all registered specialist definitions"""
@@ -534,8 +666,60 @@ class SpecialistRegistry:
         return self._urls.get(specialist_id)
     
     def get_health(self, specialist_id: str) -> Optional[SpecialistHealth]:
-        """Get health status for a specialist"""
-        return self._health.get(specialist_id)
+        """Get health status for a specialist (refreshed from passive request data)"""
+        return self._refresh_from_traffic(specialist_id)
+    
+    def _refresh_from_traffic(self, specialist_id: str) -> Optional[SpecialistHealth]:
+        """
+        Derive a specialist's health from recent request outcomes.
+        
+        With no requests in the window the last verdict (probe or passive)
+        stands; an open circuit always wins.
+        """
+        health = self._health.get(specialist_id)
+        url = self._urls.get(specialist_id)
+        if health is None or url is None:
+            return health
+        
+        host = http_pool.host_health(HttpPoolManager.origin(url))
+        requests, failures = host.totals()
+        if requests and host.last_seen_at != health.last_check:
+            error_rate = failures / requests
+            latency_ms = host.latency_ewma * 1000
+            trusted = requests >= self.MIN_PASSIVE_REQUESTS
+            
+            if host.consecutive_failures >= self.UNHEALTHY_AFTER_FAILURES or (
+                trusted and error_rate >= self._unhealthy_error_rate
+            ):
+                health.status = SpecialistStatus.UNHEALTHY
+                health.error_message = host.last_error or f"Error rate {error_rate:.0%}"
+            elif failures and (not trusted or error_rate >= self._degraded_error_rate):
+                health.status = SpecialistStatus.DEGRADED
+                health.error_message = host.last_error or f"Error rate {error_rate:.0%}"
+            elif latency_ms >= self._slow_ms:
+                health.status = SpecialistStatus.DEGRADED
+                health.error_message = f"Slow responses ({latency_ms:.0f} ms)"
+            else:
+                health.status = SpecialistStatus.HEALTHY
+                health.error_message = None
+            
+            health.consecutive_failures = host.consecutive_failures
+            health.response_time_ms = latency_ms
+            health.last_check = host.last_seen_at
+        
+        if health.circuit_state == CircuitState.OPEN.value:
+            health.status = SpecialistStatus.UNHEALTHY
+            health.error_message = "Circuit open"
+        return health
+    
+    @property
+    def routes(self) -> Dict[str, ToolRoute]:
+        """Current tool routing table (replaced, never mutated, on registration)"""
+        return self._routes
+    
+    def get_route(self, tool_name: str) -> Optional[ToolRoute]:
+        """Get the compiled route for a tool"""
+        return self._routes.get(tool_name)
     
     def get_tool(self, tool_name: str) -> Optional[tuple]:
         """
@@ -544,11 +728,8 @@ class SpecialistRegistry:
         Returns:
             Tuple of (specialist_id, SpecialistTool) or None
         """
-        for spec_id, definition in self._definitions.items():
-            for tool in definition.tools:
-                if tool.name == tool_name:
-                    return (spec_id, tool)
-        return None
+        route = self._routes.get(tool_name)
+        return (route.specialist_id, route.tool) if route else None
     
     def get_all_tools(self) -> Dict[str, tuple]:
         """
@@ -557,11 +738,17 @@ class SpecialistRegistry:
         Returns:
             Dict mapping tool_name -> (specialist_id, SpecialistTool)
         """
-        tools = {}
-        for spec_id, definition in self._definitions.items():
-            for tool in definition.tools:
-                tools[tool.name] = (spec_id, tool)
-        return tools
+        return {name: (route.specialist_id, route.tool) for name, route in self._routes.items()}
+    
+    def add_route_listener(self, listener: Callable[[Dict[str, ToolRoute]], None]):
+        """Register a callback for routing table rebuilds: listener(routes)"""
+        self._route_listeners.append(listener)
+    
+    def _rebuild_routes(self):
+        """Recompile the routing table and swap it in"""
+        self._routes = compile_routes(self._definitions)
+        for listener in self._route_listeners:
+            listener(self._routes)
     
     def get_tools_description(self) -> str:
         """Generate tools description for LLM prompt"""
@@ -575,7 +762,12 @@ class SpecialistRegistry:
         return "\n".join(lines)
     
     async def check_health(self, specialist_id: str) -> SpecialistHealth:
-        """Check health of a single specialist"""
+        """
+        Actively probe a single specialist
+        
+        The probe's outcome is recorded like any other request to the host,
+        so it feeds the same passive health as real traffic.
+        """
         if specialist_id not in self._definitions:
             return SpecialistHealth(
                 status=SpecialistStatus.UNKNOWN,
@@ -584,50 +776,52 @@ class SpecialistRegistry:
         
         definition = self._definitions[specialist_id]
         url = self._urls.get(specialist_id)
-        health = self._health.get(specialist_id, SpecialistHealth())
+        health = self._health.setdefault(specialist_id, SpecialistHealth())
+        origin = HttpPoolManager.origin(url)
         
+        # Probe over the shared keep-alive pool rather than a fresh connection
+        probe_url = f"{url}{definition.health_path}"
+        http_pool.request_started(origin)
+        started = time.perf_counter()
         try:
-            start_time = datetime.now(timezone.utc)
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{url}{definition.health_path}")
-                
-            end_time = datetime.now(timezone.utc)
-            response_time = (end_time - start_time).total_seconds() * 1000
-            
-            if response.status_code == 200:
-                health.status = SpecialistStatus.HEALTHY
-                health.consecutive_failures = 0
-                health.error_message = None
+            response = await http_pool.get_client(probe_url).get(probe_url, timeout=10.0)
+        except Exception as e:
+            http_pool.request_finished(
+                origin, error=True, latency=time.perf_counter() - started, detail=describe_transport_error(e)
+            )
+            # A failed probe is direct evidence; don't wait for more failures
+            self._refresh_from_traffic(specialist_id)
+            health.status = SpecialistStatus.UNHEALTHY
+            health.error_message = describe_transport_error(e)
+            self._probe_failures[specialist_id] = self._probe_failures.get(specialist_id, 0) + 1
+        except BaseException:
+            # Cancelled probe: no evidence either way
+            http_pool.request_finished(origin)
+            raise
+        else:
+            ok = response.status_code == 200
+            http_pool.request_finished(
+                origin,
+                error=not ok,
+                latency=time.perf_counter() - started,
+                detail=None if ok else f"HTTP {response.status_code}"
+            )
+            if ok:
                 try:
                     health.metadata = response.json()
-                except:
+                except Exception:
                     health.metadata = {}
+                self._probe_failures[specialist_id] = 0
             else:
-                health.status = SpecialistStatus.DEGRADED
-                health.consecutive_failures += 1
-                health.error_message = f"HTTP {response.status_code}"
-            
-            health.response_time_ms = response_time
-            health.last_check = end_time
-            
-        except httpx.ConnectError:
-            health.status = SpecialistStatus.UNHEALTHY
-            health.consecutive_failures += 1
-            health.error_message = "Connection refused"
-            health.last_check = datetime.now(timezone.utc)
-        except httpx.TimeoutException:
-            health.status = SpecialistStatus.UNHEALTHY
-            health.consecutive_failures += 1
-            health.error_message = "Timeout"
-            health.last_check = datetime.now(timezone.utc)
-        except Exception as e:
+                self._probe_failures[specialist_id] = self._probe_failures.get(specialist_id, 0) + 1
+            self._refresh_from_traffic(specialist_id)
+        
+        # A reachable host whose circuit is still open is not yet serving tool calls
+        health.circuit_state = http_pool.breaker(origin).state.value
+        if health.circuit_state == CircuitState.OPEN.value:
             health.status = SpecialistStatus.UNHEALTHY
-            health.consecutive_failures += 1
-            health.error_message = str(e)
-            health.last_check = datetime.now(timezone.utc)
+            health.error_message = "Circuit open"
         
-        self._health[specialist_id] = health
         return health
     
     async def check_all_health(self) -> Dict[str, SpecialistHealth]:
@@ -649,38 +843,115 @@ class SpecialistRegistry:
         """
         Verify that all critical specialists are healthy.
         
+        Only specialists without health data are probed; the rest are judged
+        on their current (passive or probed) health.
+        
         Returns:
             Tuple of (all_healthy: bool, unhealthy_list: List[str])
         """
-        await self.check_all_health()
+        unknown = [
+            spec_id for spec_id in self.critical_specialists
+            if spec_id not in self._health or self._health[spec_id].status == SpecialistStatus.UNKNOWN
+        ]
+        if unknown:
+            await asyncio.gather(*(self.check_health(spec_id) for spec_id in unknown), return_exceptions=True)
         
         unhealthy = []
         for spec_id in self.critical_specialists:
-            health = self._health.get(spec_id)
+            health = self.get_health(spec_id)
             if not health or health.status != SpecialistStatus.HEALTHY:
                 unhealthy.append(spec_id)
         
         return (len(unhealthy) == 0, unhealthy)
     
+    def _jittered(self, interval: float) -> float:
+        return interval * random.uniform(1 - self._probe_jitter, 1 + self._probe_jitter)
+    
+    def _probe_interval(self, specialist_id: str) -> Optional[float]:
+        """
+        Seconds until the next probe, or None if traffic makes it unnecessary
+        
+        Healthy specialists with recent traffic are never probed. Idle ones
+        are probed every ``health_check_interval``; suspect ones (unknown,
+        degraded or unhealthy) sooner, backing off while probes keep failing.
+        """
+        health = self._refresh_from_traffic(specialist_id)
+        url = self._urls.get(specialist_id)
+        if health is None or url is None:
+            return None
+        
+        idle = http_pool.host_health(HttpPoolManager.origin(url)).idle_seconds()
+        if health.status == SpecialistStatus.HEALTHY:
+            if idle < self._health_check_interval:
+                return None
+            return self._jittered(self._health_check_interval)
+        
+        failures = self._probe_failures.get(specialist_id, 0)
+        backoff = min(self._suspect_probe_interval * (2 ** failures), self._max_probe_interval)
+        return self._jittered(backoff)
+    
+    def request_probe(self, specialist_id: str):
+        """Ask the monitor to probe a specialist soon (non-blocking)"""
+        if specialist_id not in self._definitions:
+            return
+        self._next_probe[specialist_id] = 0.0
+        if self._probe_wakeup is not None:
+            self._probe_wakeup.set()
+    
+    async def _probe_due(self) -> float:
+        """Probe specialists whose schedule is due; returns seconds until the next one"""
+        now = time.monotonic()
+        due = []
+        for spec_id in list(self._definitions):
+            next_at = self._next_probe.get(spec_id)
+            if next_at is None:
+                # Spread the first round of probes instead of firing in lockstep
+                next_at = self._next_probe[spec_id] = now + random.uniform(0, self._suspect_probe_interval)
+            if next_at <= now:
+                due.append(spec_id)
+        
+        if due:
+            results = await asyncio.gather(*(self.check_health(spec_id) for spec_id in due), return_exceptions=True)
+            for spec_id, result in zip(due, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Health probe for {spec_id} failed: {result}")
+        
+        now = time.monotonic()
+        for spec_id in list(self._definitions):
+            if self._next_probe.get(spec_id, 0.0) <= now:
+                interval = self._probe_interval(spec_id)
+                # Active, healthy specialists are re-evaluated a full interval later
+                self._next_probe[spec_id] = now + (interval if interval is not None else self._health_check_interval)
+        
+        return max(0.0, min(self._next_probe.values(), default=now + self._health_check_interval) - now)
+    
     async def start_health_monitoring(self):
-        """Start background health monitoring"""
+        """Start background health monitoring (adaptive, jittered probes)"""
         if self._health_check_task is not None:
             return
         
+        http_pool.add_circuit_listener(self._on_circuit_change)
+        self._probe_wakeup = asyncio.Event()
+        
         async def monitor():
             while True:
                 try:
-                    await self.check_all_health()
-                    logger.debug("Health check completed for all specialists")
+                    delay = await self._probe_due()
                 except Exception as e:
                     logger.error(f"Health monitoring error: {e}")
-                await asyncio.sleep(self._health_check_interval)
+                    delay = self._suspect_probe_interval
+                self._probe_wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._probe_wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
         
         self._health_check_task = asyncio.create_task(monitor())
-        logger.info(f"Started health monitoring (interval: {self._health_check_interval}s)")
+        logger.info(f"Started adaptive health monitoring (idle interval: {self._health_check_interval}s)")
     
     async def stop_health_monitoring(self):
         """Stop background health monitoring"""
+        http_pool.remove_circuit_listener(self._on_circuit_change)
         if self._health_check_task:
             self._health_check_task.cancel()
             try:
@@ -688,6 +959,7 @@ class SpecialistRegistry:
             except asyncio.CancelledError:
                 pass
             self._health_check_task = None
+            self._probe_wakeup = None
             logger.info("Stopped health monitoring")
     
     def get_status_summary(self) -> Dict[str, Any]:
@@ -701,7 +973,8 @@ class SpecialistRegistry:
             "specialists": {}
         }
         
-        for spec_id, health in self._health.items():
+        for spec_id in list(self._health):
+            health = self._refresh_from_traffic(spec_id)
             summary[health.status.value] += 1
             definition = self._definitions.get(spec_id)
             summary["specialists"][spec_id] = {
@@ -712,6 +985,7 @@ class SpecialistRegistry:
                 "response_time_ms": health.response_time_ms,
                 "last_check": health.last_check.isoformat() if health.last_check else None,
                 "error": health.error_message,
+                "circuit_state": health.circuit_state,
                 "tool_count": len(definition.tools) if definition else 0
             }
         
@@ -735,6 +1009,7 @@ class SpecialistRegistry:
         
         if definition:
             self._definitions[specialist_id] = definition
+            self._rebuild_routes()
         
         if specialist_id not in self._health:
             self._health[specialist_id] = SpecialistHealth()
@@ -744,8 +1019,11 @@ class SpecialistRegistry:
     def unregister_specialist(self, specialist_id: str):
         """Remove a specialist from the registry"""
         self._urls.pop(specialist_id, None)
-        self._definitions.pop(specialist_id, None)
+        if self._definitions.pop(specialist_id, None) is not None:
+            self._rebuild_routes()
         self._health.pop(specialist_id, None)
+        self._next_probe.pop(specialist_id, None)
+        self._probe_failures.pop(specialist_id, None)
         logger.info(f"Unregistered specialist: {specialist_id}")
 
 
@@ -765,8 +1043,8 @@ async def get_healthy_specialists() -> List[str]:
     """Get list of currently healthy specialist IDs"""
     return [
         spec_id 
-        for spec_id, health in specialist_registry._health.items()
-        if health.status == SpecialistStatus.HEALTHY
+        for spec_id in list(specialist_registry._health)
+        if specialist_registry.get_health(spec_id).status == SpecialistStatus.HEALTHY
     ]
 
 
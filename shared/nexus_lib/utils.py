@@ -3,11 +3,18 @@ Nexus Utility Functions
 HTTP Client, Retry Logic, and Common Helpers
 """
 import os
+import time
 import logging
 import asyncio
 import hashlib
 import json
-from typing import Optional, Dict, Any, List, TypeVar, Callable
+import weakref
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from itertools import accumulate
+from enum import Enum
+from typing import Optional, Dict, Any, List, TypeVar, Callable, Hashable, Tuple
 from datetime import datetime, timezone
 from functools import wraps
 
@@ -16,16 +23,565 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
     before_sleep_log,
     RetryError
 )
 
+from nexus_lib.instrumentation import (
+    HTTP_POOL_REQUESTS,
+    HTTP_POOL_IN_FLIGHT,
+    CIRCUIT_BREAKER_STATE,
+    CIRCUIT_BREAKER_TRANSITIONS,
+    CIRCUIT_BREAKER_REJECTIONS,
+    HTTP_RETRIES_TOTAL,
+    CACHE_REQUESTS_TOTAL,
+    CACHE_EVICTIONS_TOTAL,
+)
+
 logger = logging.getLogger("nexus.utils")
 
 T = TypeVar("T")
 
 
+# ============================================================================
+# CIRCUIT BREAKER AND RETRY BUDGET
+# ============================================================================
+
+# Transport failures that are worth retrying and count against a circuit
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectTimeout,
+    httpx.ReadTimeout,
+    httpx.ConnectError,
+    httpx.RemoteProtocolError
+)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker state"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Numeric encoding for the state gauge
+_CIRCUIT_STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class RollingWindow:
+    """Success/failure counts over the last ``window_seconds``, in one-second buckets"""
+    
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._buckets: deque = deque()  # [second, requests, failures]
+    
+    def _expire(self, now: float):
+        while self._buckets and self._buckets[0][0] <= now - self.window_seconds:
+            self._buckets.popleft()
+    
+    def record(self, failure: bool = False):
+        """Record one outcome"""
+        now = time.monotonic()
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0])
+        self._buckets[-1][1] += 1
+        self._buckets[-1][2] += int(failure)
+        self._expire(now)
+    
+    def totals(self) -> tuple:
+        """(requests, failures) in the window"""
+        self._expire(time.monotonic())
+        return (
+            sum(b[1] for b in self._buckets),
+            sum(b[2] for b in self._buckets)
+        )
+    
+    def reset(self):
+        self._buckets.clear()
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker driven by a rolling error rate.
+    
+    Closed: requests flow; once the window holds at least ``min_requests``
+    outcomes and the failure rate reaches ``failure_rate_threshold`` the
+    circuit opens. Open: requests are rejected immediately for
+    ``open_seconds``. Half-open: up to ``half_open_max_calls`` trial requests
+    are let through; a success closes the circuit, a failure re-opens it.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: Optional[float] = None,
+        min_requests: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        open_seconds: Optional[float] = None,
+        half_open_max_calls: int = 1,
+        on_state_change: Optional[Callable[[str, CircuitState], None]] = None
+    ):
+        """
+        Initialize the circuit breaker
+        
+        Args:
+            name: Host (origin) the breaker protects
+            failure_rate_threshold: Failure fraction that opens the circuit
+            min_requests: Outcomes needed in the window before the rate is trusted
+            window_seconds: Rolling window length
+            open_seconds: How long the circuit stays open before a trial request
+            half_open_max_calls: Concurrent trial requests while half-open
+            on_state_change: Called with (name, new_state) on every transition
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold or float(
+            os.environ.get("HTTP_CIRCUIT_FAILURE_RATE", "0.5")
+        )
+        self.min_requests = min_requests or int(os.environ.get("HTTP_CIRCUIT_MIN_REQUESTS", "10"))
+        self.open_seconds = open_seconds if open_seconds is not None else float(
+            os.environ.get("HTTP_CIRCUIT_OPEN_SECONDS", "15")
+        )
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        
+        self._window = RollingWindow(window_seconds or float(os.environ.get("HTTP_CIRCUIT_WINDOW", "30")))
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+    
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an open circuit turns half-open once ``open_seconds`` pass)"""
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+    
+    def _transition(self, state: CircuitState):
+        if state == self._state:
+            return
+        previous, self._state = self._state, state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if state != CircuitState.HALF_OPEN:
+            self._half_open_calls = 0
+        if state == CircuitState.CLOSED:
+            self._window.reset()
+        
+        CIRCUIT_BREAKER_STATE.labels(host=self.name).set(_CIRCUIT_STATE_VALUES[state])
+        CIRCUIT_BREAKER_TRANSITIONS.labels(host=self.name, state=state.value).inc()
+        logger.warning(f"Circuit for {self.name}: {previous.value} -> {state.value}")
+        
+        if self.on_state_change:
+            try:
+                self.on_state_change(self.name, state)
+            except Exception as e:
+                logger.error(f"Circuit state listener failed: {e}")
+    
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now (reserves a trial slot when half-open)"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        CIRCUIT_BREAKER_REJECTIONS.labels(host=self.name).inc()
+        return False
+    
+    def release_trial(self):
+        """Give back a half-open trial slot whose request ended without an outcome (e.g. cancelled)"""
+        if self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+    
+    def record_success(self):
+        """Record a successful request"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+        else:
+            self._window.record(failure=False)
+    
+    def record_failure(self):
+        """Record a failed request"""
+        if self._state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+        self._window.record(failure=True)
+        requests, failures = self._window.totals()
+        if (
+            self._state == CircuitState.CLOSED
+            and requests >= self.min_requests
+            and failures / requests >= self.failure_rate_threshold
+        ):
+            self._transition(CircuitState.OPEN)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and window counts"""
+        requests, failures = self._window.totals()
+        return {
+            "state": self.state.value,
+            "window_requests": requests,
+            "window_failures": failures,
+            "failure_rate": round(failures / requests, 4) if requests else 0.0
+        }
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of live traffic for one host.
+    
+    A retry is allowed while retries in the rolling window stay below
+    ``ratio`` x requests (plus a small per-second floor so low-traffic hosts
+    can still retry), so an outage cannot multiply load by ``max_retries``.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        ratio: Optional[float] = None,
+        min_per_second: Optional[float] = None,
+        window_seconds: float = 10.0
+    ):
+        """
+        Initialize the retry budget
+        
+        Args:
+            name: Host (origin) the budget applies to
+            ratio: Retries allowed per request in the window
+            min_per_second: Retries always allowed per second of window
+            window_seconds: Rolling window length
+        """
+        self.name = name
+        self.ratio = ratio if ratio is not None else float(os.environ.get("HTTP_RETRY_BUDGET_RATIO", "0.2"))
+        self.min_per_second = min_per_second if min_per_second is not None else float(
+            os.environ.get("HTTP_RETRY_BUDGET_MIN_PER_SECOND", "1")
+        )
+        self.window_seconds = window_seconds
+        self._requests = RollingWindow(window_seconds)
+        self._retries = RollingWindow(window_seconds)
+    
+    def record_request(self):
+        """Record a first attempt"""
+        self._requests.record()
+    
+    def try_retry(self) -> bool:
+        """Withdraw one retry from the budget; False if it is exhausted"""
+        requests, _ = self._requests.totals()
+        retries, _ = self._retries.totals()
+        allowed = self.ratio * requests + self.min_per_second * self.window_seconds
+        if retries >= allowed:
+            HTTP_RETRIES_TOTAL.labels(host=self.name, result="budget_exhausted").inc()
+            return False
+        self._retries.record()
+        HTTP_RETRIES_TOTAL.labels(host=self.name, result="retried").inc()
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        requests, _ = self._requests.totals()
+        retries, _ = self._retries.totals()
+        return {"window_requests": requests, "window_retries": retries, "ratio": self.ratio}
+
+
+class HostHealth:
+    """
+    Passive health of one host, derived from real request outcomes.
+    
+    Tracks an exponentially weighted moving average of latency and a rolling
+    error rate, so callers can judge a host from the traffic already flowing
+    to it instead of probing it.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        alpha: Optional[float] = None,
+        window_seconds: Optional[float] = None
+    ):
+        """
+        Initialize host health
+        
+        Args:
+            name: Host (origin) being tracked
+            alpha: EWMA weight of the newest latency sample
+            window_seconds: Rolling window for the error rate
+        """
+        self.name = name
+        self.alpha = alpha or float(os.environ.get("HTTP_HEALTH_EWMA_ALPHA", "0.3"))
+        self._window = RollingWindow(window_seconds or float(os.environ.get("HTTP_HEALTH_WINDOW", "30")))
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_seen: Optional[float] = None
+        self.last_seen_at: Optional[datetime] = None
+    
+    def record(self, latency: float, failure: bool = False, error: Optional[str] = None):
+        """
+        Record one request outcome
+        
+        Args:
+            latency: Seconds the request took
+            failure: Whether it failed (transport error or 5xx)
+            error: Short description of the failure
+        """
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.alpha * (latency - self.latency_ewma)
+        self._window.record(failure=failure)
+        if failure:
+            self.consecutive_failures += 1
+            self.last_error = error
+        else:
+            self.consecutive_failures = 0
+            self.last_error = None
+        self.last_seen = time.monotonic()
+        self.last_seen_at = datetime.now(timezone.utc)
+    
+    def totals(self) -> Tuple[int, int]:
+        """(requests, failures) in the rolling window"""
+        return self._window.totals()
+    
+    def idle_seconds(self) -> float:
+        """Seconds since the last recorded outcome (inf if none)"""
+        if self.last_seen is None:
+            return float("inf")
+        return time.monotonic() - self.last_seen
+    
+    def get_stats(self) -> Dict[str, Any]:
+        requests, failures = self.totals()
+        return {
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 2) if self.latency_ewma is not None else None,
+            "window_requests": requests,
+            "window_failures": failures,
+            "consecutive_failures": self.consecutive_failures,
+            "idle_seconds": round(self.idle_seconds(), 1) if self.last_seen is not None else None
+        }
+
+
+# ============================================================================
+# SHARED CONNECTION POOLS
+# ============================================================================
+
+def describe_transport_error(exc: BaseException) -> str:
+    """Short, stable description of a request failure for health reporting"""
+    if isinstance(exc, httpx.ConnectError):
+        return "Connection refused"
+    if isinstance(exc, httpx.TimeoutException):
+        return "Timeout"
+    return str(exc) or type(exc).__name__
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)"""
+    import importlib.util
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpPoolManager:
+    """
+    Process-wide pool of ``httpx.AsyncClient`` instances, one per origin.
+    
+    Every ``AsyncHttpClient`` (and any caller that needs raw httpx) talking
+    to the same scheme/host/port shares one connection pool, so inter-service
+    calls reuse keep-alive connections instead of paying TCP/TLS setup. Pools
+    are kept per event loop because httpx connections cannot cross loops.
+    """
+    
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None
+    ):
+        """
+        Initialize the pool manager
+        
+        Args:
+            max_connections: Maximum open connections per host
+            max_keepalive_connections: Maximum idle connections kept per host
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Negotiate HTTP/2 when the ``h2`` package is installed
+        """
+        self.max_connections = max_connections or int(os.environ.get("HTTP_POOL_MAX_CONNECTIONS", "100"))
+        self.max_keepalive_connections = max_keepalive_connections or int(
+            os.environ.get("HTTP_POOL_MAX_KEEPALIVE", "20")
+        )
+        self.keepalive_expiry = keepalive_expiry if keepalive_expiry is not None else float(
+            os.environ.get("HTTP_POOL_KEEPALIVE_EXPIRY", "30")
+        )
+        if http2 is None:
+            http2 = os.environ.get("HTTP_POOL_HTTP2", "true").lower() == "true"
+        self.http2 = http2 and _http2_available()
+        
+        self._clients: Dict[Any, Dict[str, httpx.AsyncClient]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._host_health: Dict[str, HostHealth] = {}
+        # Bound methods are held weakly so listeners do not keep their owners alive
+        self._circuit_listeners: List[Callable[[], Optional[Callable[[str, CircuitState], None]]]] = []
+    
+    @staticmethod
+    def origin(url: str) -> str:
+        """scheme://host:port of a URL"""
+        parsed = httpx.URL(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        return f"{parsed.scheme}://{parsed.host}:{port}"
+    
+    @staticmethod
+    def _loop_key():
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+    
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Get the pooled client for the origin of ``url``
+        
+        Args:
+            url: Any URL on the target host
+        """
+        loop = self._loop_key()
+        clients = self._clients.get(loop)
+        if clients is None:
+            # Drop pools that belong to event loops which have since closed
+            for stale in [loop for loop in self._clients if loop is not None and loop.is_closed()]:
+                del self._clients[stale]
+            clients = self._clients[loop] = {}
+        
+        origin = self.origin(url)
+        client = clients.get(origin)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry
+                ),
+                follow_redirects=True
+            )
+            clients[origin] = client
+            self._stats.setdefault(origin, {"requests": 0, "in_flight": 0, "peak_in_flight": 0, "errors": 0})
+            logger.debug(f"Created pooled HTTP client for {origin} (http2={self.http2})")
+        return client
+    
+    def breaker(self, origin: str) -> CircuitBreaker:
+        """Circuit breaker for ``origin``"""
+        breaker = self._breakers.get(origin)
+        if breaker is None:
+            breaker = self._breakers[origin] = CircuitBreaker(origin, on_state_change=self._notify_circuit)
+        return breaker
+    
+    def retry_budget(self, origin: str) -> RetryBudget:
+        """Retry budget for ``origin``"""
+        budget = self._budgets.get(origin)
+        if budget is None:
+            budget = self._budgets[origin] = RetryBudget(origin)
+        return budget
+    
+    def host_health(self, origin: str) -> HostHealth:
+        """Passive health tracker for ``origin``"""
+        health = self._host_health.get(origin)
+        if health is None:
+            health = self._host_health[origin] = HostHealth(origin)
+        return health
+    
+    def add_circuit_listener(self, listener: Callable[[str, CircuitState], None]):
+        """
+        Register a callback for circuit state changes: listener(origin, state)
+        
+        Bound methods are held by weak reference and dropped once their
+        object is garbage collected. Registering a listener twice is a no-op.
+        """
+        if any(ref() == listener for ref in self._circuit_listeners):
+            return
+        if hasattr(listener, "__self__"):
+            self._circuit_listeners.append(weakref.WeakMethod(listener))
+        else:
+            self._circuit_listeners.append(lambda: listener)
+    
+    def remove_circuit_listener(self, listener: Callable[[str, CircuitState], None]):
+        """Unregister a callback added with ``add_circuit_listener``"""
+        self._circuit_listeners = [
+            ref for ref in self._circuit_listeners if ref() is not None and ref() != listener
+        ]
+    
+    def _notify_circuit(self, origin: str, state: CircuitState):
+        listeners = [ref() for ref in self._circuit_listeners]
+        if None in listeners:
+            self._circuit_listeners = [ref for ref in self._circuit_listeners if ref() is not None]
+        for listener in listeners:
+            if listener is not None:
+                listener(origin, state)
+    
+    def request_started(self, origin: str):
+        """Record a request entering the pool for ``origin``"""
+        stats = self._stats.setdefault(origin, {"requests": 0, "in_flight": 0, "peak_in_flight": 0, "errors": 0})
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        HTTP_POOL_REQUESTS.labels(host=origin).inc()
+        HTTP_POOL_IN_FLIGHT.labels(host=origin).set(stats["in_flight"])
+    
+    def request_finished(
+        self,
+        origin: str,
+        error: bool = False,
+        latency: Optional[float] = None,
+        detail: Optional[str] = None
+    ):
+        """
+        Record a request leaving the pool for ``origin``
+        
+        Args:
+            origin: Host the request went to
+            error: Whether it failed (transport error or 5xx)
+            latency: Seconds it took; feeds the host's passive health
+            detail: Short failure description (e.g. "Timeout", "HTTP 503")
+        """
+        stats = self._stats[origin]
+        stats["in_flight"] -= 1
+        if error:
+            stats["errors"] += 1
+        HTTP_POOL_IN_FLIGHT.labels(host=origin).set(stats["in_flight"])
+        if latency is not None:
+            self.host_health(origin).record(latency, failure=error, error=detail)
+    
+    async def close_all(self):
+        """Close every pooled client (call on shutdown)"""
+        for clients in self._clients.values():
+            for client in clients.values():
+                if not client.is_closed:
+                    await client.aclose()
+        self._clients.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-host request counts and pool utilization"""
+        return {
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "hosts": {
+                origin: {
+                    **stats,
+                    "utilization": round(stats["in_flight"] / self.max_connections, 4),
+                    "circuit": self._breakers[origin].get_stats() if origin in self._breakers else None,
+                    "retry_budget": self._budgets[origin].get_stats() if origin in self._budgets else None,
+                    "health": self._host_health[origin].get_stats() if origin in self._host_health else None
+                }
+                for origin, stats in self._stats.items()
+            }
+        }
+
+
+# Global pool manager shared by every client in the process
+http_pool = HttpPoolManager()
+
+
 # ============================================================================
 # ASYNC HTTP CLIENT WITH RETRY
 # ============================================================================
@@ -34,6 +590,11 @@ class AsyncHttpClient:
     """
     Async HTTP client with built-in retry logic, circuit breaker pattern,
     and comprehensive error handling.
+    
+    Connections, circuit breakers and retry budgets are shared per host
+    through the pool manager: requests to a host whose circuit is open fail
+    immediately, and transport errors are only retried while the host's
+    retry budget allows it.
     """
     
     def __init__(
@@ -44,7 +605,8 @@ class AsyncHttpClient:
         max_retries: int = 3,
         retry_min_wait: float = 1.0,
         retry_max_wait: float = 10.0,
-        auth_token: Optional[str] = None
+        auth_token: Optional[str] = None,
+        pool: Optional[HttpPoolManager] = None
     ):
         """
         Initialize the HTTP client
@@ -57,6 +619,7 @@ class AsyncHttpClient:
             retry_min_wait: Minimum wait between retries (seconds)
             retry_max_wait: Maximum wait between retries (seconds)
             auth_token: Optional JWT token for authentication
+            pool: Connection pool manager (defaults to the shared ``http_pool``)
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
@@ -75,17 +638,33 @@ class AsyncHttpClient:
         if auth_token:
             default_headers["Authorization"] = f"Bearer {auth_token}"
         
-        self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=httpx.Timeout(timeout),
-            headers=default_headers,
-            follow_redirects=True
-        )
+        self.headers = default_headers
+        self.pool = pool or http_pool
         
         self._closed = False
     
-    def _create_retry_decorator(self):
-        """Create tenacity retry decorator"""
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client for this base URL's host (shared with other clients)"""
+        return self.pool.get_client(self.base_url)
+    
+    def _create_retry_decorator(self, origin: str):
+        """
+        Create tenacity retry decorator
+        
+        Retries transport errors only while the host's circuit is closed and
+        its retry budget has room.
+        """
+        breaker = self.pool.breaker(origin)
+        budget = self.pool.retry_budget(origin)
+        
+        def should_retry(exc: BaseException) -> bool:
+            return (
+                isinstance(exc, RETRYABLE_EXCEPTIONS)
+                and breaker.state == CircuitState.CLOSED
+                and budget.try_retry()
+            )
+        
         return retry(
             stop=stop_after_attempt(self.max_retries),
             wait=wait_exponential(
@@ -93,12 +672,7 @@ class AsyncHttpClient:
                 min=self.retry_min_wait,
                 max=self.retry_max_wait
             ),
-            retry=retry_if_exception_type((
-                httpx.ConnectTimeout,
-                httpx.ReadTimeout,
-                httpx.ConnectError,
-                httpx.RemoteProtocolError
-            )),
+            retry=retry_if_exception(should_retry),
             before_sleep=before_sleep_log(logger, logging.WARNING),
             reraise=True
         )
@@ -130,25 +704,67 @@ class AsyncHttpClient:
             raise RuntimeError("Client has been closed")
         
         url = endpoint if endpoint.startswith("http") else f"{self.base_url}{endpoint}"
+        origin = self.pool.origin(url)
+        request_headers = {**self.headers, **headers} if headers else self.headers
         
-        @self._create_retry_decorator()
+        breaker = self.pool.breaker(origin)
+        if not breaker.allow_request():
+            logger.warning(f"Circuit open for {origin}, failing fast")
+            return {"status": "error", "error": f"Circuit open for {origin}", "circuit_open": True}
+        self.pool.retry_budget(origin).record_request()
+        # Whether the breaker saw this request's outcome; if not, its
+        # half-open trial slot (if any) is released on the way out
+        outcome_recorded = False
+        
+        @self._create_retry_decorator(origin)
         async def _make_request():
+            nonlocal outcome_recorded
             request_kwargs = {
                 "method": method.upper(),
                 "url": url,
                 "params": params,
-                "headers": headers
+                "headers": request_headers,
+                "timeout": timeout or self.timeout
             }
             
             if json_body is not None:
                 request_kwargs["json"] = json_body
             
-            if timeout:
-                request_kwargs["timeout"] = timeout
-            
             logger.debug(f"{method.upper()} {url} params={params}")
             
-            response = await self.client.request(**request_kwargs)
+            self.pool.request_started(origin)
+            started = time.perf_counter()
+            try:
+                response = await self.pool.get_client(url).request(**request_kwargs)
+            except Exception as e:
+                transport_error = isinstance(e, httpx.TransportError)
+                self.pool.request_finished(
+                    origin,
+                    error=True,
+                    latency=time.perf_counter() - started if transport_error else None,
+                    detail=describe_transport_error(e)
+                )
+                if transport_error:
+                    breaker.record_failure()
+                    outcome_recorded = True
+                raise
+            except BaseException:
+                # Cancelled: leave the pool's books balanced
+                self.pool.request_finished(origin)
+                raise
+            
+            server_error = response.status_code >= 500
+            self.pool.request_finished(
+                origin,
+                error=server_error,
+                latency=time.perf_counter() - started,
+                detail=f"HTTP {response.status_code}" if server_error else None
+            )
+            if server_error:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            outcome_recorded = True
             response.raise_for_status()
             
             # Handle empty responses
@@ -176,6 +792,9 @@ class AsyncHttpClient:
         except Exception as e:
             logger.error(f"Request failed: {e}")
             return {"status": "error", "error": str(e)}
+        finally:
+            if not outcome_recorded:
+                breaker.release_trial()
     
     async def get(
         self,
@@ -222,9 +841,13 @@ class AsyncHttpClient:
         return await self.request("DELETE", endpoint, **kwargs)
     
     async def close(self):
-        """Close the HTTP client"""
+        """
+        Close the HTTP client
+        
+        The underlying connection pool is shared and stays open; it is
+        closed by ``http_pool.close_all()`` on shutdown.
+        """
         if not self._closed:
-            await self.client.aclose()
             self._closed = True
             logger.debug("HTTP client closed")
     
@@ -465,30 +1088,89 @@ async def retry_async(
 # CACHING UTILITIES
 # ============================================================================
 
+class _CacheEntry:
+    """A cached value with its expiry times (monotonic seconds)"""
+    __slots__ = ("value", "expires_at", "stale_until")
+    
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+
+
 class SimpleCache:
-    """Simple in-memory cache with TTL"""
+    """
+    Bounded in-memory LRU cache with TTL.
+    
+    Expiry uses the monotonic clock. When more than ``max_size`` entries are
+    stored the least recently used is evicted. An entry may carry a stale
+    window after its TTL during which ``lookup`` still returns it (flagged
+    stale) so callers can serve it while refreshing.
+    """
     
-    def __init__(self, default_ttl: int = 300):
-        self._cache: Dict[str, tuple] = {}
+    def __init__(self, default_ttl: int = 300, max_size: Optional[int] = None, name: str = "default"):
+        """
+        Initialize the cache
+        
+        Args:
+            default_ttl: Default time to live in seconds
+            max_size: Maximum entries (defaults to CACHE_MAX_ENTRIES)
+            name: Label used in metrics
+        """
+        self._cache: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
         self._default_ttl = default_ttl
+        self.max_size = max_size or int(os.environ.get("CACHE_MAX_ENTRIES", "10000"))
+        self.name = name
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0}
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired"""
-        if key in self._cache:
-            value, expires_at = self._cache[key]
-            if datetime.now(timezone.utc).timestamp() < expires_at:
-                return value
-            else:
-                del self._cache[key]
-        return None
+    def lookup(self, key: Hashable) -> Tuple[bool, Any, bool]:
+        """
+        Look up a key, including values inside their stale window
+        
+        Returns:
+            (found, value, stale)
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.expires_at:
+                self._cache.move_to_end(key)
+                self._record("hits", "hit")
+                return True, entry.value, False
+            if now < entry.stale_until:
+                self._cache.move_to_end(key)
+                self._record("stale_hits", "stale")
+                return True, entry.value, True
+            del self._cache[key]
+            CACHE_EVICTIONS_TOTAL.labels(cache=self.name, reason="expired").inc()
+        self._record("misses", "miss")
+        return False, None, False
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set value in cache with TTL"""
-        ttl = ttl or self._default_ttl
-        expires_at = datetime.now(timezone.utc).timestamp() + ttl
-        self._cache[key] = (value, expires_at)
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get value from cache if not expired"""
+        found, value, stale = self.lookup(key)
+        return value if found and not stale else None
     
-    def delete(self, key: str):
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, stale_ttl: float = 0):
+        """
+        Set value in cache with TTL
+        
+        Args:
+            key: Cache key
+            value: Value to store (None and other falsy values are cached too)
+            ttl: Time to live in seconds (defaults to the cache's default_ttl)
+            stale_ttl: Extra seconds the value may be served stale after ``ttl``
+        """
+        ttl = self._default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl
+        self._cache[key] = _CacheEntry(value, expires_at, expires_at + stale_ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self._stats["evictions"] += 1
+            CACHE_EVICTIONS_TOTAL.labels(cache=self.name, reason="size").inc()
+    
+    def delete(self, key: Hashable):
         """Delete value from cache"""
         self._cache.pop(key, None)
     
@@ -497,58 +1179,137 @@ class SimpleCache:
         self._cache.clear()
     
     def cleanup(self):
-        """Remove expired entries"""
-        now = datetime.now(timezone.utc).timestamp()
-        expired = [k for k, (_, exp) in self._cache.items() if now >= exp]
+        """Remove entries past their stale window"""
+        now = time.monotonic()
+        expired = [k for k, entry in self._cache.items() if now >= entry.stale_until]
         for key in expired:
             del self._cache[key]
+        if expired:
+            CACHE_EVICTIONS_TOTAL.labels(cache=self.name, reason="expired").inc(len(expired))
+    
+    def __len__(self) -> int:
+        return len(self._cache)
+    
+    def _record(self, stat: str, result: str):
+        self._stats[stat] += 1
+        CACHE_REQUESTS_TOTAL.labels(cache=self.name, result=result).inc()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self._stats["hits"] + self._stats["stale_hits"] + self._stats["misses"]
+        return {
+            "name": self.name,
+            "entries": len(self._cache),
+            "max_size": self.max_size,
+            "hit_rate": round((self._stats["hits"] + self._stats["stale_hits"]) / lookups, 4) if lookups else 0.0,
+            **self._stats
+        }
 
 
 # Global cache instance
 cache = SimpleCache()
 
 
-def cached(ttl: int = 300, key_prefix: str = ""):
+def _cache_key_part(value: Any) -> Tuple[str, str]:
+    """Type-tagged repr of one argument"""
+    return (f"{type(value).__module__}.{type(value).__qualname__}", repr(value))
+
+
+def _make_cache_key(prefix: str, args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """
+    Build a cache key from call arguments
+    
+    Arguments are reduced to their type and repr, so equal-hashing values of
+    different types (``1``, ``True``, ``1.0``) get separate entries and the
+    key keeps no reference to the arguments (including ``self``).
+    """
+    return (
+        prefix,
+        tuple(_cache_key_part(arg) for arg in args),
+        tuple((name, _cache_key_part(value)) for name, value in sorted(kwargs.items()))
+    )
+
+
+def cached(
+    ttl: int = 300,
+    key_prefix: str = "",
+    stale_ttl: float = 0,
+    negative_ttl: Optional[float] = None,
+    store: Optional[SimpleCache] = None
+):
     """
     Decorator to cache function results
     
+    For coroutines, concurrent misses for the same key share one call
+    (single-flight), and a value inside its stale window is returned at once
+    while a single background call refreshes it (stale-while-revalidate).
+    Exceptions are never cached.
+    
     Args:
         ttl: Time to live in seconds
         key_prefix: Prefix for cache keys
+        stale_ttl: Seconds after ``ttl`` a value may be served stale while it is refreshed
+        negative_ttl: Time to live for None results (defaults to ``ttl``; 0 disables)
+        store: Cache to use (defaults to the global ``cache``)
     """
     def decorator(func: Callable):
+        target = store if store is not None else cache
+        prefix = key_prefix or f"{func.__module__}.{func.__qualname__}"
+        in_flight: Dict[Hashable, asyncio.Task] = {}
+        
+        def _store(cache_key: Hashable, result: Any):
+            result_ttl = ttl
+            if result is None and negative_ttl is not None:
+                result_ttl = negative_ttl
+            if result_ttl > 0:
+                target.set(cache_key, result, result_ttl, stale_ttl)
+        
+        def _refresh(cache_key: Hashable, args: tuple, kwargs: Dict[str, Any]) -> asyncio.Task:
+            """Start (or join) the single in-flight call for a key"""
+            task = in_flight.get(cache_key)
+            if task is not None and task.get_loop() is asyncio.get_running_loop():
+                return task
+            
+            async def _run():
+                try:
+                    result = await func(*args, **kwargs)
+                    _store(cache_key, result)
+                    return result
+                finally:
+                    in_flight.pop(cache_key, None)
+            
+            task = in_flight[cache_key] = asyncio.ensure_future(_run())
+            return task
+        
+        def _log_refresh_error(task: asyncio.Task):
+            # A failed background refresh keeps serving the stale value
+            if not task.cancelled() and task.exception() is not None:
+                logger.warning(f"Background refresh of {func.__name__} failed: {task.exception()}")
+        
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            key_parts = [key_prefix or func.__name__]
-            key_parts.extend(str(a) for a in args)
-            key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = hash_content(":".join(key_parts))
+            cache_key = _make_cache_key(prefix, args, kwargs)
             
-            # Check cache
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
+            found, value, stale = target.lookup(cache_key)
+            if found:
+                if stale:
+                    _refresh(cache_key, args, kwargs).add_done_callback(_log_refresh_error)
                 logger.debug(f"Cache hit for {func.__name__}")
-                return cached_value
+                return value
             
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            return result
+            # Shield so one cancelled caller does not cancel the shared call
+            return await asyncio.shield(_refresh(cache_key, args, kwargs))
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
-            key_parts = [key_prefix or func.__name__]
-            key_parts.extend(str(a) for a in args)
-            key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
-            cache_key = hash_content(":".join(key_parts))
+            cache_key = _make_cache_key(prefix, args, kwargs)
             
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
+            found, value, stale = target.lookup(cache_key)
+            if found and not stale:
+                return value
             
             result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
+            _store(cache_key, result)
             return result
         
         if asyncio.iscoroutinefunction(func):
@@ -562,69 +1323,196 @@ def cached(ttl: int = 300, key_prefix: str = ""):
 # LOG PROCESSING UTILITIES (for RCA)
 # ============================================================================
 
-# Common error patterns to preserve in truncated logs
-ERROR_PATTERNS = [
-    # Python
-    r"Traceback \(most recent call last\):.*?(?=\n\n|\Z)",
-    r"^\s*File \".*\", line \d+.*$",
-    r"^\w+Error:.*$",
-    r"^\w+Exception:.*$",
-    r"AssertionError:.*$",
-    r"FAILED.*$",
-    
-    # Java/JVM
-    r"Exception in thread.*$",
-    r"^\s*at [\w\.$]+\(.*:\d+\).*$",
-    r"Caused by:.*$",
-    r"java\.\w+\.\w+Exception:.*$",
-    r"BUILD FAILURE.*$",
-    r"\[ERROR\].*$",
-    
-    # JavaScript/Node
-    r"Error:.*$",
-    r"^\s*at .*\(.*:\d+:\d+\).*$",
-    r"ReferenceError:.*$",
-    r"TypeError:.*$",
-    r"SyntaxError:.*$",
-    
-    # Generic CI/Build
-    r"FAILURE:.*$",
-    r"ERROR:.*$",
-    r"FATAL:.*$",
-    r"Test failed:.*$",
-    r"Compilation failed.*$",
-    r"Permission denied.*$",
-    r"Cannot find.*$",
-    r"No such file or directory.*$",
-    r"Command failed.*$",
-    r"Exit code: [1-9]\d*.*$",
-    r"npm ERR!.*$",
-    r"ModuleNotFoundError:.*$",
-    r"ImportError:.*$",
-]
+# Common error patterns to preserve in truncated logs, grouped by family
+ERROR_PATTERN_FAMILIES: Dict[str, List[str]] = {
+    "python": [
+        r"Traceback \(most recent call last\):.*?(?=\n\n|\Z)",
+        r"^\s*File \".*\", line \d+.*$",
+        r"^\w+Error:.*$",
+        r"^\w+Exception:.*$",
+        r"AssertionError:.*$",
+        r"FAILED.*$",
+    ],
+    "jvm": [
+        r"Exception in thread.*$",
+        r"^\s*at [\w\.$]+\(.*:\d+\).*$",
+        r"Caused by:.*$",
+        r"java\.\w+\.\w+Exception:.*$",
+        r"BUILD FAILURE.*$",
+        r"\[ERROR\].*$",
+    ],
+    "javascript": [
+        r"Error:.*$",
+        r"^\s*at .*\(.*:\d+:\d+\).*$",
+        r"ReferenceError:.*$",
+        r"TypeError:.*$",
+        r"SyntaxError:.*$",
+    ],
+    "ci": [
+        r"FAILURE:.*$",
+        r"ERROR:.*$",
+        r"FATAL:.*$",
+        r"Test failed:.*$",
+        r"Compilation failed.*$",
+        r"Permission denied.*$",
+        r"Cannot find.*$",
+        r"No such file or directory.*$",
+        r"Command failed.*$",
+        r"Exit code: [1-9]\d*.*$",
+        r"npm ERR!.*$",
+        r"ModuleNotFoundError:.*$",
+        r"ImportError:.*$",
+    ],
+}
+
+ERROR_PATTERNS = [p for patterns in ERROR_PATTERN_FAMILIES.values() for p in patterns]
 
 # Compiled patterns for efficiency
 import re
 COMPILED_ERROR_PATTERNS = [re.compile(p, re.MULTILINE | re.IGNORECASE) for p in ERROR_PATTERNS]
 
+# One alternation with a named group per family, applied to candidate lines only
+ERROR_FAMILY_REGEX = re.compile(
+    "|".join(
+        f"(?P<{family}>{'|'.join(f'(?:{p})' for p in patterns)})"
+        for family, patterns in ERROR_PATTERN_FAMILIES.items()
+    ),
+    re.MULTILINE | re.IGNORECASE
+)
 
-def truncate_build_log(
+# Lowercase literals at least one of which occurs in any line an
+# ERROR_PATTERNS entry can match (apart from indented stack frames, found by
+# ERROR_FRAME_PREFILTER). Plain substring search is far faster than running
+# the regexes over every position of a multi-MB log.
+ERROR_KEYWORDS = (
+    "error", "exception", "fail", "fatal", "traceback", "caused by", "denied",
+    "cannot find", "no such file", "exit code", "npm err",
+)
+ERROR_FRAME_PREFILTER = re.compile(r'\n[ \t]*(?:at |file ")')
+
+
+@dataclass
+class LogReduction:
+    """Result of reducing a build log for LLM analysis"""
+    text: str
+    total_lines: int = 0
+    error_lines: int = 0
+    error_blocks: int = 0
+    matched_families: Dict[str, int] = field(default_factory=dict)
+    truncated: bool = False
+
+
+def _error_family(line: str) -> Optional[str]:
+    """Pattern family of an error line, or None"""
+    match = ERROR_FAMILY_REGEX.search(line)
+    return match.lastgroup if match else None
+
+
+def _assemble_reduction(
+    head: List[str],
+    tail: List[str],
+    blocks,
+    families: Dict[str, int],
+    total_lines: int,
+    max_total_chars: int,
+    head_lines: int,
+    tail_lines: int
+) -> LogReduction:
+    """
+    Build the reduced log text, adding error blocks while they fit
+    
+    Args:
+        blocks: Iterable of error blocks as line lists, in log order
+            (None marks a block known to exceed the budget)
+    """
+    separator = "\n\n" + "=" * 60 + "\n"
+    header = "=== BUILD LOG START (first {} lines) ===\n".format(head_lines) + '\n'.join(head)
+    footer = (
+        separator + f"[... {total_lines - len(head) - len(tail)} lines truncated ...]\n"
+        + separator + "=== BUILD LOG END (last {} lines) ===\n".format(tail_lines)
+        + '\n'.join(tail)
+    )
+    
+    blocks_header = separator + "=== EXTRACTED ERROR BLOCKS ({}) ===\n".format(", ".join(sorted(families)))
+    kept = []
+    size = len(header) + len(footer) + len(blocks_header)
+    for block_lines in blocks:
+        if block_lines is None:
+            break
+        block = f"\n--- Error Block {len(kept) + 1} ---\n" + '\n'.join(block_lines)
+        if size + len(block) > max_total_chars:
+            break
+        kept.append(block)
+        size += len(block)
+    
+    result = header + (blocks_header + ''.join(kept) if kept else "") + footer
+    
+    # If still too long, hard truncate
+    if len(result) > max_total_chars:
+        result = result[:max_total_chars] + "\n[... LOG TRUNCATED TO FIT CONTEXT WINDOW ...]"
+    
+    return LogReduction(
+        text=result,
+        total_lines=total_lines,
+        error_lines=sum(families.values()),
+        error_blocks=len(kept),
+        matched_families=families,
+        truncated=True
+    )
+
+
+def _candidate_error_lines(text: str, offsets: List[int], first: int, last: int) -> List[int]:
+    """
+    Indexes of lines in [first, last) that contain an error keyword
+    
+    Each keyword is located with str.find over the lowercased log, jumping to
+    the next line after every hit, so the scan is linear in log size.
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Some characters change length when lowercased: lowercase per line instead
+        lines = text.split('\n')
+        return [
+            i for i in range(first, last)
+            if any(k in lines[i].lower() for k in ERROR_KEYWORDS)
+            or ERROR_FRAME_PREFILTER.match('\n' + lines[i].lower())
+        ]
+    
+    start, end = offsets[first], offsets[last]
+    candidates = set()
+    for keyword in ERROR_KEYWORDS:
+        pos = lowered.find(keyword, start, end)
+        while pos != -1:
+            line = bisect_right(offsets, pos) - 1
+            candidates.add(line)
+            pos = lowered.find(keyword, offsets[line + 1], end)
+    
+    # Frame lines are anchored at line start; the preceding newline is before ``start``
+    for match in ERROR_FRAME_PREFILTER.finditer(lowered, max(start - 1, 0), end):
+        candidates.add(bisect_right(offsets, match.start() + 1) - 1)
+    if start == 0 and ERROR_FRAME_PREFILTER.match('\n' + lowered[:offsets[1]]):
+        candidates.add(0)
+    
+    return sorted(line for line in candidates if first <= line < last)
+
+
+def reduce_build_log(
     log_content: str,
-    max_total_chars: int = 100000,  # ~25k tokens for most models
+    max_total_chars: int = 100000,
     head_lines: int = 100,
     tail_lines: int = 200,
     error_context_lines: int = 10,
-    preserve_error_blocks: bool = True
-) -> str:
+    preserve_error_blocks: bool = True,
+    max_error_blocks: int = 20
+) -> LogReduction:
     """
-    Intelligently truncate a build log to fit within LLM context windows
-    while preserving the most relevant error information.
+    Reduce a build log to fit an LLM context window in time linear in its size.
     
-    Strategy:
-    1. Keep the first N lines (build initialization, environment info)
-    2. Keep the last M lines (final status, summary)
-    3. Extract and preserve all error blocks with context
-    4. Ensure total size fits within max_total_chars
+    Keeps the first ``head_lines`` and last ``tail_lines`` lines, and from the
+    middle every line matching ``ERROR_PATTERNS`` with ``error_context_lines``
+    of context. The log is split once into lines with an offset index; error
+    lines are found with a keyword prefilter and classified by a single
+    combined regex; overlapping context windows are merged into one block.
     
     Args:
         log_content: The full build log content
@@ -633,106 +1521,276 @@ def truncate_build_log(
         tail_lines: Number of lines to keep from the end
         error_context_lines: Lines of context around each error
         preserve_error_blocks: Whether to extract and preserve error blocks
+        max_error_blocks: Maximum number of (merged) error blocks kept
     
     Returns:
-        Truncated log with preserved error sections
+        LogReduction with the reduced text and which pattern families matched
     """
     if len(log_content) <= max_total_chars:
-        return log_content
+        return LogReduction(text=log_content, total_lines=log_content.count('\n') + 1)
     
     lines = log_content.split('\n')
     total_lines = len(lines)
     
     if total_lines <= head_lines + tail_lines:
-        return log_content[:max_total_chars]
-    
-    # Extract sections
-    head_section = lines[:head_lines]
-    tail_section = lines[-tail_lines:]
-    middle_section = lines[head_lines:-tail_lines] if tail_lines > 0 else lines[head_lines:]
-    
-    # Find error blocks in the middle section
-    error_blocks = []
-    if preserve_error_blocks and middle_section:
-        middle_text = '\n'.join(middle_section)
-        
-        for pattern in COMPILED_ERROR_PATTERNS:
-            for match in pattern.finditer(middle_text):
-                start_pos = match.start()
-                end_pos = match.end()
-                
-                # Get line numbers
-                start_line = middle_text[:start_pos].count('\n')
-                end_line = middle_text[:end_pos].count('\n')
-                
-                # Add context
-                context_start = max(0, start_line - error_context_lines)
-                context_end = min(len(middle_section), end_line + error_context_lines + 1)
-                
-                error_block = '\n'.join(middle_section[context_start:context_end])
-                
-                # Avoid duplicates
-                if error_block not in error_blocks:
-                    error_blocks.append(error_block)
-    
-    # Build the truncated log
-    separator = "\n\n" + "=" * 60 + "\n"
-    
-    parts = []
+        return LogReduction(text=log_content[:max_total_chars], total_lines=total_lines, truncated=True)
     
-    # Header section
-    parts.append("=== BUILD LOG START (first {} lines) ===\n".format(head_lines))
-    parts.append('\n'.join(head_section))
+    first, last = head_lines, total_lines - tail_lines
     
-    # Error blocks
-    if error_blocks:
-        parts.append(separator)
-        parts.append("=== EXTRACTED ERROR BLOCKS ===\n")
-        for i, block in enumerate(error_blocks[:20], 1):  # Limit to 20 blocks
-            parts.append(f"\n--- Error Block {i} ---\n")
-            parts.append(block)
+    # Find error lines in the middle section and merge their context windows
+    families: Dict[str, int] = {}
+    windows: List[List[int]] = []
+    if preserve_error_blocks:
+        offsets = [0]
+        offsets.extend(accumulate(len(line) + 1 for line in lines))
+        
+        for line_no in _candidate_error_lines(log_content, offsets, first, last):
+            family = _error_family(lines[line_no])
+            if family is None:
+                continue
+            families[family] = families.get(family, 0) + 1
+            
+            window_start = max(first, line_no - error_context_lines)
+            window_end = min(last, line_no + error_context_lines + 1)
+            if windows and window_start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], window_end)
+            else:
+                windows.append([window_start, window_end])
+    
+    return _assemble_reduction(
+        head=lines[:first],
+        tail=lines[last:],
+        blocks=(lines[start:end] for start, end in windows[:max_error_blocks]),
+        families=families,
+        total_lines=total_lines,
+        max_total_chars=max_total_chars,
+        head_lines=head_lines,
+        tail_lines=tail_lines
+    )
+
+
+async def reduce_build_log_async(log_content: str, **kwargs) -> LogReduction:
+    """Run ``reduce_build_log`` on a worker thread so large logs do not block the event loop"""
+    return await asyncio.to_thread(reduce_build_log, log_content, **kwargs)
+
+
+class StreamingLogReducer:
+    """
+    Bounded-memory, incremental version of ``reduce_build_log``.
     
-    # Truncation notice
-    skipped_lines = total_lines - head_lines - tail_lines
-    parts.append(separator)
-    parts.append(f"[... {skipped_lines} lines truncated ...]\n")
+    Feed the log in chunks as it downloads; only the head, a ring buffer of
+    the last ``tail_lines`` lines, the current context window and the error
+    blocks collected so far (capped by ``max_error_blocks`` and
+    ``max_total_chars``) are kept, so memory stays flat however large the
+    log is. ``finish`` produces the same text ``reduce_build_log`` would.
+    """
     
-    # Tail section
-    parts.append(separator)
-    parts.append("=== BUILD LOG END (last {} lines) ===\n".format(tail_lines))
-    parts.append('\n'.join(tail_section))
+    def __init__(
+        self,
+        max_total_chars: int = 100000,
+        head_lines: int = 100,
+        tail_lines: int = 200,
+        error_context_lines: int = 10,
+        max_error_blocks: int = 20
+    ):
+        self.max_total_chars = max_total_chars
+        self.head_lines = head_lines
+        self.tail_lines = tail_lines
+        self.error_context_lines = error_context_lines
+        self.max_error_blocks = max_error_blocks
+        
+        self._partial = ""
+        self._full: Optional[List[str]] = []  # whole log while it is under max_total_chars
+        self._chars = 0
+        self._lines = 0
+        self._head: List[str] = []
+        self._tail: deque = deque(maxlen=tail_lines)
+        self._recent: deque = deque(maxlen=error_context_lines)  # (line_no, line)
+        # At most tail_lines errors fall in the tail, so one more always
+        # includes the last error before it
+        self._tail_errors: deque = deque(maxlen=tail_lines + 1)  # (line_no, family)
+        self._families: Dict[str, int] = {}
+        # Each block: [start_line, end_line (exclusive), lines, chars,
+        # overflow_line, first_error_line]. overflow_line is the line that
+        # pushed the block past max_total_chars, or None.
+        self._blocks: List[list] = []
+        self._block_chars = 0
+    
+    def feed(self, chunk: str):
+        """Consume the next chunk of log text"""
+        if not chunk:
+            return
+        self._chars += len(chunk)
+        if self._full is not None:
+            if self._chars <= self.max_total_chars:
+                self._full.append(chunk)
+            else:
+                self._full = None
+        
+        lines = (self._partial + chunk).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._add_line(line)
+    
+    def _add_line(self, line: str):
+        line_no = self._lines
+        self._lines += 1
+        
+        if line_no < self.head_lines:
+            self._head.append(line)
+            return
+        
+        block = self._blocks[-1] if self._blocks else None
+        if block is not None and line_no < block[1]:
+            self._append_to_block(block, line_no, line)
+        
+        lowered = line.lower()
+        if any(k in lowered for k in ERROR_KEYWORDS) or ERROR_FRAME_PREFILTER.match('\n' + lowered):
+            family = _error_family(line)
+            if family is not None:
+                self._families[family] = self._families.get(family, 0) + 1
+                self._tail_errors.append((line_no, family))
+                self._open_window(line_no, line)
+        
+        self._recent.append((line_no, line))
+        self._tail.append(line)
+        
+        # An overflowing line more than tail_lines back is certainly before the
+        # tail, so the block cannot fit and its lines can be dropped
+        if block is not None and block[4] is not None and block[2] and block[4] < self._lines - self.tail_lines:
+            self._block_chars -= block[3]
+            block[2], block[3] = [], 0
+    
+    def _open_window(self, line_no: int, line: str):
+        """Start or extend the context window around an error line"""
+        start = max(self.head_lines, line_no - self.error_context_lines)
+        end = line_no + self.error_context_lines + 1
+        block = self._blocks[-1] if self._blocks else None
+        
+        if block is not None and start <= block[1]:
+            # Merge: pull in the lines between the block end and this error
+            if block[1] <= line_no:
+                for recent_no, recent_line in self._recent:
+                    if recent_no >= block[1]:
+                        self._append_to_block(block, recent_no, recent_line)
+                self._append_to_block(block, line_no, line)
+            block[1] = max(block[1], end)
+            return
+        
+        if len(self._blocks) >= self.max_error_blocks or self._block_chars > self.max_total_chars:
+            return
+        block = [start, end, [], 0, None, line_no]
+        self._blocks.append(block)
+        for recent_no, recent_line in self._recent:
+            if recent_no >= start:
+                self._append_to_block(block, recent_no, recent_line)
+        self._append_to_block(block, line_no, line)
+    
+    def _append_to_block(self, block: list, line_no: int, line: str):
+        if block[4] is not None and not block[2]:
+            return
+        block[2].append(line)
+        block[3] += len(line) + 1
+        self._block_chars += len(line) + 1
+        if block[4] is None and block[3] > self.max_total_chars:
+            # Over budget unless this line turns out to be in the tail; keep
+            # the lines until that is known (at most tail_lines more)
+            block[4] = line_no
+    
+    def finish(self) -> LogReduction:
+        """Flush the last partial line and build the reduced log"""
+        # Like str.split, an empty log is one empty line
+        self._add_line(self._partial)
+        self._partial = ""
+        total_lines = self._lines
+        
+        if self._full is not None:
+            text = ''.join(self._full)
+            return LogReduction(text=text, total_lines=total_lines)
+        
+        if total_lines <= self.head_lines + self.tail_lines:
+            overlap = total_lines - len(self._head)
+            lines = self._head + (list(self._tail)[-overlap:] if overlap > 0 else [])
+            return LogReduction(
+                text='\n'.join(lines)[:self.max_total_chars], total_lines=total_lines, truncated=True
+            )
+        
+        # Errors in the tail belong to the tail only: they neither count nor
+        # open or extend error blocks
+        tail_start = total_lines - self.tail_lines
+        families = dict(self._families)
+        last_error = None
+        for line_no, family in self._tail_errors:
+            if line_no >= tail_start:
+                families[family] -= 1
+                if not families[family]:
+                    del families[family]
+            else:
+                last_error = line_no
+        
+        def blocks():
+            for i, (start, end, lines, _, overflow_line, first_error) in enumerate(self._blocks):
+                if first_error >= tail_start:
+                    return
+                is_last = i + 1 == len(self._blocks) or self._blocks[i + 1][5] >= tail_start
+                if is_last and last_error is not None:
+                    # Undo any extension by errors past tail_start
+                    end = last_error + self.error_context_lines + 1
+                end = min(end, tail_start)
+                if overflow_line is not None and overflow_line < end:
+                    yield None
+                    return
+                yield lines[:end - start]
+        
+        return _assemble_reduction(
+            head=self._head,
+            tail=list(self._tail),
+            blocks=blocks(),
+            families=families,
+            total_lines=total_lines,
+            max_total_chars=self.max_total_chars,
+            head_lines=self.head_lines,
+            tail_lines=self.tail_lines
+        )
+
+
+def truncate_build_log(
+    log_content: str,
+    max_total_chars: int = 100000,  # ~25k tokens for most models
+    head_lines: int = 100,
+    tail_lines: int = 200,
+    error_context_lines: int = 10,
+    preserve_error_blocks: bool = True
+) -> str:
+    """
+    Intelligently truncate a build log to fit within LLM context windows
+    while preserving the most relevant error information.
     
-    result = ''.join(parts)
+    Strategy:
+    1. Keep the first N lines (build initialization, environment info)
+    2. Keep the last M lines (final status, summary)
+    3. Extract and preserve all error blocks with context
+    4. Ensure total size fits within max_total_chars
     
-    # Final size check - if still too long, truncate from middle error blocks
-    if len(result) > max_total_chars:
-        # Calculate how much we need to cut
-        excess = len(result) - max_total_chars
-        
-        # Remove error blocks until we fit
-        while error_blocks and len(result) > max_total_chars:
-            error_blocks.pop()
-            parts = []
-            parts.append("=== BUILD LOG START (first {} lines) ===\n".format(head_lines))
-            parts.append('\n'.join(head_section))
-            if error_blocks:
-                parts.append(separator)
-                parts.append("=== EXTRACTED ERROR BLOCKS ===\n")
-                for i, block in enumerate(error_blocks, 1):
-                    parts.append(f"\n--- Error Block {i} ---\n")
-                    parts.append(block)
-            parts.append(separator)
-            parts.append(f"[... {skipped_lines} lines truncated ...]\n")
-            parts.append(separator)
-            parts.append("=== BUILD LOG END (last {} lines) ===\n".format(tail_lines))
-            parts.append('\n'.join(tail_section))
-            result = ''.join(parts)
-        
-        # If still too long, hard truncate
-        if len(result) > max_total_chars:
-            result = result[:max_total_chars] + "\n[... LOG TRUNCATED TO FIT CONTEXT WINDOW ...]"
+    Args:
+        log_content: The full build log content
+        max_total_chars: Maximum total characters to return
+        head_lines: Number of lines to keep from the start
+        tail_lines: Number of lines to keep from the end
+        error_context_lines: Lines of context around each error
+        preserve_error_blocks: Whether to extract and preserve error blocks
     
-    return result
+    Returns:
+        Truncated log with preserved error sections
+    """
+    return reduce_build_log(
+        log_content,
+        max_total_chars=max_total_chars,
+        head_lines=head_lines,
+        tail_lines=tail_lines,
+        error_context_lines=error_context_lines,
+        preserve_error_blocks=preserve_error_blocks
+    ).text
 
 
 def extract_error_summary(log_content: str, max_errors: int = 10) -> List[str]:
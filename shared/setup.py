@@ -34,6 +34,9 @@ setup(
         "opentelemetry-propagator-b3>=1.21.0",
     ],
     extras_require={
+        "http2": [
+            "httpx[http2]>=0.25.0",
+        ],
         "dev": [
             "pytest>=7.4.0",
             "pytest-asyncio>=0.21.0",
@@ -737,6 +737,102 @@ class TestIntegrationWorkflows:
         assert config_data["mode"] == stats_data["mode"]
 
 
+# =============================================================================
+# Auth Caching Tests
+# =============================================================================
+
+class TestAuthCaching:
+    """Tests for the verified-token cache and memoized permissions."""
+    
+    def test_token_verified_once(self):
+        import auth
+        
+        user = auth.rbac_store.users["admin-001"]
+        token = auth.create_access_token(user, [auth.rbac_store.roles["admin"]])
+        
+        with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+            payloads = [auth.decode_token(token) for _ in range(10)]
+        
+        assert decode.call_count == 1
+        assert all(p.sub == "admin-001" for p in payloads)
+    
+    def test_cached_payload_is_copied(self):
+        import auth
+        
+        user = auth.rbac_store.users["admin-001"]
+        token = auth.create_access_token(user, [auth.rbac_store.roles["admin"]])
+        
+        first = auth.decode_token(token)
+        first.roles.append("tampered")
+        first.sub = "someone-else"
+        
+        second = auth.decode_token(token)
+        assert second is not first
+        assert second.sub == "admin-001"
+        assert "tampered" not in second.roles
+    
+    def test_cache_scoped_to_secret(self):
+        import auth
+        from fastapi import HTTPException
+        
+        user = auth.rbac_store.users["admin-001"]
+        token = auth.create_access_token(user, [auth.rbac_store.roles["admin"]])
+        auth.decode_token(token)
+        
+        with patch.object(auth.AuthConfig, "SECRET_KEY", "rotated-secret"):
+            with pytest.raises(HTTPException) as exc:
+                auth.decode_token(token)
+        assert exc.value.status_code == 401
+    
+    def test_token_without_exp_rejected(self):
+        import auth
+        from fastapi import HTTPException
+        
+        token = auth.jwt.encode(
+            {"sub": "admin-001", "email": "a@nexus.dev", "name": "A", "roles": [], "permissions": [], "iat": 0},
+            auth.AuthConfig.SECRET_KEY, algorithm=auth.AuthConfig.ALGORITHM
+        )
+        
+        with pytest.raises(HTTPException) as exc:
+            auth.decode_token(token)
+        assert exc.value.status_code == 401
+    
+    def test_permissions_memoized_until_roles_change(self):
+        import auth
+        from nexus_lib.schemas.rbac import RoleCreate, RoleUpdate, UserCreate
+        
+        role = auth.RBACService.create_role(
+            RoleCreate(name="Cache Test", description="test", permissions={"view_dashboard"}), "test"
+        )
+        user = auth.RBACService.create_user(UserCreate(email="cache@nexus.dev", name="Cache", roles=[role.id]))
+        
+        with patch.object(
+            auth.RBACService, "_project_permissions", wraps=auth.RBACService._project_permissions
+        ) as project:
+            first = auth.RBACService.get_user_with_permissions(user)
+            second = auth.RBACService.get_user_with_permissions(user)
+            assert project.call_count == 1
+            assert second is not first
+            
+            # Callers' edits do not reach the memoized projection
+            first.permissions.add("manage_users")
+            assert "manage_users" not in auth.RBACService.get_user_with_permissions(user).permissions
+            assert project.call_count == 1
+            
+            auth.RBACService.update_role(role.id, RoleUpdate(permissions={"view_dashboard", "view_users"}))
+            updated = auth.RBACService.get_user_with_permissions(user)
+            assert project.call_count == 2
+            assert "view_users" in updated.permissions
+            
+            user.roles.append("viewer")
+            auth.RBACService.get_user_with_permissions(user)
+            assert project.call_count == 3
+        
+        auth.RBACService.delete_user(user.id)
+        auth.RBACService.delete_role(role.id)
+        assert user.id not in auth.rbac_store.permission_cache
+
+
 # =============================================================================
 # Edge Cases and Error Handling Tests
 # =============================================================================
@@ -194,6 +194,43 @@ class TestQueryProcessing:
         assert response.status_code == 200
 
 
+class TestStreaming:
+    """Tests for streamed (SSE / WebSocket) task execution."""
+    
+    def test_execute_stream_sse(self, client):
+        """Test SSE endpoint emits progress events and a closing result."""
+        response = client.post("/execute/stream", json={
+            "task_id": "stream-1",
+            "action": "query",
+            "payload": {"query": "What is the status of PROJ-123?", "no_cache": True}
+        })
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert "event: start" in response.text
+        assert "event: complete" in response.text
+    
+    def test_execute_stream_empty_query(self, client):
+        """Test SSE endpoint rejects an empty query."""
+        response = client.post("/execute/stream", json={"task_id": "stream-2", "action": "query", "payload": {}})
+        
+        assert response.status_code == 400
+    
+    def test_execute_websocket(self, client):
+        """Test WebSocket endpoint streams events until completion."""
+        with client.websocket_connect("/ws/execute") as ws:
+            ws.send_json({"task_id": "ws-1", "query": "Is the release ready?", "no_cache": True})
+            events = []
+            while True:
+                event = ws.receive_json()
+                events.append(event["event"])
+                if event["event"] in ("complete", "error"):
+                    break
+        
+        assert events[0] == "start"
+        assert events[-1] == "complete"
+
+
 # =============================================================================
 # Specialist Management Tests
 # =============================================================================
@@ -0,0 +1,123 @@
+"""
+Jira Agent Concurrency Load Test
+================================
+
+Fires concurrent ``GET /issue/{key}`` requests at the Jira agent (through its
+ASGI app, with a simulated Jira that takes a fixed time per call) two ways:
+
+- blocking: the live client calls Jira synchronously from the async handler
+  (how ``atlassian.Jira`` was used), so requests queue behind each other
+- async:    the live client uses ``JiraTransport`` on pooled httpx, so
+  requests overlap up to ``JIRA_MAX_CONCURRENCY``
+
+Usage:
+    pytest tests/performance/test_jira_concurrency.py -v -m slow
+    python tests/performance/test_jira_concurrency.py   # prints a table
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+sys.path.insert(0, os.path.join(ROOT, "shared"))
+
+from nexus_lib.jira import JiraTransport
+from nexus_lib.utils import HttpPoolManager
+
+# Simulated Jira round-trip
+JIRA_LATENCY = 0.05
+
+
+def _load_agent():
+    """Import the Jira agent's main module under a unique name"""
+    path = os.path.join(ROOT, "services/agents/jira_agent/main.py")
+    spec = importlib.util.spec_from_file_location("jira_agent_main", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _issue(key: str) -> dict:
+    return {
+        "key": key,
+        "id": "10000",
+        "fields": {
+            "summary": f"Issue {key}",
+            "issuetype": {"name": "Story"},
+            "status": {"name": "In Progress"},
+            "project": {"key": key.split("-")[0]},
+        }
+    }
+
+
+class BlockingJira:
+    """Stand-in for atlassian.Jira: a synchronous round-trip inside async code"""
+
+    async def get_issue(self, key, expand=None, fields=None):
+        time.sleep(JIRA_LATENCY)
+        return _issue(key)
+
+
+def async_jira(max_concurrency: int) -> JiraTransport:
+    """JiraTransport against a simulated Jira with JIRA_LATENCY per call"""
+
+    async def handler(request):
+        await asyncio.sleep(JIRA_LATENCY)
+        return httpx.Response(200, json=_issue(request.url.path.rsplit("/", 1)[-1]))
+
+    pool = HttpPoolManager()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    pool.get_client = lambda url: client
+    return JiraTransport("https://jira.test", "bot", "token", max_concurrency=max_concurrency, pool=pool)
+
+
+async def _fire(agent, jira, requests: int) -> float:
+    """Wall time for ``requests`` concurrent GET /issue calls"""
+    client = agent.JiraClient()
+    client._initialized, client._last_mode, client._jira = True, False, jira
+    agent.jira_client = client
+
+    with patch.object(agent, "is_mock_mode", new=AsyncMock(return_value=False)):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=agent.app), base_url="http://jira-agent"
+        ) as http:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(http.get(f"/issue/NEXUS-{i}") for i in range(requests)))
+            elapsed = time.perf_counter() - started
+
+    assert all(r.status_code == 200 and r.json()["status"] == "success" for r in responses)
+    return elapsed
+
+
+def measure(requests: int = 16, max_concurrency: int = 8) -> dict:
+    agent = _load_agent()
+    return {
+        "blocking_s": asyncio.run(_fire(agent, BlockingJira(), requests)),
+        "async_s": asyncio.run(_fire(agent, async_jira(max_concurrency), requests)),
+    }
+
+
+@pytest.mark.slow
+class TestJiraAgentConcurrency:
+    """Concurrent agent requests must overlap on the Jira round-trip."""
+
+    def test_requests_no_longer_serialize(self):
+        result = measure(requests=16, max_concurrency=8)
+
+        # Blocking: 16 sequential round-trips. Async: two waves of 8.
+        assert result["blocking_s"] >= 16 * JIRA_LATENCY * 0.9, result
+        assert result["async_s"] < 16 * JIRA_LATENCY / 3, result
+
+
+if __name__ == "__main__":
+    print(f"{'requests':>8} {'blocking s':>11} {'async s':>9} {'speedup':>8}")
+    for requests in (8, 16, 32, 64):
+        r = measure(requests)
+        print(f"{requests:>8} {r['blocking_s']:>11.3f} {r['async_s']:>9.3f} {r['blocking_s'] / r['async_s']:>7.1f}x")
@@ -0,0 +1,151 @@
+"""
+Build Log Reducer Benchmark
+===========================
+
+Benchmarks nexus_lib.utils.reduce_build_log against synthetic multi-MB
+Jenkins logs. The reducer must stay linear in log size: the previous
+implementation counted newlines from the start of the log for every regex
+match, which made large logs quadratic.
+
+Usage:
+    pytest tests/performance/test_log_reducer.py -v
+    python tests/performance/test_log_reducer.py   # prints a timing table
+"""
+
+import os
+import sys
+import time
+import random
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../shared")))
+
+from nexus_lib.utils import StreamingLogReducer, reduce_build_log, reduce_build_log_async
+
+NOISE_WORDS = (
+    "compiling module downloading artifact resolving dependency running step "
+    "checkout workspace cache restored archiving results publishing"
+).split()
+
+ERROR_SNIPPETS = [
+    [
+        "Traceback (most recent call last):",
+        '  File "app/service.py", line 42, in handle',
+        "ValueError: invalid literal for int()",
+    ],
+    [
+        "Exception in thread \"main\" java.lang.IllegalStateException: pool closed",
+        "    at com.acme.pool.Pool.acquire(Pool.java:118)",
+        "Caused by: java.io.IOException: broken pipe",
+    ],
+    ["npm ERR! code ELIFECYCLE", "npm ERR! errno 1"],
+    ["[ERROR] Failed to execute goal on project core", "BUILD FAILURE"],
+]
+
+
+def make_log(size_mb: float, error_every: int = 4000, seed: int = 7) -> str:
+    """Synthetic Jenkins console output of roughly ``size_mb`` megabytes"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1_000_000)
+    lines, size, i = [], 0, 0
+    while size < target:
+        if i and i % error_every == 0:
+            block = rng.choice(ERROR_SNIPPETS)
+        else:
+            block = [f"[{i:08d}] [INFO] " + " ".join(rng.choice(NOISE_WORDS) for _ in range(9))]
+        lines.extend(block)
+        size += sum(len(line) + 1 for line in block)
+        i += 1
+    return "\n".join(lines)
+
+
+def time_reduce(log: str, repeat: int = 3) -> float:
+    """Best-of-``repeat`` wall time for one reduction"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        reduce_build_log(log)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+class TestLogReducerBehaviour:
+    """Correctness of the reducer on synthetic logs."""
+
+    def test_keeps_errors_and_reports_families(self):
+        log = make_log(2, error_every=2000)
+        reduction = reduce_build_log(log, max_total_chars=100000)
+
+        assert reduction.truncated
+        assert len(reduction.text) <= 100000 + 100
+        assert reduction.error_blocks > 0
+        assert set(reduction.matched_families) <= {"python", "jvm", "javascript", "ci"}
+        assert "=== EXTRACTED ERROR BLOCKS" in reduction.text
+        assert "=== BUILD LOG END" in reduction.text
+
+    def test_overlapping_windows_merge(self):
+        lines = [f"info line {i}" for i in range(1000)]
+        lines[500] = "ERROR: first"
+        lines[505] = "FATAL: second"
+        lines[800] = "npm ERR! third"
+        reduction = reduce_build_log(
+            "\n".join(lines), max_total_chars=2000, head_lines=10, tail_lines=10, error_context_lines=3
+        )
+
+        assert reduction.error_lines == 3
+        assert reduction.error_blocks == 2
+        assert reduction.text.count("ERROR: first") == 1
+        assert sum(reduction.matched_families.values()) == 3
+        assert "ci" in reduction.matched_families
+
+    @pytest.mark.asyncio
+    async def test_async_variant(self):
+        log = make_log(1)
+        reduction = await reduce_build_log_async(log, max_total_chars=50000)
+        assert len(reduction.text) <= 50000 + 100
+
+
+@pytest.mark.slow
+class TestLogReducerBenchmark:
+    """Timing of the reducer on multi-MB logs."""
+
+    def test_scales_linearly(self):
+        small = time_reduce(make_log(4))
+        large = time_reduce(make_log(16))
+
+        # 4x the input should cost ~4x the time; allow generous noise
+        assert large < small * 8, f"4MB: {small:.3f}s, 16MB: {large:.3f}s"
+
+    def test_streaming_memory_is_bounded(self):
+        import tracemalloc
+        
+        chunk = make_log(0.5, error_every=50)
+        reducer = StreamingLogReducer()
+        tracemalloc.start()
+        for _ in range(40):  # ~20 MB streamed
+            reducer.feed(chunk + "\n")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        reduction = reducer.finish()
+        
+        assert peak < 5_000_000, f"peak {peak / 1e6:.1f}MB"
+        assert len(reduction.text) <= 100000 + 100
+    
+    def test_50mb_log_under_budget(self):
+        log = make_log(50)
+        elapsed = time_reduce(log, repeat=1)
+
+        assert elapsed < 5.0, f"50MB log took {elapsed:.2f}s"
+
+
+if __name__ == "__main__":
+    print(f"{'size':>8} {'seconds':>9} {'MB/s':>8} {'blocks':>7}  families")
+    for size_mb in (1, 5, 10, 25, 50):
+        log = make_log(size_mb)
+        elapsed = time_reduce(log)
+        reduction = reduce_build_log(log)
+        print(
+            f"{size_mb:>6}MB {elapsed:>9.3f} {size_mb / elapsed:>8.1f} "
+            f"{reduction.error_blocks:>7}  {reduction.matched_families}"
+        )
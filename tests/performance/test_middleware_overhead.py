@@ -0,0 +1,188 @@
+"""
+Middleware Overhead Benchmark
+=============================
+
+Per-request overhead of each service's middleware stack, run two ways:
+
+- chained: one BaseHTTPMiddleware per stage with the path normalized on every
+  request (how the stacks were built before NexusMiddleware)
+- fused:   a single pure ASGI NexusMiddleware running the same stages with
+  cached route templates
+
+Requests are driven straight through the ASGI callable (no HTTP client) so the
+numbers are middleware cost, and the bare app's time is subtracted.
+
+Usage:
+    pytest tests/performance/test_middleware_overhead.py -v -m slow
+    python tests/performance/test_middleware_overhead.py   # prints a table
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../shared")))
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from nexus_lib.middleware import (
+    AuthStage,
+    JWTConfig,
+    JWTHandler,
+    MetricsStage,
+    NexusMiddleware,
+    RequestContext,
+    RequestIdStage,
+    normalize_endpoint,
+)
+
+SECRET = "benchmark-secret-of-at-least-32-bytes"
+TOKEN = JWTHandler(JWTConfig(secret_key=SECRET)).create_service_token("bench", "orchestrator")
+
+
+def _auth():
+    return AuthStage(secret_key=SECRET, require_auth=True)
+
+
+# Stages each service registers (auth as in production: NEXUS_REQUIRE_AUTH=true).
+# The RCA agent, admin dashboard, webhooks and analytics services do not use
+# the shared middleware.
+SERVICE_STAGES = {
+    "orchestrator": lambda: [RequestIdStage(), MetricsStage("orchestrator"), _auth()],
+    "jira": lambda: [MetricsStage("jira"), _auth()],
+    "jira_hygiene": lambda: [MetricsStage("jira_hygiene"), _auth()],
+    "git_ci": lambda: [MetricsStage("git_ci"), _auth()],
+    "reporting": lambda: [MetricsStage("reporting"), _auth()],
+    "slack": lambda: [MetricsStage("slack")],
+}
+
+
+class ChainedStage(BaseHTTPMiddleware):
+    """A stage wrapped in its own BaseHTTPMiddleware (the pre-fusion layout)"""
+
+    def __init__(self, app, stage):
+        super().__init__(app)
+        self.stage = stage
+
+    async def dispatch(self, request, call_next):
+        if not self.stage.applies_to(request.url.path):
+            return await call_next(request)
+
+        ctx = RequestContext(request, normalize_endpoint(request.url.path))
+        status_code, error = 500, None
+        try:
+            response = await self.stage.on_request(ctx)
+            if response is None:
+                response = await call_next(request)
+            status_code = response.status_code
+            self.stage.on_response(ctx, status_code, response.headers)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.stage.on_complete(ctx, status_code, error)
+
+
+def make_app(stages=None, fused=True) -> FastAPI:
+    """A service-shaped app: a few dozen routes, half of them parameterised"""
+    app = FastAPI()
+
+    for i in range(20):
+        app.add_api_route(f"/api/v1/resource{i}", lambda: {"ok": True}, methods=["GET"])
+        app.add_api_route(f"/api/v1/resource{i}/{{item_id}}", lambda item_id: {"id": item_id}, methods=["GET"])
+
+    @app.get("/jira/ticket/{key}")
+    async def ticket(key: str):
+        return {"key": key}
+
+    if stages:
+        if fused:
+            app.add_middleware(NexusMiddleware, stages=stages)
+        else:
+            for stage in reversed(stages):
+                app.add_middleware(ChainedStage, stage=stage)
+    return app
+
+
+async def _drive(app, requests: int) -> float:
+    """Seconds per request for GET /jira/ticket/NEX-<n>"""
+    headers = [(b"host", b"bench"), (b"authorization", f"Bearer {TOKEN}".encode())]
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for n in range(requests):
+        path = f"/jira/ticket/NEX-{n % 50}"
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / requests
+
+
+def measure(service: str, requests: int = 2000, repeat: int = 5) -> dict:
+    """Best-of-``repeat`` per-request overhead (microseconds) for one service"""
+    apps = {
+        "bare": make_app(),
+        "chained": make_app(SERVICE_STAGES[service](), fused=False),
+        "fused": make_app(SERVICE_STAGES[service](), fused=True),
+    }
+
+    async def run():
+        for app in apps.values():
+            await _drive(app, 100)  # warm up (builds the middleware stack)
+        # Interleave variants so machine noise hits all of them alike
+        timings = {name: float("inf") for name in apps}
+        for _ in range(repeat):
+            for name, app in apps.items():
+                timings[name] = min(timings[name], await _drive(app, requests))
+        return timings
+
+    timings = asyncio.run(run())
+    return {
+        "bare_us": timings["bare"] * 1e6,
+        "chained_us": (timings["chained"] - timings["bare"]) * 1e6,
+        "fused_us": (timings["fused"] - timings["bare"]) * 1e6,
+    }
+
+
+@pytest.mark.slow
+class TestMiddlewareOverhead:
+    """Fused middleware must cost less than the chained stack it replaces."""
+
+    @pytest.mark.parametrize("service", sorted(SERVICE_STAGES))
+    def test_fused_cheaper_than_chained(self, service):
+        result = measure(service, requests=1000)
+
+        assert result["fused_us"] < result["chained_us"], result
+
+
+if __name__ == "__main__":
+    print(f"{'service':>14} {'bare us':>9} {'chained us':>11} {'fused us':>9} {'saved':>7}")
+    for service in SERVICE_STAGES:
+        r = measure(service)
+        saved = 1 - r["fused_us"] / r["chained_us"]
+        print(
+            f"{service:>14} {r['bare_us']:>9.1f} {r['chained_us']:>11.1f} "
+            f"{r['fused_us']:>9.1f} {saved:>6.0%}"
+        )
@@ -270,6 +270,118 @@ class TestConfigManagerBasics:
         assert value is None or value == ""
 
 
+class FakeConfigRedis:
+    """Minimal async Redis stand-in for snapshot tests."""
+    
+    def __init__(self, data):
+        self.data = dict(data)
+        self.mget_calls = 0
+        self.published = []
+    
+    async def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+    
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.data.get(key) for key in keys]
+    
+    async def get(self, key):
+        return self.data.get(key)
+    
+    async def set(self, key, value):
+        self.data[key] = value
+    
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class TestConfigSnapshot:
+    """Tests for the ConfigManager near cache."""
+    
+    @pytest.fixture
+    def fake_redis(self):
+        from nexus_lib.config import ConfigManager
+        
+        redis = FakeConfigRedis({
+            "nexus:mode": "live",
+            "nexus:config:jira_url": "https://acme.atlassian.net",
+        })
+        ConfigManager.clear_cache()
+        with patch.object(ConfigManager, "_push_enabled", False), \
+             patch("nexus_lib.config.RedisConnection.get_client", AsyncMock(return_value=redis)):
+            yield redis
+        ConfigManager.clear_cache()
+    
+    @pytest.mark.asyncio
+    async def test_reads_served_from_one_mget(self, fake_redis, monkeypatch):
+        """Test the whole namespace loads once and later reads hit the snapshot."""
+        from nexus_lib.config import ConfigManager, ConfigKeys
+        
+        monkeypatch.delenv("LLM_PROVIDER", raising=False)
+        assert await ConfigManager.is_mock_mode() is False
+        assert await ConfigManager.get(ConfigKeys.JIRA_URL) == "https://acme.atlassian.net"
+        assert await ConfigManager.get(ConfigKeys.LLM_PROVIDER) == "google"
+        assert fake_redis.mget_calls == 1
+        assert ConfigManager.get_snapshot_stats()["keys"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_env_uses_reverse_index(self, fake_redis):
+        """Test get_env resolves through the Redis key for mapped variables."""
+        from nexus_lib.config import ConfigManager, ENV_TO_KEY
+        
+        assert ENV_TO_KEY["JIRA_URL"] == "nexus:config:jira_url"
+        assert await ConfigManager.get_env("JIRA_URL") == "https://acme.atlassian.net"
+    
+    @pytest.mark.asyncio
+    async def test_published_change_updates_snapshot(self, fake_redis):
+        """Test a change message from another process refreshes the key."""
+        import json
+        from nexus_lib.config import ConfigManager, ConfigKeys, CONFIG_CHANGES_CHANNEL
+        
+        assert await ConfigManager.is_mock_mode() is False
+        
+        fake_redis.data["nexus:mode"] = "mock"
+        await ConfigManager._handle_message({
+            "type": "message",
+            "channel": CONFIG_CHANGES_CHANNEL,
+            "data": json.dumps({"keys": [ConfigKeys.SYSTEM_MODE]}),
+        })
+        assert await ConfigManager.is_mock_mode() is True
+        
+        del fake_redis.data["nexus:config:jira_url"]
+        await ConfigManager._handle_message({
+            "type": "pmessage",
+            "channel": "__keyspace@0__:nexus:config:jira_url",
+            "data": "del",
+        })
+        assert await ConfigManager.get(ConfigKeys.JIRA_URL) == "https://your-org.atlassian.net"
+    
+    @pytest.mark.asyncio
+    async def test_set_updates_snapshot_and_publishes(self, fake_redis):
+        """Test local writes apply immediately and are announced."""
+        from nexus_lib.config import ConfigManager, CONFIG_CHANGES_CHANNEL
+        
+        await ConfigManager.get_mode()
+        assert await ConfigManager.set_mode("mock") is True
+        
+        assert await ConfigManager.get_mode() == "mock"
+        assert fake_redis.published[-1][0] == CONFIG_CHANGES_CHANNEL
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_to_env_without_redis(self, monkeypatch):
+        """Test env vars are used when Redis is unavailable."""
+        from nexus_lib.config import ConfigManager
+        
+        ConfigManager.clear_cache()
+        monkeypatch.setenv("JIRA_PROJECT_KEY", "ENVKEY")
+        with patch("nexus_lib.config.RedisConnection.get_client", AsyncMock(return_value=None)):
+            assert await ConfigManager.get_env("JIRA_PROJECT_KEY") == "ENVKEY"
+        ConfigManager.clear_cache()
+
+
 class TestMockModeFunction:
     """Tests for is_mock_mode standalone function."""
     
@@ -211,5 +211,127 @@ class TestDateCalculations:
         assert is_overdue is True
 
 
+
+def _hygiene_main():
+    """The hygiene agent's main module (imported once per process)"""
+    import importlib.util
+    
+    loaded = sys.modules.get("main")
+    if loaded is not None and hasattr(loaded, "HygieneChecker"):
+        return loaded
+    if "jira_hygiene_main" not in sys.modules:
+        root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+        sys.path.insert(0, os.path.join(root, "shared"))
+        spec = importlib.util.spec_from_file_location(
+            "jira_hygiene_main", os.path.join(root, "services/agents/jira_hygiene_agent/main.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["jira_hygiene_main"] = module
+    return sys.modules["jira_hygiene_main"]
+
+
+class TestIncrementalHygiene:
+    """Tests for snapshot-based incremental hygiene checks."""
+    
+    @staticmethod
+    def _ticket(key, complete=True):
+        return {
+            "key": key,
+            "fields": {
+                "summary": f"Ticket {key}",
+                "labels": ["backend"] if complete else [],
+                "fixVersions": [{"name": "v2.0.0"}],
+                "versions": [{"name": "v1.9.0"}],
+                "customfield_10016": 3.0,
+                "customfield_10001": {"name": "Platform"},
+                "assignee": {"emailAddress": "alice@example.com", "displayName": "Alice"},
+            }
+        }
+    
+    def _checker(self, handler):
+        import httpx
+        from unittest.mock import AsyncMock, MagicMock
+        from nexus_lib.jira import JiraTransport
+        from nexus_lib.utils import HttpPoolManager
+        
+        main = _hygiene_main()
+        pool = HttpPoolManager()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool.get_client = lambda url: client
+        
+        config = main.HygieneConfig()
+        jira = main.JiraHygieneClient(config)
+        jira._jira = JiraTransport("https://jira.test", "bot", "token", pool=pool)
+        jira._last_mode, jira._initialized = False, True
+        jira._ensure_initialized = AsyncMock()
+        return main.HygieneChecker(jira, MagicMock(), config)
+    
+    @pytest.mark.asyncio
+    async def test_delta_check_updates_snapshot(self):
+        """Test later checks fetch only changed tickets and rescore from the snapshot."""
+        import httpx
+        
+        active = {f"PROJ-{i}": self._ticket(f"PROJ-{i}", complete=i != 2) for i in range(1, 6)}
+        changed = set()
+        queries = []
+        
+        def handler(request):
+            jql, fields = request.url.params["jql"], request.url.params["fields"]
+            queries.append((jql, fields))
+            if "updated >=" not in jql:
+                issues = list(active.values())
+            elif "openSprints" not in jql:
+                issues = [{"key": key} for key in changed]
+            else:
+                issues = [active[key] for key in changed if key in active]
+            return httpx.Response(200, json={"total": len(issues), "startAt": 0, "maxResults": 100, "issues": issues})
+        
+        checker = self._checker(handler)
+        first = await checker.check_hygiene("PROJ")
+        assert first.total_tickets_checked == 5
+        assert first.compliant_tickets == 4
+        assert queries[0][1] == "labels,fixVersions,versions,customfield_10016,customfield_10001,summary,assignee,updated"
+        
+        # Nothing changed: one narrow query, nothing re-validated
+        queries.clear()
+        await checker.check_hygiene("PROJ")
+        assert len(queries) == 1
+        assert "updated >= -2m" in queries[0][0]
+        assert queries[0][1] == "updated"
+        
+        # PROJ-2 fixed, PROJ-5 completed (left the active set)
+        active["PROJ-2"] = self._ticket("PROJ-2")
+        del active["PROJ-5"]
+        changed.update({"PROJ-2", "PROJ-5"})
+        queries.clear()
+        third = await checker.check_hygiene("PROJ")
+        
+        assert len(queries) == 2
+        assert third.total_tickets_checked == 4
+        assert third.compliant_tickets == 4
+        assert third.hygiene_score == 100.0
+    
+    @pytest.mark.asyncio
+    async def test_required_field_change_forces_full_sync(self):
+        """Test changing the required fields re-fetches every ticket."""
+        import httpx
+        
+        queries = []
+        
+        def handler(request):
+            queries.append(request.url.params["jql"])
+            issues = [self._ticket("PROJ-1")]
+            return httpx.Response(200, json={"total": 1, "startAt": 0, "maxResults": 100, "issues": issues})
+        
+        checker = self._checker(handler)
+        await checker.check_hygiene("PROJ")
+        checker.config.required_fields = ["labels", "duedate"]
+        result = await checker.check_hygiene("PROJ")
+        
+        assert all("updated >=" not in q for q in queries)
+        assert result.violation_summary == {"duedate": 1}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -388,6 +388,297 @@ class TestJiraClientIssueParser:
         assert ticket.subtasks[0].key == "NEXUS-100-1"
         assert ticket.subtasks[0].status == "Done"
 
+    def test_parse_issue_v3_adf_description(self, client):
+        """Test REST v3 Atlassian Document Format descriptions flatten to text."""
+        issue_data = {
+            "key": "NEXUS-124",
+            "fields": {
+                "summary": "v3 ticket",
+                "description": {
+                    "type": "doc",
+                    "version": 1,
+                    "content": [
+                        {
+                            "type": "paragraph",
+                            "content": [
+                                {"type": "text", "text": "Fix the "},
+                                {"type": "text", "text": "login", "marks": [{"type": "strong"}]},
+                                {"type": "text", "text": " flow"},
+                            ]
+                        },
+                        {
+                            "type": "bulletList",
+                            "content": [
+                                {"type": "listItem", "content": [
+                                    {"type": "paragraph", "content": [{"type": "text", "text": "one"}]}
+                                ]},
+                                {"type": "listItem", "content": [
+                                    {"type": "paragraph", "content": [{"type": "text", "text": "two"}]}
+                                ]},
+                            ]
+                        },
+                    ]
+                },
+                "issuetype": {"name": "Bug"},
+                "status": {"name": "Open"},
+            }
+        }
+
+        ticket = client._parse_issue(issue_data)
+
+        assert ticket.description == "Fix the login flow\none\ntwo"
+        assert client._flatten_adf(None) is None
+        assert client._flatten_adf("plain v2 text") == "plain v2 text"
+
+
+# =============================================================================
+# Async Jira Transport Tests
+# =============================================================================
+
+def _mock_transport(handler, **kwargs):
+    """JiraTransport whose pooled client is served by ``handler``"""
+    import httpx
+    from nexus_lib.jira import JiraTransport
+    from nexus_lib.utils import HttpPoolManager
+    
+    pool = HttpPoolManager()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    pool.get_client = lambda url: client
+    return JiraTransport("https://jira.test", "bot@example.com", "token", pool=pool, **kwargs)
+
+
+class TestJiraTransport:
+    """Tests for the non-blocking Jira REST transport."""
+    
+    @pytest.mark.asyncio
+    async def test_search_paginates_all_results(self):
+        """Test every page of a search is fetched, none beyond the total."""
+        import httpx
+        
+        starts = []
+        
+        def handler(request):
+            start = int(request.url.params["startAt"])
+            size = int(request.url.params["maxResults"])
+            starts.append(start)
+            assert request.url.params["fields"] == "status"
+            keys = range(start, min(start + size, 250))
+            return httpx.Response(200, json={
+                "total": 250, "startAt": start, "maxResults": size,
+                "issues": [{"key": f"NEXUS-{i}"} for i in keys]
+            })
+        
+        transport = _mock_transport(handler)
+        issues = await transport.search_all("project = NEXUS", fields="status", page_size=100)
+        
+        assert [i["key"] for i in issues] == [f"NEXUS-{i}" for i in range(250)]
+        assert sorted(starts) == [0, 100, 200]
+    
+    @pytest.mark.asyncio
+    async def test_rate_limited_request_is_retried(self):
+        """Test 429 responses are retried after Retry-After."""
+        import httpx
+        
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            assert request.headers["authorization"].startswith("Basic ")
+            return httpx.Response(200, json={"key": "NEXUS-1", "fields": {}})
+        
+        transport = _mock_transport(handler)
+        issue = await transport.get_issue("NEXUS-1")
+        
+        assert issue["key"] == "NEXUS-1"
+        assert str(calls[0].url).startswith("https://jira.test/rest/api/2/issue/NEXUS-1")
+        assert transport.get_stats()["retries"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_error_response_raises(self):
+        """Test 4xx responses raise JiraAPIError with the status code."""
+        import httpx
+        from nexus_lib.jira import JiraAPIError
+        
+        transport = _mock_transport(lambda request: httpx.Response(404, json={"errorMessages": ["nope"]}))
+        
+        with pytest.raises(JiraAPIError) as exc:
+            await transport.get_issue("NEXUS-404")
+        assert exc.value.status_code == 404
+        assert exc.value.response == {"errorMessages": ["nope"]}
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped(self):
+        """Test requests in flight never exceed max_concurrency."""
+        import asyncio
+        import httpx
+        
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"key": request.url.path.rsplit("/", 1)[-1], "fields": {}})
+        
+        transport = _mock_transport(handler, max_concurrency=3)
+        await asyncio.gather(*(transport.get_issue(f"NEXUS-{i}") for i in range(10)))
+        
+        assert transport.get_stats()["peak_in_flight"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_client_live_mode_uses_transport(self):
+        """Test JiraClient awaits the transport for transitions and comments."""
+        from main import JiraClient
+        
+        client = JiraClient()
+        client._last_mode = False
+        client._initialized = True
+        client._jira = MagicMock()
+        client._jira.get_transitions = AsyncMock(return_value=[{"id": "31", "to": {"name": "Done"}}])
+        client._jira.transition_issue = AsyncMock()
+        client._jira.add_comment = AsyncMock()
+        
+        with patch.object(client, '_ensure_initialized', new=AsyncMock()):
+            result = await client.update_issue_status("NEXUS-1", "done", "shipped")
+        
+        assert result is True
+        client._jira.transition_issue.assert_awaited_once_with("NEXUS-1", "31")
+        client._jira.add_comment.assert_awaited_once_with("NEXUS-1", "shipped")
+
+
+class TestJiraHierarchyFetch:
+    """Tests for the level-by-level batched hierarchy walk."""
+    
+    @staticmethod
+    def _jira_handler(children, queries):
+        """Simulated Jira serving ``children`` (parent key -> child keys)"""
+        import re
+        import httpx
+        
+        def issue(key, parent=None, issue_type="Story"):
+            fields = {"summary": key, "status": {"name": "To Do"}, "issuetype": {"name": issue_type}}
+            if parent:
+                fields["parent"] = {"key": parent}
+            return {"key": key, "fields": fields}
+        
+        def handler(request):
+            params = request.url.params
+            if request.url.path.endswith("/search"):
+                queries.append(params["jql"])
+                parents = re.search(r"parent in \((.*)\)", params["jql"]).group(1).split(", ")
+                matches = [
+                    issue(child, parent, "Sub-task" if "-S" in child else "Story")
+                    for parent in parents for child in children.get(parent, [])
+                ]
+                start, size = int(params["startAt"]), int(params["maxResults"])
+                return httpx.Response(200, json={
+                    "total": len(matches), "startAt": start, "maxResults": size,
+                    "issues": matches[start:start + size]
+                })
+            assert "fields" not in params
+            return httpx.Response(200, json=issue(request.url.path.rsplit("/", 1)[-1], issue_type="Epic"))
+        
+        return handler
+    
+    @pytest.mark.asyncio
+    async def test_one_batched_query_per_level(self):
+        """Test each level is one paginated query per batch, not one per node."""
+        from main import JiraClient
+        
+        stories = [f"NEXUS-{i}" for i in range(1, 121)]
+        children = {"NEXUS-0": stories, **{s: [f"{s}-S1", f"{s}-S2"] for s in stories[:3]}}
+        queries = []
+        
+        client = JiraClient()
+        client._last_mode, client._initialized = False, True
+        client._jira = _mock_transport(self._jira_handler(children, queries))
+        
+        with patch.object(client, '_ensure_initialized', new=AsyncMock()), \
+                patch("main.HIERARCHY_BATCH_SIZE", 100):
+            root = await client.get_issue_hierarchy("NEXUS-0", max_depth=3)
+        
+        assert [t.key for t in root.subtasks] == stories
+        assert [t.key for t in root.subtasks[0].subtasks] == ["NEXUS-1-S1", "NEXUS-1-S2"]
+        assert root.subtasks[0].subtasks[0].parent_key == "NEXUS-1"
+        # Level 1: one query; level 2: 120 stories in two batches; subtasks are leaves
+        assert len(set(queries)) == 3
+        assert queries[0] == "parent in (NEXUS-0)"
+    
+    def test_stream_endpoint_emits_levels(self):
+        """Test the SSE hierarchy stream sends one event per level then complete."""
+        import json
+        from main import app
+        
+        with TestClient(app) as client:
+            response = client.get("/hierarchy/PROJ-100/stream?max_depth=2")
+        
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert [e["event"] for e in events] == ["level", "level", "level", "complete"]
+        assert events[1]["tickets"][0]["parent_key"] == "PROJ-100"
+        assert events[-1]["total_tickets"] == 6
+
+
+class TestSprintStatsAggregation:
+    """Tests for paged, projected and cached sprint statistics."""
+    
+    @pytest.mark.asyncio
+    async def test_stats_page_through_all_issues_and_cache(self):
+        """Test stats cover every page, request few fields, and are cached until a webhook."""
+        import httpx
+        from main import JiraClient
+        from nexus_lib.jira import JiraEntityCache
+        
+        statuses = ["Done", "In Progress", "Blocked", "To Do"]
+        issues = [
+            {"key": f"NEXUS-{i}", "fields": {"status": {"name": statuses[i % 4]}, "customfield_10016": 2}}
+            for i in range(1200)
+        ]
+        requests = []
+        
+        def handler(request):
+            params = request.url.params
+            requests.append(params)
+            start, size = int(params["startAt"]), int(params["maxResults"])
+            return httpx.Response(200, json={
+                "total": len(issues), "startAt": start, "maxResults": size,
+                "issues": issues[start:start + size]
+            })
+        
+        client = JiraClient()
+        client._last_mode, client._initialized = False, True
+        client._jira = _mock_transport(handler, cache=JiraEntityCache("stats.jira.test"))
+        
+        with patch.object(client, '_ensure_initialized', new=AsyncMock()):
+            stats = await client.get_sprint_stats("NEXUS", "Sprint 9")
+            fetches = len(requests)
+            again = await client.get_sprint_stats("NEXUS", "Sprint 9")
+            assert len(requests) == fetches
+            
+            await client._jira.cache.invalidate_issue("NEXUS-7")
+            await client.get_sprint_stats("NEXUS", "Sprint 9")
+        
+        assert stats.total_issues == 1200
+        assert stats.completed_issues == stats.in_progress_issues == stats.blocked_issues == 300
+        assert stats.total_story_points == 2400
+        assert stats.completed_story_points == 600
+        assert stats.blockers[0] == "NEXUS-2"
+        assert again is stats
+        assert {r["fields"] for r in requests} == {"status,customfield_10016"}
+        assert len(requests) == 2 * fetches
+    
+    def test_webhook_endpoint(self):
+        """Test the webhook endpoint reports what it invalidated."""
+        from main import app
+        
+        with TestClient(app) as client:
+            issue = client.post("/webhooks/jira", json={"webhookEvent": "jira:issue_created", "issue": {"key": "ABC-1"}})
+            sprint = client.post("/webhooks/jira", json={"webhookEvent": "sprint_closed", "sprint": {"id": 3}})
+        
+        assert issue.json() == {"event": "jira:issue_created", "invalidated": "ABC-1"}
+        assert sprint.json()["invalidated"] == "sprints"
+
 
 # =============================================================================
 # API Endpoint Tests
@@ -593,3 +884,159 @@ class TestJiraAgentErrorHandling:
         
         assert response.status_code == 422
 
+
+class TestJiraEntityCache:
+    """Tests for the shared Jira entity cache (L1 only: no Redis in tests)."""
+    
+    @staticmethod
+    def _issue(key, updated="2026-01-01T00:00:00.000+0000"):
+        return {
+            "key": key,
+            "fields": {
+                "summary": key,
+                "updated": updated,
+                "project": {"key": key.split("-")[0]},
+                "issuetype": {"name": "Story"},
+                "status": {"name": "To Do"},
+            }
+        }
+    
+    @pytest.mark.asyncio
+    async def test_issue_reads_hit_cache_until_write(self):
+        """Test repeated reads are served from cache and a write invalidates."""
+        import asyncio
+        import httpx
+        from nexus_lib.jira import JiraEntityCache
+        
+        requests = []
+        
+        def handler(request):
+            requests.append((request.method, request.url.path))
+            if request.method == "GET":
+                return httpx.Response(200, json=self._issue("NEX-1"))
+            return httpx.Response(204)
+        
+        cache = JiraEntityCache("write.jira.test")
+        transport = _mock_transport(handler, cache=cache)
+        
+        await asyncio.gather(*(transport.get_issue("NEX-1") for _ in range(5)))
+        await transport.get_issue("NEX-1")
+        await transport.update_issue("NEX-1", {"summary": "changed"})
+        await transport.get_issue("NEX-1")
+        
+        assert [m for m, _ in requests] == ["GET", "PUT", "GET"]
+        stats = cache.get_stats()
+        assert stats["miss"] == 2
+        assert stats["coalesced"] == 4
+        assert stats["invalidations"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_releases_waiters(self):
+        """Test a waiter loads itself when the load it was sharing is cancelled."""
+        import asyncio
+        from nexus_lib.jira import JiraEntityCache
+        
+        cache = JiraEntityCache("cancel.jira.test")
+        cache._redis_down_until = float("inf")
+        started = asyncio.Event()
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                await asyncio.sleep(10)
+            return {"total": 0, "issues": []}
+        
+        leader = asyncio.ensure_future(cache.get_search("project = A", loader))
+        await started.wait()
+        follower = asyncio.ensure_future(cache.get_search("project = A", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        
+        result = await asyncio.wait_for(follower, timeout=2)
+        
+        assert result == {"total": 0, "issues": []}
+        assert len(calls) == 2
+        assert leader.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_old_entries_are_revalidated(self):
+        """Test stale-aged issues are checked with If-None-Match before being served."""
+        import httpx
+        from nexus_lib.jira import JiraEntityCache
+        
+        checks = []
+        
+        def handler(request):
+            if request.headers.get("If-None-Match") == '"v1"':
+                checks.append(request.url.params["fields"])
+                return httpx.Response(304)
+            return httpx.Response(200, json=self._issue("NEX-2"), headers={"ETag": '"v1"'})
+        
+        cache = JiraEntityCache("etag.jira.test", revalidate_after=0)
+        transport = _mock_transport(handler, cache=cache)
+        
+        first = await transport.get_issue("NEX-2")
+        second = await transport.get_issue("NEX-2")
+        
+        assert first == second
+        assert checks == ["updated"]
+        assert cache.get_stats()["revalidated"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_transitions_shared_by_type_and_status(self):
+        """Test issues with the same workflow position share cached transitions."""
+        import httpx
+        from nexus_lib.jira import JiraEntityCache
+        
+        transition_calls = []
+        
+        def handler(request):
+            if request.url.path.endswith("/transitions"):
+                transition_calls.append(request.url.path)
+                return httpx.Response(200, json={"transitions": [{"id": "21", "name": "Start"}]})
+            return httpx.Response(200, json=self._issue(request.url.path.rsplit("/", 1)[-1]))
+        
+        transport = _mock_transport(handler, cache=JiraEntityCache("workflow.jira.test"))
+        
+        first = await transport.get_transitions("NEX-3")
+        second = await transport.get_transitions("NEX-4")
+        
+        assert first == second == [{"id": "21", "name": "Start"}]
+        assert len(transition_calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_webhook_invalidates_issue_and_project_searches(self):
+        """Test a webhook for one issue retires the issue and searches over its project only."""
+        import httpx
+        from nexus_lib.jira import jira_cache_for, invalidate_jira_webhook
+        
+        calls = []
+        
+        def handler(request):
+            calls.append(request.url.params.get("jql") or request.url.path)
+            if request.url.path.endswith("/search"):
+                return httpx.Response(200, json={"total": 0, "issues": []})
+            return httpx.Response(200, json=self._issue("HOOK-1"))
+        
+        cache = jira_cache_for("https://hook.jira.test")
+        transport = _mock_transport(handler, cache=cache)
+        
+        async def read_all():
+            await transport.get_issue("HOOK-1")
+            await transport.search("project = HOOK")
+            await transport.search("project = OTHER")
+        
+        await read_all()
+        await read_all()
+        assert len(calls) == 3
+        
+        result = await invalidate_jira_webhook({
+            "webhookEvent": "jira:issue_updated",
+            "issue": {"key": "HOOK-1", "self": "https://hook.jira.test/rest/api/2/issue/1"}
+        })
+        await read_all()
+        
+        assert result == {"event": "jira:issue_updated", "invalidated": "HOOK-1"}
+        assert calls[3:] == ["/rest/api/2/issue/HOOK-1", "project = HOOK"]
@@ -95,6 +95,90 @@ class TestLogTruncation:
         result = truncate_build_log("")
         
         assert result is not None
+    
+    def test_streaming_reducer_matches_batch(self):
+        """Test the streaming reducer produces the same output from chunks."""
+        from nexus_lib.utils import StreamingLogReducer, reduce_build_log
+        
+        lines = [f"[INFO] step {i}" for i in range(3000)]
+        lines[1200:1203] = ["Traceback (most recent call last):", '  File "a.py", line 1, in f', "KeyError: 'x'"]
+        lines[2500] = "npm ERR! code ELIFECYCLE"
+        log = "\n".join(lines)
+        
+        reducer = StreamingLogReducer(max_total_chars=8000)
+        for i in range(0, len(log), 777):
+            reducer.feed(log[i:i + 777])
+        streamed = reducer.finish()
+        
+        assert streamed == reduce_build_log(log, max_total_chars=8000)
+        assert streamed.error_blocks == 2
+    
+    def test_streaming_reducer_ignores_tail_errors(self):
+        """Test errors in the tail do not extend a block started before it."""
+        from nexus_lib.utils import StreamingLogReducer, reduce_build_log
+        
+        lines = [f"[INFO] step {i}" for i in range(1000)]
+        tail_start = 1000 - 200
+        lines[tail_start - 15] = "ERROR: compilation failed"
+        lines[tail_start + 3] = "ERROR: upload failed"
+        log = "\n".join(lines)
+        
+        reducer = StreamingLogReducer(max_total_chars=8000)
+        reducer.feed(log)
+        streamed = reducer.finish()
+        
+        assert streamed == reduce_build_log(log, max_total_chars=8000)
+        assert f"step {tail_start - 4}\n" not in streamed.text.split("=== BUILD LOG END")[0]
+    
+    def test_streaming_reducer_matches_batch_randomized(self):
+        """Test random logs, chunk sizes and windows give the batch result."""
+        import random
+        from nexus_lib.utils import StreamingLogReducer, reduce_build_log
+        
+        error_lines = [
+            "ERROR: build failed", "Traceback (most recent call last):",
+            '  File "a.py", line 1, in f', "npm ERR! code ELIFECYCLE", "FAILED test_x",
+        ]
+        rng = random.Random(1234)
+        for _ in range(300):
+            density = rng.choice([0.01, 0.05, 0.2, 0.6])
+            lines = [
+                rng.choice(error_lines) if rng.random() < density else f"[INFO] step {i} " + "x" * rng.randint(0, 40)
+                for i in range(rng.randint(0, 1200))
+            ]
+            log = "\n".join(lines)
+            kwargs = dict(
+                max_total_chars=rng.choice([500, 2000, 6000, 20000]),
+                head_lines=rng.randint(0, 60),
+                tail_lines=rng.randint(0, 80),
+                error_context_lines=rng.randint(0, 12),
+                max_error_blocks=rng.randint(1, 8),
+            )
+        
+            reducer = StreamingLogReducer(**kwargs)
+            pos = 0
+            while pos < len(log):
+                size = rng.randint(1, 300)
+                reducer.feed(log[pos:pos + size])
+                pos += size
+        
+            assert reducer.finish() == reduce_build_log(log, **kwargs), kwargs
+    
+    def test_streaming_reducer_empty_log(self):
+        """Test an empty stream reports one line, like the batch reducer."""
+        from nexus_lib.utils import StreamingLogReducer, reduce_build_log
+        
+        assert StreamingLogReducer().finish() == reduce_build_log("")
+    
+    def test_streaming_reducer_short_log_verbatim(self):
+        """Test logs under the budget are returned unchanged."""
+        from nexus_lib.utils import StreamingLogReducer
+        
+        reducer = StreamingLogReducer()
+        reducer.feed("Build started\nCompil")
+        reducer.feed("ing...\nBuild complete")
+        
+        assert reducer.finish().text == "Build started\nCompiling...\nBuild complete"
 
 
 class TestErrorSummaryExtraction:
@@ -59,6 +59,52 @@ class TestReActEngine:
         assert "get_jira_ticket" in description
         assert "get_security_scan" in description
     
+    def test_tools_description_cached_per_health_state(self):
+        """Test tools description is only re-rendered when health changes"""
+        from nexus_lib.specialists import specialist_registry, SpecialistStatus
+
+        health = specialist_registry.get_health("jira")
+        original_status = health.status
+        try:
+            health.status = SpecialistStatus.HEALTHY
+            first = get_tools_description(include_health=True)
+            assert get_tools_description(include_health=True) is first
+            assert "## JIRA ✓" in first
+
+            health.status = SpecialistStatus.UNHEALTHY
+            second = get_tools_description(include_health=True)
+            assert second is not first
+            assert "## JIRA ✗ (unavailable)" in second
+        finally:
+            health.status = original_status
+
+    def test_system_prompt_cached(self, react_engine):
+        """Test the static system prompt is rendered once and reused"""
+        prompt = react_engine._get_system_prompt()
+
+        assert react_engine._get_system_prompt() is prompt
+        assert "get_jira_ticket" in prompt
+        assert "{tools_description}" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_prompt_prefix_stable_across_iterations(self, react_engine, mock_llm_response, mock_final_answer_response):
+        """Test system prompt is identical and the step transcript grows append-only"""
+        with patch.object(react_engine.llm, 'generate', new_callable=AsyncMock) as mock_llm:
+            mock_llm.side_effect = [mock_llm_response, mock_llm_response, mock_final_answer_response]
+
+            with patch.object(react_engine, '_execute_tool', new_callable=AsyncMock) as mock_tool:
+                mock_tool.return_value = {"status": "success"}
+                await react_engine.run("Check ticket PROJ-123", {"user_id": "test"})
+
+        calls = mock_llm.call_args_list
+        assert len({c.args[1] for c in calls}) == 1
+        assert calls[0].args[1].startswith(react_engine._get_system_prompt())
+
+        second_prompt, third_prompt = calls[1].args[0], calls[2].args[0]
+        transcript = second_prompt.split("\n\nObservation from previous")[0]
+        assert third_prompt.startswith(transcript)
+        assert "Step 1:" in third_prompt and "Step 2:" in third_prompt
+
     @pytest.mark.asyncio
     async def test_react_run_simple_query(self, react_engine, mock_final_answer_response):
         """Test running a simple query that gets immediate answer"""
@@ -136,6 +182,203 @@ Final Answer: The release is ready to go."""
         assert parsed["final_answer"] == "The release is ready to go."
         assert parsed["action"] is None
     
+    def test_parse_llm_response_multiple_actions(self, react_engine):
+        """Test parsing LLM response with several parallel actions"""
+        response = """Thought: I need sprint, build and security data.
+Action: get_sprint_stats
+Action Input: {"project_key": "PROJ"}
+Action: get_build_status
+Action Input: {"job_name": "nexus-main"}
+Action: get_security_scan
+Action Input: {"repo_name": "nexus/backend"}"""
+
+        parsed = react_engine._parse_llm_response(response)
+
+        assert [a["action"] for a in parsed["actions"]] == [
+            "get_sprint_stats", "get_build_status", "get_security_scan"
+        ]
+        assert parsed["actions"][1]["action_input"] == {"job_name": "nexus-main"}
+        assert parsed["action"] == "get_sprint_stats"
+        assert parsed["action_input"] == {"project_key": "PROJ"}
+
+    @pytest.mark.asyncio
+    async def test_react_run_with_parallel_actions(self, react_engine, mock_final_answer_response):
+        """Test a multi-action step executes every tool and feeds all observations back"""
+        multi_action_response = {
+            "content": """Thought: Gather release data.
+Action: get_sprint_stats
+Action Input: {"project_key": "PROJ"}
+Action: get_build_status
+Action Input: {"job_name": "nexus-main"}""",
+            "input_tokens": 100,
+            "output_tokens": 50
+        }
+
+        with patch.object(react_engine.llm, 'generate', new_callable=AsyncMock) as mock_llm:
+            mock_llm.side_effect = [multi_action_response, mock_final_answer_response]
+
+            with patch.object(react_engine, '_execute_tool', new_callable=AsyncMock) as mock_tool:
+                mock_tool.side_effect = lambda name, args: {"tool": name}
+
+                result = await react_engine.run("Is v2.0 ready?", {"user_id": "test"})
+
+                assert mock_tool.await_count == 2
+                assert result["steps"] == 2
+                assert "get_sprint_stats + get_build_status" in result["plan"]
+
+                second_prompt = mock_llm.call_args_list[1].args[0]
+                assert "[get_sprint_stats]" in second_prompt
+                assert "[get_build_status]" in second_prompt
+
+    @pytest.mark.asyncio
+    async def test_execute_tools_respects_concurrency_cap(self, react_engine):
+        """Test parallel tool execution never exceeds max_parallel_tools"""
+        import asyncio
+
+        react_engine.max_parallel_tools = 2
+        in_flight = 0
+        peak = 0
+
+        async def fake_tool(name, args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if name == "boom":
+                raise RuntimeError("tool crashed")
+            return {"tool": name}
+
+        with patch.object(react_engine, '_execute_tool', side_effect=fake_tool):
+            actions = [{"action": f"tool_{i}", "action_input": {}} for i in range(5)]
+            actions.append({"action": "boom", "action_input": {}})
+            results = await react_engine._execute_tools(actions)
+
+        assert peak == 2
+        assert [r.get("tool") for r in results[:5]] == [f"tool_{i}" for i in range(5)]
+        assert "tool crashed" in results[5]["error"]
+
+    @pytest.mark.asyncio
+    async def test_run_stream_event_order(self, react_engine, mock_llm_response, mock_final_answer_response):
+        """Test run_stream yields progress events ending in the same result run() returns"""
+        responses = [mock_llm_response["content"], mock_final_answer_response["content"]]
+
+        async def fake_stream(prompt, system_prompt=None, usage=None):
+            content = responses.pop(0)
+            for chunk in content.split(" "):
+                yield chunk + " "
+            if usage is not None:
+                usage["input_tokens"] = 10
+                usage["output_tokens"] = len(content.split(" "))
+
+        with patch.object(react_engine.llm, 'stream', side_effect=fake_stream):
+            with patch.object(react_engine, '_execute_tool', new_callable=AsyncMock) as mock_tool:
+                mock_tool.return_value = {"status": "In Progress"}
+
+                events = [e async for e in react_engine.run_stream("What is PROJ-123?", {"user_id": "test"})]
+
+        names = [e["event"] for e in events]
+        assert names[0] == "start"
+        assert names[-1] == "complete"
+        assert "token" in names
+        assert names.index("action") < names.index("observation") < names.index("final_answer")
+
+        result = events[-1]["result"]
+        assert result["steps"] == 2
+        assert result["result"] == "The release is ready. All criteria are met."
+        assert events[names.index("final_answer")]["answer"] == result["result"]
+        assert result["tokens_used"] == 20 + sum(len(r.split(" ")) for r in (
+            mock_llm_response["content"], mock_final_answer_response["content"]
+        ))
+
+    @pytest.mark.asyncio
+    async def test_prefetch_serves_first_observation(self, react_engine, mock_llm_response, mock_final_answer_response):
+        """Test the class's tools start before the LLM asks and are reused when it does"""
+        import asyncio
+
+        started = []
+
+        async def fake_tool(name, args):
+            started.append((name, args))
+            await asyncio.sleep(0)
+            return {"tool": name}
+
+        async def slow_llm(prompt, system_prompt=None):
+            await asyncio.sleep(0.01)
+            return responses.pop(0)
+
+        responses = [mock_llm_response, mock_final_answer_response]
+        with patch.object(react_engine.llm, 'generate', side_effect=slow_llm):
+            with patch.object(react_engine, '_execute_tool', side_effect=fake_tool):
+                await react_engine.run("What is the status of ticket PROJ-123?", {"user_id": "test"})
+
+        assert started == [("get_jira_ticket", {"ticket_key": "PROJ-123"})]
+        assert react_engine.prefetch.get_stats()["jira_query"]["hit_rate"] == 1.0
+
+    def test_prefetch_plan_uses_context_and_learned_args(self, react_engine):
+        """Test prefetch only plans GET tools whose required params are known"""
+        planner = react_engine.prefetch
+
+        assert planner.plan("release_check", "Is v2.0 ready?", {}) == []
+
+        planner.learn({"user_id": "u1"}, [{"action": "get_build_status", "action_input": {"job_name": "nexus-main"}}])
+        context = {"project_key": "NEXUS", "repo_name": "nexus"}
+        plan = planner.plan("release_check", "Is v2.0 ready?", {**context, "user_id": "u1"})
+
+        assert plan == [
+            ("get_sprint_stats", {"project_key": "NEXUS"}),
+            ("get_build_status", {"job_name": "nexus-main"}),
+            ("get_security_scan", {"repo_name": "nexus"}),
+        ]
+
+    def test_learned_args_are_not_shared_without_scope(self, react_engine):
+        """Test learned args stay with their user and anonymous runs learn nothing"""
+        planner = react_engine.prefetch
+        action = [{"action": "get_build_status", "action_input": {"job_name": "nexus-main"}}]
+
+        planner.learn({"user_id": "u1"}, action)
+        assert planner.plan("rca", "Why did build fail?", {"user_id": "u2"}) == []
+
+        planner.learn({}, action)
+        assert planner.plan("rca", "Why did build fail?", {}) == []
+        assert planner.plan("rca", "Why did build fail?", {"user_id": "u1"}) == [
+            ("get_build_status", {"job_name": "nexus-main"})
+        ]
+
+    def test_learned_args_are_bounded(self, react_engine):
+        """Test learned args evict the least recently used scope past max_size"""
+        planner = react_engine.prefetch
+        planner._learned_args.max_size = 2
+        action = [{"action": "get_build_status", "action_input": {"job_name": "nexus-main"}}]
+
+        for session_id in ("s1", "s2", "s3"):
+            planner.learn({"session_id": session_id}, action)
+
+        assert len(planner._learned_args) == 2
+        assert planner.plan("rca", "Why did build fail?", {"session_id": "s1"}) == []
+        assert planner.plan("rca", "Why did build fail?", {"session_id": "s3"}) == [
+            ("get_build_status", {"job_name": "nexus-main"})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unused_prefetch_is_cancelled(self, react_engine, mock_final_answer_response):
+        """Test prefetched calls the LLM never requests are cancelled and counted as wasted"""
+        import asyncio
+
+        async def hanging_tool(name, args):
+            await asyncio.sleep(10)
+
+        with patch.object(react_engine.llm, 'generate', new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = mock_final_answer_response
+            with patch.object(react_engine, '_execute_tool', side_effect=hanging_tool):
+                await react_engine.run("Why did build fail?", {"job_name": "nexus-main"})
+
+        await asyncio.sleep(0)
+        assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        assert react_engine.prefetch.get_stats()["rca"] == {
+            "prefetched": 1, "hit": 0, "wasted": 1, "hit_rate": 0.0
+        }
+
     def test_classify_query(self, react_engine):
         """Test query classification for metrics"""
         assert react_engine._classify_query("Is the release ready?") == "release_check"
@@ -145,6 +388,26 @@ Final Answer: The release is ready to go."""
         assert react_engine._classify_query("Generate a report") == "report"
         assert react_engine._classify_query("Hello world") == "general"
     
+    @pytest.mark.asyncio
+    async def test_availability_check_never_probes(self, react_engine):
+        """Unknown specialists are tried and probed in the background, not inline"""
+        from nexus_lib.specialists import specialist_registry, SpecialistStatus
+
+        health = specialist_registry.get_health("jira")
+        original_status = health.status
+        try:
+            health.status = SpecialistStatus.UNKNOWN
+            with patch.object(specialist_registry, "check_health", new=AsyncMock()) as probe, \
+                    patch.object(specialist_registry, "request_probe") as request_probe:
+                available, status_msg = await react_engine._check_specialist_available("jira")
+
+            assert available is True
+            assert status_msg.startswith("unknown")
+            probe.assert_not_called()
+            request_probe.assert_called_once_with("jira")
+        finally:
+            health.status = original_status
+
     @pytest.mark.asyncio
     async def test_execute_tool_unknown(self, react_engine):
         """Test executing unknown tool returns error"""
@@ -153,6 +416,22 @@ Final Answer: The release is ready to go."""
         assert "error" in result
         assert "Unknown tool" in result["error"]
 
+    @pytest.mark.asyncio
+    async def test_execute_tool_uses_compiled_route(self, react_engine):
+        """Path parameters fill the template; the rest become query params"""
+        client = AsyncMock()
+        client.get.return_value = {"ok": True}
+        with patch.object(react_engine, "_check_specialist_available", new=AsyncMock(return_value=(True, "healthy"))), \
+                patch.object(react_engine, "_get_agent_client", new=AsyncMock(return_value=client)):
+            result = await react_engine._execute_tool(
+                "get_pr_status", {"repo_name": "nexus", "pr_number": 42, "include": "checks"}
+            )
+            missing = await react_engine._execute_tool("get_pr_status", {"repo_name": "nexus"})
+
+        assert result == {"ok": True}
+        client.get.assert_awaited_once_with("/repo/nexus/pr/42", params={"include": "checks"})
+        assert "pr_number" in missing["error"]
+
 
 class TestVectorMemory:
     """Tests for Vector Memory"""
@@ -190,6 +469,382 @@ class TestVectorMemory:
         assert "backend" in stats
         assert "count" in stats
 
+    @pytest.mark.asyncio
+    async def test_local_backend_round_trip(self, tmp_path, monkeypatch):
+        """Test the local backend persists documents across instances"""
+        monkeypatch.setenv("MEMORY_BACKEND", "local")
+        monkeypatch.setenv("LOCAL_MEMORY_DIR", str(tmp_path))
+
+        memory = VectorMemory()
+        assert memory.backend == "local"
+        await memory.add_context("doc-1", "Release v1.0 had database issues")
+        await memory.add_context("doc-2", "Sprint 41 completed on time")
+        await memory.close()
+
+        reopened = VectorMemory()
+        stats = await reopened.get_stats()
+        assert stats["count"] == 2
+
+        result = await reopened.retrieve("Release v1.0 had database issues", n_results=1)
+        assert "database issues" in result
+        assert "Sprint 41" not in result
+
+
+class TestConversationMemory:
+    """Tests for bounded conversation memory"""
+
+    @pytest.mark.asyncio
+    async def test_ring_buffer_keeps_latest_turns(self):
+        """Test a session keeps only the last max_turns turns"""
+        from app.core.memory import ConversationMemory
+
+        memory = ConversationMemory(max_turns=3)
+        for i in range(5):
+            await memory.add_turn("s1", "user", f"message {i}")
+
+        turns = await memory.get_turns("s1")
+        assert [t["content"] for t in turns] == ["message 2", "message 3", "message 4"]
+        assert (await memory.get_context("s1")).startswith("user: message 2")
+
+    @pytest.mark.asyncio
+    async def test_idle_ttl_and_session_cap(self):
+        """Test idle sessions expire and the least recently active is evicted at the cap"""
+        from app.core.memory import ConversationMemory
+
+        memory = ConversationMemory(ttl=60, max_sessions=2)
+        await memory.add_turn("s1", "user", "hi")
+        await memory.add_turn("s2", "user", "hi")
+        await memory.get_turns("s1")
+        await memory.add_turn("s3", "user", "hi")
+
+        assert list(memory.conversations) == ["s1", "s3"]
+
+        with patch("app.core.memory.time.monotonic", return_value=memory.conversations["s3"].last_active + 61):
+            assert await memory.get_context("s1") == ""
+            stats = await memory.get_stats()
+
+        assert stats["sessions"] == 0
+        assert stats["evictions"] == {"ttl": 2, "capacity": 1}
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_falls_back_to_local(self):
+        """Test the Redis store keeps working in-process while Redis is down"""
+        from app.core.memory import RedisConversationMemory
+
+        connection = MagicMock()
+        connection.get_client = AsyncMock(return_value=None)
+        connection.is_connected = False
+
+        memory = RedisConversationMemory(redis_connection=connection)
+        await memory.add_turn("s1", "user", "hello")
+
+        assert await memory.get_context("s1") == "user: hello"
+        assert (await memory.get_stats())["backend"].startswith("memory")
+
+    @pytest.mark.asyncio
+    async def test_redis_down_costs_one_attempt_per_retry_window(self):
+        """Test a down Redis is not retried on every turn until the back-off passes"""
+        from app.core.memory import RedisConversationMemory
+
+        connection = MagicMock()
+        connection.get_client = AsyncMock(return_value=None)
+        connection.is_connected = False
+
+        memory = RedisConversationMemory(redis_connection=connection, redis_retry_seconds=30)
+        clock = [1000.0]
+        with patch("app.core.memory.time.monotonic", lambda: clock[0]):
+            for i in range(5):
+                await memory.add_turn("s1", "user", f"turn {i}")
+                await memory.get_turns("s1")
+            assert connection.get_client.await_count == 1
+
+            clock[0] += 31
+            await memory.get_turns("s1")
+            assert connection.get_client.await_count == 2
+
+
+class TestMemoryWriteQueue:
+    """Tests for write-behind memory persistence"""
+
+    @pytest.fixture
+    def memory(self):
+        """Memory whose bulk writes are recorded"""
+        memory = MagicMock()
+        memory.batches = []
+
+        async def add_contexts(batch):
+            memory.batches.append([doc_id for doc_id, _, _ in batch])
+
+        memory.add_contexts = add_contexts
+        return memory
+
+    @pytest.mark.asyncio
+    async def test_batches_and_flushes_on_close(self, memory):
+        """Test queued documents are written in batches and drained on close"""
+        from app.core.memory import MemoryWriteQueue
+
+        queue = MemoryWriteQueue(memory, batch_size=3, flush_interval=0.05)
+        queue.start()
+        for i in range(7):
+            assert await queue.add_context(f"doc-{i}", "text")
+        await queue.close(timeout=1)
+
+        assert [len(b) for b in memory.batches] == [3, 3, 1]
+        assert queue.get_stats()["written"] == 7
+        assert not queue.get_stats()["running"]
+
+    @pytest.mark.asyncio
+    async def test_backend_errors_count_as_failed(self):
+        """Test a batch the backend rejects is counted as failed, not written"""
+        from app.core.memory import MemoryWriteQueue, VectorMemory
+
+        memory = VectorMemory(backend="mock")
+        memory.backend = "chromadb"
+        memory.collection = MagicMock()
+        memory.collection.upsert.side_effect = RuntimeError("collection unavailable")
+
+        queue = MemoryWriteQueue(memory, batch_size=3, flush_interval=0.01)
+        queue.start()
+        for i in range(2):
+            assert await queue.add_context(f"doc-{i}", "text")
+        await queue.close(timeout=1)
+
+        assert queue.get_stats()["failed"] == 2
+        assert queue.get_stats()["written"] == 0
+        # The single-document API still logs instead of raising
+        await memory.add_context("doc-3", "text")
+
+    @pytest.mark.asyncio
+    async def test_backpressure_drops_when_full(self, memory):
+        """Test a full queue makes producers wait, then drops"""
+        from app.core.memory import MemoryWriteQueue
+
+        queue = MemoryWriteQueue(memory, max_size=2, enqueue_timeout=0.01)
+        assert await queue.add_context("doc-1", "text")
+        assert await queue.add_context("doc-2", "text")
+        assert not await queue.add_context("doc-3", "text")
+
+        assert queue.get_stats()["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_engine_enqueues_trace(self, mock_vector_memory, mock_final_answer_response):
+        """Test the ReAct engine hands completed traces to the write queue"""
+        writer = MagicMock()
+        writer.add_context = AsyncMock(return_value=True)
+        engine = ReActEngine(memory_client=mock_vector_memory, memory_writer=writer)
+
+        with patch.object(engine.llm, 'generate', new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = mock_final_answer_response
+            result = await engine.run("Is v2.0 ready?", {"user_id": "test"})
+
+        writer.add_context.assert_awaited_once()
+        assert writer.add_context.call_args.kwargs["doc_id"] == result["trace_id"]
+
+
+class TestEmbeddingService:
+    """Tests for the batched embedding pipeline"""
+
+    @pytest.fixture
+    def service(self):
+        """Embedding service with a counting encoder"""
+        from app.core.embeddings import EmbeddingService, hash_embedding
+
+        service = EmbeddingService(batch_size=8, max_wait_ms=5, cache_size=3)
+        service.calls = []
+
+        def fake_encode(texts):
+            service.calls.append(list(texts))
+            return [hash_embedding(t) for t in texts]
+
+        service.encode = fake_encode
+        return service
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_a_batch(self, service):
+        """Test concurrent embeds are encoded together and duplicates once"""
+        import asyncio
+
+        results = await asyncio.gather(*(service.embed(t) for t in ["a", "b", "c", "a"]))
+
+        assert service.calls == [["a", "b", "c"]]
+        assert results[0] == results[3]
+        assert len(results[1]) == 384
+
+    @pytest.mark.asyncio
+    async def test_batches_split_at_batch_size(self, service):
+        """Test a bulk embed is split into batch_size chunks"""
+        service.cache_size = 100
+        await service.embed_many([f"text {i}" for i in range(20)])
+
+        assert [len(batch) for batch in service.calls] == [8, 8, 4]
+        assert service.get_stats()["batches"] == 3
+
+    @pytest.mark.asyncio
+    async def test_lru_cache(self, service):
+        """Test cached texts skip the model and the LRU bound is enforced"""
+        await service.embed_many(["a", "b", "c"])
+        await service.embed("a")
+        await service.embed("d")
+        await service.embed("a")
+
+        assert service.calls == [["a", "b", "c"], ["d"]]
+        assert service.get_stats()["cache_entries"] == 3
+        assert service.get_stats()["hits"] == 2
+
+        await service.embed("b")
+        assert service.calls[-1] == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_model_load_failure_falls_back_to_hash(self):
+        """Test a model that fails to load neither breaks warmup nor embedding"""
+        import sys
+        from unittest.mock import MagicMock, patch
+        from app.core.embeddings import EmbeddingService, hash_embedding
+
+        broken = MagicMock()
+        broken.SentenceTransformer.side_effect = OSError("no network")
+        service = EmbeddingService()
+        with patch.dict(sys.modules, {"sentence_transformers": broken}):
+            await service.warmup()
+            embedding = await service.embed("release status")
+
+        assert embedding == hash_embedding("release status")
+        await service.close()
+
+
+class TestLocalVectorIndex:
+    """Tests for the in-process NumPy vector index"""
+
+    @pytest.fixture
+    def vectors(self):
+        """Random unit vectors"""
+        import numpy as np
+        rng = np.random.default_rng(42)
+        data = rng.normal(size=(200, 16)).astype("float32")
+        return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+    def test_exact_top_k(self, vectors):
+        """Test search returns the brute-force cosine top-k, best first"""
+        import numpy as np
+        from app.core.vector_index import LocalVectorIndex
+
+        index = LocalVectorIndex(initial_capacity=8)
+        for i, v in enumerate(vectors):
+            index.upsert(f"doc-{i}", v.tolist(), f"content {i}")
+
+        query = vectors[7] + 0.05 * vectors[3]
+        results = index.search(query.tolist(), k=5)
+        expected = np.argsort(-(vectors @ (query / np.linalg.norm(query))))[:5]
+
+        assert [doc_id for doc_id, _, _ in results] == [f"doc-{i}" for i in expected]
+        assert results[0][1] >= results[-1][1]
+
+    def test_upsert_delete_and_filter(self, vectors):
+        """Test replace, swap-delete and metadata filtering keep rows consistent"""
+        from app.core.vector_index import LocalVectorIndex
+
+        index = LocalVectorIndex()
+        for i in range(3):
+            index.upsert(f"doc-{i}", vectors[i].tolist(), f"content {i}", {"team": "a" if i else "b"})
+        index.upsert("doc-0", vectors[5].tolist(), "replaced", {"team": "b"})
+        assert len(index) == 3
+
+        assert index.delete("doc-0")
+        assert not index.delete("doc-0")
+        assert index.search(vectors[2].tolist(), k=1)[0][0] == "doc-2"
+        assert index.search(vectors[2].tolist(), k=3, filter_metadata={"team": "b"}) == []
+
+    def test_persistence_and_growth(self, tmp_path, vectors):
+        """Test the memory-mapped matrix grows and reloads with the document log"""
+        from app.core.vector_index import LocalVectorIndex
+
+        index = LocalVectorIndex(path=str(tmp_path), initial_capacity=4)
+        for i in range(50):
+            index.upsert(f"doc-{i}", vectors[i].tolist(), f"content {i}")
+        index.delete("doc-3")
+        index.close()
+
+        reopened = LocalVectorIndex(path=str(tmp_path))
+        assert len(reopened) == 49
+        assert reopened.get_stats()["capacity"] >= 64
+        assert reopened.search(vectors[49].tolist(), k=1)[0][0] == "doc-49"
+        assert "doc-3" not in reopened
+
+    def test_ivf_recall(self, vectors):
+        """Test the IVF quantizer kicks in and still finds near-duplicates"""
+        from app.core.vector_index import LocalVectorIndex
+
+        index = LocalVectorIndex(ivf_min_vectors=100, nprobe=4)
+        for i, v in enumerate(vectors):
+            index.upsert(f"doc-{i}", v.tolist(), f"content {i}")
+
+        # Searching never trains; it scans until the quantizer is built
+        assert index.search(vectors[0].tolist(), k=1)[0][0] == "doc-0"
+        assert index.get_stats()["ivf_lists"] == 0
+        assert index.needs_training()
+
+        index.train()
+        hits = sum(index.search(vectors[i].tolist(), k=1)[0][0] == f"doc-{i}" for i in range(0, 200, 10))
+        assert index.get_stats()["ivf_lists"] > 1
+        assert not index.needs_training()
+        assert hits == 20
+
+    def test_rows_written_during_training_are_reassigned(self, vectors):
+        """Test upserts racing a training run are assigned to the new lists"""
+        import numpy as np
+        from unittest.mock import patch
+        from app.core.vector_index import LocalVectorIndex
+
+        index = LocalVectorIndex(ivf_min_vectors=50, nprobe=2)
+        for i in range(100):
+            index.upsert(f"doc-{i}", vectors[i].tolist(), f"content {i}")
+
+        real_argmax = np.argmax
+        calls = {"n": 0}
+
+        def argmax(*args, **kwargs):
+            # The first k-means step runs unlocked, between snapshot and install
+            calls["n"] += 1
+            if calls["n"] == 1:
+                for i in range(100, 200):
+                    index.upsert(f"doc-{i}", vectors[i].tolist(), f"content {i}")
+                index.delete("doc-0")
+            return real_argmax(*args, **kwargs)
+
+        with patch("app.core.vector_index.np.argmax", argmax):
+            index.train(iterations=1)
+
+        assert len(index) == 199
+        assert (index._assignments[:len(index)] >= 0).all()
+        hits = sum(index.search(vectors[i].tolist(), k=1)[0][0] == f"doc-{i}" for i in range(100, 200, 10))
+        assert hits == 10
+
+    @pytest.mark.asyncio
+    async def test_vector_memory_trains_off_loop(self, vectors):
+        """Test VectorMemory runs index writes and training on a worker thread"""
+        import asyncio
+        from unittest.mock import patch
+        from app.core.memory import VectorMemory
+        from app.core.vector_index import LocalVectorIndex
+
+        with patch.dict("os.environ", {"LOCAL_MEMORY_DIR": ""}):
+            memory = VectorMemory(backend="local")
+        memory.index = LocalVectorIndex(ivf_min_vectors=100, nprobe=4)
+        memory.embeddings.embed_many = lambda texts: asyncio.sleep(
+            0, [vectors[int(t.split()[1])].tolist() for t in texts]
+        )
+
+        with patch("app.core.memory.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            await memory.add_contexts([(f"doc-{i}", f"content {i}", None) for i in range(200)])
+            await memory._index_training
+            assert memory.index.get_stats()["ivf_lists"] > 1
+            await memory.delete("doc-0")
+            await memory.clear()
+
+        assert [call.args[0] for call in to_thread.call_args_list] == [
+            memory.index.upsert_many, memory.index.train, memory.index.delete, memory.index.clear
+        ]
+
 
 class TestLLMClient:
     """Tests for LLM Client"""
@@ -223,3 +878,209 @@ class TestLLMClient:
         
         assert "Thought:" in result["content"]
         assert "Action" in result["content"] or "Final Answer" in result["content"]
+
+
+    @pytest.mark.asyncio
+    async def test_mock_llm_stream(self):
+        """Test mock streaming reassembles into the generated response"""
+        from app.core.react_engine import LLMClient
+
+        client = LLMClient()
+        chunks = [c async for c in client.stream("What is the status of PROJ-123?")]
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == client._mock_generate("What is the status of PROJ-123?")["content"]
+
+    @pytest.mark.asyncio
+    async def test_stream_records_llm_usage(self):
+        """Test streamed calls record the same LLM metrics as generate()"""
+        from prometheus_client import REGISTRY
+        from app.core.react_engine import LLMClient
+
+        client = LLMClient()
+        labels = {"model_name": client.model, "status": "success"}
+        before = REGISTRY.get_sample_value("nexus_llm_requests_total", labels) or 0
+        tokens_before = REGISTRY.get_sample_value(
+            "nexus_llm_tokens_total", {"model_name": client.model, "type": "output"}
+        ) or 0
+
+        usage = {}
+        [c async for c in client.stream("What is the status of PROJ-123?", usage=usage)]
+
+        assert usage == {"input_tokens": 100, "output_tokens": 50}
+        assert REGISTRY.get_sample_value("nexus_llm_requests_total", labels) == before + 1
+        assert REGISTRY.get_sample_value(
+            "nexus_llm_tokens_total", {"model_name": client.model, "type": "output"}
+        ) == tokens_before + 50
+
+    @pytest.mark.asyncio
+    async def test_stream_error_falls_back_to_mock(self):
+        """Test a provider error before any chunk streams the mock response"""
+        from unittest.mock import MagicMock
+        from app.core.react_engine import LLMClient
+
+        async def failing_stream(prompt, system_prompt=None):
+            raise ConnectionError("provider down")
+            yield  # pragma: no cover
+
+        client = LLMClient()
+        client.provider = "openai"
+        client._stream_client = MagicMock(stream=failing_stream)
+
+        usage = {}
+        chunks = [c async for c in client.stream("What is the status of PROJ-123?", usage=usage)]
+
+        assert "".join(chunks) == client._mock_generate("What is the status of PROJ-123?")["content"]
+        assert usage["output_tokens"] == 50
+
+    @pytest.mark.asyncio
+    async def test_stream_error_after_chunks_is_raised(self):
+        """Test a stream that breaks midway fails instead of returning half an answer"""
+        from unittest.mock import MagicMock
+        from prometheus_client import REGISTRY
+        from app.core.react_engine import LLMClient
+
+        async def broken_stream(prompt, system_prompt=None):
+            yield "Thought: I need to "
+            raise ConnectionError("connection reset")
+
+        client = LLMClient()
+        client.provider = "openai"
+        client._stream_client = MagicMock(stream=broken_stream)
+        labels = {"model_name": client.model, "status": "error"}
+        before = REGISTRY.get_sample_value("nexus_llm_requests_total", labels) or 0
+
+        usage = {}
+        chunks = []
+        with pytest.raises(ConnectionError):
+            async for chunk in client.stream("What is the status of PROJ-123?", usage=usage):
+                chunks.append(chunk)
+
+        assert chunks == ["Thought: I need to "]
+        assert usage == {}
+        assert REGISTRY.get_sample_value("nexus_llm_requests_total", labels) == before + 1
+
+
+class TestResponseCache:
+    """Tests for the orchestrator response cache"""
+    
+    @pytest.fixture
+    def response_cache(self):
+        """Create response cache instance"""
+        from app.core.response_cache import ResponseCache
+        from app.core.react_engine import get_agent_types_for_result
+        return ResponseCache(ttl=60, max_entries=3, tag_resolver=get_agent_types_for_result)
+    
+    @pytest.fixture
+    def user_context(self):
+        return {"user_id": "U1", "team_id": "T1"}
+    
+    def test_normalize_query(self):
+        """Test near-identical phrasings normalize to the same key"""
+        from app.core.response_cache import normalize_query
+        
+        assert normalize_query("Is v2.0 ready?") == normalize_query("  is V2.0   READY ")
+        assert normalize_query("Status of PROJ-123.") == "status of proj-123"
+    
+    @pytest.mark.asyncio
+    async def test_hit_and_miss(self, response_cache, user_context):
+        """Test exact-match hits are scoped per user"""
+        result = {"result": "Ready", "plan": "get_sprint_stats"}
+        
+        assert await response_cache.get("Is v2.0 ready?", user_context) is None
+        await response_cache.set("Is v2.0 ready?", result, user_context)
+        
+        assert await response_cache.get("is v2.0 ready", user_context) == result
+        assert await response_cache.get("is v2.0 ready", {"user_id": "U2", "team_id": "T1"}) is None
+        
+        stats = response_cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, response_cache, user_context):
+        """Test failed runs are never cached"""
+        await response_cache.set("loop", {"result": "x", "error": "max_iterations_exceeded"}, user_context)
+        
+        assert await response_cache.get("loop", user_context) is None
+    
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, response_cache, user_context):
+        """Test expired entries are not served"""
+        response_cache.ttl = 0
+        await response_cache.set("Build status?", {"result": "green"}, user_context)
+        
+        assert await response_cache.get("Build status?", user_context) is None
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, response_cache, user_context):
+        """Test the cache stays within max_entries"""
+        for i in range(5):
+            await response_cache.set(f"query {i}", {"result": i}, user_context)
+        
+        assert response_cache.get_stats()["entries"] == 3
+        assert await response_cache.get("query 0", user_context) is None
+        assert await response_cache.get("query 4", user_context) == {"result": 4}
+    
+    @pytest.mark.asyncio
+    async def test_event_invalidation_is_selective(self, response_cache, user_context):
+        """Test webhook events only evict answers built from affected agents"""
+        await response_cache.set("sprint?", {"result": "a", "plan": "get_sprint_stats"}, user_context)
+        await response_cache.set("build?", {"result": "b", "plan": "get_build_status"}, user_context)
+        
+        assert response_cache.invalidate_for_event("ticket.updated") == 1
+        
+        assert await response_cache.get("sprint?", user_context) is None
+        assert await response_cache.get("build?", user_context) is not None
+        
+        assert response_cache.invalidate_for_event("release.created") == 1
+        assert response_cache.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_tool_less_answers_tagged_by_query_class(self, response_cache, user_context):
+        """Test answers that called no tools are evicted by events for their query class"""
+        direct = {"result": "yes", "plan": "Direct response"}
+        await response_cache.set("Is v2.0 ready?", direct, user_context, task_type="release_check")
+        await response_cache.set("Who broke the build?", direct, user_context, task_type="rca")
+        await response_cache.set("Hello", direct, user_context)
+        
+        assert response_cache.invalidate_for_event("ticket.updated") == 2
+        assert await response_cache.get("Who broke the build?", user_context) is not None
+        assert response_cache.invalidate_for_event("build.failed") == 1
+    
+    @pytest.mark.asyncio
+    async def test_anonymous_callers_bypass_cache(self, response_cache):
+        """Test callers without an identity for the cache scope are never cached"""
+        from app.core.response_cache import ResponseCache
+        
+        await response_cache.set("Is v2.0 ready?", {"result": "Ready"}, {})
+        assert await response_cache.get("Is v2.0 ready?", {}) is None
+        await response_cache.set("Is v2.0 ready?", {"result": "Ready"}, {"team_id": "T1"})
+        assert response_cache.get_stats()["entries"] == 0
+        
+        tenant_cache = ResponseCache(ttl=60, scope="tenant")
+        await tenant_cache.set("Is v2.0 ready?", {"result": "Ready"}, {"user_id": "U1"})
+        assert tenant_cache.get_stats()["entries"] == 0
+        await tenant_cache.set("Is v2.0 ready?", {"result": "Ready"}, {"user_id": "U1", "team_id": "T1"})
+        assert await tenant_cache.get("Is v2.0 ready?", {"user_id": "U2", "team_id": "T1"}) == {"result": "Ready"}
+    
+    @pytest.mark.asyncio
+    async def test_semantic_match(self, user_context):
+        """Test similar queries hit through embedding similarity"""
+        from app.core.response_cache import ResponseCache
+        
+        vectors = {
+            "release status for v2.0": [1.0, 0.0, 0.1],
+            "is v2.0 ready": [0.98, 0.0, 0.12],
+            "who broke the build": [0.0, 1.0, 0.0],
+        }
+        
+        async def embedder(text):
+            return vectors[text]
+        
+        cache = ResponseCache(ttl=60, semantic=True, similarity_threshold=0.95, embedder=embedder)
+        await cache.set("Release status for v2.0", {"result": "Ready"}, user_context)
+        
+        assert await cache.get("Is v2.0 ready?", user_context) == {"result": "Ready"}
+        assert await cache.get("Who broke the build?", user_context) is None
+        assert cache.get_stats()["semantic_hits"] == 1
@@ -18,6 +18,7 @@ Usage:
     pytest tests/unit/test_shared_lib.py -v
 """
 
+import asyncio
 import pytest
 import sys
 import os
@@ -453,6 +454,121 @@ class TestUtilityFunctions:
         assert parsed is not None
 
 
+class TestSimpleCache:
+    """Tests for SimpleCache and the cached decorator."""
+    
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted at capacity."""
+        from nexus_lib.utils import SimpleCache
+        
+        store = SimpleCache(max_size=2, name="test_lru")
+        store.set("a", 1)
+        store.set("b", 2)
+        assert store.get("a") == 1
+        store.set("c", 3)
+        
+        assert store.get("b") is None
+        assert store.get("a") == 1
+        assert store.get_stats()["evictions"] == 1
+    
+    def test_stale_window(self):
+        """Test expired values are returned flagged stale inside the stale window."""
+        from nexus_lib.utils import SimpleCache
+        
+        store = SimpleCache(name="test_stale")
+        store.set("k", "v", ttl=0, stale_ttl=60)
+        
+        assert store.get("k") is None
+        assert store.lookup("k") == (True, "v", True)
+    
+    @pytest.mark.asyncio
+    async def test_single_flight_and_falsy_results(self):
+        """Test concurrent misses share one call and empty results are cached."""
+        from nexus_lib.utils import SimpleCache, cached
+        
+        calls = {"n": 0}
+        
+        @cached(ttl=60, store=SimpleCache(name="test_flight"))
+        async def lookup(key):
+            calls["n"] += 1
+            await asyncio.sleep(0.01)
+            return []
+        
+        results = await asyncio.gather(*(lookup("PROJ") for _ in range(10)))
+        assert results == [[]] * 10
+        assert await lookup("PROJ") == []
+        assert calls["n"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_keys_distinguish_argument_types(self):
+        """Test 1, True and 1.0 get separate entries and keys hold no arguments."""
+        import gc
+        import weakref
+        from nexus_lib.utils import SimpleCache, cached
+        
+        store = SimpleCache(name="test_key_types")
+        
+        @cached(ttl=60, store=store)
+        async def describe(value):
+            return type(value).__name__
+        
+        assert [await describe(v) for v in (1, True, 1.0)] == ["int", "bool", "float"]
+        assert await describe(True) == "bool"
+        
+        class Service:
+            @cached(ttl=60, store=store)
+            async def status(self):
+                return "ok"
+        
+        service = Service()
+        ref = weakref.ref(service)
+        assert await service.status() == "ok"
+        del service
+        gc.collect()
+        assert ref() is None
+    
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        """Test a stale value is served while one background call refreshes it."""
+        from nexus_lib.utils import SimpleCache, cached
+        
+        values = iter(["v1", "v2"])
+        
+        @cached(ttl=0.01, stale_ttl=60, store=SimpleCache(name="test_swr"))
+        async def fetch():
+            return next(values)
+        
+        assert await fetch() == "v1"
+        await asyncio.sleep(0.02)
+        assert await fetch() == "v1"
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert await fetch() == "v2"
+    
+    @pytest.mark.asyncio
+    async def test_negative_ttl_and_errors(self):
+        """Test None results can be skipped and exceptions are not cached."""
+        from nexus_lib.utils import SimpleCache, cached
+        
+        calls = {"n": 0}
+        
+        @cached(ttl=60, negative_ttl=0, store=SimpleCache(name="test_negative"))
+        async def find(key):
+            calls["n"] += 1
+            if key == "boom":
+                raise ValueError("boom")
+            return None
+        
+        assert await find("missing") is None
+        assert await find("missing") is None
+        assert calls["n"] == 2
+        
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await find("boom")
+        assert calls["n"] == 4
+
+
 class TestAgentRegistry:
     """Tests for AgentRegistry."""
     
@@ -500,6 +616,765 @@ class TestAsyncHttpClient:
             max_retries=3
         )
         assert client.max_retries == 3
+    
+    @pytest.mark.asyncio
+    async def test_clients_share_pool_per_host(self):
+        """Test clients for the same host reuse one pooled httpx client."""
+        from nexus_lib.utils import AsyncHttpClient, HttpPoolManager
+        
+        pool = HttpPoolManager()
+        a = AsyncHttpClient(base_url="http://jira-agent:8081/api", pool=pool)
+        b = AsyncHttpClient(base_url="http://jira-agent:8081", pool=pool)
+        c = AsyncHttpClient(base_url="http://git-ci-agent:8082", pool=pool)
+        
+        assert a.client is b.client
+        assert a.client is not c.client
+        
+        await a.close()
+        assert not b.client.is_closed
+        
+        await pool.close_all()
+    
+    @pytest.mark.asyncio
+    async def test_request_records_pool_stats(self):
+        """Test requests go through the pool with default headers and are counted."""
+        import httpx
+        from nexus_lib.utils import AsyncHttpClient, HttpPoolManager
+        
+        seen = {}
+        
+        def handler(request):
+            seen["auth"] = request.headers.get("Authorization")
+            seen["trace"] = request.headers.get("X-Trace")
+            return httpx.Response(200, json={"ok": True})
+        
+        pool = HttpPoolManager(max_connections=10)
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool.get_client = lambda url: mock_client
+        
+        client = AsyncHttpClient(base_url="http://jira-agent:8081", auth_token="t0k", pool=pool)
+        result = await client.get("/issue/PROJ-1", headers={"X-Trace": "abc"})
+        
+        assert result == {"ok": True}
+        assert seen == {"auth": "Bearer t0k", "trace": "abc"}
+        
+        stats = pool.get_stats()["hosts"]["http://jira-agent:8081"]
+        assert stats["requests"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["utilization"] == 0.0
+        
+        await mock_client.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_circuit_opens_and_fails_fast(self):
+        """Test a failing host trips its circuit and further calls are rejected."""
+        import httpx
+        from nexus_lib.utils import AsyncHttpClient, HttpPoolManager, CircuitBreaker, CircuitState
+        
+        calls = {"n": 0}
+        
+        def handler(request):
+            calls["n"] += 1
+            return httpx.Response(503)
+        
+        pool = HttpPoolManager()
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool.get_client = lambda url: mock_client
+        origin = "http://flaky-agent:8090"
+        pool._breakers[origin] = CircuitBreaker(
+            origin, failure_rate_threshold=0.5, min_requests=3, window_seconds=30, open_seconds=60,
+            on_state_change=pool._notify_circuit
+        )
+        
+        transitions = []
+        pool.add_circuit_listener(lambda o, state: transitions.append((o, state)))
+        
+        client = AsyncHttpClient(base_url=origin, pool=pool)
+        for _ in range(3):
+            result = await client.get("/health")
+            assert result["status"] == "error"
+        
+        assert pool.breaker(origin).state == CircuitState.OPEN
+        assert transitions == [(origin, CircuitState.OPEN)]
+        
+        result = await client.get("/health")
+        assert result["circuit_open"] is True
+        assert calls["n"] == 3
+        
+        await mock_client.aclose()
+    
+    def test_circuit_half_open_recovery(self):
+        """Test an open circuit lets one trial through and closes on success."""
+        from nexus_lib.utils import CircuitBreaker, CircuitState
+        
+        breaker = CircuitBreaker("http://a:1", failure_rate_threshold=0.5, min_requests=2, open_seconds=0)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker._state == CircuitState.OPEN
+        
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_stats()["window_requests"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_half_open_trial_releases_slot(self):
+        """Test a cancelled trial request neither wedges the circuit nor leaks in-flight counts."""
+        import asyncio
+        import httpx
+        from nexus_lib.utils import AsyncHttpClient, HttpPoolManager, CircuitBreaker, CircuitState
+        
+        async def handler(request):
+            await asyncio.sleep(10)
+            return httpx.Response(200, json={"ok": True})
+        
+        pool = HttpPoolManager()
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool.get_client = lambda url: mock_client
+        origin = "http://trial-agent:8090"
+        breaker = pool._breakers[origin] = CircuitBreaker(origin, min_requests=1, open_seconds=0)
+        breaker.record_failure()
+        assert breaker.state == CircuitState.HALF_OPEN
+        
+        client = AsyncHttpClient(base_url=origin, pool=pool)
+        trial = asyncio.ensure_future(client.get("/health"))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        assert pool.get_stats()["hosts"][origin]["in_flight"] == 0
+        
+        await mock_client.aclose()
+    
+    def test_retry_budget_caps_retries(self):
+        """Test retries stop once they exceed the budgeted share of traffic."""
+        from nexus_lib.utils import RetryBudget
+        
+        budget = RetryBudget("http://a:1", ratio=0.2, min_per_second=0, window_seconds=10)
+        for _ in range(10):
+            budget.record_request()
+        
+        assert budget.try_retry() is True
+        assert budget.try_retry() is True
+        assert budget.try_retry() is False
+        assert budget.get_stats()["window_retries"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_request_records_host_health(self):
+        """Test request outcomes feed the host's latency EWMA and error window."""
+        import httpx
+        from nexus_lib.utils import AsyncHttpClient, HttpPoolManager
+        
+        statuses = iter([503, 200])
+        
+        def handler(request):
+            return httpx.Response(next(statuses), json={})
+        
+        pool = HttpPoolManager()
+        mock_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        pool.get_client = lambda url: mock_client
+        client = AsyncHttpClient(base_url="http://passive-agent:8091", pool=pool, max_retries=1)
+        
+        await client.get("/a")
+        host = pool.host_health("http://passive-agent:8091")
+        assert host.consecutive_failures == 1
+        assert host.last_error == "HTTP 503"
+        
+        await client.get("/b")
+        assert host.totals() == (2, 1)
+        assert host.consecutive_failures == 0
+        assert host.latency_ewma is not None
+        assert pool.get_stats()["hosts"]["http://passive-agent:8091"]["health"]["window_failures"] == 1
+        
+        await mock_client.aclose()
+    
+    def test_host_health_ewma(self):
+        from nexus_lib.utils import HostHealth
+        
+        host = HostHealth("http://a:1", alpha=0.5)
+        host.record(0.1)
+        host.record(0.3)
+        assert host.latency_ewma == pytest.approx(0.2)
+        assert host.idle_seconds() < 1
+    
+    def test_registry_derives_health_from_traffic(self):
+        """Test specialist health follows real request outcomes without probes."""
+        from nexus_lib.specialists import SpecialistRegistry, SpecialistStatus
+        from nexus_lib.utils import http_pool, HttpPoolManager
+        
+        registry = SpecialistRegistry()
+        registry.register_specialist("jira", "http://passive-jira:9101")
+        host = http_pool.host_health(HttpPoolManager.origin("http://passive-jira:9101"))
+        
+        for _ in range(5):
+            host.record(0.05)
+        health = registry.get_health("jira")
+        assert health.status == SpecialistStatus.HEALTHY
+        assert health.response_time_ms == pytest.approx(50)
+        
+        host.record(0.05, failure=True, error="Timeout")
+        assert registry.get_health("jira").status == SpecialistStatus.DEGRADED
+        
+        host.record(0.05, failure=True, error="Timeout")
+        host.record(0.05, failure=True, error="Timeout")
+        health = registry.get_health("jira")
+        assert health.status == SpecialistStatus.UNHEALTHY
+        assert health.error_message == "Timeout"
+    
+    def test_probe_schedule_adapts(self):
+        """Test busy healthy specialists are not probed; suspect ones back off."""
+        from nexus_lib.specialists import SpecialistRegistry
+        from nexus_lib.utils import http_pool, HttpPoolManager
+        
+        registry = SpecialistRegistry(health_check_interval=30)
+        registry._probe_jitter = 0
+        registry.register_specialist("jira", "http://probe-jira:9102")
+        registry.register_specialist("git_ci", "http://probe-git:9103")
+        
+        # Unknown -> suspect interval; repeated probe failures back off to the cap
+        assert registry._probe_interval("git_ci") == registry._suspect_probe_interval
+        registry._probe_failures["git_ci"] = 3
+        assert registry._probe_interval("git_ci") == registry._suspect_probe_interval * 8
+        registry._probe_failures["git_ci"] = 20
+        assert registry._probe_interval("git_ci") == registry._max_probe_interval
+        
+        # Healthy with live traffic -> no probe needed
+        host = http_pool.host_health(HttpPoolManager.origin("http://probe-jira:9102"))
+        for _ in range(5):
+            host.record(0.01)
+        assert registry._probe_interval("jira") is None
+        
+        registry.request_probe("jira")
+        assert registry._next_probe["jira"] == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_probe_due_only_probes_due_specialists(self):
+        from nexus_lib.specialists import SpecialistRegistry, SpecialistHealth
+        
+        registry = SpecialistRegistry()
+        registry._next_probe = {spec_id: float("inf") for spec_id in registry.all_specialists}
+        registry.request_probe("jira")
+        
+        with patch.object(registry, "check_health", new=AsyncMock(return_value=SpecialistHealth())) as probe:
+            delay = await registry._probe_due()
+        
+        probe.assert_awaited_once_with("jira")
+        assert 0 < delay <= registry._suspect_probe_interval * (1 + registry._probe_jitter)
+    
+    def test_registry_marks_specialist_unhealthy_on_open_circuit(self):
+        """Test the specialist registry follows circuit state for its hosts."""
+        from nexus_lib.specialists import SpecialistRegistry, SpecialistStatus
+        from nexus_lib.utils import HttpPoolManager, CircuitState
+        
+        registry = SpecialistRegistry()
+        origin = HttpPoolManager.origin(registry.get_url("jira"))
+        
+        registry._on_circuit_change(origin, CircuitState.OPEN)
+        health = registry.get_health("jira")
+        assert health.status == SpecialistStatus.UNHEALTHY
+        assert registry.get_status_summary()["specialists"]["jira"]["circuit_state"] == "open"
+        
+        registry._on_circuit_change(origin, CircuitState.CLOSED)
+        assert registry.get_health("jira").status == SpecialistStatus.HEALTHY
+    
+    @pytest.mark.asyncio
+    async def test_registry_releases_circuit_listener(self):
+        """Test the shared pool neither keeps registries alive nor notifies stopped ones."""
+        import gc
+        import weakref
+        from nexus_lib.specialists import SpecialistRegistry
+        from nexus_lib.utils import http_pool
+        
+        registry = SpecialistRegistry()
+        await registry.start_health_monitoring()
+        await registry.stop_health_monitoring()
+        assert all(ref() != registry._on_circuit_change for ref in http_pool._circuit_listeners)
+        
+        ref = weakref.ref(SpecialistRegistry())
+        gc.collect()
+        assert ref() is None
+    
+    def test_tool_routes_compiled_on_registration(self):
+        """Test the routing table is prebuilt and swapped on (un)registration."""
+        from nexus_lib.specialists import (
+            SpecialistRegistry, SpecialistDefinition, SpecialistCategory,
+            SpecialistTool, ToolParameter,
+        )
+        
+        registry = SpecialistRegistry()
+        route = registry.get_route("get_pr_status")
+        assert route.specialist_id == "git_ci"
+        assert route.path_params == {"repo_name", "pr_number"}
+        assert route.build_path({"repo_name": "nexus", "pr_number": 7}) == "/repo/nexus/pr/7"
+        assert route.query_params({"repo_name": "nexus", "pr_number": 7, "verbose": 1}) == {"verbose": 1}
+        assert registry.get_tool("get_pr_status") == ("git_ci", route.tool)
+        
+        search = registry.get_route("search_jira")
+        assert search.schema["required"] == ["jql"]
+        assert search.build_path({"jql": "{project}"}) == "/search"
+        
+        seen = []
+        registry.add_route_listener(seen.append)
+        before = registry.routes
+        registry.register_specialist("docs", "http://docs:9200", SpecialistDefinition(
+            id="docs", name="Docs Agent", description="Docs", category=SpecialistCategory.DATA,
+            port=9200, env_url_key="DOCS_AGENT_URL",
+            tools=[SpecialistTool(
+                name="get_page", description="Fetch a page", endpoint="/page/{page_id}",
+                parameters=[ToolParameter(name="page_id", description="Page ID", required=True)],
+            )],
+        ))
+        assert registry.routes is not before
+        assert "get_page" not in before
+        assert registry.get_route("get_page").build_path({"page_id": "a{b}"}) == "/page/a{b}"
+        assert seen == [registry.routes]
+        
+        registry.unregister_specialist("docs")
+        assert registry.get_route("get_page") is None
+        assert len(seen) == 2
+
+
+# =============================================================================
+# JWT Cache Tests
+# =============================================================================
+
+class TestJWTCache:
+    """Tests for the verified-token cache in JWTHandler."""
+    
+    SECRET = "jwt-cache-test-secret-32-bytes-long!"
+    
+    def _handler(self, secret=None):
+        from nexus_lib.middleware import JWTConfig, JWTHandler
+        from nexus_lib.utils import SimpleCache
+        return JWTHandler(JWTConfig(secret_key=secret or self.SECRET), cache=SimpleCache(name="jwt_test"))
+    
+    def test_fan_out_verifies_once(self):
+        """Ten calls with the same service token verify the signature once."""
+        import jwt as pyjwt
+        handler = self._handler()
+        token = handler.create_service_token("orchestrator", "orchestrator")
+        
+        with patch("nexus_lib.middleware.jwt.decode", wraps=pyjwt.decode) as decode:
+            payloads = [handler.decode_token(token) for _ in range(10)]
+        
+        assert decode.call_count == 1
+        assert all(p["sub"] == "orchestrator" for p in payloads)
+    
+    def test_payload_copies_are_independent(self):
+        handler = self._handler()
+        token = handler.create_access_token("svc")
+        
+        handler.decode_token(token)["sub"] = "tampered"
+        assert handler.decode_token(token)["sub"] == "svc"
+    
+    def test_cache_is_scoped_to_signing_key(self):
+        """A token cached by one handler is not accepted under another key."""
+        from fastapi import HTTPException
+        
+        handler = self._handler()
+        token = handler.create_access_token("svc")
+        other = self._handler(secret="another-secret-that-is-32-bytes-long")
+        other.cache = handler.cache
+        
+        handler.decode_token(token)
+        with pytest.raises(HTTPException):
+            other.decode_token(token)
+    
+    def test_expired_token_not_cached(self):
+        from fastapi import HTTPException
+        
+        handler = self._handler()
+        token = handler.create_access_token("svc", expires_delta=timedelta(seconds=-1))
+        
+        with pytest.raises(HTTPException):
+            handler.decode_token(token)
+        assert len(handler.cache) == 0
+
+
+# =============================================================================
+# Fused Middleware Tests
+# =============================================================================
+
+class TestNexusMiddleware:
+    """Tests for the fused pure-ASGI middleware and its stages."""
+    
+    def _app(self, stages):
+        from fastapi import FastAPI
+        from fastapi.responses import StreamingResponse
+        from nexus_lib.middleware import NexusMiddleware
+        from nexus_lib.multitenancy import get_current_tenant
+        
+        app = FastAPI()
+        app.add_middleware(NexusMiddleware, stages=stages)
+        
+        @app.get("/jira/ticket/{key}")
+        async def ticket(key: str):
+            tenant = get_current_tenant()
+            return {"key": key, "tenant": tenant.slug if tenant else None}
+        
+        @app.get("/stream")
+        async def stream():
+            async def chunks():
+                for i in range(3):
+                    yield f"chunk{i}\n"
+            return StreamingResponse(chunks(), media_type="text/plain")
+        
+        return app
+    
+    def test_route_template_resolution(self):
+        """Paths resolve to the declared route template and are cached."""
+        from nexus_lib.middleware import RouteTemplateCache
+        
+        app = self._app([])
+        cache = RouteTemplateCache(max_size=2)
+        scope = lambda path: {"type": "http", "method": "GET", "path": path, "root_path": "", "app": app}
+        
+        assert cache.resolve(scope("/jira/ticket/PROJ-1")) == "/jira/ticket/{key}"
+        assert cache.resolve(scope("/stream")) == "/stream"
+        assert cache.resolve(scope("/unknown/123")) == "/unknown/{id}"
+        assert len(cache._resolved) == 2
+    
+    def test_metrics_use_route_template(self):
+        from fastapi.testclient import TestClient
+        from prometheus_client import REGISTRY
+        from nexus_lib.middleware import MetricsStage
+        
+        client = TestClient(self._app([MetricsStage(agent_type="fused_test")]))
+        for key in ("PROJ-1", "OTHER-2"):
+            assert client.get(f"/jira/ticket/{key}").status_code == 200
+        
+        count = REGISTRY.get_sample_value("http_requests_total", {
+            "method": "GET", "endpoint": "/jira/ticket/{key}", "status": "200", "agent_type": "fused_test"
+        })
+        assert count == 2
+        assert REGISTRY.get_sample_value("http_active_requests", {"agent_type": "fused_test"}) == 0
+    
+    def test_short_circuit_runs_outer_stages(self, monkeypatch):
+        """A 401 from auth still gets the request id and is not an exception."""
+        from fastapi.testclient import TestClient
+        from nexus_lib.middleware import AuthStage, RequestIdStage
+        
+        monkeypatch.setenv("NEXUS_ENV", "production")
+        client = TestClient(self._app([RequestIdStage(), AuthStage(secret_key="s" * 32)]))
+        
+        response = client.get("/jira/ticket/PROJ-1", headers={"X-Request-ID": "req-1"})
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Missing authorization header"}
+        assert response.headers["X-Request-ID"] == "req-1"
+        
+        response = client.get("/jira/ticket/PROJ-1", headers={"Authorization": "Bearer not-a-jwt"})
+        assert response.status_code == 401
+    
+    def test_auth_accepts_valid_token(self, monkeypatch):
+        from fastapi.testclient import TestClient
+        from nexus_lib.middleware import AuthStage, JWTConfig, JWTHandler
+        
+        monkeypatch.setenv("NEXUS_ENV", "production")
+        secret = "s" * 32
+        token = JWTHandler(JWTConfig(secret_key=secret)).create_service_token("orchestrator", "orchestrator")
+        client = TestClient(self._app([AuthStage(secret_key=secret)]))
+        
+        response = client.get("/jira/ticket/PROJ-1", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 200
+    
+    def test_auth_rejects_unauthenticated_websocket(self, monkeypatch):
+        """WebSocket handshakes need a valid token (header or access_token param)."""
+        from fastapi import WebSocket
+        from fastapi.testclient import TestClient
+        from starlette.websockets import WebSocketDisconnect
+        from nexus_lib.middleware import AuthStage, JWTConfig, JWTHandler
+        
+        monkeypatch.setenv("NEXUS_ENV", "production")
+        secret = "s" * 32
+        token = JWTHandler(JWTConfig(secret_key=secret)).create_service_token("orchestrator", "orchestrator")
+        app = self._app([AuthStage(secret_key=secret)])
+        
+        @app.websocket("/ws")
+        async def ws_endpoint(websocket: WebSocket):
+            await websocket.accept()
+            await websocket.send_json({"user": websocket.state.user["sub"]})
+            await websocket.close()
+        
+        client = TestClient(app)
+        for url, headers in (("/ws", {}), ("/ws?access_token=not-a-jwt", {})):
+            with pytest.raises(WebSocketDisconnect) as exc:
+                with client.websocket_connect(url, headers=headers) as ws:
+                    ws.receive_json()
+            assert exc.value.code == 1008
+        
+        with client.websocket_connect(f"/ws?access_token={token}") as ws:
+            assert ws.receive_json()["user"]
+        with client.websocket_connect("/ws", headers={"Authorization": f"Bearer {token}"}) as ws:
+            assert ws.receive_json()["user"]
+    
+    def test_streaming_response_is_not_buffered(self):
+        """Body chunks reach the server one message at a time."""
+        from nexus_lib.middleware import MetricsStage, RequestIdStage
+        
+        app = self._app([RequestIdStage(), MetricsStage(agent_type="fused_test")])
+        messages = []
+        received = []
+        
+        async def receive():
+            if received:
+                await asyncio.Event().wait()  # client stays connected
+            received.append(True)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        
+        async def send(message):
+            messages.append(message)
+        
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+            "query_string": b"", "headers": [(b"host", b"test")], "client": ("127.0.0.1", 1),
+            "server": ("test", 80),
+        }
+        asyncio.run(app(scope, receive, send))
+        
+        start = messages[0]
+        assert any(name == b"x-request-id" for name, _ in start["headers"])
+        bodies = [m["body"] for m in messages[1:] if m.get("body")]
+        assert bodies == [b"chunk0\n", b"chunk1\n", b"chunk2\n"]
+    
+    def test_tenant_stage_sets_context(self):
+        from fastapi.testclient import TestClient
+        from nexus_lib.multitenancy import TenantStage, get_current_tenant
+        
+        tenant = MagicMock(id="t-1", slug="acme")
+        tenant.is_active.return_value = True
+        repository = MagicMock()
+        repository.get_by_id = AsyncMock(return_value=tenant)
+        client = TestClient(self._app([TenantStage(repository=repository)]))
+        
+        response = client.get("/jira/ticket/PROJ-1", headers={"X-Tenant-ID": "t-1"})
+        assert response.json()["tenant"] == "acme"
+        assert response.headers["X-Tenant-ID"] == "t-1"
+        assert get_current_tenant() is None
+    
+    def test_rate_limit_keys_on_route_template(self):
+        from fastapi.testclient import TestClient
+        from nexus_lib.middleware import RateLimitStage, TokenBucketLimiter
+        
+        limiter = TokenBucketLimiter()
+        limiter.use_redis = False
+        client = TestClient(self._app([RateLimitStage(requests_per_minute=1, limiter=limiter)]))
+        
+        assert client.get("/jira/ticket/PROJ-1").status_code == 200
+        response = client.get("/jira/ticket/PROJ-2")
+        assert response.status_code == 429
+        assert response.headers["X-RateLimit-Remaining"] == "0"
+        assert any("GET /jira/ticket/{key}" in key for key in limiter._local)
+
+
+# =============================================================================
+# Rate Limiter Tests
+# =============================================================================
+
+class TestTokenBucketLimiter:
+    """Tests for the token-bucket rate limiter and middleware."""
+    
+    def _local_limiter(self):
+        from nexus_lib.middleware import TokenBucketLimiter
+        limiter = TokenBucketLimiter(max_local_buckets=2)
+        limiter.use_redis = False
+        return limiter
+    
+    @pytest.mark.asyncio
+    async def test_bucket_exhausts_and_refills(self):
+        """A drained bucket refills at limit/period and reports Retry-After."""
+        from nexus_lib.middleware import RateLimit
+        
+        limiter = self._local_limiter()
+        limits = [RateLimit("second", 2, 1)]
+        clock = [100.0]
+        with patch("nexus_lib.middleware.time.monotonic", lambda: clock[0]):
+            assert (await limiter.acquire("a", limits)).allowed
+            assert (await limiter.acquire("a", limits)).remaining == 0
+            denied = await limiter.acquire("a", limits)
+            assert not denied.allowed
+            assert denied.retry_after == pytest.approx(0.5)
+            
+            clock[0] += 0.5
+            assert (await limiter.acquire("a", limits)).allowed
+    
+    @pytest.mark.asyncio
+    async def test_every_limit_must_have_a_token(self):
+        """A denial by one limit does not consume tokens from the others."""
+        from nexus_lib.middleware import RateLimit
+        
+        limiter = self._local_limiter()
+        limits = [RateLimit("hour", 10, 3600), RateLimit("day", 1, 86400)]
+        assert (await limiter.acquire("a", limits)).allowed
+        assert not (await limiter.acquire("a", limits)).allowed
+        hour_bucket = limiter._local[limiter._bucket_key("a", limits[0])]
+        assert int(hour_bucket[0]) == 9
+    
+    @pytest.mark.asyncio
+    async def test_local_buckets_are_bounded(self):
+        from nexus_lib.middleware import RateLimit
+        
+        limiter = self._local_limiter()
+        for scope in ("a", "b", "c"):
+            await limiter.acquire(scope, [RateLimit("minute", 5, 60)])
+        assert len(limiter._local) == 2
+    
+    @pytest.mark.asyncio
+    async def test_redis_script_result_and_fallback(self):
+        """Redis decisions are used when available; errors fall back locally."""
+        from nexus_lib.middleware import RateLimit, TokenBucketLimiter
+        
+        script = AsyncMock(return_value=[0, 0, 1500])
+        redis = MagicMock()
+        redis.register_script.return_value = script
+        limiter = TokenBucketLimiter(redis_retry_seconds=60)
+        limiter.use_redis = True
+        limits = [RateLimit("hour", 100, 3600)]
+        
+        with patch("nexus_lib.config.RedisConnection.get_client", AsyncMock(return_value=redis)):
+            result = await limiter.acquire("t:u:GET /x", limits)
+            assert not result.allowed
+            assert result.backend == "redis"
+            assert result.retry_after == 1.5
+            assert script.call_args.kwargs["keys"] == ["nexus:ratelimit:{t:u:GET /x}:hour"]
+            
+            script.side_effect = ConnectionError("down")
+            assert (await limiter.acquire("t:u:GET /x", limits)).backend == "local"
+            script.side_effect = None
+            # Stays on the fallback until the retry interval passes
+            assert (await limiter.acquire("t:u:GET /x", limits)).backend == "local"
+    
+    def test_middleware_returns_429_with_retry_after(self):
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from nexus_lib.middleware import RateLimitMiddleware
+        
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, requests_per_minute=1, limiter=self._local_limiter())
+        
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"id": item_id}
+        
+        client = TestClient(app)
+        assert client.get("/items/1").headers["X-RateLimit-Remaining"] == "0"
+        # Same route template shares the bucket
+        response = client.get("/items/2")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "60"
+    
+    def test_middleware_uses_tenant_limits(self):
+        from nexus_lib.middleware import RateLimit, RateLimitMiddleware
+        from nexus_lib.multitenancy.tenant import TenantLimits
+        
+        middleware = RateLimitMiddleware(MagicMock(), limiter=self._local_limiter())
+        tenant = MagicMock(limits=TenantLimits(max_requests_per_hour=50, max_requests_per_day=400))
+        
+        client_limits, tenant_limits = middleware._limits_for(tenant)
+        assert [(l.name, l.limit) for l in client_limits] == [("minute", 100)]
+        assert [(l.name, l.limit) for l in tenant_limits] == [("hour", 50), ("day", 400)]
+        assert middleware._limits_for(None) == ([RateLimit("minute", 100, 60)], [])
+    
+    @pytest.mark.asyncio
+    async def test_tenant_quota_is_shared_across_users_and_routes(self):
+        """Hour/day quotas are charged to the tenant, not per user and route."""
+        from types import SimpleNamespace
+        from nexus_lib.middleware import RateLimitStage
+        from nexus_lib.multitenancy.tenant import TenantLimits
+        
+        limiter = self._local_limiter()
+        limiter.max_local_buckets = 100
+        stage = RateLimitStage(requests_per_minute=100, limiter=limiter)
+        tenant = SimpleNamespace(
+            id="acme",
+            limits=TenantLimits(max_requests_per_hour=3, max_requests_per_day=400)
+        )
+        
+        statuses = []
+        for user in ("alice", "bob", "carol"):
+            for route in ("/jira/ticket/{key}", "/reports/{id}"):
+                request = SimpleNamespace(
+                    state=SimpleNamespace(tenant=tenant, user={"sub": user}),
+                    headers={},
+                    client=None
+                )
+                ctx = SimpleNamespace(request=request, method="GET", endpoint=route)
+                response = await stage.on_request(ctx)
+                statuses.append(200 if response is None else response.status_code)
+        
+        assert statuses == [200, 200, 200, 429, 429, 429]
+        assert "nexus:ratelimit:{acme}:hour" in limiter._local
+        assert "nexus:ratelimit:{acme}:acme:alice:GET /reports/{id}:minute" in limiter._local
+
+
+class TestJiraEntityCache:
+    """Tests for the shared Jira entity cache's generational invalidation."""
+    
+    def test_jql_projects(self):
+        """Project scope is read from project clauses and issue keys."""
+        from nexus_lib.jira import jql_projects
+        
+        assert jql_projects('project = nexus AND sprint in openSprints()') == ["NEXUS"]
+        assert jql_projects('project IN (ABC, "DEF") ORDER BY key') == ["ABC", "DEF"]
+        assert jql_projects('project = A AND (status = Open OR summary ~ "x")') == ["A"]
+        assert jql_projects("assignee = currentUser()") == []
+    
+    def test_jql_projects_unconfined_queries(self):
+        """Queries that can return issues from other projects are not scoped."""
+        from nexus_lib.jira import jql_projects
+        
+        assert jql_projects("project = A OR assignee = currentUser()") == []
+        assert jql_projects("project = A || project = B") == []
+        assert jql_projects("parent in (EPIC-1, EPIC-2)") == []
+        assert jql_projects("NOT project = A AND status = Open") == []
+        assert jql_projects('summary ~ "project = A"') == []
+    
+    @pytest.mark.asyncio
+    async def test_unconfined_searches_retire_on_any_invalidation(self):
+        """OR and parent-in searches are retired by invalidations in other projects."""
+        from nexus_lib.jira import JiraEntityCache
+        
+        cache = JiraEntityCache("unconfined.jira.test")
+        cache._redis_down_until = float("inf")
+        calls = []
+        
+        async def loader():
+            calls.append(1)
+            return {"total": len(calls), "issues": []}
+        
+        queries = ["project = A OR assignee = currentUser()", "parent in (EPIC-1)"]
+        for jql in queries:
+            await cache.get_search(jql, loader)
+            await cache.get_search(jql, loader)
+        assert len(calls) == 2
+        
+        await cache.invalidate_issue("OTHER-7")
+        for jql in queries:
+            await cache.get_search(jql, loader)
+        assert len(calls) == 4
+    
+    @pytest.mark.asyncio
+    async def test_invalidation_scopes(self):
+        """Issue invalidation retires its project's searches; sprint events retire all."""
+        from nexus_lib.jira import JiraEntityCache
+        
+        cache = JiraEntityCache("generations.jira.test")
+        cache._redis_down_until = float("inf")
+        nexus, other = await cache.search_generation(["NEXUS"]), await cache.search_generation(["OTHER"])
+        
+        await cache.invalidate_issue("NEXUS-1")
+        assert await cache.search_generation(["NEXUS"]) != nexus
+        assert await cache.search_generation(["OTHER"]) == other
+        
+        await cache.invalidate_sprints()
+        assert await cache.search_generation(["OTHER"]) != other
+        assert cache.get_stats()["invalidations"] == 2
 
 
 # =============================================================================